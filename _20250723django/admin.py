@@ -0,0 +1,167 @@
+# _20250723django/admin.py
+# 여러 앱(blog, photo, bookmark)의 관리자 클래스가 함께 사용하는 대용량 테이블용 변경 목록(changelist) 도구 모음입니다.
+# - CachedCountPaginator: 필터 없는 목록은 COUNT(*) 대신 추정 행 수를, 필터/검색이 걸린 목록은 잠시 캐시한 정확한 수를 사용합니다.
+# - LimitedRelatedFieldListFilter / TagListFilter: 관련 객체(사용자, 분류, 태그)를 전부 나열하지 않고 LIMIT개만 선택지로 표시합니다.
+# - TagAutocompleteWidget: 태그 입력칸에 관리자 자동 완성 API의 제안을 붙입니다. (전체 태그 목록을 읽지 않음)
+# - ScalableAdminMixin: 위 도구와 list_defer(목록에서 읽지 않을 큰 필드)를 ModelAdmin에 적용합니다.
+# 검색은 각 앱의 관리자 클래스가 get_search_results()에서 전문 검색 색인(FTS5)을 사용하도록 재정의합니다.
+
+import hashlib
+
+from django.conf import settings
+from django.contrib import admin
+from django.contrib.admin.views.main import ChangeList
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import caches
+from django.core.exceptions import EmptyResultSet
+from django.core.paginator import Paginator
+from django.db import connections
+from django.forms import Media
+from django.urls import reverse
+from django.utils.functional import cached_property
+from taggit.forms import TagWidget
+from taggit.managers import TaggableManager
+from taggit.models import TaggedItem
+
+# 기본 설정 (settings.py에서 같은 이름으로 덮어쓸 수 있습니다)
+DEFAULT_COUNT_CACHE_TIMEOUT = 60 # 초, 필터/검색 결과 수를 캐시하는 시간 (0이면 캐시 안 함)
+DEFAULT_EXACT_COUNT_LIMIT = 10000 # 추정 행 수가 이보다 작은 테이블은 정확히 셈
+DEFAULT_FILTER_CHOICES = 30 # 관련 객체 필터에 표시할 최대 선택지 수
+
+KEY_PREFIX = 'admin-count'
+
+
+def get_cache():
+    return caches[getattr(settings, 'ADMIN_COUNT_CACHE_ALIAS', 'default')]
+
+
+def estimated_row_count(model, using):
+    # 테이블의 행 수를 COUNT(*) 없이 추정합니다. (SQLite: rowid 최댓값, 삭제된 행이 있으면 실제보다 큼)
+    # rowid는 기본 키 인덱스(B-트리)의 마지막 항목이므로 테이블 크기와 무관하게 바로 읽힙니다.
+    connection = connections[using]
+    if connection.vendor != 'sqlite':
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute(f'SELECT max(rowid) FROM {connection.ops.quote_name(model._meta.db_table)}')
+        return cursor.fetchone()[0] or 0
+
+
+class CachedCountPaginator(Paginator):
+    # 관리자 변경 목록의 전체 개수(페이지 수 계산용)
+    # - 필터/검색이 없으면: 추정 행 수가 ADMIN_EXACT_COUNT_LIMIT 이상이면 추정치를 그대로 사용
+    # - 그 외: 정확한 COUNT(*) 결과를 쿼리(SQL과 인자)별로 ADMIN_COUNT_CACHE_TIMEOUT초 동안 캐시
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        if not hasattr(queryset, 'query'):
+            return super().count
+        if not queryset.query.where and not queryset.query.distinct:
+            estimate = estimated_row_count(queryset.model, queryset.db)
+            if estimate is not None and estimate >= getattr(settings, 'ADMIN_EXACT_COUNT_LIMIT', DEFAULT_EXACT_COUNT_LIMIT):
+                return estimate
+        timeout = getattr(settings, 'ADMIN_COUNT_CACHE_TIMEOUT', DEFAULT_COUNT_CACHE_TIMEOUT)
+        if timeout <= 0:
+            return super().count
+        try:
+            sql, params = queryset.query.sql_with_params()
+        except EmptyResultSet:
+            return 0
+        digest = hashlib.md5(repr((queryset.db, sql, params)).encode()).hexdigest()
+        key = f'{KEY_PREFIX}:{queryset.model._meta.label_lower}:{digest}'
+        count = get_cache().get(key)
+        if count is None:
+            count = super().count
+            get_cache().set(key, count, timeout)
+        return count
+
+
+def get_filter_choices():
+    return getattr(settings, 'ADMIN_FILTER_CHOICES', DEFAULT_FILTER_CHOICES)
+
+
+class LimitedRelatedFieldListFilter(admin.RelatedFieldListFilter):
+    # ForeignKey 필터: 관련 모델의 행을 전부 읽지 않고 정렬 순서상 처음 ADMIN_FILTER_CHOICES개만 표시합니다.
+    # (현재 선택된 값은 목록 밖에 있어도 함께 표시, 그 밖의 값은 자동 완성 입력이나 검색으로 찾음)
+
+    def field_choices(self, field, request, model_admin):
+        related_model = field.remote_field.model
+        ordering = self.field_admin_ordering(field, request, model_admin) or related_model._meta.ordering or ('pk',)
+        queryset = related_model._default_manager.order_by(*ordering)
+        choices = [(obj.pk, str(obj)) for obj in queryset[:get_filter_choices()]]
+        selected = self.lookup_val[0] if self.lookup_val else None
+        if selected and selected not in {str(pk) for pk, _ in choices}:
+            obj = related_model._default_manager.filter(pk=selected).first()
+            if obj is not None:
+                choices.append((obj.pk, str(obj)))
+        return choices
+
+
+class TagListFilter(admin.SimpleListFilter):
+    # 태그 필터: 이 모델에 가장 많이 쓰인 태그 ADMIN_FILTER_CHOICES개만 표시합니다. (태그 통계 테이블 TagStat 사용)
+    # 필터링은 JOIN 대신 태그 인덱스(tag_id, content_type_id, object_id)를 읽는 id 서브쿼리로 하므로 중복 행이 생기지 않습니다.
+    title = '태그'
+    parameter_name = 'tag'
+
+    def lookups(self, request, model_admin):
+        from tag_cloud.stats import top_tags
+
+        tags = list(top_tags(model_admin.model, get_filter_choices()))
+        if self.value() and self.value() not in {tag.slug for tag in tags}:
+            tags += list(top_tags(model_admin.model, 1, slug=self.value()))
+        return [(tag.slug, tag.name) for tag in tags]
+
+    def queryset(self, request, queryset):
+        if not self.value():
+            return queryset
+        content_type = ContentType.objects.get_for_model(queryset.model)
+        tagged = TaggedItem.objects.filter(content_type=content_type, tag__slug=self.value()).values('object_id')
+        return queryset.filter(pk__in=tagged)
+
+
+class TagAutocompleteWidget(TagWidget):
+    # 쉼표로 구분한 태그 입력칸 (taggit TagWidget)
+    # 마지막으로 입력 중인 태그를 관리자 자동 완성 API(admin:autocomplete, TagAdmin.search_fields)로 찾아 datalist 제안으로 붙입니다.
+
+    def __init__(self, field, admin_site, attrs=None):
+        self.field = field
+        self.admin_site = admin_site
+        super().__init__(attrs)
+
+    @property
+    def media(self):
+        return Media(js=['js/admin_tag_autocomplete.js'])
+
+    def build_attrs(self, base_attrs, extra_attrs=None):
+        attrs = super().build_attrs(base_attrs, extra_attrs)
+        attrs['class'] = f"{attrs.get('class', '')} admin-tag-autocomplete".strip()
+        attrs['autocomplete'] = 'off'
+        attrs['data-autocomplete-url'] = reverse(f'{self.admin_site.name}:autocomplete')
+        attrs['data-app-label'] = self.field.model._meta.app_label
+        attrs['data-model-name'] = self.field.model._meta.model_name
+        attrs['data-field-name'] = self.field.name
+        return attrs
+
+
+class DeferringChangeList(ChangeList):
+    # 변경 목록에서만 ModelAdmin.list_defer 필드를 읽지 않습니다. (수정 화면은 전체 필드를 읽음)
+
+    def get_queryset(self, request, exclude_parameters=None):
+        queryset = super().get_queryset(request, exclude_parameters)
+        if self.model_admin.list_defer:
+            queryset = queryset.defer(*self.model_admin.list_defer)
+        return queryset
+
+
+class ScalableAdminMixin:
+    paginator = CachedCountPaginator
+    show_full_result_count = False # 필터 결과 옆의 "전체 N개"를 세는 두 번째 COUNT(*) 생략
+    list_defer = () # 변경 목록에서 읽지 않을 큰 필드 (예: 게시물 본문)
+
+    def get_changelist(self, request, **kwargs):
+        return DeferringChangeList
+
+    def formfield_for_dbfield(self, db_field, request, **kwargs):
+        if isinstance(db_field, TaggableManager):
+            kwargs.setdefault('widget', TagAutocompleteWidget(db_field, self.admin_site))
+        return super().formfield_for_dbfield(db_field, request, **kwargs)
@@ -9,8 +9,24 @@ https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
 
 import os
 
-from django.core.asgi import get_asgi_application
+import django
+from django.conf import settings
+from django.core.handlers.asgi import ASGIHandler
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', '_20250723django.settings')
 
-application = get_asgi_application()
+
+# ASGI 요청은 비동기 뷰 URL 설정(settings.ASYNC_ROOT_URLCONF, 기본: _20250723django/async_urls.py)으로 처리합니다.
+# 요청마다 request.urlconf를 지정하므로 같은 프로세스의 WSGI 요청(ROOT_URLCONF)에는 영향이 없습니다.
+class AsyncViewsASGIHandler(ASGIHandler):
+
+    def create_request(self, scope, body_file):
+        request, error_response = super().create_request(scope, body_file)
+        if request is not None:
+            request.urlconf = getattr(settings, 'ASYNC_ROOT_URLCONF', settings.ROOT_URLCONF)
+        return request, error_response
+
+
+# get_asgi_application()과 같이 Django를 초기화한 뒤 핸들러를 만듭니다.
+django.setup(set_prefix=False)
+application = AsyncViewsASGIHandler()
@@ -0,0 +1,22 @@
+# _20250723django/async_urls.py
+# ASGI 요청용 URL 설정 (settings.ASYNC_ROOT_URLCONF, _20250723django/asgi.py에서 사용)
+# 공개 조회 페이지가 있는 앱(blog, photo, tag_cloud)은 비동기 뷰 URL(<앱>/async_urls.py)로 바꾸고,
+# 나머지(admin, bookmark, home, 미디어/정적 파일)는 동기 URL 설정(_20250723django/urls.py)을 그대로 사용합니다.
+# 앱 네임스페이스와 URL 이름이 같으므로 {% url %} / reverse()의 결과는 WSGI와 같습니다.
+
+from django.urls import include, path
+
+from _20250723django import urls
+
+# 비동기 뷰로 바꿀 앱 네임스페이스: 비동기 URL 모듈
+ASYNC_APP_URLCONFS = {
+    'blog': 'blog.async_urls',
+    'photo': 'photo.async_urls',
+    'tag_cloud': 'tag_cloud.async_urls',
+}
+
+urlpatterns = [
+    path(str(pattern.pattern), include(ASYNC_APP_URLCONFS[pattern.namespace]))
+    if getattr(pattern, 'namespace', None) in ASYNC_APP_URLCONFS else pattern
+    for pattern in urls.urlpatterns
+]
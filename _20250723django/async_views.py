@@ -0,0 +1,111 @@
+# _20250723django/async_views.py
+# 공개 조회 페이지용 비동기 뷰 기반 클래스
+# ASGI 서버에서 실행될 때 (_20250723django/asgi.py) 요청 처리 전체가 이벤트 루프에서 진행되도록
+# DB 조회는 비동기 ORM(aget, acount, aaggregate, async for)으로만 하고, 템플릿은 render()로 바로 렌더링합니다.
+# (TemplateResponse는 핸들러가 동기 함수로 렌더링하므로 스레드 전환이 한 번 더 생깁니다)
+# 템플릿 이름, 컨텍스트 변수 이름, 페이지 캐시 태그, 조건부 GET 검증값은 동기 뷰와 같습니다.
+
+from django.http import Http404
+from django.shortcuts import render
+from django.views import View
+
+from _20250723django.conditional import ConditionalGetMixin, add_validator_headers, not_modified_response
+from _20250723django.mixins import ListQuerysetMixin
+from _20250723django.pagecache import add_cache_tags
+from _20250723django.pagination import CursorPaginationMixin
+
+
+# --- 비동기 페이지 뷰 (AsyncPageView) ---
+# 하위 클래스는 aget_context_data()에서 필요한 데이터를 비동기로 조회합니다.
+# validator_timestamp_field가 지정된 뷰는 동기 뷰와 같은 ETag / Last-Modified로 304를 응답합니다.
+class AsyncPageView(ConditionalGetMixin, View):
+    model = None
+    template_name = None
+    page_cache_tags = ()
+
+    def get_queryset(self):
+        return self.model._default_manager.all()
+
+    def get_page_cache_tags(self):
+        return list(self.page_cache_tags)
+
+    async def aget_context_data(self, **kwargs):
+        kwargs.setdefault('view', self)
+        return kwargs
+
+    async def get(self, request, *args, **kwargs):
+        # 템플릿의 {{ user }}와 ETag 계산이 동기 세션/사용자 조회를 하지 않도록 사용자를 미리 불러 둡니다.
+        request.user = await request.auser()
+        etag = last_modified = None
+        if self.validator_timestamp_field:
+            etag, last_modified = await self.aget_validators()
+            if etag is not None:
+                response = not_modified_response(request, etag, last_modified)
+                if response is not None:
+                    return add_validator_headers(request, response, etag, last_modified)
+        context = await self.aget_context_data()
+        add_cache_tags(request, *self.get_page_cache_tags())
+        response = render(request, self.template_name, context)
+        if etag is not None:
+            add_validator_headers(request, response, etag, last_modified)
+        return response
+
+
+# --- 비동기 목록 뷰 (AsyncListView) ---
+# ListView와 같은 컨텍스트(object_list, page_obj, paginator, is_paginated, cursor_page)를 만듭니다.
+# 페이지네이션은 CursorPaginationMixin.apaginate_queryset()을 사용합니다. (?page= / ?cursor=)
+class AsyncListView(CursorPaginationMixin, ListQuerysetMixin, AsyncPageView):
+    context_object_name = None
+    paginate_by = None
+    page_kwarg = 'page'
+
+    async def aget_context_data(self, **kwargs):
+        queryset = self.get_queryset()
+        if self.paginate_by:
+            paginator, page, object_list, is_paginated = await self.apaginate_queryset(queryset, self.paginate_by)
+        else:
+            paginator, page, is_paginated = None, None, False
+            object_list = [obj async for obj in queryset]
+        context = {
+            'paginator': paginator,
+            'page_obj': page,
+            'is_paginated': is_paginated,
+            'object_list': object_list,
+            'cursor_page': getattr(self, 'cursor_page', None),
+        }
+        if self.context_object_name:
+            context[self.context_object_name] = object_list
+        context.update(kwargs)
+        return await super().aget_context_data(**context)
+
+
+# --- 비동기 상세 뷰 (AsyncDetailView) ---
+# URL의 pk 또는 slug로 객체 하나를 조회하고, 없으면 404를 반환합니다.
+# 객체의 태그(검증값과 템플릿에서 사용)는 get_queryset()에서 prefetch_related('tags')로 미리 가져옵니다.
+class AsyncDetailView(AsyncPageView):
+    context_object_name = None
+    pk_url_kwarg = 'pk'
+    slug_url_kwarg = 'slug'
+    slug_field = 'slug'
+
+    async def get(self, request, *args, **kwargs):
+        # 조건부 GET 검증 전에 객체를 조회합니다. (없는 객체는 조건부 요청 헤더와 관계없이 404)
+        self.object = await self.aget_object()
+        return await super().get(request, *args, **kwargs)
+
+    async def aget_object(self):
+        if self.pk_url_kwarg in self.kwargs:
+            lookup = {'pk': self.kwargs[self.pk_url_kwarg]}
+        else:
+            lookup = {self.slug_field: self.kwargs[self.slug_url_kwarg]}
+        try:
+            return await self.get_queryset().aget(**lookup)
+        except self.model.DoesNotExist:
+            raise Http404(f'{self.model._meta.verbose_name}을(를) 찾을 수 없습니다.')
+
+    async def aget_context_data(self, **kwargs):
+        context = {'object': self.object}
+        if self.context_object_name:
+            context[self.context_object_name] = self.object
+        context.update(kwargs)
+        return await super().aget_context_data(**context)
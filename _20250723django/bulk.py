@@ -0,0 +1,29 @@
+# _20250723django/bulk.py
+# bulk_create로 대량의 행을 넣을 때 여러 앱(home 시드 데이터, bookmark 가져오기)이 함께 쓰는 도우미입니다.
+
+import itertools
+from contextlib import contextmanager
+
+
+def chunked(iterable, size):
+    # iterable을 size개씩 나눈 리스트를 차례로 돌려줍니다. (전체를 메모리에 올리지 않음)
+    iterator = iter(iterable)
+    while chunk := list(itertools.islice(iterator, size)):
+        yield chunk
+
+
+@contextmanager
+def explicit_timestamps(*models):
+    # auto_now / auto_now_add 필드가 bulk_create 시 현재 시각으로 덮어쓰지 않도록 잠시 끕니다.
+    # (시드 데이터나 가져온 북마크의 원래 작성일을 보존하기 위해 사용, 값은 호출하는 쪽에서 채워야 합니다)
+    saved = []
+    for model in models:
+        for field in model._meta.concrete_fields:
+            if getattr(field, 'auto_now', False) or getattr(field, 'auto_now_add', False):
+                saved.append((field, field.auto_now, field.auto_now_add))
+                field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, auto_now, auto_now_add in saved:
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
@@ -0,0 +1,143 @@
+# _20250723django/conditional.py
+# 조건부 GET (ETag / Last-Modified)
+# 브라우저나 프록시가 If-None-Match / If-Modified-Since 헤더로 다시 요청하면,
+# 본 쿼리와 템플릿 렌더링 없이 검증값만으로 내용이 바뀌었는지 판단하여 바뀌지 않았으면 304 Not Modified를 반환합니다.
+# 검증값은 두 가지입니다.
+# - DB 집계: 목록이 보여주는 객체 범위의 (개수, 최대 수정 시각) - 어느 프로세스의 쓰기든, 시그널이 없는
+#   bulk_create / update()도 반영됩니다. 추가/수정은 최대 수정 시각이, 삭제는 개수가 바꿉니다.
+# - 페이지 캐시의 태그 버전(_20250723django/pagecache.py): 객체 추가/수정/삭제, 태그 연결 변경, 태그 이름 변경 시그널이
+#   커밋 시각(ns)으로 올립니다. 수정 시각이 바뀌지 않는 변경(태그 연결, 이전/다음 객체)을 반영하며,
+#   모든 프로세스가 공유하는 캐시일 때만 사용합니다. (pagecache.is_shared())
+
+import datetime
+import hashlib
+
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response, patch_cache_control, quote_etag
+from django.utils.http import http_date
+
+from _20250723django import pagecache
+
+
+def make_etag(*parts):
+    # 검증값 목록으로 ETag 문자열(따옴표 포함)을 만듭니다.
+    return quote_etag(hashlib.md5(repr(parts).encode()).hexdigest())
+
+
+def not_modified_response(request, etag, last_modified):
+    # 요청의 If-None-Match / If-Modified-Since가 현재 검증값과 일치하면 304 응답, 아니면 None
+    return get_conditional_response(request, etag=etag, last_modified=_timestamp(last_modified))
+
+
+def add_validator_headers(request, response, etag, last_modified):
+    # 렌더링한 응답(또는 304 응답)에 ETag / Last-Modified / Cache-Control 헤더를 붙입니다.
+    if response.status_code not in (200, 304):
+        return response
+    response.headers.setdefault('ETag', etag)
+    if last_modified is not None:
+        response.headers.setdefault('Last-Modified', http_date(_timestamp(last_modified)))
+    # 브라우저와 프록시가 사본을 보관하되 매번 검증(조건부 요청)하도록 합니다.
+    # 로그인 사용자의 페이지는 공유 캐시(프록시)에 저장되지 않도록 private로 표시합니다.
+    if request.user.is_authenticated:
+        patch_cache_control(response, private=True, no_cache=True)
+    else:
+        patch_cache_control(response, no_cache=True)
+    return response
+
+
+def _timestamp(last_modified):
+    return int(last_modified.timestamp()) if last_modified else None
+
+
+def _version_datetime(version):
+    # 태그 버전(ns) → datetime
+    return datetime.datetime.fromtimestamp(version / 1_000_000_000, datetime.timezone.utc)
+
+
+# --- 조건부 GET 믹스인 (ConditionalGetMixin) ---
+# validator_timestamp_field: 객체가 바뀔 때마다 갱신되는 필드 (Post.modify_dt, Photo.updated_at) - 지정한 뷰만 조건부 GET을 사용합니다.
+# 목록 뷰: get_validator_queryset()의 (개수, 최대 수정 시각) 집계 쿼리 1회와 페이지의 의존 태그(get_page_cache_tags) 버전
+#          (페이지 번호와 관계없이 같은 검증값)
+# 상세 뷰: 객체를 먼저 조회하고 (없으면 조건부 요청 헤더와 관계없이 404), 객체의 수정 시각과 태그,
+#          객체 자신의 태그 버전을 사용합니다. 이전/다음 객체가 바뀌면 시그널이 이 객체의 태그 버전도 올리므로,
+#          태그 버전을 공유하지 않는 설정에서는 상세 뷰의 조건부 GET을 사용하지 않습니다.
+# 비동기 뷰(_20250723django/async_views.py)는 aget_validators()와 위의 함수들을 직접 사용합니다.
+class ConditionalGetMixin:
+    validator_timestamp_field = None
+
+    def get_validator_queryset(self):
+        # 목록 뷰의 집계 대상: 목록이 보여주는 객체 범위 (태그별 목록은 그 태그의 객체만, 정렬은 집계에 필요 없음)
+        return self.get_queryset().order_by()
+
+    def get_etag_parts(self):
+        # 검증값 외에 ETag에 포함할 값 (예: 오늘 날짜 아카이브의 날짜) - 필요한 뷰에서 재정의합니다.
+        return ()
+
+    def is_detail_view(self):
+        return hasattr(self, 'get_object') or hasattr(self, 'aget_object')
+
+    def get_validator_tags(self):
+        # 검증에 사용할 페이지 캐시 태그 (상세 뷰는 태그 범위 ?tag=<slug> 안의 이웃이 바뀌는 경우를 위해 그 태그도 포함)
+        if not self.is_detail_view():
+            return self.get_page_cache_tags()
+        tags = [pagecache.instance_tag(self.object)]
+        tag_slug = self.get_tag_slug() if hasattr(self, 'get_tag_slug') else None
+        if tag_slug:
+            tags.append(pagecache.taggit_tag(tag_slug))
+        return tags
+
+    def _make_validators(self, versions, state=None):
+        # (ETag, Last-Modified) - state: 목록 뷰의 집계 결과 {'num': 개수, 'last': 최대 수정 시각}
+        timestamps = [_version_datetime(version) for version in versions.values()]
+        parts = ()
+        if state is not None:
+            parts = (state['num'], state['last'])
+            if state['last'] is not None:
+                timestamps.append(state['last'])
+        if self.is_detail_view():
+            # 객체 자신의 (id, 수정 시각, 태그) - 태그는 미리 가져온 값(prefetch_related('tags'))을 사용합니다.
+            modified = getattr(self.object, self.validator_timestamp_field)
+            parts = (self.object.pk, modified, sorted(tag.slug for tag in self.object.tags.all()))
+            timestamps.append(modified)
+        # 로그인 사용자마다 메뉴(사용자 이름)가 다르게 렌더링되므로 사용자 id도 ETag에 포함합니다.
+        etag = make_etag(*parts, sorted(versions.items()), self.request.user.pk, *self.get_etag_parts())
+        return etag, max(timestamps, default=None)
+
+    def _aggregates(self):
+        return {'num': Count('pk'), 'last': Max(self.validator_timestamp_field)}
+
+    def get_validators(self):
+        # (ETag, Last-Modified), 조건부 GET을 사용하지 않으면 (None, None)
+        shared = pagecache.is_shared()
+        if self.is_detail_view():
+            if not shared:
+                return None, None
+            return self._make_validators(pagecache.tag_versions(self.get_validator_tags()))
+        state = self.get_validator_queryset().aggregate(**self._aggregates())
+        return self._make_validators(pagecache.tag_versions(self.get_validator_tags()) if shared else {}, state)
+
+    async def aget_validators(self):
+        shared = pagecache.is_shared()
+        if self.is_detail_view():
+            if not shared:
+                return None, None
+            return self._make_validators(await pagecache.atag_versions(self.get_validator_tags()))
+        state = await self.get_validator_queryset().aaggregate(**self._aggregates())
+        return self._make_validators(await pagecache.atag_versions(self.get_validator_tags()) if shared else {}, state)
+
+    def get(self, request, *args, **kwargs):
+        detail = self.is_detail_view()
+        if detail:
+            self.object = self.get_object() # 없는 객체는 여기서 404
+        etag, last_modified = self.get_validators()
+        response = None
+        if etag is not None:
+            response = not_modified_response(request, etag, last_modified)
+        if response is None:
+            if detail: # DetailView.get()과 같지만 객체를 다시 조회하지 않습니다.
+                response = self.render_to_response(self.get_context_data(object=self.object))
+            else:
+                response = super().get(request, *args, **kwargs)
+        if etag is None:
+            return response
+        return add_validator_headers(request, response, etag, last_modified)
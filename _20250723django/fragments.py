@@ -0,0 +1,114 @@
+# _20250723django/fragments.py
+# 목록 카드(게시물/사진 카드 등) 조각 캐시 템플릿 태그
+# - 카드 하나를 (조각 이름, 모델, id, 버전)을 키로 렌더링 결과 HTML째 캐시합니다.
+#   버전은 수정 시각(modify_dt / updated_at), 태그 집합(slug, 이름), 카드에 표시하는 관련 객체(작성자 id와 이름),
+#   vary_on 값으로 만들기 때문에 객체가 수정되거나 태그나 작성자 이름이 바뀌면 키 자체가 달라져
+#   따로 무효화할 필요가 없습니다. (이전 키는 만료 시간에 사라짐)
+# - 같은 게시물은 전체 목록, 커서 페이지, 검색 결과 등 어느 목록에서든 같은 카드를 재사용합니다.
+#   (목록마다 달라지는 값, 예: 상세 링크의 ?tag=, 검색어에 따른 스니펫은 vary_on으로 넘겨 키에 포함)
+# - 목록에서 처음 카드를 그릴 때 목록 전체의 키를 get_many() 한 번으로 읽어 두므로 캐시 왕복은 페이지당 1회입니다.
+#   캐시에 없는 카드만 렌더링해 저장합니다.
+# 사용 예 (TEMPLATES OPTIONS의 libraries에 'fragment_cache'로 등록되어 있음):
+#   {% load fragment_cache %}
+#   {% for post in posts %}
+#       {% cardcache 'post-card' post in posts tag_slug search_query %} ...카드 마크업... {% endcardcache %}
+#   {% endfor %}
+# 태그 배지를 그리는 카드는 목록 뷰에서 prefetch_related('tags'), 작성자를 표시하는 카드는 select_related('author')를
+# 해 두어야 버전 계산에 쿼리가 추가되지 않습니다.
+
+import hashlib
+
+from django import template
+from django.conf import settings
+from django.core.cache import caches
+
+# 기본 설정 (settings.py에서 같은 이름으로 덮어쓸 수 있습니다)
+DEFAULT_TIMEOUT = 60 * 60 * 24 # 초 (0이면 조각 캐시 사용 안 함)
+
+KEY_PREFIX = 'fragment'
+MODIFIED_FIELDS = ('modify_dt', 'updated_at') # 수정 시각 필드 이름 (Post, Photo)
+DISPLAYED_RELATIONS = ('author',) # 카드에 str()로 표시하는 ForeignKey (사용자 이름은 객체의 수정 시각을 바꾸지 않음)
+
+register = template.Library()
+
+
+def get_cache():
+    return caches[getattr(settings, 'FRAGMENT_CACHE_ALIAS', 'default')]
+
+
+def get_timeout():
+    return getattr(settings, 'FRAGMENT_CACHE_TIMEOUT', DEFAULT_TIMEOUT)
+
+
+def tag_set_version(obj):
+    # 객체에 달린 태그 (slug, 이름) 집합 (태그 추가/삭제/이름 변경 시 달라짐)
+    if not hasattr(obj, 'tags'):
+        return ()
+    return sorted((tag.slug, tag.name) for tag in obj.tags.all())
+
+
+def related_version(obj):
+    # 카드에 표시하는 관련 객체의 (id, 표시 이름) 목록 (작성자가 바뀌거나 사용자 이름이 바뀌면 달라짐)
+    parts = []
+    for field in DISPLAYED_RELATIONS:
+        if hasattr(obj, f'{field}_id'):
+            related = getattr(obj, field)
+            parts.append((getattr(obj, f'{field}_id'), str(related) if related is not None else None))
+    return parts
+
+
+def fragment_key(name, obj, vary_on=()):
+    parts = [getattr(obj, field, None) for field in MODIFIED_FIELDS]
+    parts += [tag_set_version(obj), related_version(obj), list(vary_on)]
+    version = hashlib.md5(repr(parts).encode()).hexdigest()
+    return f'{KEY_PREFIX}:{name}:{obj._meta.label_lower}:{obj.pk}:{version}'
+
+
+class CardCacheNode(template.Node):
+
+    def __init__(self, nodelist, name, obj, objects, vary_on):
+        self.nodelist = nodelist
+        self.name = name
+        self.obj = obj
+        self.objects = objects
+        self.vary_on = vary_on
+
+    def render(self, context):
+        timeout = get_timeout()
+        obj = self.obj.resolve(context)
+        if timeout <= 0 or obj is None:
+            return self.nodelist.render(context)
+        name = self.name.resolve(context)
+        vary_on = [var.resolve(context) for var in self.vary_on]
+        fragments = self._prefetch(context, name, vary_on)
+        key = fragment_key(name, obj, vary_on)
+        html = fragments.get(key)
+        if html is None:
+            html = self.nodelist.render(context)
+            get_cache().set(key, html, timeout)
+            fragments[key] = html
+        return html
+
+    def _prefetch(self, context, name, vary_on):
+        # 목록 렌더링(이 태그의 첫 호출) 시 목록 전체의 카드를 한 번에 읽어 render_context에 보관합니다.
+        objects = self.objects.resolve(context)
+        prefetched = context.render_context.get(self)
+        if prefetched is None or prefetched[0] is not objects:
+            keys = [fragment_key(name, item, vary_on) for item in objects or ()]
+            prefetched = (objects, get_cache().get_many(keys) if keys else {})
+            context.render_context[self] = prefetched
+        return prefetched[1]
+
+
+@register.tag
+def cardcache(parser, token):
+    # {% cardcache <조각 이름> <객체> in <목록> [vary_on ...] %} ... {% endcardcache %}
+    bits = token.split_contents()
+    if len(bits) < 5 or bits[3] != 'in':
+        raise template.TemplateSyntaxError(
+            f"'{bits[0]}' 태그는 {{% {bits[0]} <이름> <객체> in <목록> [vary_on ...] %}} 형식이어야 합니다."
+        )
+    nodelist = parser.parse(('endcardcache',))
+    parser.delete_first_token()
+    name, obj, objects = (parser.compile_filter(bit) for bit in (bits[1], bits[2], bits[4]))
+    return CardCacheNode(nodelist, name, obj, objects, [parser.compile_filter(bit) for bit in bits[5:]])
@@ -0,0 +1,13 @@
+# _20250723django/fts.py
+# SQLite FTS5 전문 검색 색인을 사용하는 앱(blog, bookmark)이 공유하는 도우미 함수입니다.
+
+import re
+
+
+def build_match_query(keyword):
+    # 사용자가 입력한 검색어를 FTS5 MATCH 구문으로 변환합니다.
+    # 각 단어를 큰따옴표로 감싸 FTS5 문법 문자(AND, OR, *, : 등)를 무력화하고,
+    # 뒤에 *를 붙여 접두어 검색으로 만듭니다. (예: '장고' -> '장고를', '장고의'도 일치)
+    # 단어 사이는 공백(암묵적 AND)으로 연결됩니다. 검색할 단어가 없으면 빈 문자열을 반환합니다.
+    terms = re.findall(r'\w+', keyword)
+    return ' '.join(f'"{term}"*' for term in terms)
@@ -0,0 +1,209 @@
+# _20250723django/media.py
+# MEDIA_ROOT의 업로드 파일(사진 원본과 렌디션)을 내려주는 뷰입니다. (DEBUG와 관계없이 사용)
+# - 파일은 FileResponse로 보내므로 WSGI 서버가 wsgi.file_wrapper(sendfile)를 지원하면 파이썬에서 읽지 않고 전송됩니다.
+# - ETag / Last-Modified로 조건부 요청(304, 412)을, Range / If-Range로 부분 요청(206, 416)을 처리합니다.
+# - MEDIA_OFFLOAD를 'x-accel-redirect'(nginx) 또는 'x-sendfile'(Apache, lighttpd)로 설정하면
+#   Django는 접근 허용 여부만 판단하고, 파일 전송(범위 요청, 조건부 요청 포함)은 앞단 프록시에 맡깁니다.
+#
+# nginx 설정 예 (MEDIA_OFFLOAD = 'x-accel-redirect', MEDIA_ACCEL_REDIRECT_PREFIX = '/protected-media/'):
+#   location /protected-media/ {
+#       internal;
+#       alias /path/to/media/;
+#   }
+
+import mimetypes
+import os
+import re
+import stat
+from urllib.parse import quote
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.core.handlers.asgi import ASGIRequest
+from django.http import FileResponse, Http404, HttpResponse
+from django.utils._os import safe_join
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, parse_http_date_safe
+from django.views.decorators.http import require_safe
+
+# 기본 설정 (settings.py에서 같은 이름으로 덮어쓸 수 있습니다)
+DEFAULT_PUBLIC_PREFIXES = ('photos/',)
+DEFAULT_CACHE_MAX_AGE = 3600 # 초
+DEFAULT_ACCEL_REDIRECT_PREFIX = '/protected-media/'
+
+BLOCK_SIZE = 64 * 1024 # sendfile을 쓸 수 없을 때 한 번에 읽는 크기
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+def get_public_prefixes():
+    return tuple(getattr(settings, 'MEDIA_PUBLIC_PREFIXES', DEFAULT_PUBLIC_PREFIXES))
+
+
+def is_public(path):
+    # 내려줄 수 있는 경로인지 판단합니다. (지정한 하위 디렉터리만 허용, 숨김 파일 제외)
+    if any(part.startswith('.') for part in path.split('/')):
+        return False
+    return path.startswith(get_public_prefixes())
+
+
+def file_etag(st):
+    # 파일 크기와 수정 시각으로 만든 ETag (nginx와 같은 방식, 파일 내용을 읽지 않음)
+    return f'"{st.st_size:x}-{st.st_mtime_ns:x}"'
+
+
+def parse_range(header, size):
+    # 'bytes=시작-끝' 형식의 단일 범위를 (시작, 끝) 바이트 위치(끝 포함)로 바꿉니다.
+    # 범위 요청이 아니거나 여러 범위이면 None (전체 응답), 만족할 수 없는 범위이면 False (416)
+    match = RANGE_RE.match(header.strip().replace(' ', ''))
+    if not match or match.group(1) == match.group(2) == '':
+        return None
+    start, end = match.groups()
+    if start == '':
+        # 마지막 N바이트 (bytes=-N)
+        length = int(end)
+        if length == 0 or size == 0:
+            return False
+        return max(size - length, 0), size - 1
+    start = int(start)
+    if end and int(end) < start:
+        return None # 잘못된 범위는 무시합니다.
+    if start >= size:
+        return False
+    return start, min(int(end), size - 1) if end else size - 1
+
+
+def if_range_matches(request, etag, last_modified):
+    # If-Range가 없거나 현재 파일의 검증값과 같으면 범위 요청을 처리합니다. (다르면 전체 응답)
+    value = request.META.get('HTTP_IF_RANGE')
+    if not value:
+        return True
+    if value.startswith(('"', 'W/')):
+        return value == etag # 약한 비교를 허용하지 않음
+    return parse_http_date_safe(value) == last_modified
+
+
+class RangeFile:
+    # 파일의 [start, start + length) 구간만 읽는 파일 객체
+    # tell / seek을 제공하지 않으므로 FileResponse가 Content-Length를 파일 전체 크기로 덮어쓰지 않습니다.
+    # fileno()의 현재 위치가 구간 시작이므로 sendfile을 쓰는 WSGI 서버(gunicorn)는 Content-Length만큼만 보냅니다.
+
+    def __init__(self, file, start, length):
+        file.seek(start)
+        self.file = file
+        self.name = file.name
+        self.remaining = length
+
+    def read(self, size=-1):
+        if self.remaining <= 0:
+            return b''
+        if size is None or size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.file.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def fileno(self):
+        return self.file.fileno()
+
+    def close(self):
+        self.file.close()
+
+
+async def _aread_chunks(file):
+    # ASGI용: 블록마다 스레드에서 읽어 이벤트 루프를 막지 않습니다.
+    read = sync_to_async(file.read, thread_sensitive=False)
+    try:
+        while chunk := await read(BLOCK_SIZE):
+            yield chunk
+    finally:
+        file.close()
+
+
+def _file_response(request, file, length, **kwargs):
+    # WSGI: FileResponse가 wsgi.file_wrapper(sendfile)로 보냅니다.
+    # ASGI: sendfile이 없고, 동기 이터레이터는 Django가 전체를 메모리에 모은 뒤 보내므로 비동기 이터레이터로 보냅니다.
+    if isinstance(request, ASGIRequest):
+        response = FileResponse(_aread_chunks(file), **kwargs)
+    else:
+        response = FileResponse(file, **kwargs)
+        response.block_size = BLOCK_SIZE
+    response['Content-Length'] = length
+    return response
+
+
+def _offload_response(path, full_path, content_type):
+    # 앞단 프록시가 파일을 보내도록 헤더만 있는 응답을 만듭니다.
+    response = HttpResponse(content_type=content_type)
+    if getattr(settings, 'MEDIA_OFFLOAD', None) == 'x-sendfile':
+        response['X-Sendfile'] = full_path
+    else:
+        prefix = getattr(settings, 'MEDIA_ACCEL_REDIRECT_PREFIX', DEFAULT_ACCEL_REDIRECT_PREFIX)
+        response['X-Accel-Redirect'] = prefix + quote(path)
+    return response
+
+
+def open_regular_file(root, path):
+    # root 아래의 일반 파일 경로와 os.stat 결과를 반환합니다. (없거나 root 밖이면 404)
+    try:
+        full_path = safe_join(root, path)
+        st = os.stat(full_path)
+    except (SuspiciousFileOperation, OSError, ValueError):
+        raise Http404('파일을 찾을 수 없습니다.')
+    if not stat.S_ISREG(st.st_mode):
+        raise Http404('파일을 찾을 수 없습니다.')
+    return full_path, st
+
+
+def guess_content_type(path):
+    content_type, encoding = mimetypes.guess_type(path)
+    if encoding or not content_type:
+        # 압축 파일(.gz 등)은 브라우저가 풀지 않도록 Content-Encoding 없이 그대로 내려줍니다.
+        return 'application/octet-stream'
+    return content_type
+
+
+def file_response(request, full_path, st, content_type, content_encoding=None):
+    # 파일 하나의 조건부(304 / 412) / 범위(206 / 416) / 전체(200) 응답 (Cache-Control은 호출하는 쪽에서 붙임)
+    # content_encoding: 미리 압축해 둔 파일을 보낼 때의 Content-Encoding (gzip, br)
+    etag = file_etag(st)
+    last_modified = int(st.st_mtime)
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is None:
+        size = st.st_size
+        byte_range = None
+        if 'HTTP_RANGE' in request.META and if_range_matches(request, etag, last_modified):
+            byte_range = parse_range(request.META['HTTP_RANGE'], size)
+        if byte_range is False:
+            response = HttpResponse(status=416, content_type=content_type)
+            response['Content-Range'] = f'bytes */{size}'
+        elif request.method == 'HEAD':
+            response = HttpResponse(content_type=content_type) # 파일을 열지 않음
+            response['Content-Length'] = size
+        elif byte_range:
+            start, end = byte_range
+            file = RangeFile(open(full_path, 'rb'), start, end - start + 1)
+            response = _file_response(request, file, end - start + 1, status=206, content_type=content_type)
+            response['Content-Range'] = f'bytes {start}-{end}/{size}'
+        else:
+            response = _file_response(request, open(full_path, 'rb'), size, content_type=content_type)
+        response['Accept-Ranges'] = 'bytes'
+        if content_encoding:
+            response['Content-Encoding'] = content_encoding
+    # 304 응답에도 검증값을 다시 보냅니다.
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(last_modified)
+    return response
+
+
+@require_safe
+def serve_media(request, path):
+    if not is_public(path):
+        raise Http404('파일을 찾을 수 없습니다.')
+    full_path, st = open_regular_file(settings.MEDIA_ROOT, path)
+    content_type = guess_content_type(full_path)
+    if getattr(settings, 'MEDIA_OFFLOAD', None):
+        return _offload_response(path, full_path, content_type)
+    response = file_response(request, full_path, st, content_type)
+    patch_cache_control(response, public=True, max_age=getattr(settings, 'MEDIA_CACHE_MAX_AGE', DEFAULT_CACHE_MAX_AGE))
+    return response
@@ -0,0 +1,27 @@
+# _20250723django/mixins.py
+# 여러 앱(blog, photo, bookmark)의 뷰가 함께 사용하는 공통 믹스인 모음입니다.
+
+
+# --- 목록 쿼리셋 공통 계층 (ListQuerysetMixin) ---
+# 목록 템플릿은 카드마다 tags.all, author, category 등을 참조합니다.
+# 이 값을 미리 select_related / prefetch_related로 묶어 가져오면
+# 한 페이지에 몇 개의 항목이 있든 쿼리 수가 일정하게 유지됩니다.
+# 반대로 목록에서 쓰지 않는 큰 컬럼(예: 게시물 본문)은 list_defer로 빼서 읽는 데이터 양을 줄입니다.
+class ListQuerysetMixin:
+    list_select_related = () # JOIN으로 함께 가져올 ForeignKey 필드 (예: 'author', 'category')
+    list_prefetch_related = () # 별도 쿼리 1회로 묶어 가져올 관계 (예: 'tags')
+    list_defer = () # 목록에서 읽지 않을 필드 (예: 'content')
+
+    def get_queryset(self):
+        # ListView의 기본 쿼리셋에 관계 최적화를 적용한 뒤 반환
+        return self.optimize_list_queryset(super().get_queryset())
+
+    def optimize_list_queryset(self, queryset):
+        # 뷰가 직접 만든 쿼리셋에도 같은 최적화를 적용할 수 있도록 분리한 메서드
+        if self.list_select_related:
+            queryset = queryset.select_related(*self.list_select_related)
+        if self.list_prefetch_related:
+            queryset = queryset.prefetch_related(*self.list_prefetch_related)
+        if self.list_defer:
+            queryset = queryset.defer(*self.list_defer)
+        return queryset
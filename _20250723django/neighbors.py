@@ -0,0 +1,85 @@
+# _20250723django/neighbors.py
+# 상세 페이지의 이전/다음 항목 조회
+# (정렬 필드, id) 인덱스에서 현재 행 바로 앞/뒤 행의 id를 찾는 두 서브쿼리(... LIMIT 1)를
+# 'WHERE id IN ((앞), (뒤))' 한 쿼리로 실행합니다. 각 서브쿼리는 인덱스 범위 탐색이므로 테이블 크기와 무관하게 행 하나만 읽습니다.
+# queryset을 태그 등으로 좁혀서 넘기면 그 범위 안에서의 이전/다음 항목을 구합니다.
+
+from django.db.models import Q, Subquery
+
+
+def _seek(queryset, field, value, pk, previous):
+    # (value, pk) 바로 앞(previous=True) 또는 뒤의 행 id를 구하는 서브쿼리
+    # '<= value AND NOT (= value AND pk >= ...)' 형태로 써야 정렬 필드가 인덱스 범위 조건이 됩니다.
+    # ('< value OR (= value AND pk < ...)'는 OR 때문에 범위 탐색을 하지 못함)
+    op, tie_op, prefix = ('lte', 'gte', '-') if previous else ('gte', 'lte', '')
+    return Subquery(
+        queryset.filter(Q(**{f'{field}__{op}': value}) & ~Q(**{field: value, f'pk__{tie_op}': pk}))
+        .order_by(f'{prefix}{field}', f'{prefix}pk')
+        .values('pk')[:1]
+    )
+
+
+def neighbor_queryset(instance, queryset=None, field='created_at', fields=('title',)):
+    # 이전/다음 행(pk, 정렬 필드, fields...)을 담은 values() 쿼리셋 (최대 2행)
+    if queryset is None:
+        queryset = type(instance)._default_manager.all()
+    value = getattr(instance, field)
+    seeks = [_seek(queryset, field, value, instance.pk, previous) for previous in (True, False)]
+    # 바깥 쿼리는 id로만 찾으므로 태그 등의 조건(JOIN) 없이 기본 매니저를 사용합니다.
+    rows = queryset.model._default_manager.using(queryset.db).filter(pk__in=seeks).order_by()
+    return rows.values('pk', field, *fields)
+
+
+def _build(instance, field, fields, rows):
+    # 쿼리 결과 행들을 (이전 항목, 다음 항목) 객체 튜플로 바꿉니다. pk와 fields만 채워진 객체입니다.
+    model = type(instance)
+    current = (getattr(instance, field), instance.pk)
+    previous = following = None
+    for row in rows:
+        neighbor = model(**{name: row[name] for name in ('pk', *fields)})
+        if (row[field], row['pk']) < current:
+            previous = neighbor
+        else:
+            following = neighbor
+    return previous, following
+
+
+def get_neighbors(instance, queryset=None, field='created_at', fields=('title',)):
+    # (이전 항목, 다음 항목) 튜플을 반환합니다. 이전 = 정렬 필드 값이 더 작은(오래된) 항목, 없으면 None
+    return _build(instance, field, fields, list(neighbor_queryset(instance, queryset, field, fields)))
+
+
+async def aget_neighbors(instance, queryset=None, field='created_at', fields=('title',)):
+    # get_neighbors()의 비동기 버전 (비동기 뷰에서 사용)
+    return _build(instance, field, fields, [row async for row in neighbor_queryset(instance, queryset, field, fields)])
+
+
+# --- 모델 믹스인 (NeighborsMixin) ---
+# 상세 페이지의 이전/다음 링크용 get_neighbors() / aget_neighbors()를 모델에 추가합니다.
+# 같은 객체에서 다시 호출하면 저장해 둔 결과를 사용하므로 뷰와 템플릿에서 여러 번 불러도 쿼리는 한 번입니다.
+class NeighborsMixin:
+    neighbor_fields = ('title',) # 이전/다음 객체에 채울 필드 (링크와 제목 표시용)
+
+    def get_neighbor_queryset(self, tag_slug=None):
+        # 이전/다음을 찾을 범위: tag_slug가 있으면 같은 태그가 달린 객체 중에서 찾습니다.
+        queryset = type(self)._default_manager.all()
+        if tag_slug:
+            queryset = queryset.filter(tags__slug=tag_slug)
+        return queryset
+
+    def _neighbor_cache(self):
+        if not hasattr(self, '_neighbors'):
+            self._neighbors = {}
+        return self._neighbors
+
+    def get_neighbors(self, tag_slug=None):
+        cache = self._neighbor_cache()
+        if tag_slug not in cache:
+            cache[tag_slug] = get_neighbors(self, self.get_neighbor_queryset(tag_slug), fields=self.neighbor_fields)
+        return cache[tag_slug]
+
+    async def aget_neighbors(self, tag_slug=None):
+        cache = self._neighbor_cache()
+        if tag_slug not in cache:
+            cache[tag_slug] = await aget_neighbors(self, self.get_neighbor_queryset(tag_slug), fields=self.neighbor_fields)
+        return cache[tag_slug]
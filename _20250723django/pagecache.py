@@ -0,0 +1,319 @@
+# _20250723django/pagecache.py
+# 익명 사용자용 전체 페이지 캐시
+# - 로그인하지 않은 사용자의 GET/HEAD 요청에 대해 렌더링된 페이지를 (URL + 쿼리 문자열) 단위로 캐시합니다.
+# - 각 페이지는 의존 태그(예: 'post:3', 'post-list', 'tag:django', 'tag-cloud')를 가지며,
+#   모델 변경 시그널이 해당 태그만 무효화하므로 관련 없는 페이지의 캐시는 그대로 유지됩니다.
+# - 태그 무효화는 캐시 항목을 찾아 지우는 대신 "태그 버전"을 올리는 방식입니다.
+#   캐시 항목은 저장 시점의 태그 버전을 함께 기록하고, 조회 시 하나라도 버전이 다르면 버려집니다.
+# - 로그인한 사용자와 PAGE_CACHE_EXCLUDED_APPS(기본: bookmark, admin, media, static)의 요청은 캐시하지 않습니다.
+# - 캐시 항목과 태그 버전은 모든 프로세스가 공유하는 캐시(PAGE_CACHE_ALIAS)에 두어야 다른 프로세스(웹 워커, 관리 명령, 셸)의
+#   쓰기에도 무효화됩니다. 프로세스 안에서만 유효한 백엔드(LocMemCache, DummyCache)이면 페이지 캐시를 사용하지 않습니다.
+# 뷰는 PageCacheMixin(또는 add_cache_tags)으로 의존 태그를 선언한 경우에만 캐시됩니다.
+
+import hashlib
+import time
+from functools import partial
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import transaction
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import parse_http_date_safe
+
+# 기본 설정 (settings.py에서 같은 이름으로 덮어쓸 수 있습니다)
+DEFAULT_TIMEOUT = 600 # 초
+DEFAULT_EXCLUDED_APPS = ('bookmark', 'admin', 'media', 'static')
+
+KEY_PREFIX = 'pagecache'
+TAG_CLOUD = 'tag-cloud'
+
+# 캐시된 응답에 다시 붙이지 않을 헤더 (사용자별로 달라지는 값)
+SKIPPED_HEADERS = {'set-cookie', 'vary'}
+
+# 다른 프로세스와 공유되지 않는 캐시 백엔드 (여기에 둔 태그 버전은 다른 프로세스의 무효화를 알 수 없음)
+PROCESS_LOCAL_BACKENDS = (LocMemCache, DummyCache)
+
+
+def get_cache():
+    return caches[getattr(settings, 'PAGE_CACHE_ALIAS', 'default')]
+
+
+def get_timeout():
+    return getattr(settings, 'PAGE_CACHE_TIMEOUT', DEFAULT_TIMEOUT)
+
+
+def is_shared():
+    # 태그 버전을 모든 프로세스가 공유하는지 여부 (조건부 GET도 이 값이 True일 때만 태그 버전을 검증값으로 사용)
+    return not isinstance(get_cache(), PROCESS_LOCAL_BACKENDS)
+
+
+def is_enabled():
+    return get_timeout() > 0 and is_shared()
+
+
+# --- 의존 태그 이름 ---
+
+def list_tag(model):
+    # 모델 전체 목록에 대한 태그 (예: 'post-list', 'photo-list')
+    return f'{model._meta.model_name}-list'
+
+
+def instance_tag(instance):
+    # 객체 하나에 대한 태그 (예: 'post:3', 'photo:7')
+    return f'{instance._meta.model_name}:{instance.pk}'
+
+
+def taggit_tag(slug):
+    # taggit 태그 하나에 대한 태그 (예: 'tag:django') - 태그별 목록 페이지가 사용합니다.
+    return f'tag:{slug}'
+
+
+def object_tags(instance, tag_slugs):
+    # 게시물/사진이 바뀌었을 때 무효화할 태그: 객체 자신, 전체 목록, 객체에 달린 태그별 목록
+    return [instance_tag(instance), list_tag(type(instance)), *(taggit_tag(slug) for slug in tag_slugs)]
+
+
+def list_cache_tags(model, tag_slug=None):
+    # 목록 페이지의 의존 태그: 태그별 목록은 해당 태그의 변경에만, 전체 목록은 모델 변경 전체에 의존합니다.
+    return [taggit_tag(tag_slug)] if tag_slug else [list_tag(model)]
+
+
+def detail_cache_tags(instance, tag_slug=None):
+    # 상세 페이지의 의존 태그: 객체 자신과 이전/다음 객체 (제목이 바뀌거나 삭제되면 이 페이지도 무효화)
+    # 태그 범위 안에서 이동하는 경우(?tag=<slug>) 그 태그에 객체가 추가/삭제되면 이웃이 바뀌므로 태그도 포함합니다.
+    # 이웃은 뷰에서 이미 조회한 결과(NeighborsMixin의 저장값)를 사용하므로 추가 쿼리가 없습니다.
+    tags = [instance_tag(instance)]
+    tags += [instance_tag(neighbor) for neighbor in instance.get_neighbors(tag_slug) if neighbor]
+    if tag_slug:
+        tags.append(taggit_tag(tag_slug))
+    return tags
+
+
+def current_tag_slugs(instance, using=None):
+    # 객체에 현재 달린 taggit 태그 slug 목록
+    return list(instance.tags.using(using).values_list('slug', flat=True))
+
+
+# --- 태그 버전 ---
+
+def _tag_key(tag):
+    return f'{KEY_PREFIX}:tag:{tag}'
+
+
+def _page_key(request):
+    url = request.build_absolute_uri()
+    return f'{KEY_PREFIX}:page:{hashlib.md5(url.encode()).hexdigest()}'
+
+
+def _bump(tags):
+    # 태그 버전을 현재 시각(ns)으로 올립니다. 이전 버전으로 저장된 캐시 항목은 모두 무효가 됩니다.
+    version = time.time_ns()
+    get_cache().set_many({_tag_key(tag): version for tag in set(tags)}, timeout=None)
+
+
+def invalidate(*tags, using=None):
+    # 태그 무효화를 트랜잭션 커밋 이후로 미룹니다. (커밋 전에 무효화하면 다른 요청이 이전 데이터를 다시 캐시할 수 있음)
+    if tags:
+        transaction.on_commit(partial(_bump, tags), using=using)
+
+
+def _current_versions(tags, versions):
+    # 조회한 버전 {태그 키: 버전} → {태그: 버전}, 처음 쓰이는(또는 캐시에서 밀려난) 태그는 새 버전으로 시작합니다.
+    missing = {_tag_key(tag): time.time_ns() for tag in tags if _tag_key(tag) not in versions}
+    versions = {**versions, **missing}
+    return {tag: versions[_tag_key(tag)] for tag in tags}, missing
+
+
+def tag_versions(tags):
+    # 태그들의 현재 버전 {태그: 버전(ns)} - 조건부 GET의 검증값으로 사용합니다. (_20250723django/conditional.py)
+    cache = get_cache()
+    tags = set(tags)
+    result, missing = _current_versions(tags, cache.get_many([_tag_key(tag) for tag in tags]))
+    if missing:
+        cache.set_many(missing, timeout=None)
+    return result
+
+
+async def atag_versions(tags):
+    cache = get_cache()
+    tags = set(tags)
+    result, missing = _current_versions(tags, await cache.aget_many([_tag_key(tag) for tag in tags]))
+    if missing:
+        await cache.aset_many(missing, timeout=None)
+    return result
+
+
+def add_cache_tags(request, *tags):
+    # 현재 요청이 렌더링하는 페이지의 의존 태그를 등록합니다. 태그가 등록된 요청만 캐시됩니다.
+    if not hasattr(request, '_page_cache_tags'):
+        request._page_cache_tags = set()
+    request._page_cache_tags.update(tags)
+
+
+# --- 뷰 믹스인 (PageCacheMixin) ---
+# page_cache_tags에 고정 태그를 지정하거나, get_page_cache_tags()를 재정의하여 객체별 태그를 추가합니다.
+class PageCacheMixin:
+    page_cache_tags = ()
+
+    def get_page_cache_tags(self):
+        return list(self.page_cache_tags)
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        add_cache_tags(self.request, *self.get_page_cache_tags())
+        return context
+
+
+# --- 미들웨어 (AnonymousPageCacheMiddleware) ---
+# AuthenticationMiddleware 다음에 두어야 request.user로 로그인 여부를 확인할 수 있습니다.
+# WSGI(동기)와 ASGI(비동기) 양쪽에서 동작하며, 비동기 모드에서는 캐시도 비동기 API(aget 등)로 조회하므로
+# 이 미들웨어 때문에 비동기 뷰 앞뒤로 스레드 전환이 추가되지 않습니다.
+class AnonymousPageCacheMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+            self.process_view = self.aprocess_view # 핸들러가 모드에 맞는 process_view를 사용하도록 교체
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        request._page_cache_started = time.time_ns()
+        response = self.get_response(request)
+        if self._should_store(request, response):
+            self._store(request, response)
+        return response
+
+    async def __acall__(self, request):
+        request._page_cache_started = time.time_ns()
+        response = await self.get_response(request)
+        if self._should_store(request, response):
+            await self._astore(request, response)
+        return response
+
+    def _is_cacheable_route(self, request):
+        if request.method not in ('GET', 'HEAD') or not is_enabled():
+            return False
+        match = request.resolver_match
+        return match is not None and match.app_name not in getattr(settings, 'PAGE_CACHE_EXCLUDED_APPS', DEFAULT_EXCLUDED_APPS)
+
+    def _has_session(self, request):
+        # 세션 쿠키가 없으면 세션을 읽지 않고도 익명 사용자임을 알 수 있습니다.
+        return settings.SESSION_COOKIE_NAME in request.COOKIES
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if not self._is_cacheable_route(request):
+            return None
+        if self._has_session(request) and request.user.is_authenticated:
+            return None
+        cache = get_cache()
+        key = _page_key(request)
+        entry = cache.get(key)
+        if entry is not None:
+            versions = cache.get_many([_tag_key(tag) for tag in entry['tags']])
+            response = self._cached_response(request, entry, versions)
+            if response is not None:
+                return response
+        return self._mark_miss(request, key)
+
+    async def aprocess_view(self, request, view_func, view_args, view_kwargs):
+        if not self._is_cacheable_route(request):
+            return None
+        if self._has_session(request) and (await request.auser()).is_authenticated:
+            return None
+        cache = get_cache()
+        key = _page_key(request)
+        entry = await cache.aget(key)
+        if entry is not None:
+            versions = await cache.aget_many([_tag_key(tag) for tag in entry['tags']])
+            response = self._cached_response(request, entry, versions)
+            if response is not None:
+                return response
+        return self._mark_miss(request, key)
+
+    def _cached_response(self, request, entry, versions):
+        # 저장된 태그 버전이 모두 현재 버전과 같으면 캐시된 응답을, 하나라도 다르면 None을 반환합니다.
+        if not all(versions.get(_tag_key(tag)) == version for tag, version in entry['tags'].items()):
+            return None
+        response = HttpResponse(entry['content'], status=entry['status'])
+        for header, value in entry['headers']:
+            response[header] = value
+        response['X-Page-Cache'] = 'hit'
+        # 저장된 ETag / Last-Modified로 조건부 요청에 304를 응답합니다. (_20250723django/conditional.py)
+        return get_conditional_response(
+            request,
+            etag=response.get('ETag'),
+            last_modified=parse_http_date_safe(response.get('Last-Modified', '')),
+            response=response,
+        )
+
+    def _mark_miss(self, request, key):
+        if request.method == 'GET':
+            request._page_cache_key = key # 캐시 미스: 응답이 만들어지면 저장
+        return None
+
+    def _should_store(self, request, response):
+        # 의존 태그가 선언된 요청의 정상 응답 중 쿠키를 설정하지 않는 응답만 저장합니다. (CSRF 토큰 등 사용자별 값 제외)
+        return bool(
+            getattr(request, '_page_cache_key', None)
+            and getattr(request, '_page_cache_tags', None)
+            and response.status_code == 200
+            and not response.streaming
+            and not response.cookies
+            and not request.META.get('CSRF_COOKIE_NEEDS_UPDATE')
+            and 'private' not in response.get('Cache-Control', '')
+        )
+
+    def _entry(self, request, response, tag_keys, versions):
+        # 저장할 캐시 항목을 만듭니다. 저장하면 안 되는 경우 None을 반환합니다.
+        if any(key not in versions for key in tag_keys.values()):
+            return None
+        if any(version > request._page_cache_started for version in versions.values()):
+            # 렌더링하는 동안 무효화된 태그가 있으면 이 응답은 이미 오래된 내용일 수 있습니다.
+            return None
+        response['X-Page-Cache'] = 'miss'
+        return {
+            'content': response.content,
+            'status': response.status_code,
+            'headers': [
+                (header, value) for header, value in response.items()
+                if header.lower() not in SKIPPED_HEADERS and header != 'X-Page-Cache'
+            ],
+            'tags': {tag: versions[key] for tag, key in tag_keys.items()},
+        }
+
+    def _missing_versions(self, tag_keys, versions):
+        # 처음 쓰이는(또는 캐시에서 밀려난) 태그는 새 버전으로 시작합니다. (이번 응답은 저장하지 않음)
+        return {key: time.time_ns() for key in tag_keys.values() if key not in versions}
+
+    def _store(self, request, response):
+        cache = get_cache()
+        tag_keys = {tag: _tag_key(tag) for tag in request._page_cache_tags}
+        versions = cache.get_many(tag_keys.values())
+        missing = self._missing_versions(tag_keys, versions)
+        if missing:
+            cache.set_many(missing, timeout=None)
+            return
+        entry = self._entry(request, response, tag_keys, versions)
+        if entry is not None:
+            cache.set(request._page_cache_key, entry, get_timeout())
+
+    async def _astore(self, request, response):
+        cache = get_cache()
+        tag_keys = {tag: _tag_key(tag) for tag in request._page_cache_tags}
+        versions = await cache.aget_many(tag_keys.values())
+        missing = self._missing_versions(tag_keys, versions)
+        if missing:
+            await cache.aset_many(missing, timeout=None)
+            return
+        entry = self._entry(request, response, tag_keys, versions)
+        if entry is not None:
+            await cache.aset(request._page_cache_key, entry, get_timeout())
@@ -0,0 +1,207 @@
+# _20250723django/pagination.py
+# 키셋(커서) 페이지네이션
+# Django 기본 Paginator는 OFFSET과 COUNT(*)를 사용하므로 뒤쪽 페이지일수록 느려집니다.
+# 커서 방식은 "마지막으로 본 항목의 (정렬 값, id)" 다음부터 LIMIT만큼 읽으므로
+# 몇 번째 페이지든 첫 페이지와 같은 비용으로 조회됩니다.
+
+import base64
+import json
+
+from django.core.exceptions import ValidationError
+from django.core.paginator import InvalidPage, Paginator
+from django.db.models import Q, Value
+from django.db.models.constants import LOOKUP_SEP
+from django.db.models.functions import Coalesce
+from django.http import Http404
+
+
+class InvalidCursor(Exception):
+    pass
+
+
+def encode_cursor(value, pk, reverse=False):
+    # (정렬 값, id, 방향)을 URL에 넣을 수 있는 불투명한 토큰으로 변환합니다.
+    # datetime은 마이크로초까지 보존하기 위해 isoformat()을 그대로 사용합니다.
+    if hasattr(value, 'isoformat'):
+        value = value.isoformat()
+    payload = json.dumps({'v': value, 'pk': pk, 'r': reverse}, separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(token):
+    # encode_cursor()의 역변환: (정렬 값, id, 방향) 튜플을 반환합니다.
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        value, pk, reverse = payload['v'], int(payload['pk']), bool(payload['r'])
+    except (ValueError, TypeError, KeyError):
+        raise InvalidCursor(token)
+    # encode_cursor()가 만들 수 없는 값 (정렬 값 null, SQLite 정수 범위를 넘는 id)
+    if value is None or not -2 ** 63 <= pk < 2 ** 63:
+        raise InvalidCursor(token)
+    return value, pk, reverse
+
+
+class CursorPage:
+    # 커서 페이지 한 장: 템플릿에서 object_list, has_next/has_previous, next_cursor/previous_cursor를 사용합니다.
+
+    def __init__(self, object_list, next_cursor, previous_cursor):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+class CursorPaginator:
+    # queryset을 (field, pk) 순서로 정렬하고 커서 토큰 기준으로 잘라내는 페이지네이터입니다.
+    # field: 정렬 필드 (예: 'created_at', 'title', 'category__name')
+    # descending: True이면 내림차순 (최신순)
+    # 관계를 거치는 필드(category__name 등)는 NULL일 수 있으므로 빈 문자열로 치환하여 비교합니다.
+    # (SQLite에서 NULL은 가장 작은 값으로 정렬되므로 빈 문자열로 치환해도 순서는 같습니다.)
+
+    def __init__(self, queryset, per_page, field='created_at', descending=True):
+        self.per_page = per_page
+        self.field = field
+        self.descending = descending
+        if LOOKUP_SEP in field:
+            queryset = queryset.annotate(cursor_value=Coalesce(field, Value('')))
+            self.key = 'cursor_value'
+            self.model_field = None
+        else:
+            self.key = field
+            self.model_field = queryset.model._meta.get_field(field)
+        self.queryset = queryset
+
+    def _to_python(self, value):
+        if self.model_field is None:
+            return value
+        return self.model_field.to_python(value)
+
+    def _after(self, value, pk, descending):
+        # 정렬 방향 기준으로 (value, pk) "다음"에 오는 행만 남기는 조건
+        op = 'lt' if descending else 'gt'
+        return Q(**{f'{self.key}__{op}': value}) | Q(**{self.key: value, f'pk__{op}': pk})
+
+    def _prepare(self, token):
+        # token이 가리키는 위치부터 읽을 쿼리셋과 방향(reverse)을 준비합니다.
+        reverse = False
+        queryset = self.queryset
+        if token:
+            try:
+                value, pk, reverse = decode_cursor(token)
+                value = self._to_python(value)
+            except (InvalidCursor, ValidationError, TypeError, ValueError):
+                raise Http404('잘못된 페이지 커서입니다.')
+            # 정렬 값은 하나의 스칼라 값입니다. (빈 문자열 등 to_python()이 None으로 바꾸는 값도 비교할 수 없음)
+            if value is None or isinstance(value, (dict, list)):
+                raise Http404('잘못된 페이지 커서입니다.')
+            # 이전 페이지(reverse)는 반대 방향으로 읽은 뒤 결과를 다시 뒤집습니다.
+            queryset = queryset.filter(self._after(value, pk, self.descending != reverse))
+
+        descending = self.descending != reverse
+        prefix = '-' if descending else ''
+        queryset = queryset.order_by(f'{prefix}{self.key}', f'{prefix}pk')
+
+        # 다음 페이지 존재 여부를 COUNT 없이 알기 위해 한 개를 더 읽습니다.
+        return queryset[:self.per_page + 1], reverse
+
+    def _make_page(self, rows, token, reverse):
+        has_more = len(rows) > self.per_page
+        rows = rows[:self.per_page]
+        if reverse:
+            rows.reverse()
+
+        # 정방향: 더 읽을 행이 있으면 다음 페이지, 커서로 들어왔으면 이전 페이지가 있습니다.
+        # 역방향: 출발한 페이지가 곧 다음 페이지이고, 더 읽을 행이 있으면 이전 페이지가 있습니다.
+        if reverse:
+            has_next, has_previous = True, has_more
+        else:
+            has_next, has_previous = has_more, bool(token)
+
+        next_cursor = previous_cursor = None
+        if rows:
+            first, last = rows[0], rows[-1]
+            if has_next:
+                next_cursor = encode_cursor(getattr(last, self.key), last.pk)
+            if has_previous:
+                previous_cursor = encode_cursor(getattr(first, self.key), first.pk, reverse=True)
+        return CursorPage(rows, next_cursor, previous_cursor)
+
+    def page(self, token=None):
+        # token이 없으면 첫 페이지, 있으면 토큰이 가리키는 위치의 다음(또는 이전) 페이지를 반환합니다.
+        queryset, reverse = self._prepare(token)
+        return self._make_page(list(queryset), token, reverse)
+
+    async def apage(self, token=None):
+        # page()의 비동기 버전 (비동기 뷰에서 사용)
+        queryset, reverse = self._prepare(token)
+        return self._make_page([obj async for obj in queryset], token, reverse)
+
+
+async def apaginate(queryset, per_page, page_number):
+    # ListView.paginate_queryset()의 비동기 버전 (OFFSET 방식)
+    # COUNT와 페이지 조회를 비동기 ORM으로 실행하고, 나머지 계산은 Django Paginator를 그대로 사용합니다.
+    paginator = Paginator(queryset, per_page)
+    paginator.count = await queryset.acount() # cached_property를 미리 채워 동기 COUNT 쿼리를 막습니다.
+    try:
+        number = paginator.num_pages if page_number == 'last' else int(page_number or 1)
+        page = paginator.page(number)
+    except (ValueError, InvalidPage):
+        raise Http404('잘못된 페이지 번호입니다.')
+    page.object_list = [obj async for obj in page.object_list]
+    return paginator, page, page.object_list, page.has_other_pages()
+
+
+# --- 커서 페이지네이션 믹스인 (CursorPaginationMixin) ---
+# ListView에 섞어 쓰면 요청에 'cursor' 파라미터가 있을 때(첫 페이지는 ?cursor=) 커서 방식으로,
+# 그렇지 않으면 기존 OFFSET 방식(?page=)으로 페이지를 나눕니다.
+# cursor_pagination = True로 지정한 뷰는 항상 커서 방식을 사용합니다.
+# 템플릿에서는 cursor_page가 있으면 커서 내비게이션을, 없으면 기존 page_obj 내비게이션을 그립니다.
+class CursorPaginationMixin:
+    cursor_pagination = False # True이면 ?cursor가 없어도 항상 커서 방식 사용
+    cursor_query_param = 'cursor'
+
+    def get_cursor_ordering(self):
+        # (정렬 필드, 내림차순 여부) - 정렬 옵션이 있는 뷰는 이 메서드를 재정의합니다.
+        return 'created_at', True
+
+    def use_cursor_pagination(self):
+        return self.cursor_pagination or self.cursor_query_param in self.request.GET
+
+    def paginate_queryset(self, queryset, page_size):
+        if not self.use_cursor_pagination():
+            return super().paginate_queryset(queryset, page_size)
+        field, descending = self.get_cursor_ordering()
+        paginator = CursorPaginator(queryset, page_size, field=field, descending=descending)
+        page = paginator.page(self.request.GET.get(self.cursor_query_param))
+        self.cursor_page = page
+        return (paginator, page, page.object_list, page.has_other_pages())
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['cursor_page'] = getattr(self, 'cursor_page', None)
+        return context
+
+    async def apaginate_queryset(self, queryset, page_size):
+        # paginate_queryset()의 비동기 버전 (비동기 목록 뷰에서 사용)
+        if not self.use_cursor_pagination():
+            return await apaginate(queryset, page_size, self.request.GET.get(self.page_kwarg))
+        field, descending = self.get_cursor_ordering()
+        paginator = CursorPaginator(queryset, page_size, field=field, descending=descending)
+        page = await paginator.apage(self.request.GET.get(self.cursor_query_param))
+        self.cursor_page = page
+        return (paginator, page, page.object_list, page.has_other_pages())
@@ -0,0 +1,31 @@
+# _20250723django/queryplan.py
+# SQLite EXPLAIN QUERY PLAN 검사 도구 (각 앱 tests.py의 쿼리 계획 테스트에서 사용)
+# 목록 뷰의 쿼리셋이 인덱스를 타는지 확인합니다. 다음 두 가지를 문제로 봅니다.
+# - 'USE TEMP B-TREE FOR ORDER BY' 등: 조건에 맞는 행을 모두 읽어 정렬한 뒤에야 LIMIT을 적용함
+# - 'SCAN <테이블>' (USING INDEX 없이): 테이블 전체를 읽음
+# 'SCAN <테이블> USING INDEX <인덱스>'는 인덱스 순서대로 읽다가 LIMIT에서 멈추므로 허용합니다.
+
+import re
+
+# EXPLAIN QUERY PLAN의 각 행: 'id parent notused detail'
+PLAN_LINE_RE = re.compile(r'^\d+ \d+ \d+ (?P<detail>.*)$')
+
+
+def query_plan(queryset):
+    # 쿼리셋의 EXPLAIN QUERY PLAN 결과를 detail 문자열 목록으로 반환합니다.
+    details = []
+    for line in queryset.explain().splitlines():
+        match = PLAN_LINE_RE.match(line.strip())
+        details.append(match.group('detail') if match else line.strip())
+    return details
+
+
+def plan_problems(queryset):
+    # 임시 B-tree 정렬과 전체 테이블 스캔에 해당하는 계획 행만 반환합니다. (문제가 없으면 빈 목록)
+    problems = []
+    for detail in query_plan(queryset):
+        if 'TEMP B-TREE' in detail:
+            problems.append(detail)
+        elif detail.startswith('SCAN ') and ' USING ' not in detail:
+            problems.append(detail)
+    return problems
@@ -0,0 +1,227 @@
+# _20250723django/replica.py
+# SQLite 읽기 전용 복제본 (replica) 라우팅
+# - 읽기 전용 요청(GET/HEAD, REPLICA_EXCLUDED_APPS 제외)의 조회 쿼리는 'replica' 별칭으로 보내고,
+#   쓰기와 그 밖의 요청(관리자 화면, 북마크, POST 등)의 조회는 모두 기본 DB(default)에서 처리합니다.
+# - 복제본은 기본 DB 파일을 SQLite 백업 API(sqlite3.Connection.backup)로 통째로 복사한 파일입니다.
+#   WAL 모드의 기본 DB는 복사하는 동안에도 쓰기를 막지 않으며, 복사본은 한 시점의 일관된 스냅샷입니다.
+# - 낡음 판단은 기본 DB 자체로 합니다. 복사를 시작할 때 기본 DB 파일과 WAL 파일(-wal)의 (수정 시각, 크기)를
+#   복제본 옆의 표시 파일('<복제본>.snapshot')에 기록하고, 지금의 값과 같을 때만 복제본에서 읽습니다.
+#   어느 프로세스의 쓰기든 (시그널이 없는 bulk_create / update(), 원시 SQL, 마이그레이션 포함) 커밋하면 WAL 파일이 바뀌므로
+#   다음 요청부터 기본 DB에서 읽습니다. (체크포인트처럼 내용이 같은 변경도 낡음으로 보므로 안전한 쪽으로 틀림)
+# - 복사는 요청 처리 경로 밖의 백그라운드 스레드에서 합니다. 낡은 복제본을 발견한 요청과 모델 저장/삭제 시그널(home/signals.py)이
+#   request_refresh()로 갱신을 요청하며, 프로세스마다 한 번에 하나씩, REPLICA_MIN_REFRESH_INTERVAL초에 한 번까지만 복사합니다.
+#   python manage.py refresh_replica로 직접 갱신할 수도 있습니다.
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+from contextvars import ContextVar
+from functools import partial
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+
+# 기본 설정 (settings.py에서 같은 이름으로 덮어쓸 수 있습니다)
+DEFAULT_EXCLUDED_APPS = ('admin', 'bookmark')
+DEFAULT_MIN_REFRESH_INTERVAL = 5 # 초, 복사 간격의 최소값 (그 사이의 쓰기는 다음 복사까지 기본 DB에서 읽음)
+
+REPLICA_ALIAS = 'replica'
+SNAPSHOT_SUFFIX = '.snapshot'
+
+logger = logging.getLogger(__name__)
+
+_use_replica = ContextVar('use_replica', default=False)
+
+_refresh_lock = threading.Lock() # 복사 (프로세스 안에서 한 번에 하나)
+_request_lock = threading.Lock() # 백그라운드 갱신 스레드 시작
+_refresh_thread = None
+_last_refresh = 0.0
+# 복사에 쓰는 기본 DB 연결 (프로세스가 끝날 때까지 유지)
+# 복사 후에 연결을 닫으면 마지막 연결일 때 SQLite가 WAL을 체크포인트하고 지워 방금 기록한 표시와 달라지므로 열어 둡니다.
+_source_connections = {}
+
+
+def replica_configured():
+    return REPLICA_ALIAS in settings.DATABASES
+
+
+def _database_path(alias):
+    return str(connections[alias].settings_dict['NAME'])
+
+
+def _separate_replica(using=DEFAULT_DB_ALIAS):
+    # 복제본이 기본 DB와 다른 파일일 때만 복사/표시합니다. (테스트의 TEST MIRROR는 같은 연결을 사용)
+    if not replica_configured() or connections[using].is_in_memory_db():
+        return False
+    return _database_path(using) != _database_path(REPLICA_ALIAS)
+
+
+def _file_state(path):
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return '-'
+    return f'{stat.st_mtime_ns}:{stat.st_size}'
+
+
+def primary_state(using=DEFAULT_DB_ALIAS):
+    # 기본 DB 파일과 WAL 파일의 (수정 시각, 크기) - 어느 연결이든 쓰기를 커밋하면 바뀝니다.
+    path = _database_path(using)
+    return f'{_file_state(path)} {_file_state(path + "-wal")}'
+
+
+def _snapshot_is_current():
+    replica_path = _database_path(REPLICA_ALIAS)
+    try:
+        with open(replica_path + SNAPSHOT_SUFFIX) as marker:
+            copied = marker.read()
+    except FileNotFoundError:
+        return False
+    return copied == primary_state() and os.path.exists(replica_path)
+
+
+def replica_ready():
+    # 복제본을 복사한 뒤 기본 DB에 쓰기가 없었을 때만 복제본에서 읽습니다. 낡았으면 백그라운드 갱신을 요청합니다.
+    # (DB 조회 없이 파일 상태만 확인합니다)
+    if not _separate_replica():
+        return False
+    if _snapshot_is_current():
+        return True
+    request_refresh()
+    return False
+
+
+def _source_connection(path):
+    connection = _source_connections.get(path)
+    if connection is None:
+        connection = _source_connections[path] = sqlite3.connect(path, check_same_thread=False)
+        connection.execute('PRAGMA schema_version') # 처음 읽을 때 WAL 파일이 없으면 만들어지므로 상태를 기록하기 전에 한 번 읽음
+    return connection
+
+
+def refresh_replica(using=DEFAULT_DB_ALIAS):
+    # 기본 DB 전체를 복제본 파일로 복사합니다. 복사한 페이지 수를 반환합니다. (복제본이 없거나 같은 DB이면 0)
+    global _last_refresh
+    if not _separate_replica(using):
+        return 0
+    with _refresh_lock:
+        source_path, replica_path = _database_path(using), _database_path(REPLICA_ALIAS)
+        snapshot_path = replica_path + SNAPSHOT_SUFFIX
+        if os.path.exists(snapshot_path):
+            os.remove(snapshot_path) # 복사하는 동안은 기본 DB에서 읽음
+        source = _source_connection(source_path)
+        # 복사를 시작하기 전의 상태: 이후에 커밋된 쓰기는 상태를 바꾸므로, 복사본에 빠진 쓰기가 있으면 표시와 달라집니다.
+        state = primary_state(using)
+        replica = sqlite3.connect(replica_path)
+        try:
+            # pages=-1: 한 번에 복사하므로 하나의 읽기 트랜잭션(스냅샷)에서 끝나고, 도중의 쓰기 때문에 다시 시작하지 않습니다.
+            # 복제본을 읽는 중인 연결이 있으면 sleep초 간격으로 다시 시도합니다.
+            source.backup(replica, pages=-1, sleep=0.05)
+            pages = replica.execute('PRAGMA page_count').fetchone()[0]
+        finally:
+            replica.close()
+        with open(snapshot_path, 'w') as marker:
+            marker.write(state)
+        _last_refresh = time.monotonic()
+        return pages
+
+
+def _refresh_in_background(using):
+    try:
+        refresh_replica(using)
+    except Exception:
+        logger.exception('복제본 갱신 실패')
+
+
+def request_refresh(using=DEFAULT_DB_ALIAS):
+    # 복제본 갱신을 백그라운드 스레드에 맡깁니다. (요청 처리를 기다리게 하지 않음)
+    # 이미 복사 중이거나 마지막 복사 후 REPLICA_MIN_REFRESH_INTERVAL초가 지나지 않았으면 아무것도 하지 않습니다.
+    global _refresh_thread
+    if not _separate_replica(using):
+        return
+    with _request_lock:
+        interval = getattr(settings, 'REPLICA_MIN_REFRESH_INTERVAL', DEFAULT_MIN_REFRESH_INTERVAL)
+        if _refresh_thread is not None and _refresh_thread.is_alive() or time.monotonic() - _last_refresh < interval:
+            return
+        _refresh_thread = threading.Thread(target=_refresh_in_background, args=(using,), name='replica-refresh', daemon=True)
+        _refresh_thread.start()
+
+
+def schedule_refresh(using=DEFAULT_DB_ALIAS):
+    # 모델 저장/삭제 시그널에서 호출합니다. 트랜잭션 하나에서 여러 번 호출되어도 커밋 후 한 번만 갱신을 요청합니다.
+    # (표시는 스레드별 DB 연결 객체에 두므로 다른 스레드의 트랜잭션과 섞이지 않음)
+    if using != DEFAULT_DB_ALIAS or not replica_configured():
+        return
+    connections[using]._replica_dirty = True
+    transaction.on_commit(partial(refresh_after_commit, using), using=using)
+
+
+def refresh_after_commit(using=DEFAULT_DB_ALIAS):
+    connection = connections[using]
+    if not getattr(connection, '_replica_dirty', False):
+        return
+    connection._replica_dirty = False
+    request_refresh(using)
+
+
+class ReplicaRouter:
+    # DATABASE_ROUTERS에 등록합니다. 쓰기는 항상 기본 DB, 조회는 읽기 전용 요청일 때만 복제본으로 보냅니다.
+
+    def db_for_read(self, model, **hints):
+        return REPLICA_ALIAS if _use_replica.get() else None
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True # 복제본은 기본 DB와 같은 데이터
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db != REPLICA_ALIAS # 복제본의 테이블은 백업으로 복사됨
+
+
+class ReadReplicaMiddleware:
+    # 뷰 실행 직전(process_view)에 읽기 전용 요청인지 정해 ReplicaRouter에 알립니다.
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+            self.process_view = self.aprocess_view
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        token = _use_replica.set(False)
+        try:
+            return self.get_response(request)
+        finally:
+            _use_replica.reset(token)
+
+    async def __acall__(self, request):
+        token = _use_replica.set(False)
+        try:
+            return await self.get_response(request)
+        finally:
+            _use_replica.reset(token)
+
+    def _is_read_only_route(self, request):
+        if request.method not in ('GET', 'HEAD'):
+            return False
+        match = request.resolver_match
+        return match is not None and match.app_name not in getattr(settings, 'REPLICA_EXCLUDED_APPS', DEFAULT_EXCLUDED_APPS)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if self._is_read_only_route(request) and replica_ready():
+            _use_replica.set(True)
+
+    async def aprocess_view(self, request, view_func, view_args, view_kwargs):
+        # 비동기 메서드로 두어야 같은 컨텍스트에서 실행되어 설정한 값이 뷰까지 전달됩니다.
+        if self._is_read_only_route(request) and replica_ready(): # 파일 상태만 확인하므로 이벤트 루프에서 바로 실행
+            _use_replica.set(True)
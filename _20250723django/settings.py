@@ -47,20 +47,24 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    '_20250723django.timing.ServerTimingMiddleware', # 요청별 처리 시간 측정 (다른 미들웨어 시간까지 포함하도록 맨 앞)
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    '_20250723django.replica.ReadReplicaMiddleware', # 읽기 전용 요청의 조회를 복제본으로 보냄
+    '_20250723django.pagecache.AnonymousPageCacheMiddleware', # 익명 사용자 페이지 캐시 (request.user가 필요하므로 인증 미들웨어 다음)
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
 ROOT_URLCONF = '_20250723django.urls'
+ASYNC_ROOT_URLCONF = '_20250723django.async_urls' # ASGI 요청용 URL 설정 (공개 조회 페이지를 비동기 뷰로 처리, asgi.py)
 
 TEMPLATES = [
     {
-        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        'BACKEND': '_20250723django.timing.TimedDjangoTemplates', # DjangoTemplates + 렌더링 시간 측정
         'DIRS': [BASE_DIR / 'templates'], # 프로젝트 전체 템플릿 폴더 추가 (pathlib 스타일)
         'APP_DIRS': True, # 각 앱 내부의 'templates' 폴더도 자동으로 탐색하도록 유지
         'OPTIONS': {
@@ -70,6 +74,9 @@ TEMPLATES = [
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
             ],
+            'libraries': {
+                'fragment_cache': '_20250723django.fragments', # 목록 카드 조각 캐시 ({% cardcache %})
+            },
         },
     },
 ]
@@ -80,12 +87,48 @@ WSGI_APPLICATION = '_20250723django.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
+# SQLite 운영 설정: 연결할 때마다 아래 PRAGMA를 실행합니다.
+# WAL 모드(쓰기 중에도 다른 연결이 읽을 수 있음)는 파일에 기록되어 유지되므로 연결마다 켜지 않고
+# migrate가 끝날 때 한 번 켭니다. (home/signals.py, 연결만 해도 파일이 바뀌지 않도록 - 예: manage.py test)
+SQLITE_PRAGMAS = {
+    'synchronous': 'NORMAL', # WAL에서는 NORMAL이어도 DB가 손상되지 않음 (전원 장애 시 마지막 커밋만 유실될 수 있음)
+    'mmap_size': 256 * 1024 * 1024, # 바이트, 읽기를 메모리 매핑으로 처리
+    'cache_size': -64 * 1024, # 음수는 KiB 단위 (연결마다 64MB 페이지 캐시)
+    'busy_timeout': 5000, # ms, 다른 연결이 쓰기 잠금을 가진 동안 기다리는 시간
+    'temp_store': 'MEMORY', # 정렬 / 임시 테이블을 메모리에서 처리
+}
+SQLITE_INIT_COMMAND = ''.join(f'PRAGMA {name}={value};' for name, value in SQLITE_PRAGMAS.items())
+
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
-    }
+        'CONN_MAX_AGE': None, # 연결을 요청마다 닫지 않고 계속 사용 (PRAGMA 실행과 페이지 캐시 유지)
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': {
+            'init_command': SQLITE_INIT_COMMAND,
+            # 쓰기 트랜잭션이 처음부터 쓰기 잠금을 잡아, 읽다가 쓰기로 바꿀 때의 'database is locked' 오류를 피함
+            'transaction_mode': 'IMMEDIATE',
+        },
+    },
+    # 읽기 전용 복제본 (_20250723django/replica.py, 관리 명령 refresh_replica)
+    # 읽기 전용 요청의 조회만 이 파일에서 처리하고, 파일이 없거나 갱신 중이면 default에서 읽습니다.
+    'replica': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': BASE_DIR / 'db.replica.sqlite3',
+        'CONN_MAX_AGE': None,
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': {
+            'init_command': SQLITE_INIT_COMMAND + 'PRAGMA query_only=ON;',
+        },
+        'TEST': {'MIRROR': 'default'}, # 테스트에서는 default 연결을 그대로 사용
+    },
 }
+DATABASE_ROUTERS = ['_20250723django.replica.ReplicaRouter']
+
+# 읽기 전용 복제본 설정 (_20250723django/replica.py)
+REPLICA_EXCLUDED_APPS = ('admin', 'bookmark') # 쓰기 직후 결과를 바로 보여줘야 하는 앱은 항상 default에서 읽음
+REPLICA_MIN_REFRESH_INTERVAL = 5 # 초, 백그라운드 복사 간격의 최소값 (그 사이의 쓰기는 다음 복사까지 default에서 읽음)
 
 
 # Password validation
@@ -124,12 +167,97 @@ USE_TZ = True
 
 STATIC_URL = 'static/'
 STATICFILES_DIRS = [BASE_DIR / 'static',] # STATICFILES_DIRS 설정 (pathlib 스타일)
+STATIC_ROOT = BASE_DIR / 'staticfiles' # collectstatic 결과 (해시 이름 파일과 .gz / .br 압축 파일, DEBUG가 아닐 때 서빙)
+
+# collectstatic이 해시 이름 파일과 미리 압축한 파일을 만들도록 합니다. (_20250723django/staticfiles.py)
+STORAGES = {
+    'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+    'staticfiles': {'BACKEND': '_20250723django.staticfiles.CompressedManifestStaticFilesStorage'},
+}
 
 # Media files (User uploaded files)
 # 사용자가 업로드한 파일을 위한 설정
 MEDIA_URL = '/media/' # 웹에서 미디어 파일에 접근할 URL 접두사
 MEDIA_ROOT = BASE_DIR / 'media' # 업로드된 파일이 저장될 실제 파일 시스템 경로 (pathlib 스타일)
 
+# 업로드 파일 전송 설정 (_20250723django/media.py)
+MEDIA_PUBLIC_PREFIXES = ('photos/',) # 내려줄 수 있는 MEDIA_ROOT 아래 경로
+MEDIA_CACHE_MAX_AGE = 3600 # 초 (브라우저와 프록시의 캐시 유지 시간, 이후에는 ETag로 검증)
+MEDIA_OFFLOAD = None # 'x-accel-redirect'(nginx) 또는 'x-sendfile'(Apache, lighttpd)이면 파일 전송을 앞단 프록시에 맡김
+MEDIA_ACCEL_REDIRECT_PREFIX = '/protected-media/' # nginx의 internal location 경로 (x-accel-redirect 모드)
+
+# 사진 렌디션 설정 (photo/renditions.py)
+# 업로드된 사진마다 아래 폭(px) x 포맷 조합의 축소 이미지를 원본 옆에 생성합니다.
+PHOTO_RENDITION_WIDTHS = (160, 320, 640, 1024, 1600)
+PHOTO_RENDITION_FORMATS = ('avif', 'webp') # AVIF는 Pillow가 지원하는 경우에만 생성됩니다.
+PHOTO_RENDITION_QUALITY = 80
+PHOTO_RENDITION_WORKERS = 2 # 렌디션 생성 프로세스 풀 크기
+PHOTO_RENDITIONS_ASYNC = True # False이면 저장 요청 안에서 바로 생성 (디버깅용)
+
+# 업로드 처리 설정 (_20250723django/uploads.py, photo/storage.py)
+# 업로드 본문을 받으면서 SHA-256 해시를 계산하는 핸들러 (기본 핸들러와 같은 메모리/임시 파일 분기)
+FILE_UPLOAD_HANDLERS = [
+    '_20250723django.uploads.HashingMemoryFileUploadHandler',
+    '_20250723django.uploads.HashingTemporaryFileUploadHandler',
+]
+PHOTO_FILE_GC_GRACE = 60 * 60 * 24 # 초, 어떤 사진도 쓰지 않게 된 원본 파일을 gc_photo_files가 지우기까지의 유예 시간
+
+# 관리자 변경 목록 설정 (_20250723django/admin.py)
+ADMIN_EXACT_COUNT_LIMIT = 10000 # 필터 없는 목록은 행 수가 이보다 많으면 COUNT(*) 대신 추정치 사용
+ADMIN_COUNT_CACHE_TIMEOUT = 60 # 초, 필터/검색 결과 수 캐시 시간
+ADMIN_FILTER_CHOICES = 30 # 작성자/분류/태그 필터에 표시할 최대 선택지 수
+
+# 캐시 설정
+# 'default'는 프로세스마다 따로인 메모리 캐시입니다. 내용으로 키를 만드는 캐시(목록 카드 조각, 관리자 목록 수)만 사용합니다.
+# 'pagecache'는 모든 프로세스(웹 워커, 관리 명령, 셸)가 공유하는 파일 캐시입니다. 한 프로세스에서 일어난
+# 페이지 캐시 무효화(태그 버전)가 다른 프로세스에도 반영되어야 하므로 페이지 캐시와 태그 버전은 여기에 둡니다.
+# (Redis, Memcached 등 다른 공유 백엔드로 바꿔도 됩니다)
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'kopynara',
+        'OPTIONS': {'MAX_ENTRIES': 5000},
+    },
+    'pagecache': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': BASE_DIR / 'cache' / 'pagecache',
+        'OPTIONS': {'MAX_ENTRIES': 10000},
+    },
+}
+
+# 익명 사용자 페이지 캐시 설정 (_20250723django/pagecache.py)
+# PAGE_CACHE_ALIAS의 백엔드가 프로세스 안에서만 유효하면(LocMemCache 등) 페이지 캐시와 조건부 GET의 태그 버전 검증은 꺼집니다.
+PAGE_CACHE_ALIAS = 'pagecache'
+PAGE_CACHE_TIMEOUT = 600 # 초 (0이면 페이지 캐시 사용 안 함)
+PAGE_CACHE_EXCLUDED_APPS = ('bookmark', 'admin', 'media', 'static') # 사용자별 데이터를 보여주는 앱과 업로드 / 정적 파일은 캐시하지 않음
+
+# 목록 카드 조각 캐시 설정 (_20250723django/fragments.py)
+FRAGMENT_CACHE_ALIAS = 'default'
+FRAGMENT_CACHE_TIMEOUT = 60 * 60 * 24 # 초 (0이면 조각 캐시 사용 안 함)
+
+# 북마크 링크 점검 설정 (bookmark/linkcheck.py, 관리 명령 check_bookmark_links)
+BOOKMARK_LINK_CHECK_CONCURRENCY = 64 # 전체 동시 요청 수
+BOOKMARK_LINK_CHECK_PER_HOST = 4 # 호스트별 동시 연결 수
+BOOKMARK_LINK_CHECK_HOST_RATE = 4.0 # 호스트별 초당 요청 수
+BOOKMARK_LINK_CHECK_TIMEOUT = 10.0 # 요청 하나의 제한 시간 (초)
+BOOKMARK_LINK_CHECK_ALLOW_PRIVATE_ADDRESSES = False # 루프백 / 사설망 / 링크 로컬(메타데이터) 주소로의 요청 허용 여부
+
+
+# 요청 처리 시간 측정 설정 (_20250723django/timing.py)
+SERVER_TIMING_HEADER = True # 응답에 Server-Timing 헤더를 붙임 (외부에 내부 처리 시간을 숨기려면 False)
+SLOW_REQUEST_THRESHOLD_MS = 500 # 이보다 오래 걸린 요청은 느린 요청 로그에 남김
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        # 느린 요청 로그 (JSON 한 줄)
+        '_20250723django.timing': {'handlers': ['console'], 'level': 'WARNING', 'propagate': False},
+    },
+}
 
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
@@ -0,0 +1,140 @@
+# _20250723django/staticfiles.py
+# 정적 파일(css, js, 이미지) 배포 파이프라인입니다.
+# - collectstatic: ManifestStaticFilesStorage로 내용 해시가 붙은 파일 이름(style.3f2a9c1b7d4e.css)을 만들고,
+#   압축 효과가 있는 텍스트 파일마다 .gz(와 brotli 모듈이 있으면 .br) 파일을 함께 만들어 둡니다.
+# - serve_static: STATIC_ROOT의 파일을 내려줄 때 Accept-Encoding에 맞는 미리 압축한 파일을 고르고,
+#   해시가 붙은 파일 이름에는 내용이 바뀌지 않으므로 1년 + immutable 캐시 헤더를 보냅니다.
+#   (파일 전송, 조건부 / 범위 요청은 업로드 파일과 같은 _20250723django.media.file_response 사용)
+
+import gzip
+import os
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage, staticfiles_storage
+from django.core.files.base import ContentFile
+from django.http import Http404
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from django.views.decorators.http import require_safe
+
+from _20250723django.media import file_response, guess_content_type, open_regular_file
+
+try:
+    import brotli # 선택 의존성: 설치되어 있을 때만 .br 파일을 만듭니다.
+except ImportError:
+    brotli = None
+
+COMPRESSIBLE_EXTENSIONS = {
+    '.css', '.js', '.mjs', '.json', '.map', '.svg', '.txt', '.xml', '.html', '.ico', '.ttf', '.otf', '.eot', '.wasm',
+}
+# (Content-Encoding, 확장자) - 선호 순서
+# 서빙할 때는 brotli 모듈 설치 여부와 관계없이 빌드 환경에서 만들어 둔 .br 파일도 사용합니다.
+ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+MIN_COMPRESS_SIZE = 256 # 이보다 작은 파일은 압축 이득이 거의 없음
+MIN_COMPRESS_RATIO = 0.95 # 원본의 95% 이상이면 압축 파일을 두지 않음
+
+IMMUTABLE_MAX_AGE = 365 * 24 * 3600 # 해시가 붙은 파일 (내용이 바뀌면 이름도 바뀜)
+DEFAULT_MAX_AGE = 3600 # 해시가 없는 파일
+
+
+def get_compressors():
+    # (확장자, 압축 함수) - 현재 환경에서 만들 수 있는 압축 형식
+    compressors = []
+    if brotli is not None:
+        compressors.append(('.br', lambda data: brotli.compress(data, quality=11)))
+    # mtime=0: 같은 내용이면 항상 같은 .gz 파일이 만들어지도록 합니다.
+    compressors.append(('.gz', lambda data: gzip.compress(data, compresslevel=9, mtime=0)))
+    return compressors
+
+
+def is_compressible(name):
+    return os.path.splitext(name)[1].lower() in COMPRESSIBLE_EXTENSIONS
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    # collectstatic 후처리: 해시 이름 파일 생성과 매니페스트(staticfiles.json) 저장이 끝난 뒤 압축 파일을 만듭니다.
+
+    def post_process(self, paths, dry_run=False, **options):
+        yield from super().post_process(paths, dry_run=dry_run, **options)
+        if dry_run:
+            return
+        # 해시가 붙은 파일과 원래 이름의 파일 모두 (원래 이름은 DEBUG나 매니페스트 밖의 참조용)
+        names = set(paths) | set(self.hashed_files.values())
+        for name in sorted(names):
+            if is_compressible(name):
+                for compressed_name in self.compress(name):
+                    yield name, compressed_name, True
+
+    def compress(self, name):
+        with self.open(name) as file:
+            data = file.read()
+        # 이전 collectstatic의 결과를 지웁니다. (덮어쓰지 않으면 다른 이름으로 저장되고, 지금 만들지 않는 인코딩은 내용이 낡음)
+        for _, suffix in ENCODINGS:
+            if self.exists(name + suffix):
+                self.delete(name + suffix)
+        if len(data) < MIN_COMPRESS_SIZE:
+            return
+        for suffix, compress in get_compressors():
+            compressed_name = name + suffix
+            compressed = compress(data)
+            if len(compressed) < len(data) * MIN_COMPRESS_RATIO:
+                self._save(compressed_name, ContentFile(compressed))
+                yield compressed_name
+
+
+def accepted_encodings(request):
+    # Accept-Encoding 헤더에서 받을 수 있는 인코딩 이름 집합 (q=0은 제외)
+    accepted = set()
+    for item in request.META.get('HTTP_ACCEPT_ENCODING', '').split(','):
+        name, *params = [part.strip() for part in item.split(';')]
+        quality = 1.0
+        for param in params:
+            if param.startswith('q='):
+                try:
+                    quality = float(param[2:])
+                except ValueError:
+                    quality = 0.0
+        if name and quality > 0:
+            accepted.add(name.lower())
+    return accepted
+
+
+def is_hashed(path):
+    # collectstatic 매니페스트에 해시 이름으로 기록된 파일인지 확인합니다.
+    return path in _hashed_names()
+
+
+_hashed_name_set = None
+
+
+def _hashed_names():
+    # 매니페스트는 collectstatic 후 프로세스를 다시 시작해야 바뀌므로 한 번만 읽습니다.
+    global _hashed_name_set
+    if _hashed_name_set is None:
+        _hashed_name_set = frozenset(getattr(staticfiles_storage, 'hashed_files', {}).values())
+    return _hashed_name_set
+
+
+@require_safe
+def serve_static(request, path):
+    if any(part.startswith('.') for part in path.split('/')):
+        raise Http404('파일을 찾을 수 없습니다.')
+    full_path, st = open_regular_file(settings.STATIC_ROOT, path)
+    content_type = guess_content_type(full_path)
+    content_encoding = None
+    if is_compressible(path):
+        accepted = accepted_encodings(request)
+        for encoding, suffix in ENCODINGS:
+            if encoding in accepted:
+                try:
+                    st, full_path, content_encoding = os.stat(full_path + suffix), full_path + suffix, encoding
+                    break
+                except OSError:
+                    pass
+    response = file_response(request, full_path, st, content_type, content_encoding)
+    if is_compressible(path):
+        patch_vary_headers(response, ['Accept-Encoding'])
+    if is_hashed(path):
+        patch_cache_control(response, public=True, max_age=IMMUTABLE_MAX_AGE, immutable=True)
+    else:
+        patch_cache_control(response, public=True, max_age=DEFAULT_MAX_AGE)
+    return response
@@ -0,0 +1,220 @@
+# _20250723django/timing.py
+# 요청별 처리 시간 측정 (Server-Timing 헤더와 느린 요청 로그)
+# - SQL: 모든 DB 연결에 execute_wrapper를 걸어 쿼리 수와 실행 시간을 기록합니다.
+# - 템플릿: TEMPLATES의 BACKEND를 TimedDjangoTemplates로 두면 render() 시간을 잽니다. (템플릿 안에서 실행된 SQL 제외)
+# - 뷰: 뷰 호출부터 응답까지의 시간에서 SQL과 템플릿 시간을 뺀 파이썬 실행 시간입니다.
+# 결과는 'Server-Timing: db;dur=.., tpl;dur=.., view;dur=.., total;dur=..' 헤더로 보내고 (브라우저 개발자 도구에서 확인),
+# SLOW_REQUEST_THRESHOLD_MS보다 오래 걸린 요청은 URL 이름, 쿼리 수, 중복 쿼리, 가장 느린 SQL을 JSON 한 줄로 로그에 남깁니다.
+
+import hashlib
+import json
+import logging
+import re
+import time
+from collections import Counter
+from contextlib import ExitStack
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import connections
+from django.template.backends.django import DjangoTemplates, Template, reraise
+from django.template.exceptions import TemplateDoesNotExist
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+# 기본 설정 (settings.py에서 같은 이름으로 덮어쓸 수 있습니다)
+DEFAULT_THRESHOLD_MS = 500
+DEFAULT_HEADER = True
+
+SLOWEST_QUERIES = 3 # 로그에 남길 가장 느린 SQL 수
+DUPLICATE_QUERIES = 5 # 로그에 남길 중복 쿼리 지문 수
+SQL_LOG_LENGTH = 500
+
+# 같은 모양의 쿼리를 묶기 위한 정규화: IN (%s, %s, ...) 목록 길이와 LIMIT / OFFSET 숫자를 지웁니다.
+IN_LIST_RE = re.compile(r'\(\s*%s(?:\s*,\s*%s)*\s*\)')
+NUMBER_RE = re.compile(r'\b(LIMIT|OFFSET)\s+\d+', re.IGNORECASE)
+
+_current = ContextVar('request_timer', default=None)
+
+
+def fingerprint(sql):
+    normalized = NUMBER_RE.sub(r'\1 ?', IN_LIST_RE.sub('(%s...)', sql))
+    return hashlib.md5(normalized.encode()).hexdigest()[:12], normalized
+
+
+class RequestTimer:
+    # 요청 하나의 측정값 (execute_wrapper와 템플릿 백엔드가 채움)
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.view_started = None
+        self.view_ms = 0.0
+        self.queries = [] # (SQL, 실행 시간 ms)
+        self.db_ms = 0.0
+        self.template_ms = 0.0
+        self.template_db_ms = 0.0 # 템플릿 렌더링 중 실행된 SQL 시간 (템플릿 시간에서 제외)
+        self.template_depth = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        # connection.execute_wrapper()용
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = (time.perf_counter() - start) * 1000
+            self.queries.append((sql, elapsed))
+            self.db_ms += elapsed
+            if self.template_depth:
+                self.template_db_ms += elapsed
+
+    def wrap_connections(self):
+        # 모든 DB 별칭에 기록기를 겁니다. (연결은 실제 쿼리가 실행될 때 열림)
+        stack = ExitStack()
+        for alias in connections:
+            stack.enter_context(connections[alias].execute_wrapper(self))
+        return stack
+
+    def start_view(self):
+        self.view_started = time.perf_counter()
+
+    def finish(self):
+        now = time.perf_counter()
+        self.total_ms = (now - self.started) * 1000
+        if self.view_started is not None:
+            self.view_ms = (now - self.view_started) * 1000
+        return self
+
+    @property
+    def template_only_ms(self):
+        return max(self.template_ms - self.template_db_ms, 0.0)
+
+    @property
+    def python_ms(self):
+        # 뷰 시간 중 SQL과 템플릿을 뺀 나머지
+        return max(self.view_ms - self.db_ms - self.template_only_ms, 0.0) if self.view_started else 0.0
+
+    def server_timing(self):
+        metrics = [
+            f'db;dur={self.db_ms:.1f};desc="{len(self.queries)} queries"',
+            f'tpl;dur={self.template_only_ms:.1f}',
+            f'view;dur={self.python_ms:.1f}',
+            f'total;dur={self.total_ms:.1f}',
+        ]
+        return ', '.join(metrics)
+
+    def log_record(self, request, response):
+        # 느린 요청 로그 한 건 (JSON으로 직렬화)
+        shapes = {}
+        counts = Counter()
+        for sql, _ in self.queries:
+            key, normalized = fingerprint(sql)
+            counts[key] += 1
+            shapes.setdefault(key, normalized)
+        match = request.resolver_match
+        return {
+            'time': timezone.now().isoformat(),
+            'method': request.method,
+            'path': request.get_full_path(),
+            'url_name': match.view_name if match else None,
+            'status': response.status_code,
+            'total_ms': round(self.total_ms, 1),
+            'view_ms': round(self.python_ms, 1),
+            'db_ms': round(self.db_ms, 1),
+            'template_ms': round(self.template_only_ms, 1),
+            'queries': len(self.queries),
+            'duplicates': [
+                {'fingerprint': key, 'count': count, 'sql': shapes[key][:SQL_LOG_LENGTH]}
+                for key, count in counts.most_common(DUPLICATE_QUERIES) if count > 1
+            ],
+            'slowest': [
+                {'ms': round(elapsed, 2), 'sql': sql[:SQL_LOG_LENGTH]}
+                for sql, elapsed in sorted(self.queries, key=lambda query: query[1], reverse=True)[:SLOWEST_QUERIES]
+            ],
+        }
+
+
+# --- 템플릿 백엔드 (TimedDjangoTemplates) ---
+# DjangoTemplates와 같고, 최상위 템플릿의 render() 시간만 현재 요청의 측정값에 더합니다.
+# ({% include %} / {% extends %}는 엔진 내부에서 처리되므로 중복으로 세지 않습니다)
+class TimedTemplate(Template):
+
+    def render(self, context=None, request=None):
+        timer = _current.get()
+        if timer is None:
+            return super().render(context, request)
+        timer.template_depth += 1
+        start = time.perf_counter()
+        try:
+            return super().render(context, request)
+        finally:
+            timer.template_depth -= 1
+            if not timer.template_depth:
+                timer.template_ms += (time.perf_counter() - start) * 1000
+
+
+class TimedDjangoTemplates(DjangoTemplates):
+
+    def from_string(self, template_code):
+        return TimedTemplate(self.engine.from_string(template_code), self)
+
+    def get_template(self, template_name):
+        try:
+            return TimedTemplate(self.engine.get_template(template_name), self)
+        except TemplateDoesNotExist as exc:
+            reraise(exc, self)
+
+
+# --- 미들웨어 (ServerTimingMiddleware) ---
+# MIDDLEWARE의 맨 앞에 두어야 다른 미들웨어(세션, 인증, 페이지 캐시 등)의 시간까지 total에 포함됩니다.
+# 페이지 캐시가 응답을 저장한 뒤에 헤더를 붙이므로 캐시된 응답에 이전 측정값이 남지 않습니다.
+class ServerTimingMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        timer = RequestTimer()
+        token = _current.set(timer)
+        try:
+            with timer.wrap_connections():
+                response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self._finish(request, response, timer)
+
+    async def __acall__(self, request):
+        # DB 연결은 스레드마다 따로 있으므로, 요청의 ORM 호출이 실행되는 sync_to_async 스레드에서 기록기를 겁니다.
+        # (ASGIHandler는 요청마다 스레드 하나를 정해 같은 요청의 동기 호출을 모두 그 스레드에서 실행함)
+        timer = RequestTimer()
+        token = _current.set(timer)
+        try:
+            stack = await sync_to_async(timer.wrap_connections)()
+            try:
+                response = await self.get_response(request)
+            finally:
+                await sync_to_async(stack.close)()
+        finally:
+            _current.reset(token)
+        return self._finish(request, response, timer)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        timer = _current.get()
+        if timer is not None:
+            timer.start_view()
+
+    def _finish(self, request, response, timer):
+        timer.finish()
+        if getattr(settings, 'SERVER_TIMING_HEADER', DEFAULT_HEADER):
+            response['Server-Timing'] = timer.server_timing()
+        if timer.total_ms >= getattr(settings, 'SLOW_REQUEST_THRESHOLD_MS', DEFAULT_THRESHOLD_MS):
+            logger.warning(json.dumps(timer.log_record(request, response), ensure_ascii=False))
+        return response
@@ -0,0 +1,38 @@
+# _20250723django/uploads.py
+# 업로드 파일을 받으면서 SHA-256 해시를 함께 계산하는 업로드 핸들러 (settings.FILE_UPLOAD_HANDLERS)
+# - Django 기본 핸들러(작은 파일은 메모리, FILE_UPLOAD_MAX_MEMORY_SIZE보다 큰 파일은 임시 파일)와 같게 동작하고,
+#   요청 본문에서 읽은 조각을 저장하는 김에 해시에도 넣으므로 파일을 다시 읽지 않습니다.
+# - 완료된 UploadedFile에는 content_hash 속성(16진수 SHA-256)이 붙습니다.
+#   내용 주소 저장소(photo/storage.py)가 이 값으로 파일 이름을 정합니다. (없으면 저장소가 직접 계산)
+
+import hashlib
+
+from django.core.files.uploadhandler import MemoryFileUploadHandler, TemporaryFileUploadHandler
+
+
+class HashingUploadMixin:
+    # 이 핸들러가 받은 조각만 해시합니다. (메모리 핸들러가 크기 초과로 다음 핸들러에 넘긴 조각은 넘겨받은 쪽이 해시)
+
+    def new_file(self, *args, **kwargs):
+        self.hasher = hashlib.sha256()
+        return super().new_file(*args, **kwargs)
+
+    def receive_data_chunk(self, raw_data, start):
+        remaining = super().receive_data_chunk(raw_data, start)
+        if remaining is None: # 이 핸들러가 조각을 저장함
+            self.hasher.update(raw_data)
+        return remaining
+
+    def file_complete(self, file_size):
+        file = super().file_complete(file_size)
+        if file is not None:
+            file.content_hash = self.hasher.hexdigest()
+        return file
+
+
+class HashingMemoryFileUploadHandler(HashingUploadMixin, MemoryFileUploadHandler):
+    pass
+
+
+class HashingTemporaryFileUploadHandler(HashingUploadMixin, TemporaryFileUploadHandler):
+    pass
@@ -15,10 +15,22 @@ Including another URLconf
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
 from django.contrib import admin
-from django.urls import path, include # include 함수 임포트
+from django.urls import path, re_path, include # include 함수 임포트
 from django.conf import settings # settings를 사용하기 위해 임포트
 from django.conf.urls.static import static # static 함수를 사용하기 위해 임포트
 import os # os 모듈 임포트 (STATIC_ROOT 설정에 필요)
+from _20250723django.media import serve_media # 업로드 파일 전송 뷰 (범위 요청, 조건부 요청, X-Accel-Redirect)
+from _20250723django.staticfiles import serve_static # collectstatic 결과 전송 뷰 (미리 압축한 파일, immutable 캐시)
+
+# 업로드 파일(MEDIA_URL) URL: 'media' 네임스페이스는 익명 페이지 캐시 대상에서 제외됩니다. (PAGE_CACHE_EXCLUDED_APPS)
+media_urlpatterns = [
+    re_path(r'^(?P<path>.+)$', serve_media, name='file'),
+]
+
+# 정적 파일(STATIC_URL) URL: STATIC_ROOT의 해시 이름 파일을 내려줍니다. ('static' 네임스페이스도 페이지 캐시 제외)
+static_urlpatterns = [
+    re_path(r'^(?P<path>.+)$', serve_static, name='file'),
+]
 
 urlpatterns = [
     # Django 관리자 페이지 URL
@@ -38,11 +50,16 @@ urlpatterns = [
 
     # 'tagcloud/' 경로를 tag_cloud 앱의 urls.py로 전달 (새로 추가)
     path('tagcloud/', include('tag_cloud.urls')),
+
+    # 업로드 파일 (DEBUG와 관계없이 Django가 접근을 허용하고, 전송은 sendfile 또는 앞단 프록시가 담당)
+    path(settings.MEDIA_URL.lstrip('/'), include((media_urlpatterns, 'media'))),
 ]
 
-# 개발 환경에서만 미디어 파일과 정적 파일을 서빙하도록 설정
-# DEBUG가 True일 때만 static() 함수를 사용하여 MEDIA_URL 및 STATIC_URL에 대한 요청을 처리
+# 개발 환경에서는 원본 정적 파일을 서빙하도록 설정
+# DEBUG가 True일 때는 static() 함수를 사용하여 STATIC_URL에 대한 요청을 처리 ({% static %}도 해시 없는 이름을 출력)
 if settings.DEBUG:
-    urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
     # 정적 파일 서빙 설정 (STATICFILES_DIRS를 사용하도록)
     urlpatterns += static(settings.STATIC_URL, document_root=os.path.join(settings.BASE_DIR, 'static'))
+else:
+    # 운영 환경: collectstatic 결과(STATIC_ROOT)를 미리 압축한 파일과 immutable 캐시 헤더로 서빙
+    urlpatterns.append(path(settings.STATIC_URL.lstrip('/'), include((static_urlpatterns, 'static'))))
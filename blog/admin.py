@@ -1,9 +1,11 @@
 from django.contrib import admin
+from _20250723django.admin import LimitedRelatedFieldListFilter, ScalableAdminMixin, TagListFilter # 대용량 변경 목록 도구
+from . import search # 전문 검색 색인(my_post_fts)
 from .models import Post # Post 모델 임포트
 
 # Post 모델을 관리자 페이지에 등록
 @admin.register(Post)
-class PostAdmin(admin.ModelAdmin):
+class PostAdmin(ScalableAdminMixin, admin.ModelAdmin):
     # 관리자 목록에 표시할 필드
     list_display = ('title', 'slug', 'author', 'created_at', 'modify_dt')
     
@@ -12,10 +14,16 @@ class PostAdmin(admin.ModelAdmin):
     list_display_links = ('title',) # <-- 이 줄을 추가합니다.
     
     # 필터링 가능한 필드
-    list_filter = ('created_at', 'author')
+    # 작성자/태그는 전체를 나열하지 않고 일부만 선택지로 표시합니다.
+    list_filter = ('created_at', ('author', LimitedRelatedFieldListFilter), TagListFilter)
     
-    # 검색 가능한 필드
-    search_fields = ('title', 'content', 'author__username') # content도 검색 가능하도록 추가
+    # 검색 가능한 필드 (실제 검색은 get_search_results에서 전문 검색 색인으로 처리)
+    search_fields = ('title', 'description', 'content', 'tags__name')
+    search_help_text = '제목, 설명, 본문, 태그에서 단어(접두어)로 검색합니다.'
+
+    list_select_related = ('author',) # 작성자 이름을 JOIN으로 함께 읽음
+    list_defer = Post.list_deferred_fields # 목록에서는 본문을 읽지 않음
+    autocomplete_fields = ('author',) # 사용자 전체를 <select>로 내려주지 않고 검색해서 선택
     
     # slug 필드를 자동으로 채워주도록 설정
     prepopulated_fields = {'slug': ('title',)}
@@ -23,3 +31,9 @@ class PostAdmin(admin.ModelAdmin):
     # 기본 정렬 순서
     ordering = ('-created_at',)
 
+    def get_search_results(self, request, queryset, search_term):
+        # 본문 LIKE '%...%' 전체 스캔 대신 전문 검색 색인에서 일치한 게시물만 읽습니다. (JOIN이 없으므로 중복 행 없음)
+        if not search_term.strip():
+            return queryset, False
+        return search.filter_queryset(queryset, search_term), False
+
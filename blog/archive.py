@@ -0,0 +1,161 @@
+# blog/archive.py
+# 게시물 날짜 히스토그램(PostDateCount)을 갱신하고, 아카이브 뷰가 날짜 목록/이동에 사용하도록 제공하는 모듈입니다.
+
+import datetime
+from collections import Counter
+from zoneinfo import ZoneInfo
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.http import Http404
+from django.utils import timezone
+
+from blog.models import Post, PostDateCount
+
+
+def archive_timezone():
+    # 아카이브 날짜 기준 시간대 (settings.TIME_ZONE = 'Asia/Seoul')
+    return ZoneInfo(settings.TIME_ZONE)
+
+
+def local_date(value):
+    # created_at(UTC 저장)을 아카이브 기준 시간대의 날짜로 변환합니다.
+    return timezone.localtime(value, archive_timezone()).date()
+
+
+def period_starts(day):
+    # 날짜 하나가 속하는 (기간, 기간 첫날) 목록
+    return [
+        ('year', day.replace(month=1, day=1)),
+        ('month', day.replace(day=1)),
+        ('day', day),
+    ]
+
+
+def apply_delta(day, delta, using='default'):
+    # day가 속한 연/월/일 행의 게시물 수를 delta만큼 증감합니다. (행이 없으면 먼저 만듭니다)
+    buckets = PostDateCount.objects.using(using)
+    with transaction.atomic(using=using):
+        for period, start in period_starts(day):
+            buckets.bulk_create([PostDateCount(period=period, date=start)], ignore_conflicts=True)
+            buckets.filter(period=period, date=start).update(num_posts=F('num_posts') + delta)
+
+
+def count_dates(created_ats):
+    # created_at 값들로부터 {(기간, 기간 첫날): 게시물 수}를 계산합니다. (재계산/마이그레이션용)
+    counts = Counter()
+    for created_at in created_ats:
+        counts.update(period_starts(local_date(created_at)))
+    return counts
+
+
+@transaction.atomic
+def rebuild():
+    # 히스토그램 전체를 my_post에서 다시 계산합니다. 생성된 행 수를 반환합니다.
+    counts = count_dates(Post.objects.values_list('created_at', flat=True).iterator())
+    PostDateCount.objects.all().delete()
+    PostDateCount.objects.bulk_create(
+        [PostDateCount(period=period, date=start, num_posts=num) for (period, start), num in counts.items()],
+        batch_size=1000,
+    )
+    return len(counts)
+
+
+def period_end(period, start):
+    # 기간의 다음 기간 첫날 (범위 조회의 상한, 미포함)
+    if period == 'year':
+        return start.replace(year=start.year + 1)
+    if period == 'month':
+        return (start + datetime.timedelta(days=32)).replace(day=1)
+    return start + datetime.timedelta(days=1)
+
+
+def datetime_range(start, end):
+    # 날짜 범위 [start, end)를 아카이브 기준 시간대의 aware datetime 범위로 바꿉니다. (created_at 범위 조회용)
+    tz = archive_timezone()
+    return (
+        datetime.datetime.combine(start, datetime.time.min, tzinfo=tz),
+        datetime.datetime.combine(end, datetime.time.min, tzinfo=tz),
+    )
+
+
+# --- 아카이브 뷰용 히스토그램 믹스인 (PostDateHistogramMixin) ---
+# Django 날짜 기반 뷰의 get_date_list()와 get_next_*/get_previous_*()는 매번 my_post를 조회합니다.
+# 이 믹스인은 같은 값을 PostDateCount 테이블에서 읽어 오도록 재정의합니다.
+# date_list 항목은 PostDateCount 객체이며, year/month/day 속성과 num_posts(게시물 수)를 제공합니다.
+class PostDateHistogramMixin:
+
+    def get_histogram(self, period):
+        histogram = PostDateCount.objects.filter(period=period, num_posts__gt=0)
+        if not self.get_allow_future():
+            histogram = histogram.filter(date__lte=timezone.localdate(timezone=archive_timezone()))
+        return histogram
+
+    def get_histogram_range(self):
+        # URL 인자(year, month)로부터 현재 아카이브 페이지의 날짜 범위 [시작, 끝)을 구합니다.
+        year = self.kwargs.get('year')
+        if year is None:
+            return None, None
+        month = self.kwargs.get('month')
+        if month is None:
+            start = datetime.date(int(year), 1, 1)
+            return start, period_end('year', start)
+        start = datetime.date(int(year), int(month), 1)
+        return start, period_end('month', start)
+
+    def get_date_list_queryset(self, date_type, ordering='ASC'):
+        histogram = self.get_histogram(date_type)
+        start, end = self.get_histogram_range()
+        if start is not None:
+            histogram = histogram.filter(date__gte=start, date__lt=end)
+        return histogram.order_by('-date' if ordering == 'DESC' else 'date')
+
+    def check_date_list(self, date_list):
+        if not date_list and not self.get_allow_empty():
+            raise Http404('게시물이 없습니다.')
+        return date_list
+
+    def get_date_list(self, queryset, date_type=None, ordering='ASC'):
+        date_type = date_type or self.get_date_list_period()
+        return self.check_date_list(list(self.get_date_list_queryset(date_type, ordering)))
+
+    async def aget_date_list(self, date_type=None, ordering='ASC'):
+        # get_date_list()의 비동기 버전 (blog/async_views.py)
+        date_type = date_type or self.get_date_list_period()
+        return self.check_date_list([bucket async for bucket in self.get_date_list_queryset(date_type, ordering)])
+
+    def get_adjacent_queryset(self, period, date, forward):
+        # 게시물이 있는 바로 다음(또는 이전) 기간의 첫날을 조회하는 쿼리셋
+        current = dict(period_starts(date))[period]
+        histogram = self.get_histogram(period)
+        if forward:
+            histogram = histogram.filter(date__gt=current).order_by('date')
+        else:
+            histogram = histogram.filter(date__lt=current).order_by('-date')
+        return histogram.values_list('date', flat=True)
+
+    def _get_adjacent(self, period, date, forward):
+        # 게시물이 있는 바로 다음(또는 이전) 기간의 첫날을 반환합니다. 없으면 None
+        return self.get_adjacent_queryset(period, date, forward).first()
+
+    async def aget_adjacent(self, period, date, forward):
+        return await self.get_adjacent_queryset(period, date, forward).afirst()
+
+    def get_next_year(self, date):
+        return self._get_adjacent('year', date, forward=True)
+
+    def get_previous_year(self, date):
+        return self._get_adjacent('year', date, forward=False)
+
+    def get_next_month(self, date):
+        return self._get_adjacent('month', date, forward=True)
+
+    def get_previous_month(self, date):
+        return self._get_adjacent('month', date, forward=False)
+
+    def get_next_day(self, date):
+        return self._get_adjacent('day', date, forward=True)
+
+    def get_previous_day(self, date):
+        return self._get_adjacent('day', date, forward=False)
@@ -0,0 +1,7 @@
+from blog import async_views # 비동기 뷰 모듈 (ASGI 전용)
+from blog.urls import app_name, build_urlpatterns # 동기 URL과 같은 네임스페이스와 패턴
+
+# blog/async_urls.py
+# ASGI 요청에서 사용하는 blog URL (_20250723django/async_urls.py에서 포함)
+
+urlpatterns = build_urlpatterns(async_views)
@@ -0,0 +1,223 @@
+import calendar # 월 이름을 가져오기 위해 임포트
+import datetime
+
+from django.http import Http404
+from django.utils import timezone
+from taggit.models import Tag # Tag 모델 임포트 (django-taggit에서 제공)
+
+from blog.models import Post # Post 모델 임포트
+from blog.search import render_snippets, search_queryset # 전문 검색(FTS5) 쿼리셋
+from blog.archive import PostDateHistogramMixin, datetime_range, period_end # 날짜 히스토그램 기반 아카이브
+from tag_cloud.async_views import UnifiedTagCloudTV
+from _20250723django import pagecache # 익명 사용자 페이지 캐시 (의존 태그 선언)
+from _20250723django.async_views import AsyncListView, AsyncDetailView, AsyncPageView # 비동기 뷰 기반 클래스
+
+# blog/async_views.py
+# blog/views.py의 공개 조회 뷰를 비동기로 옮긴 버전입니다. (ASGI 전용, blog/async_urls.py)
+# 클래스 이름, 템플릿, 컨텍스트 변수는 동기 뷰와 같으므로 같은 URL 패턴(blog/urls.py의 build_urlpatterns)에 연결됩니다.
+
+# --- Post 목록 뷰 (PostLV) ---
+class PostLV(AsyncListView):
+    model = Post
+    template_name = 'blog/post_list.html'
+    context_object_name = 'posts'
+    paginate_by = 10
+    list_select_related = ('author',)
+    list_prefetch_related = ('tags',)
+    list_defer = Post.list_deferred_fields
+    validator_timestamp_field = 'modify_dt'
+
+    def get_queryset(self):
+        queryset = super().get_queryset().order_by('-created_at')
+        tag_slug = self.kwargs.get('tag_slug')
+        if tag_slug:
+            # 태그를 먼저 조회하지 않고 slug로 바로 조인합니다. (없는 태그는 빈 목록)
+            queryset = queryset.filter(tags__slug=tag_slug)
+        return queryset
+
+    def get_page_cache_tags(self):
+        return pagecache.list_cache_tags(Post, self.kwargs.get('tag_slug'))
+
+    async def aget_context_data(self, **kwargs):
+        context = await super().aget_context_data(**kwargs)
+        tag_slug = self.kwargs.get('tag_slug')
+        if tag_slug:
+            tag_name = await Tag.objects.filter(slug=tag_slug).values_list('name', flat=True).afirst()
+            if tag_name:
+                context['tagname'] = tag_name
+                context['tag_slug'] = tag_slug
+        return context
+
+# --- Post 상세 뷰 (PostDV) ---
+class PostDV(AsyncDetailView):
+    model = Post
+    template_name = 'blog/post_detail.html'
+    context_object_name = 'post'
+    validator_timestamp_field = 'modify_dt'
+
+    def get_queryset(self):
+        # 템플릿이 작성자와 태그를 표시하므로 미리 가져옵니다. (비동기 뷰에서는 지연 조회를 할 수 없음)
+        return super().get_queryset().select_related('author').prefetch_related('tags').defer('content')
+
+    def get_tag_slug(self):
+        return self.request.GET.get('tag') or None
+
+    def get_page_cache_tags(self):
+        return pagecache.detail_cache_tags(self.object, self.get_tag_slug())
+
+    async def aget_context_data(self, **kwargs):
+        context = await super().aget_context_data(**kwargs)
+        context['tag_slug'] = self.get_tag_slug()
+        context['previous_post'], context['next_post'] = await self.object.aget_neighbors(context['tag_slug'])
+        return context
+
+# --- Post 아카이브 공통 (PostArchiveView) ---
+# 날짜 목록과 이전/다음 이동은 날짜 히스토그램(PostDateCount)에서, 게시물 목록은 created_at 범위 조회로 가져옵니다.
+# archive_period: 페이지의 기간 ('year', 'month', 'day'), None이면 전체 아카이브
+class PostArchiveView(PostDateHistogramMixin, AsyncPageView):
+    model = Post
+    page_cache_tags = ('post-list',)
+    validator_timestamp_field = 'modify_dt'
+    context_object_name = 'posts'
+    allow_future = False
+    allow_empty = True
+    archive_period = None
+    date_list_period = None # 날짜 목록의 단위 (None이면 날짜 목록 없음)
+    date_list_ordering = 'ASC'
+    adjacent_periods = () # 이전/다음 링크를 만들 기간
+
+    def get_allow_future(self):
+        return self.allow_future
+
+    def get_allow_empty(self):
+        return self.allow_empty
+
+    def get_date_list_period(self):
+        return self.date_list_period
+
+    def get_archive_date(self):
+        # URL 인자로부터 기간 첫날을 구합니다. 잘못된 날짜(예: 2월 30일)는 404
+        try:
+            return datetime.date(
+                int(self.kwargs['year']),
+                int(self.kwargs.get('month', 1)),
+                int(self.kwargs.get('day', 1)),
+            )
+        except ValueError:
+            raise Http404('잘못된 날짜입니다.')
+
+    def get_queryset(self):
+        queryset = super().get_queryset().defer(*Post.list_deferred_fields).order_by('-created_at')
+        if not self.get_allow_future():
+            queryset = queryset.filter(created_at__lte=timezone.now())
+        return queryset
+
+    async def aget_context_data(self, **kwargs):
+        context = {}
+        queryset = self.get_queryset()
+        if self.archive_period:
+            date = self.get_archive_date()
+            start, end = datetime_range(date, period_end(self.archive_period, date))
+            queryset = queryset.filter(created_at__gte=start, created_at__lt=end)
+            for period in self.adjacent_periods:
+                context[f'next_{period}'] = await self.aget_adjacent(period, date, forward=True)
+                context[f'previous_{period}'] = await self.aget_adjacent(period, date, forward=False)
+        if self.date_list_period:
+            context['date_list'] = await self.aget_date_list(ordering=self.date_list_ordering)
+        object_list = [post async for post in queryset]
+        if not object_list and not self.get_allow_empty():
+            raise Http404('게시물이 없습니다.')
+        context['object_list'] = context[self.context_object_name] = object_list
+        context.update(kwargs)
+        return await super().aget_context_data(**context)
+
+# --- Post 아카이브 인덱스 뷰 (PostAV) ---
+class PostAV(PostArchiveView):
+    template_name = 'blog/post_archive.html'
+    date_list_period = 'year'
+    date_list_ordering = 'DESC' # ArchiveIndexView와 같이 최근 연도부터
+
+# --- Post 연도별 아카이브 뷰 (PostYAV) ---
+class PostYAV(PostArchiveView):
+    template_name = 'blog/post_archive_year.html'
+    archive_period = 'year'
+    date_list_period = 'month'
+    adjacent_periods = ('year',)
+
+    async def aget_context_data(self, **kwargs):
+        context = await super().aget_context_data(**kwargs)
+        context['year'] = self.kwargs['year']
+        context['month_list'] = context['date_list']
+        return context
+
+# --- Post 월별 아카이브 뷰 (PostMAV) ---
+class PostMAV(PostArchiveView):
+    template_name = 'blog/post_archive_month.html'
+    archive_period = 'month'
+    date_list_period = 'day'
+    adjacent_periods = ('month',)
+
+    async def aget_context_data(self, **kwargs):
+        context = await super().aget_context_data(**kwargs)
+        context['year'] = self.kwargs['year']
+        context['month_number'] = self.kwargs['month']
+        context['month_name'] = calendar.month_name[int(self.kwargs['month'])]
+        context['day_list'] = context['date_list']
+        return context
+
+# --- Post 일별 아카이브 뷰 (PostDAV) ---
+class PostDAV(PostArchiveView):
+    template_name = 'blog/post_archive_day.html'
+    archive_period = 'day'
+    adjacent_periods = ('day', 'month')
+
+    async def aget_context_data(self, **kwargs):
+        context = await super().aget_context_data(**kwargs)
+        context['year'] = self.kwargs['year']
+        context['month_number'] = self.kwargs['month']
+        context['month_name'] = calendar.month_name[int(self.kwargs['month'])]
+        context['day'] = self.kwargs['day']
+        return context
+
+# --- Post 오늘 날짜 아카이브 뷰 (PostTAV) ---
+class PostTAV(PostDAV):
+
+    def setup(self, request, *args, **kwargs):
+        # 오늘 날짜를 URL 인자처럼 채워 일별 아카이브와 같은 방식으로 처리합니다.
+        super().setup(request, *args, **kwargs)
+        today = timezone.localdate()
+        self.kwargs.update(year=today.year, month=today.month, day=today.day)
+
+    def get_etag_parts(self):
+        return (timezone.localdate(),) # 날짜가 바뀌면 게시물이 그대로여도 다른 페이지
+
+# --- 태그 클라우드 뷰 (TagCloudTV) ---
+# tag_cloud 앱의 비동기 뷰와 같은 템플릿과 쿼리를 사용합니다.
+class TagCloudTV(UnifiedTagCloudTV):
+    pass
+
+# --- 검색 뷰 (SearchFV) ---
+class SearchFV(AsyncListView):
+    model = Post
+    page_cache_tags = ('post-list',)
+    template_name = 'blog/post_list.html'
+    context_object_name = 'posts'
+    paginate_by = 10
+    list_select_related = ('author',)
+    list_prefetch_related = ('tags',)
+    list_defer = Post.list_deferred_fields
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        search_keyword = self.request.GET.get('q', '')
+        if search_keyword:
+            # 동기 뷰의 PostSearchResults와 같은 순서(bm25)와 스니펫을 하나의 조인 쿼리로 가져옵니다.
+            return search_queryset(search_keyword, queryset)
+        return queryset.order_by('-created_at')
+
+    async def aget_context_data(self, **kwargs):
+        context = await super().aget_context_data(**kwargs)
+        if self.request.GET.get('q'):
+            render_snippets(context['object_list'])
+        context['search_query'] = self.request.GET.get('q', '')
+        return context
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from blog import archive
+
+
+# 게시물 날짜 히스토그램(PostDateCount)을 my_post에서 다시 계산하는 관리 명령
+# QuerySet.update() 등 시그널을 거치지 않는 방식으로 created_at을 바꾼 뒤 실행합니다.
+# 사용 예: python manage.py rebuild_post_archive
+class Command(BaseCommand):
+    help = '게시물 날짜 히스토그램(연/월/일별 게시물 수)을 다시 계산합니다.'
+
+    def handle(self, *args, **options):
+        count = archive.rebuild()
+        self.stdout.write(self.style.SUCCESS(f'{count}개의 날짜 히스토그램 행을 다시 계산했습니다.'))
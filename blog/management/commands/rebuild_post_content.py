@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+
+from _20250723django import pagecache, replica
+from blog import rendering
+from blog.models import Post
+
+
+# 게시물의 정화된 본문 HTML(content_html)과 발췌문(excerpt)을 본문에서 다시 계산하는 관리 명령
+# 허용 태그 등 blog/rendering.py의 규칙을 바꾼 뒤나, 시그널 없이 본문을 바꾼 뒤(update(), 원시 SQL) 실행합니다.
+# 사용 예: python manage.py rebuild_post_content
+class Command(BaseCommand):
+    help = '게시물의 정화된 본문 HTML과 발췌문을 다시 계산합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500, help='한 번에 처리할 게시물 수 (기본값: 500)')
+
+    def handle(self, *args, **options):
+        changed_ids = rendering.rebuild(Post, batch_size=options['batch_size'])
+        if changed_ids:
+            # bulk_update는 시그널을 보내지 않으므로 바뀐 게시물의 페이지 캐시 무효화와 복제본 갱신을 직접 요청합니다.
+            pagecache.invalidate(pagecache.list_tag(Post), *(pagecache.instance_tag(Post(pk=pk)) for pk in changed_ids))
+            replica.schedule_refresh()
+        self.stdout.write(self.style.SUCCESS(f'{len(changed_ids)}개의 게시물을 갱신했습니다.'))
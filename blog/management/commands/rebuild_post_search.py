@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from blog import search
+
+
+# 게시물 전문 검색 색인(my_post_fts)을 처음부터 다시 만드는 관리 명령
+# 사용 예: python manage.py rebuild_post_search
+class Command(BaseCommand):
+    help = '게시물 전문 검색 색인(my_post_fts)을 다시 생성합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500, help='한 번에 색인할 게시물 수 (기본값: 500)')
+
+    def handle(self, *args, **options):
+        count = search.rebuild_index(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'{count}개의 게시물을 색인했습니다.'))
@@ -0,0 +1,57 @@
+# Generated by Django 5.2.4 on 2026-10-18 10:00
+
+import html
+
+from django.db import migrations
+from django.utils.html import strip_tags
+
+
+# 게시물 전문 검색용 FTS5 가상 테이블 (rowid = my_post.id)
+# prefix='2 3' 옵션으로 2~3글자 접두어 색인을 함께 만들어 접두어 검색("장고"*)을 빠르게 처리합니다.
+CREATE_FTS_TABLE = """
+CREATE VIRTUAL TABLE IF NOT EXISTS my_post_fts USING fts5(
+    title, description, content, tags,
+    tokenize = 'unicode61 remove_diacritics 2',
+    prefix = '2 3'
+)
+"""
+
+DROP_FTS_TABLE = 'DROP TABLE IF EXISTS my_post_fts'
+
+
+def populate_search_index(apps, schema_editor):
+    # 기존 게시물을 색인에 채워 넣습니다. 태그 이름은 taggit 테이블에서 직접 모읍니다.
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute("""
+            SELECT p.id, p.title, p.description, p.content,
+                   COALESCE((
+                       SELECT group_concat(t.name, ' ')
+                       FROM taggit_taggeditem ti
+                       JOIN taggit_tag t ON t.id = ti.tag_id
+                       JOIN django_content_type ct ON ct.id = ti.content_type_id
+                       WHERE ct.app_label = 'blog' AND ct.model = 'post' AND ti.object_id = p.id
+                   ), '')
+            FROM my_post p
+        """)
+        rows = [
+            (post_id, title, description, html.unescape(strip_tags(content)), tags)
+            for post_id, title, description, content, tags in cursor.fetchall()
+        ]
+        cursor.executemany(
+            'INSERT INTO my_post_fts (rowid, title, description, content, tags) VALUES (%s, %s, %s, %s, %s)',
+            rows,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0003_alter_post_options_rename_create_dt_post_created_at_and_more'),
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('taggit', '0006_rename_taggeditem_content_type_object_id_taggit_tagg_content_8fc721_idx'),
+    ]
+
+    operations = [
+        migrations.RunSQL(CREATE_FTS_TABLE, DROP_FTS_TABLE),
+        migrations.RunPython(populate_search_index, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,50 @@
+# Generated by Django 5.2.4 on 2026-10-18 09:59
+
+from collections import Counter
+from zoneinfo import ZoneInfo
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def populate_post_date_counts(apps, schema_editor):
+    # 기존 게시물의 작성일을 settings.TIME_ZONE 기준 날짜로 바꾸어 연/월/일별로 셉니다.
+    Post = apps.get_model('blog', 'Post')
+    PostDateCount = apps.get_model('blog', 'PostDateCount')
+    db_alias = schema_editor.connection.alias
+    tz = ZoneInfo(settings.TIME_ZONE)
+    counts = Counter()
+    for created_at in Post.objects.using(db_alias).values_list('created_at', flat=True).iterator():
+        day = created_at.astimezone(tz).date()
+        counts.update([('year', day.replace(month=1, day=1)), ('month', day.replace(day=1)), ('day', day)])
+    PostDateCount.objects.using(db_alias).bulk_create(
+        [PostDateCount(period=period, date=date, num_posts=num) for (period, date), num in counts.items()],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0004_post_search_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PostDateCount',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('period', models.CharField(choices=[('year', '연도'), ('month', '월'), ('day', '일')], max_length=5, verbose_name='PERIOD')),
+                ('date', models.DateField(verbose_name='DATE')),
+                ('num_posts', models.PositiveIntegerField(default=0, verbose_name='NUM POSTS')),
+            ],
+            options={
+                'verbose_name': 'post date count',
+                'verbose_name_plural': 'post date counts',
+                'db_table': 'my_post_date_count',
+                'ordering': ('period', 'date'),
+                'constraints': [models.UniqueConstraint(fields=('period', 'date'), name='my_post_date_count_period_date_uniq')],
+            },
+        ),
+        migrations.RunPython(populate_post_date_counts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:55
+
+from django.db import migrations, models
+
+from blog import rendering
+
+
+def populate_rendered_content(apps, schema_editor):
+    # 기존 게시물의 content_html / excerpt를 본문에서 계산해 채웁니다. (수정 시각은 그대로 둠)
+    rendering.rebuild(apps.get_model('blog', 'Post'), using=schema_editor.connection.alias, touch=False)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0006_sort_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='content_html',
+            field=models.TextField(blank=True, editable=False, verbose_name='CONTENT HTML'),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='excerpt',
+            field=models.CharField(blank=True, editable=False, max_length=200, verbose_name='EXCERPT'),
+        ),
+        migrations.RunPython(populate_rendered_content, migrations.RunPython.noop),
+    ]
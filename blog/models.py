@@ -2,12 +2,17 @@ from django.db import models
 from django.urls import reverse
 from taggit.managers import TaggableManager # Taggit 라이브러리 (태그 기능을 위해 필요)
 from django.conf import settings # settings.AUTH_USER_MODEL을 사용하기 위해 임포트
+from _20250723django.neighbors import NeighborsMixin # 이전/다음 항목을 인덱스 탐색 쿼리 1회로 조회
+from blog.rendering import render_content # 본문에서 정화된 HTML과 발췌문 계산
 
-class Post(models.Model):
+class Post(NeighborsMixin, models.Model):
     title = models.CharField(verbose_name='TITLE', max_length=50)
     slug = models.SlugField(verbose_name='SLUG', unique=True, allow_unicode=True, help_text='one word for title alias.')
     description = models.CharField(verbose_name='DESCRIPTION', max_length=100, blank=True, help_text='simple description text.')
     content = models.TextField(verbose_name='CONTENT')
+    # 본문에서 계산한 값 (save()에서 갱신, blog/rendering.py 참고)
+    content_html = models.TextField(verbose_name='CONTENT HTML', blank=True, editable=False) # 상세 페이지용 정화된 본문 HTML
+    excerpt = models.CharField(verbose_name='EXCERPT', max_length=200, blank=True, editable=False) # 목록 카드용 본문 발췌문
     
     created_at = models.DateTimeField(verbose_name='CREATE DATE', auto_now_add=True)
     modify_dt = models.DateTimeField(verbose_name='MODIFY DATE', auto_now=True)
@@ -21,20 +26,79 @@ class Post(models.Model):
     
     tags = TaggableManager(blank=True) # 태그 필드 추가
 
+    neighbor_fields = ('title', 'slug') # 이전/다음 게시물 링크에 필요한 필드 (NeighborsMixin)
+    list_deferred_fields = ('content', 'content_html') # 목록/검색 페이지에서 읽지 않는 본문 필드 (카드는 excerpt 사용)
+
     class Meta:
         verbose_name = 'post' # 단수 별칭
         verbose_name_plural = 'posts' # 복수 별칭
         db_table = 'my_post' # 데이터베이스 테이블 이름 지정 (기존 'blog_posts'에서 'my_post'로 변경)
         ordering = ('-created_at',) # 기본 정렬 순서 (최신 생성일 기준 내림차순으로 변경)
+        indexes = [
+            models.Index(fields=['created_at'], name='my_post_created_at_idx'), # 목록(최신순)을 인덱스 순서로 읽음
+        ]
 
     def __str__(self):
         return self.title # 객체를 문자열로 표현할 때 title 필드를 반환
 
+    def save(self, *args, **kwargs):
+        # 본문을 읽어 온 경우(지연 로딩 필드가 아닌 경우)에만 파생 컬럼을 다시 계산합니다.
+        if 'content' not in self.get_deferred_fields():
+            self.set_rendered_content()
+            update_fields = kwargs.get('update_fields')
+            if update_fields is not None and 'content' in update_fields:
+                kwargs['update_fields'] = {*update_fields, 'content_html', 'excerpt'}
+        super().save(*args, **kwargs)
+
+    def set_rendered_content(self):
+        self.content_html, self.excerpt = render_content(self.content)
+
     def get_absolute_url(self):
         return reverse('blog:post_detail', args=(self.slug,)) # slug 기반 URL (URL 패턴 이름 'post_detail'로 변경)
 
     def get_previous_post(self):
-        return self.get_previous_by_created_at() # 이전 게시물 가져오기
+        return self.get_neighbors()[0] # 이전 게시물 가져오기 (없으면 None)
 
     def get_next_post(self):
-        return self.get_next_by_created_at() # 다음 게시물 가져오기
+        return self.get_neighbors()[1] # 다음 게시물 가져오기 (없으면 None)
+
+
+# 게시물 날짜 히스토그램 (연/월/일별 게시물 수)
+# 아카이브 뷰의 날짜 목록과 이전/다음 이동을 my_post 테이블을 훑지 않고 이 테이블에서 바로 읽기 위해 사용합니다.
+# 날짜는 settings.TIME_ZONE(Asia/Seoul) 기준이며, blog/signals.py에서 게시물 생성/삭제/날짜 변경 시 증감됩니다.
+# rebuild_post_archive 관리 명령으로 다시 계산할 수 있습니다.
+class PostDateCount(models.Model):
+    PERIOD_CHOICES = (
+        ('year', '연도'),
+        ('month', '월'),
+        ('day', '일'),
+    )
+
+    period = models.CharField(verbose_name='PERIOD', max_length=5, choices=PERIOD_CHOICES)
+    date = models.DateField(verbose_name='DATE') # 기간의 첫날 (연: 1월 1일, 월: 1일, 일: 해당 날짜)
+    num_posts = models.PositiveIntegerField(verbose_name='NUM POSTS', default=0)
+
+    class Meta:
+        verbose_name = 'post date count'
+        verbose_name_plural = 'post date counts'
+        db_table = 'my_post_date_count'
+        ordering = ('period', 'date')
+        constraints = [
+            models.UniqueConstraint(fields=['period', 'date'], name='my_post_date_count_period_date_uniq'),
+        ]
+
+    def __str__(self):
+        return f'{self.period} {self.date}: {self.num_posts}'
+
+    # 템플릿에서 date.year / date.month / date.day처럼 날짜 객체와 같은 방식으로 사용할 수 있도록 제공
+    @property
+    def year(self):
+        return self.date.year
+
+    @property
+    def month(self):
+        return self.date.month
+
+    @property
+    def day(self):
+        return self.date.day
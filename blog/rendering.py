@@ -0,0 +1,148 @@
+# blog/rendering.py
+# 게시물 본문(HTML)으로부터 저장용 파생 컬럼을 만드는 모듈입니다.
+# - content_html: 허용 목록(ALLOWED_TAGS / ALLOWED_ATTRIBUTES)에 있는 태그와 속성만 남긴 본문 HTML
+#   (script / style 등은 내용째 제거, javascript: 등 허용되지 않은 URL 스킴은 속성 제거, 닫히지 않은 태그는 닫아 줌)
+# - excerpt: 태그를 제거하고 공백을 정리한 본문 텍스트의 앞부분 (목록 카드용, EXCERPT_LENGTH자)
+# Post.save()에서 본문이 바뀔 때마다 계산하며, 규칙을 바꾼 뒤에는 rebuild_post_content 관리 명령으로 다시 계산합니다.
+# (외부 HTML 정화 라이브러리 없이 표준 라이브러리 html.parser만 사용합니다)
+
+import re
+from html.parser import HTMLParser
+from urllib.parse import urlsplit
+
+from django.utils import timezone
+from django.utils.html import escape
+from django.utils.text import Truncator
+
+EXCERPT_LENGTH = 200 # 목록 카드의 기존 truncatechars:200과 같은 길이
+
+ALLOWED_TAGS = {
+    'a', 'abbr', 'b', 'blockquote', 'br', 'code', 'dd', 'del', 'div', 'dl', 'dt', 'em', 'figcaption', 'figure',
+    'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'hr', 'i', 'img', 'ins', 'kbd', 'li', 'mark', 'ol', 'p', 'pre', 's',
+    'small', 'span', 'strong', 'sub', 'sup', 'table', 'tbody', 'td', 'tfoot', 'th', 'thead', 'tr', 'u', 'ul',
+}
+ALLOWED_ATTRIBUTES = {
+    '*': {'class', 'title'},
+    'a': {'href'},
+    'abbr': {'title'},
+    'img': {'src', 'alt', 'width', 'height'},
+    'ol': {'start'},
+    'td': {'colspan', 'rowspan'},
+    'th': {'colspan', 'rowspan', 'scope'},
+}
+URL_ATTRIBUTES = {'href', 'src'}
+ALLOWED_SCHEMES = {'', 'http', 'https', 'mailto'} # ''는 상대 경로 (/media/..., #anchor 등)
+
+DROPPED_CONTENT_TAGS = {'script', 'style', 'iframe', 'object', 'embed', 'template', 'noscript', 'textarea', 'select'}
+VOID_TAGS = {'br', 'hr', 'img'}
+# 발췌문에서 앞뒤 텍스트와 띄어 써야 하는 블록 태그
+BLOCK_TAGS = {
+    'blockquote', 'br', 'dd', 'div', 'dl', 'dt', 'figcaption', 'figure', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6',
+    'hr', 'li', 'ol', 'p', 'pre', 'table', 'td', 'th', 'tr', 'ul',
+}
+
+WHITESPACE_RE = re.compile(r'\s+')
+URL_IGNORED_CHARS_RE = re.compile(r'[\x00-\x20\x7f]+') # 스킴 판별 시 무시할 공백/제어 문자 (java\tscript: 등)
+
+
+def _safe_url(value):
+    try:
+        scheme = urlsplit(URL_IGNORED_CHARS_RE.sub('', value)).scheme.lower()
+    except ValueError:
+        return False
+    return scheme in ALLOWED_SCHEMES
+
+
+class _ContentParser(HTMLParser):
+    # 본문을 한 번 읽으면서 정화된 HTML(html)과 텍스트(text)를 함께 만듭니다.
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.html = []
+        self.text = []
+        self.open_tags = []
+        self.dropped_depth = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in DROPPED_CONTENT_TAGS:
+            self.dropped_depth += 1
+            return
+        if self.dropped_depth:
+            return
+        if tag in BLOCK_TAGS:
+            self.text.append(' ')
+        if tag not in ALLOWED_TAGS:
+            return
+        allowed = ALLOWED_ATTRIBUTES['*'] | ALLOWED_ATTRIBUTES.get(tag, set())
+        parts = [tag]
+        for name, value in attrs:
+            if name not in allowed or value is None:
+                continue
+            if name in URL_ATTRIBUTES and not _safe_url(value):
+                continue
+            parts.append(f'{name}="{escape(value)}"')
+        self.html.append(f'<{" ".join(parts)}>')
+        if tag not in VOID_TAGS:
+            self.open_tags.append(tag)
+
+    def handle_endtag(self, tag):
+        if tag in DROPPED_CONTENT_TAGS:
+            self.dropped_depth = max(self.dropped_depth - 1, 0)
+            return
+        if self.dropped_depth:
+            return
+        if tag in BLOCK_TAGS:
+            self.text.append(' ')
+        if tag not in self.open_tags:
+            return # 열리지 않은 태그를 닫는 경우 무시
+        # 안쪽에서 닫히지 않은 태그를 먼저 닫습니다.
+        while self.open_tags:
+            open_tag = self.open_tags.pop()
+            self.html.append(f'</{open_tag}>')
+            if open_tag == tag:
+                break
+
+    def handle_data(self, data):
+        if self.dropped_depth:
+            return
+        self.html.append(escape(data))
+        self.text.append(data)
+
+    def close(self):
+        super().close()
+        while self.open_tags:
+            self.html.append(f'</{self.open_tags.pop()}>')
+
+
+def render_content(content):
+    # 본문 HTML로부터 (정화된 HTML, 발췌문)을 반환합니다.
+    parser = _ContentParser()
+    parser.feed(content or '')
+    parser.close()
+    text = WHITESPACE_RE.sub(' ', ''.join(parser.text)).strip()
+    return ''.join(parser.html), Truncator(text).chars(EXCERPT_LENGTH)
+
+
+def rebuild(model, using='default', batch_size=500, touch=True):
+    # 모든 게시물의 content_html / excerpt를 다시 계산하고, 값이 바뀐 게시물의 id 목록을 반환합니다.
+    # (관리 명령 rebuild_post_content와 마이그레이션에서 사용, 마이그레이션은 과거 모델을 model로 넘김)
+    # pk 순서로 batch_size개씩 읽어 bulk_update하므로 메모리 사용량이 일정하고, 시그널(색인/캐시 갱신)을 보내지 않습니다.
+    # touch=True이면 바뀐 게시물의 modify_dt도 갱신하여 조건부 GET 검증값과 카드 조각 캐시 키가 바뀌게 합니다.
+    queryset = model._default_manager.using(using).only('pk', 'content', 'content_html', 'excerpt').order_by('pk')
+    fields = ['content_html', 'excerpt', 'modify_dt'] if touch else ['content_html', 'excerpt']
+    changed_ids = []
+    last_pk = 0
+    while True:
+        batch = list(queryset.filter(pk__gt=last_pk)[:batch_size])
+        if not batch:
+            return changed_ids
+        now = timezone.now()
+        changed = []
+        for post in batch:
+            content_html, excerpt = render_content(post.content)
+            if (content_html, excerpt) != (post.content_html, post.excerpt):
+                post.content_html, post.excerpt, post.modify_dt = content_html, excerpt, now
+                changed.append(post)
+        model._default_manager.using(using).bulk_update(changed, fields)
+        changed_ids += [post.pk for post in changed]
+        last_pk = batch[-1].pk
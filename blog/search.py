@@ -0,0 +1,185 @@
+# blog/search.py
+# SQLite FTS5 가상 테이블(my_post_fts)을 이용한 게시물 전문 검색 모듈입니다.
+# my_post_fts의 rowid는 Post.id와 같으며, title / description / content / tags 4개 컬럼을 색인합니다.
+# 색인 동기화는 blog/signals.py에서, 검색은 SearchFV에서 PostSearchResults를 통해 수행합니다.
+
+import html
+
+from django.db import connections, router
+from django.db.models.expressions import RawSQL
+from django.utils.html import escape, strip_tags
+from django.utils.safestring import mark_safe
+
+from _20250723django.fts import build_match_query
+from blog.models import Post
+
+FTS_TABLE = 'my_post_fts'
+
+# bm25 가중치 (title, description, content, tags 순서) - 제목과 태그 일치를 본문보다 높게 평가
+BM25_WEIGHTS = (10.0, 4.0, 1.0, 8.0)
+
+# snippet()이 일치 부분을 감쌀 때 사용할 제어 문자 (본문과 겹치지 않도록 HTML 대신 사용)
+SNIPPET_START = '\x02'
+SNIPPET_END = '\x03'
+SNIPPET_TOKENS = 24 # 스니펫에 포함할 최대 토큰 수
+
+
+def _post_document(post):
+    # 색인에 저장할 컬럼 값 목록을 만듭니다. 본문은 HTML이므로 태그와 엔티티(&amp; 등)를 제거한 텍스트만 색인합니다.
+    tag_names = ' '.join(tag.name for tag in post.tags.all())
+    return [post.title, post.description, html.unescape(strip_tags(post.content)), tag_names]
+
+
+def index_post(post, using=None):
+    # 게시물 하나의 색인 행을 새로 씁니다. (FTS5에는 UPSERT가 없으므로 삭제 후 삽입)
+    using = using or router.db_for_write(Post, instance=post)
+    with connections[using].cursor() as cursor:
+        cursor.execute(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [post.pk])
+        cursor.execute(
+            f'INSERT INTO {FTS_TABLE} (rowid, title, description, content, tags) VALUES (%s, %s, %s, %s, %s)',
+            [post.pk, *_post_document(post)],
+        )
+
+
+def remove_post(post_id, using=None):
+    # 삭제된 게시물의 색인 행을 제거합니다.
+    using = using or router.db_for_write(Post)
+    with connections[using].cursor() as cursor:
+        cursor.execute(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [post_id])
+
+
+def rebuild_index(using=None, batch_size=500):
+    # 색인 전체를 다시 만듭니다. (관리 명령 rebuild_post_search에서 사용)
+    # 게시물을 batch_size 단위로 나누어 태그를 prefetch하므로 메모리 사용량이 일정합니다.
+    using = using or router.db_for_write(Post)
+    with connections[using].cursor() as cursor:
+        cursor.execute(f'DELETE FROM {FTS_TABLE}')
+    queryset = Post.objects.using(using).prefetch_related('tags').order_by('pk')
+    count = 0
+    last_pk = 0
+    while True:
+        batch = list(queryset.filter(pk__gt=last_pk)[:batch_size])
+        if not batch:
+            break
+        with connections[using].cursor() as cursor:
+            cursor.executemany(
+                f'INSERT INTO {FTS_TABLE} (rowid, title, description, content, tags) VALUES (%s, %s, %s, %s, %s)',
+                [[post.pk, *_post_document(post)] for post in batch],
+            )
+        count += len(batch)
+        last_pk = batch[-1].pk
+    return count
+
+
+def _render_snippet(raw_snippet):
+    # FTS5 snippet 결과를 HTML로 안전하게 변환합니다.
+    # 먼저 전체를 이스케이프한 뒤, 제어 문자로 표시된 일치 부분만 <mark>로 감쌉니다.
+    snippet = escape(raw_snippet)
+    snippet = snippet.replace(SNIPPET_START, '<mark>').replace(SNIPPET_END, '</mark>')
+    return mark_safe(snippet)
+
+
+def search_queryset(keyword, queryset=None):
+    # 검색 결과를 관련도 순으로 정렬한 Post 쿼리셋 (비동기 뷰에서 acount() / async for로 사용)
+    # my_post_fts와 rowid로 조인하며, 스니펫 원문은 search_snippet_raw에 담깁니다. (render_snippets()로 변환)
+    queryset = queryset if queryset is not None else Post.objects.all()
+    match = build_match_query(keyword)
+    if not match:
+        return queryset.none()
+    weights = ', '.join(str(weight) for weight in BM25_WEIGHTS)
+    return queryset.extra(
+        tables=[FTS_TABLE],
+        where=[f'{FTS_TABLE}.rowid = {Post._meta.db_table}.id', f'{FTS_TABLE} MATCH %s'],
+        params=[match],
+        select={
+            'search_rank': f'bm25({FTS_TABLE}, {weights})',
+            'search_snippet_raw': f'snippet({FTS_TABLE}, -1, %s, %s, %s, {SNIPPET_TOKENS})',
+        },
+        select_params=[SNIPPET_START, SNIPPET_END, '…'],
+        order_by=['search_rank'],
+    )
+
+
+def filter_queryset(queryset, keyword):
+    # 검색어와 일치하는 게시물만 남긴 쿼리셋 (관리자 검색용, 정렬은 그대로 유지)
+    # 본문 LIKE '%...%' 전체 스캔 대신 색인에서 일치한 rowid만 IN 서브쿼리로 읽습니다.
+    match = build_match_query(keyword)
+    if not match:
+        return queryset.none()
+    return queryset.filter(pk__in=RawSQL(f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s', [match]))
+
+
+def render_snippets(posts):
+    # search_queryset() 결과의 스니펫 원문을 템플릿용 HTML(search_snippet)로 변환합니다.
+    for post in posts:
+        post.search_snippet = _render_snippet(post.search_snippet_raw)
+    return posts
+
+
+class PostSearchResults:
+    # 검색 결과를 Paginator에 그대로 넘길 수 있는 지연 평가 시퀀스입니다.
+    # Paginator는 count()와 슬라이싱만 사용하므로, 페이지를 요청할 때마다
+    # 해당 페이지의 rowid만 FTS 색인에서 LIMIT/OFFSET으로 가져온 뒤 Post를 일괄 조회합니다.
+    # 따라서 게시물 테이블 전체 크기와 무관하게 "일치한 행 수"에만 비례하는 비용으로 검색됩니다.
+
+    def __init__(self, keyword, queryset=None, using=None):
+        self.match = build_match_query(keyword)
+        self.queryset = queryset if queryset is not None else Post.objects.all()
+        self.using = using or router.db_for_read(Post)
+        self._count = None
+
+    def count(self):
+        # 일치한 rowid만 IN 서브쿼리로 읽어, 넘겨받은 쿼리셋의 조건(예: 공개 게시물만)이 적용된 개수를 셉니다.
+        if self._count is None:
+            if not self.match:
+                self._count = 0
+            else:
+                self._count = self.queryset.filter(
+                    pk__in=RawSQL(f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s', [self.match])
+                ).count()
+        return self._count
+
+    def _queryset_condition(self):
+        # 쿼리셋에 조건이 있으면 색인 조회도 그 게시물 안에서만 순위를 매기도록 rowid 조건을 만듭니다.
+        # (조건이 없으면 색인만 읽음, count()와 페이지 내용이 같은 집합을 기준으로 함)
+        if not self.queryset.query.where:
+            return '', []
+        sql, params = self.queryset.order_by().values('pk').query.sql_with_params()
+        return f' AND rowid IN ({sql})', list(params)
+
+    def __len__(self):
+        return self.count()
+
+    def __getitem__(self, key):
+        if isinstance(key, int):
+            results = self[key:key + 1]
+            if not results:
+                raise IndexError(key)
+            return results[0]
+        start = key.start or 0
+        stop = key.stop if key.stop is not None else self.count()
+        return self._fetch(start, max(stop - start, 0))
+
+    def _fetch(self, offset, limit):
+        if not self.match or limit <= 0:
+            return []
+        weights = ', '.join(str(weight) for weight in BM25_WEIGHTS)
+        condition, params = self._queryset_condition()
+        with connections[self.using].cursor() as cursor:
+            cursor.execute(
+                f'SELECT rowid, snippet({FTS_TABLE}, -1, %s, %s, %s, {SNIPPET_TOKENS}) '
+                f'FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s{condition} '
+                f'ORDER BY bm25({FTS_TABLE}, {weights}) LIMIT %s OFFSET %s',
+                [SNIPPET_START, SNIPPET_END, '…', self.match, *params, limit, offset],
+            )
+            rows = cursor.fetchall()
+        # 관련도 순서를 유지하면서 Post 객체로 변환 (in_bulk는 1회 쿼리)
+        posts = self.queryset.in_bulk([post_id for post_id, _ in rows])
+        results = []
+        for post_id, snippet in rows:
+            post = posts.get(post_id)
+            if post is None: # 색인과 테이블이 잠시 어긋난 경우 건너뜀
+                continue
+            post.search_snippet = _render_snippet(snippet)
+            results.append(post)
+        return results
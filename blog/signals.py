@@ -0,0 +1,122 @@
+# blog/signals.py
+# Post 모델의 변경 사항을 전문 검색 색인(my_post_fts), 날짜 히스토그램(PostDateCount), 페이지 캐시에 반영하는 시그널 수신기 모음입니다.
+# BlogConfig.ready()에서 이 모듈을 임포트하여 수신기를 등록합니다.
+
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+from taggit.models import Tag, TaggedItem
+
+from _20250723django import pagecache
+from _20250723django.neighbors import get_neighbors
+from blog import archive, search
+from blog.models import Post
+
+TAG_REINDEX_BATCH_SIZE = 500 # 태그 삭제 후 색인을 갱신할 때 한 번에 읽는 게시물 수 (IN 목록 길이)
+
+
+# 게시물 저장 시 색인 갱신 (생성/수정 모두)
+@receiver(post_save, sender=Post, dispatch_uid='blog_post_search_save')
+def update_post_search_index(sender, instance, using, raw=False, **kwargs):
+    if raw: # loaddata 등 fixture 로딩 중에는 건너뜀 (rebuild_post_search로 재생성)
+        return
+    search.index_post(instance, using=using)
+
+
+# 게시물 삭제 시 색인 행 제거
+@receiver(post_delete, sender=Post, dispatch_uid='blog_post_search_delete')
+def remove_post_search_index(sender, instance, using, **kwargs):
+    search.remove_post(instance.pk, using=using)
+
+
+# 태그 추가/삭제/초기화 시 색인 갱신
+# taggit은 Post와 Photo 모두 TaggedItem을 through 모델로 사용하므로, 게시물인 경우만 처리합니다.
+@receiver(m2m_changed, sender=TaggedItem, dispatch_uid='blog_post_search_tags')
+def update_post_search_tags(sender, instance, action, using, **kwargs):
+    if isinstance(instance, Post) and action in ('post_add', 'post_remove', 'post_clear'):
+        search.index_post(instance, using=using)
+
+
+# 태그 이름이 바뀌면 해당 태그가 달린 게시물의 색인을 갱신
+@receiver(post_save, sender=Tag, dispatch_uid='blog_tag_rename_search')
+def update_post_search_tag_rename(sender, instance, created, using, raw=False, **kwargs):
+    if created or raw:
+        return
+    for post in Post.objects.using(using).filter(tags=instance).prefetch_related('tags'):
+        search.index_post(post, using=using)
+
+
+# 태그가 삭제되면 TaggedItem도 함께 지워지지만 m2m_changed는 보내지 않으므로,
+# 삭제 전에 태그가 달린 게시물 id를 기억해 두었다가 삭제 후 (남은 태그로) 색인을 갱신
+@receiver(pre_delete, sender=Tag, dispatch_uid='blog_tag_search_pre_delete')
+def remember_tag_posts(sender, instance, using, **kwargs):
+    instance._search_post_ids = list(Post.objects.using(using).filter(tags=instance).values_list('pk', flat=True))
+
+
+@receiver(post_delete, sender=Tag, dispatch_uid='blog_tag_search_delete')
+def update_post_search_tag_delete(sender, instance, using, **kwargs):
+    post_ids = getattr(instance, '_search_post_ids', [])
+    for start in range(0, len(post_ids), TAG_REINDEX_BATCH_SIZE):
+        batch = post_ids[start:start + TAG_REINDEX_BATCH_SIZE]
+        for post in Post.objects.using(using).filter(pk__in=batch).prefetch_related('tags'):
+            search.index_post(post, using=using)
+
+
+# 날짜 히스토그램: 저장 전 기존 작성일을 기억해 두었다가, 저장 후 날짜가 바뀐 경우에만 옮겨 셉니다.
+@receiver(pre_save, sender=Post, dispatch_uid='blog_post_archive_pre_save')
+def remember_post_created_at(sender, instance, using, raw=False, **kwargs):
+    instance._archive_old_created_at = None
+    if instance.pk and not raw:
+        instance._archive_old_created_at = (
+            Post.objects.using(using).filter(pk=instance.pk).values_list('created_at', flat=True).first()
+        )
+
+
+@receiver(post_save, sender=Post, dispatch_uid='blog_post_archive_save')
+def update_post_archive(sender, instance, created, using, raw=False, **kwargs):
+    if raw: # fixture 로딩 중에는 건너뜀 (rebuild_post_archive로 재생성)
+        return
+    new_date = archive.local_date(instance.created_at)
+    old_created_at = getattr(instance, '_archive_old_created_at', None)
+    if created or old_created_at is None:
+        archive.apply_delta(new_date, 1, using=using)
+        return
+    old_date = archive.local_date(old_created_at)
+    if old_date != new_date: # 게시물 날짜가 바뀐 경우
+        archive.apply_delta(old_date, -1, using=using)
+        archive.apply_delta(new_date, 1, using=using)
+
+
+@receiver(post_delete, sender=Post, dispatch_uid='blog_post_archive_delete')
+def remove_post_archive(sender, instance, using, **kwargs):
+    archive.apply_delta(archive.local_date(instance.created_at), -1, using=using)
+
+
+def _neighbor_tags(instance, using):
+    # 이전/다음 게시물의 상세 페이지는 이 게시물의 제목과 존재 여부를 표시하므로 함께 무효화합니다.
+    return [pagecache.instance_tag(neighbor) for neighbor in get_neighbors(instance, Post.objects.using(using), fields=()) if neighbor]
+
+
+# 페이지 캐시: 게시물 상세, 게시물 목록(아카이브/검색 포함), 게시물에 달린 태그별 목록을 무효화합니다.
+@receiver(post_save, sender=Post, dispatch_uid='blog_post_page_cache_save')
+def invalidate_post_pages(sender, instance, using, raw=False, **kwargs):
+    if raw:
+        return
+    pagecache.invalidate(
+        *pagecache.object_tags(instance, pagecache.current_tag_slugs(instance, using)),
+        *_neighbor_tags(instance, using),
+        using=using,
+    )
+
+
+# 삭제 후에는 태그 연결(TaggedItem)과 순서상 위치를 알 수 없으므로 삭제 전에 태그 slug와 이웃을 기억해 둡니다.
+@receiver(pre_delete, sender=Post, dispatch_uid='blog_post_page_cache_pre_delete')
+def remember_post_tag_slugs(sender, instance, using, **kwargs):
+    instance._page_cache_tag_slugs = pagecache.current_tag_slugs(instance, using)
+    instance._page_cache_neighbor_tags = _neighbor_tags(instance, using)
+
+
+@receiver(post_delete, sender=Post, dispatch_uid='blog_post_page_cache_delete')
+def invalidate_deleted_post_pages(sender, instance, using, **kwargs):
+    tag_slugs = getattr(instance, '_page_cache_tag_slugs', [])
+    neighbor_tags = getattr(instance, '_page_cache_neighbor_tags', [])
+    pagecache.invalidate(*pagecache.object_tags(instance, tag_slugs), *neighbor_tags, pagecache.TAG_CLOUD, using=using)
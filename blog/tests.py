@@ -1,3 +1,222 @@
-from django.test import TestCase
+import tempfile
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth.models import AnonymousUser, User
+from django.core.cache.backends.filebased import FileBasedCache
+from django.db import connection
+from django.http import Http404
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+from taggit.models import Tag
+
+from _20250723django import pagecache
+from _20250723django.neighbors import neighbor_queryset
+from _20250723django.pagination import CursorPaginator, encode_cursor
+from _20250723django.queryplan import plan_problems, query_plan
+from blog.models import Post
+from blog.rendering import render_content
+from blog.search import PostSearchResults
+from blog.views import PostDV, PostLV
+
+
+# 게시물 목록(최신순)이 created_at 인덱스 순서로 읽히는지 EXPLAIN QUERY PLAN으로 확인합니다.
+class PostListQueryPlanTests(TestCase):
+
+    def test_list_uses_created_at_index(self):
+        view = PostLV()
+        view.setup(RequestFactory().get('/blog/'))
+        queryset = view.get_queryset()
+        self.assertEqual(plan_problems(queryset[:view.paginate_by]), [])
+        paginator = CursorPaginator(queryset, view.paginate_by)
+        for token in (None, encode_cursor('2024-01-01T00:00:00+00:00', 1), encode_cursor('2024-01-01T00:00:00+00:00', 1, reverse=True)):
+            with self.subTest(token=token):
+                self.assertEqual(plan_problems(paginator._prepare(token)[0]), [])
+
+    def test_invalid_cursor_is_not_found(self):
+        # encode_cursor()가 만들지 않는 토큰 (정렬 값 null / 빈 값 / 객체, 범위를 넘는 id)은 500이 아니라 404입니다.
+        for value, pk in ((None, 1), ('', 1), ({'a': 1}, 1), (5, 1), ('2024-01-01T00:00:00+00:00', 2 ** 70)):
+            with self.subTest(value=value, pk=pk):
+                request = RequestFactory().get('/blog/', {'cursor': encode_cursor(value, pk)})
+                request.user = AnonymousUser()
+                with self.assertRaises(Http404):
+                    PostLV.as_view()(request)
+
+    def test_neighbors_seek_created_at_index(self):
+        # 이전/다음 게시물은 (created_at, id) 인덱스 범위 탐색 두 번으로 찾아야 합니다. (전체 스캔/윈도 계산 없음)
+        author = User.objects.create_user('author')
+        post = Post.objects.create(title='t', slug='t', description='', content='', author=author)
+        plan = query_plan(neighbor_queryset(post))
+        self.assertEqual([detail for detail in plan if detail.startswith('SCAN ') or 'TEMP B-TREE' in detail], [])
+        self.assertEqual(sum('USING COVERING INDEX' in detail for detail in plan), 2)
+
+
+# 조건부 GET: 없는 게시물은 If-None-Match: *에도 404, 목록 검증값은 삭제와 시그널 없는 쓰기에도 바뀌어야 합니다.
+class PostConditionalGetTests(TestCase):
+    def list_response(self, **headers):
+        request = RequestFactory().get('/blog/', **headers)
+        request.user = AnonymousUser()
+        return PostLV.as_view()(request)
+
+    def test_missing_post_is_not_found_before_preconditions(self):
+        request = RequestFactory().get('/blog/post/missing/', HTTP_IF_NONE_MATCH='*')
+        request.user = AnonymousUser()
+        with self.assertRaises(Http404):
+            PostDV.as_view()(request, slug='missing')
+
+    def test_list_validator_changes_on_delete(self):
+        author = User.objects.create_user('author')
+        with self.captureOnCommitCallbacks(execute=True):
+            Post.objects.create(title='a', slug='a', description='', content='', author=author)
+            post = Post.objects.create(title='b', slug='b', description='', content='', author=author)
+        etag = self.list_response()['ETag']
+        self.assertEqual(self.list_response(HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        with self.captureOnCommitCallbacks(execute=True):
+            post.delete()
+        self.assertEqual(self.list_response(HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_list_validator_changes_on_writes_without_signals(self):
+        # 다른 프로세스의 쓰기나 bulk_create / update()는 이 프로세스의 태그 버전을 올리지 않으므로 DB 집계로 감지합니다.
+        author = User.objects.create_user('author')
+        Post.objects.bulk_create([Post(title='a', slug='a', description='', content='', author=author)])
+        etag = self.list_response()['ETag']
+        self.assertEqual(self.list_response(HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        Post.objects.bulk_create([Post(title='b', slug='b', description='', content='', author=author)])
+        response = self.list_response(HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        Post.objects.filter(slug='a').update(modify_dt=timezone.now())
+        self.assertEqual(self.list_response(HTTP_IF_NONE_MATCH=response['ETag']).status_code, 200)
+
+    def test_detail_is_not_conditional_without_shared_versions(self):
+        author = User.objects.create_user('author')
+        Post.objects.create(title='a', slug='a', description='', content='', author=author)
+        caches = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+        with override_settings(CACHES=caches, PAGE_CACHE_ALIAS='default'):
+            request = RequestFactory().get('/blog/post/a/', HTTP_IF_NONE_MATCH='*')
+            request.user = AnonymousUser()
+            response = PostDV.as_view()(request, slug='a')
+            self.assertEqual(response.status_code, 200)
+            self.assertNotIn('ETag', response)
+            self.assertIn('ETag', self.list_response())
+
+
+# 본문 정화(render_content): 스크립트 실행 경로는 모두 제거되고 허용된 태그/속성만 남아야 합니다.
+class RenderContentTests(SimpleTestCase):
+
+    def assertRendered(self, content, html, excerpt=None):
+        rendered = render_content(content)
+        self.assertEqual(rendered[0], html)
+        if excerpt is not None:
+            self.assertEqual(rendered[1], excerpt)
+
+    def test_script_url_schemes_are_removed(self):
+        for href in (
+            'javascript:alert(1)', 'JaVaScRiPt:alert(1)', ' javascript:alert(1)', # 대소문자, 앞 공백
+            '&#106;avascript:alert(1)', '&#x6A;avascript:alert(1)', 'javascript&colon;alert(1)', # 문자 참조
+            'java\tscript:alert(1)', 'java\nscript:alert(1)', 'jav&#x09;ascript:alert(1)', '\x01javascript:alert(1)', # 공백/제어 문자로 나눈 스킴
+            'vbscript:msgbox(1)', 'data:text/html,<script>alert(1)</script>',
+        ):
+            with self.subTest(href=href):
+                self.assertRendered(f'<a href="{href}">x</a>', '<a>x</a>')
+        self.assertRendered('<img src="javascript:alert(1)" alt="a">', '<img alt="a">')
+
+    def test_allowed_urls_are_kept(self):
+        for href in ('https://example.com/?a=1&amp;b=2', '/media/a.png', '#top', 'mailto:a@example.com'):
+            with self.subTest(href=href):
+                self.assertIn('href=', render_content(f'<a href="{href}">x</a>')[0])
+
+    def test_event_handlers_and_unknown_attributes_are_removed(self):
+        self.assertRendered('<img src="/a.png" onerror="alert(1)">', '<img src="/a.png">')
+        self.assertRendered('<p class="c" onclick="alert(1)" ONMOUSEOVER="alert(1)" style="x">t</p>', '<p class="c">t</p>', 't')
+        self.assertRendered('<a href="/x" title="&quot;><script>alert(1)</script>">x</a>', '<a href="/x" title="&quot;&gt;&lt;script&gt;alert(1)&lt;/script&gt;">x</a>')
+
+    def test_foreign_content_and_style_nesting(self):
+        self.assertRendered('<svg><script>alert(1)</script><a href="/x">y</a></svg>', '<a href="/x">y</a>', 'y')
+        self.assertRendered('<svg><style><img src=x onerror=alert(1)></style></svg>', '', '')
+        self.assertRendered('<math><mi><style>*{}</style>t</mi></math>', 't', 't')
+        self.assertRendered('<style><script>alert(1)</script></style>ok', 'ok', 'ok')
+        self.assertRendered('<noscript><p title="</noscript><img src=x onerror=alert(1)>"></noscript>ok', 'ok', 'ok')
+        self.assertRendered('<template><img src=x onerror=alert(1)></template>ok', 'ok', 'ok')
+
+    def test_unclosed_tags(self):
+        self.assertRendered('<p>before<script>alert(1)', '<p>before</p>', 'before')
+        self.assertRendered('<script>alert(1)</script', '', '')
+        self.assertRendered('<ul><li><b>one</ul>two', '<ul><li><b>one</b></li></ul>two', 'one two')
+
+
+# Post.save(): 본문이 바뀌면 update_fields에도 파생 컬럼(content_html, excerpt)이 함께 저장되어야 합니다.
+class PostSaveRenderingTests(TestCase):
+
+    def setUp(self):
+        author = User.objects.create_user('author')
+        self.post = Post.objects.create(title='t', slug='t', description='', content='<p>old</p>', author=author)
+
+    def test_update_fields_with_content_saves_rendered_columns(self):
+        self.post.content = '<p onclick="x()">new<script>alert(1)</script></p>'
+        self.post.save(update_fields=['content'])
+        self.post.refresh_from_db()
+        self.assertEqual((self.post.content_html, self.post.excerpt), ('<p>new</p>', 'new'))
+
+    def test_deferred_content_keeps_rendered_columns(self):
+        post = Post.objects.defer('content').get(pk=self.post.pk)
+        post.title = 'changed'
+        post.save(update_fields=['title'])
+        self.post.refresh_from_db()
+        self.assertEqual((self.post.title, self.post.content_html, self.post.excerpt), ('changed', '<p>old</p>', 'old'))
+
+
+# 전문 검색 색인(my_post_fts): 태그가 삭제되면 그 태그가 달린 게시물의 tags 컬럼에서도 빠져야 합니다.
+class PostSearchIndexTests(TestCase):
+
+    def indexed_tags(self, post):
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT tags FROM my_post_fts WHERE rowid = %s', [post.pk])
+            return cursor.fetchone()[0]
+
+    def test_tag_delete_reindexes_posts(self):
+        author = User.objects.create_user('author')
+        post = Post.objects.create(title='t', slug='t', description='', content='', author=author)
+        post.tags.add('zebra', 'lion')
+        Tag.objects.get(name='zebra').delete()
+        self.assertEqual(self.indexed_tags(post), 'lion')
+        Tag.objects.filter(name='lion').delete() # QuerySet.delete()도 같은 시그널을 보냄
+        self.assertEqual(self.indexed_tags(post), '')
+
+
+# 검색 결과(PostSearchResults): 넘겨받은 쿼리셋에 조건이 있으면 개수와 페이지 모두 그 게시물 안에서만 계산해야 합니다.
+class PostSearchResultsTests(TestCase):
+
+    def test_count_and_pages_follow_queryset(self):
+        author, other = User.objects.create_user('author'), User.objects.create_user('other')
+        mine = [Post.objects.create(title=f'django {i}', slug=f'm{i}', description='', content='', author=author) for i in range(3)]
+        Post.objects.create(title='django other', slug='o', description='', content='', author=other)
+        Post.objects.create(title='flask', slug='f', description='', content='', author=author)
+        self.assertEqual(PostSearchResults('django').count(), 4)
+        results = PostSearchResults('django', queryset=Post.objects.filter(author=author))
+        self.assertEqual(results.count(), 3)
+        self.assertEqual(sorted(post.pk for post in results[0:2] + results[2:4]), [post.pk for post in mine])
+        self.assertTrue(all(post.search_snippet for post in results[0:3]))
+
+
+# 페이지 캐시 저장소: 태그 버전은 다른 프로세스가 같은 위치의 캐시에서 읽을 수 있어야 하고,
+# 프로세스 안에서만 유효한 캐시(LocMemCache)이면 페이지 캐시를 사용하지 않아야 합니다.
+class PageCacheStoreTests(SimpleTestCase):
+
+    def test_bumped_version_is_visible_to_other_processes(self):
+        with tempfile.TemporaryDirectory() as location:
+            caches = {'pagecache': {'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache', 'LOCATION': location}}
+            with override_settings(CACHES=caches, PAGE_CACHE_ALIAS='pagecache'):
+                self.assertTrue(pagecache.is_enabled())
+                pagecache._bump(['post-list'])
+                version = pagecache.tag_versions(['post-list'])['post-list']
+                other_process = FileBasedCache(location, {}) # 다른 프로세스가 여는 같은 캐시
+                self.assertEqual(other_process.get(pagecache._tag_key('post-list')), version)
+
+    def test_process_local_cache_disables_page_cache(self):
+        caches = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+        with override_settings(CACHES=caches, PAGE_CACHE_ALIAS='default'):
+            self.assertFalse(pagecache.is_enabled())
+            request = RequestFactory().get('/blog/')
+            request.resolver_match = mock.Mock(app_name='blog')
+            middleware = pagecache.AnonymousPageCacheMiddleware(lambda request: None)
+            self.assertIsNone(middleware.process_view(request, None, (), {}))
+            self.assertFalse(hasattr(request, '_page_cache_key'))
@@ -1,20 +1,30 @@
 from django.shortcuts import render
 from django.views.generic import ListView, DetailView, ArchiveIndexView, YearArchiveView, MonthArchiveView, DayArchiveView, TodayArchiveView
 from blog.models import Post # Post 모델 임포트
-from photo.models import Photo # Photo 모델 임포트 (TagCloudTV에서 사진 개수를 세기 위해)
+from blog.search import PostSearchResults # 전문 검색(FTS5) 결과 시퀀스
+from blog.archive import PostDateHistogramMixin # 날짜 히스토그램 기반 아카이브 날짜 목록/이동
 from taggit.models import Tag # Tag 모델 임포트 (django-taggit에서 제공)
-from django.db.models import Q, Count, F # Q 객체, Count 함수, F 함수 임포트
 from django.utils import timezone # PostTAV 뷰에서 오늘 날짜를 가져오기 위해 임포트
 import calendar # 월 이름을 가져오기 위해 임포트
+from tag_cloud.stats import tags_with_counts # 태그 통계 테이블 기반 태그 클라우드 쿼리셋
+from _20250723django.mixins import ListQuerysetMixin # 목록 뷰 공통 쿼리셋 최적화 믹스인
+from _20250723django.pagination import CursorPaginationMixin # 커서(키셋) 페이지네이션 믹스인 (?cursor=)
+from _20250723django import pagecache # 익명 사용자 페이지 캐시 (의존 태그 선언)
+from _20250723django.pagecache import PageCacheMixin
+from _20250723django.conditional import ConditionalGetMixin # 조건부 GET (ETag / Last-Modified, 304 응답)
 
 # blog/views.py
 
 # --- Post 목록 뷰 (PostLV) ---
-class PostLV(ListView):
+class PostLV(ConditionalGetMixin, PageCacheMixin, CursorPaginationMixin, ListQuerysetMixin, ListView):
     model = Post
     template_name = 'blog/post_list.html'
     context_object_name = 'posts' # 템플릿에서 사용할 객체 리스트의 이름
     paginate_by = 10 # 한 페이지에 10개의 게시물 표시
+    list_select_related = ('author',) # 카드의 작성자 표시용 (JOIN)
+    list_prefetch_related = ('tags',) # 카드의 태그 배지 표시용 (쿼리 1회)
+    list_defer = Post.list_deferred_fields # 카드는 본문 대신 발췌문(excerpt)을 표시
+    validator_timestamp_field = 'modify_dt' # 조건부 GET 사용 (검증값은 목록 범위의 개수/최대 수정 시각과 페이지 캐시 태그 버전)
 
     def get_queryset(self):
         # 기본 쿼리셋: 모든 게시물을 최신 생성일 기준으로 정렬
@@ -43,33 +53,57 @@ class PostLV(ListView):
         # 태그 이름이 있다면 컨텍스트에 추가하여 템플릿으로 전달
         if self.tag_name:
             context['tagname'] = self.tag_name # 템플릿에서 'tagname'으로 접근
+            context['tag_slug'] = self.kwargs['tag_slug'] # 상세 페이지의 같은 태그 내 이전/다음 이동용
         return context
 
+    def get_page_cache_tags(self):
+        # 태그별 목록은 해당 태그의 변경에만, 전체 목록은 게시물 변경 전체에 의존합니다.
+        return pagecache.list_cache_tags(Post, self.kwargs.get('tag_slug'))
+
 # --- Post 상세 뷰 (PostDV) ---
-class PostDV(DetailView):
+class PostDV(ConditionalGetMixin, PageCacheMixin, DetailView):
     model = Post
+    queryset = Post.objects.defer('content').prefetch_related('tags') # 정화된 본문(content_html)과 태그를 표시 (태그는 검증값에도 사용)
     template_name = 'blog/post_detail.html'
     context_object_name = 'post' # 템플릿에서 게시물 객체를 'post'로 접근
+    # 검증값: 게시물의 수정 시각과 태그, 'post:<id>' 태그 버전 (이전/다음 게시물이 바뀌어도 올라감)
+    validator_timestamp_field = 'modify_dt'
+
+    def get_tag_slug(self):
+        # 태그별 목록에서 들어온 경우(?tag=<slug>) 같은 태그의 게시물 사이에서 이전/다음으로 이동합니다.
+        return self.request.GET.get('tag') or None
+
+    def get_page_cache_tags(self):
+        # 'post:<id>'와 이전/다음 게시물 (제목이 바뀌거나 삭제되면 이 페이지도 무효화)
+        return pagecache.detail_cache_tags(self.object, self.get_tag_slug())
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        # 이전/다음 게시물 (인덱스 탐색 쿼리 1회, get_page_cache_tags와 결과 공유)
+        context['tag_slug'] = self.get_tag_slug()
+        context['previous_post'], context['next_post'] = self.object.get_neighbors(context['tag_slug'])
+        return context
 
 # --- Post 아카이브 인덱스 뷰 (PostAV) ---
 # 모든 게시물을 연도별로 그룹화하여 보여주는 뷰
-class PostAV(ArchiveIndexView):
+class PostAV(ConditionalGetMixin, PageCacheMixin, PostDateHistogramMixin, ArchiveIndexView):
     model = Post
+    queryset = Post.objects.defer(*Post.list_deferred_fields) # 아카이브 목록은 제목과 날짜만 표시하므로 본문을 읽지 않음
+    page_cache_tags = ('post-list',) # 게시물이 바뀌면 아카이브 전체 무효화
+    validator_timestamp_field = 'modify_dt' # 아카이브도 게시물 전체의 개수/최대 수정 시각과 'post-list' 태그 버전으로 변경 여부 판단
     date_field = 'created_at' # 아카이브를 위한 날짜/시간 필드 지정
     template_name = 'blog/post_archive.html' # 기존 템플릿 유지 (연도 목록 표시)
     context_object_name = 'posts' # 템플릿에서 사용할 객체 리스트의 이름
     allow_empty = True # 게시물이 없어도 페이지 표시
-
-    def get_context_data(self, **kwargs):
-        context = super().get_context_data(**kwargs)
-        # 각 연도별 게시물 수를 포함하여 date_list를 전달
-        context['date_list'] = Post.objects.dates('created_at', 'year', order='DESC').annotate(num_posts=Count('id'))
-        return context
+    # date_list(연도 목록과 연도별 게시물 수 num_posts)는 PostDateHistogramMixin이 날짜 히스토그램에서 가져옵니다.
 
 # --- Post 연도별 아카이브 뷰 (PostYAV) ---
 # 특정 연도의 게시물 목록을 보여주는 뷰
-class PostYAV(YearArchiveView):
+class PostYAV(ConditionalGetMixin, PageCacheMixin, PostDateHistogramMixin, YearArchiveView):
     model = Post
+    queryset = Post.objects.defer(*Post.list_deferred_fields)
+    page_cache_tags = ('post-list',)
+    validator_timestamp_field = 'modify_dt'
     date_field = 'created_at'
     make_object_list = True # 해당 연도의 Post 객체들을 리스트로 전달
     template_name = 'blog/post_archive_year.html' # 새로운 연도별 템플릿 지정
@@ -78,14 +112,17 @@ class PostYAV(YearArchiveView):
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context['year'] = self.kwargs['year'] # 현재 연도 전달
-        # 해당 연도의 월별 목록과 게시물 수를 템플릿에 전달 (나중에 상세 디자인 시 활용)
-        # context['month_list'] = Post.objects.filter(created_at__year=self.kwargs['year']).dates('created_at', 'month', order='ASC').annotate(num_posts=Count('id'))
+        # 해당 연도의 월별 목록과 게시물 수 (날짜 히스토그램에서 조회한 date_list를 템플릿 이름에 맞게 전달)
+        context['month_list'] = context['date_list']
         return context
 
 # --- Post 월별 아카이브 뷰 (PostMAV) ---
 # 특정 월의 게시물 목록을 보여주는 뷰
-class PostMAV(MonthArchiveView):
+class PostMAV(ConditionalGetMixin, PageCacheMixin, PostDateHistogramMixin, MonthArchiveView):
     model = Post
+    queryset = Post.objects.defer(*Post.list_deferred_fields)
+    page_cache_tags = ('post-list',)
+    validator_timestamp_field = 'modify_dt'
     date_field = 'created_at'
     month_format = '%m' # URL에서 월을 인식하는 형식 (예: 01, 02)
     make_object_list = True
@@ -97,14 +134,17 @@ class PostMAV(MonthArchiveView):
         context['year'] = self.kwargs['year']
         context['month_number'] = self.kwargs['month'] # 월 번호 (예: '07')
         context['month_name'] = calendar.month_name[int(self.kwargs['month'])] # 월 이름 (예: 'July')
-        # 해당 월의 일별 목록과 게시물 수를 템플릿에 전달 (나중에 상세 디자인 시 활용)
-        # context['day_list'] = Post.objects.filter(created_at__year=self.kwargs['year'], created_at__month=self.kwargs['month']).dates('created_at', 'day', order='ASC').annotate(num_posts=Count('id'))
+        # 해당 월의 일별 목록과 게시물 수 (날짜 히스토그램에서 조회한 date_list를 템플릿 이름에 맞게 전달)
+        context['day_list'] = context['date_list']
         return context
 
 # --- Post 일별 아카이브 뷰 (PostDAV) ---
 # 특정 일의 게시물 목록을 보여주는 뷰
-class PostDAV(DayArchiveView):
+class PostDAV(ConditionalGetMixin, PageCacheMixin, PostDateHistogramMixin, DayArchiveView):
     model = Post
+    queryset = Post.objects.defer(*Post.list_deferred_fields)
+    page_cache_tags = ('post-list',)
+    validator_timestamp_field = 'modify_dt'
     date_field = 'created_at'
     month_format = '%m'
     make_object_list = True
@@ -121,8 +161,11 @@ class PostDAV(DayArchiveView):
 
 # --- Post 오늘 날짜 아카이브 뷰 (PostTAV) ---
 # 오늘 날짜의 게시물 목록을 보여주는 뷰
-class PostTAV(TodayArchiveView):
+class PostTAV(ConditionalGetMixin, PageCacheMixin, PostDateHistogramMixin, TodayArchiveView):
     model = Post
+    queryset = Post.objects.defer(*Post.list_deferred_fields)
+    page_cache_tags = ('post-list',)
+    validator_timestamp_field = 'modify_dt'
     date_field = 'created_at'
     month_format = '%m'
     make_object_list = True
@@ -138,46 +181,40 @@ class PostTAV(TodayArchiveView):
         context['day'] = today.day
         return context
 
+    def get_etag_parts(self):
+        return (timezone.localdate(),) # 날짜가 바뀌면 게시물이 그대로여도 다른 페이지
+
 # --- 태그 클라우드 뷰 (TagCloudTV) ---
 # 이 뷰는 blog 앱 내에서 태그 클라우드 기능을 제공합니다.
 # tag_cloud 앱의 UnifiedTagCloudTV와 유사한 로직을 가집니다.
-class TagCloudTV(ListView):
+class TagCloudTV(PageCacheMixin, ListView):
     template_name = 'tag_cloud/unified_tag_cloud.html' # 템플릿 경로를 tag_cloud 앱의 것으로 명시
     context_object_name = 'tags'
+    page_cache_tags = (pagecache.TAG_CLOUD,) # 태그 추가/삭제/이름 변경 시 무효화
 
     def get_queryset(self):
-        # 모든 태그를 가져오고, 각 태그에 연결된 블로그 게시물과 사진의 개수를 계산합니다.
-        tags_with_counts = Tag.objects.annotate(
-            # 'taggit_taggeditem_items'는 TaggedItem 모델의 related_name입니다.
-            # filter=Q(taggit_taggeditem_items__content_type__model='post')는
-            # TaggedItem이 연결된 모델이 'post'인 경우만 필터링하여 Count합니다.
-            num_blog_posts=Count('taggit_taggeditem_items', filter=Q(taggit_taggeditem_items__content_type__model='post')),
-            # 'photo' 모델에 연결된 TaggedItem만 필터링하여 Count합니다.
-            num_photos=Count('taggit_taggeditem_items', filter=Q(taggit_taggeditem_items__content_type__model='photo'))
-        ).annotate(
-            # 전체 아이템 수 = 블로그 게시물 수 + 사진 수
-            num_items=F('num_blog_posts') + F('num_photos')
-        ).filter(num_items__gt=0).order_by('-num_items') # 하나라도 연결된 태그만 표시하고, 전체 아이템 수 기준으로 내림차순 정렬
-
-        return tags_with_counts
+        # 태그 통계 테이블(TagStat)에 미리 집계된 게시물/사진 수를 읽어옵니다. (UnifiedTagCloudTV와 동일)
+        return tags_with_counts()
 
 # --- 검색 뷰 (SearchFV) ---
-class SearchFV(ListView):
+class SearchFV(PageCacheMixin, ListQuerysetMixin, ListView):
     model = Post
+    page_cache_tags = ('post-list',) # 검색 결과는 모든 게시물 변경에 의존
     template_name = 'blog/post_list.html' # 검색 결과를 보여줄 템플릿 (기존 post_list.html 재사용)
     context_object_name = 'posts' # 템플릿에서 사용할 검색 결과 리스트의 이름
     paginate_by = 10 # 검색 결과도 페이지네이션
+    list_select_related = ('author',) # PostLV와 같은 카드 템플릿을 사용하므로 동일하게 최적화
+    list_prefetch_related = ('tags',)
+    list_defer = Post.list_deferred_fields
 
     def get_queryset(self):
+        queryset = super().get_queryset() # 관계 최적화가 적용된 기본 쿼리셋
         search_keyword = self.request.GET.get('q', '')
         if search_keyword:
-            return Post.objects.filter(
-                Q(title__icontains=search_keyword) |
-                Q(content__icontains=search_keyword) |
-                Q(description__icontains=search_keyword) |
-                Q(tags__name__icontains=search_keyword)
-            ).distinct().order_by('-created_at')
-        return Post.objects.all().order_by('-created_at') # 검색어가 없으면 모든 게시물 반환
+            # 전문 검색 색인(my_post_fts)에서 관련도 순으로 결과를 가져옵니다.
+            # PostSearchResults는 페이지 단위로 색인을 조회하므로 테이블 크기와 무관하게 빠릅니다.
+            return PostSearchResults(search_keyword, queryset=queryset)
+        return queryset.order_by('-created_at') # 검색어가 없으면 모든 게시물 반환
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
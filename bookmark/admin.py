@@ -1,4 +1,6 @@
 from django.contrib import admin
+from _20250723django.admin import LimitedRelatedFieldListFilter, ScalableAdminMixin # 대용량 변경 목록 도구
+from . import search # 북마크 검색 색인(bookmark_fts)
 from .models import Bookmark, Category
 
 # Category 모델을 관리자 페이지에 등록
@@ -9,7 +11,7 @@ class CategoryAdmin(admin.ModelAdmin):
 
 # Bookmark 모델 등록 (owner 필드 추가)
 @admin.register(Bookmark)
-class BookmarkAdmin(admin.ModelAdmin):
+class BookmarkAdmin(ScalableAdminMixin, admin.ModelAdmin):
     # list_display에 'is_favorite' 추가하여 목록에서 볼 수 있도록 합니다.
     # is_favorite는 BooleanField이므로 체크박스 형태로 표시됩니다.
     list_display = ('title', 'url', 'category', 'description', 'thumbnail_url', 'owner', 'is_favorite', 'created_at', 'updated_at')
@@ -18,8 +20,24 @@ class BookmarkAdmin(admin.ModelAdmin):
     # list_display에 있는 필드 중 하나여야 합니다.
     list_display_links = ('title',) # <-- 이 줄을 추가합니다.
     
-    list_filter = ('category', 'owner', 'is_favorite', 'created_at') # 'owner'로 필터링 가능하도록 추가
-    # search_fields에 'owner__username' 추가하여 소유자 이름으로 검색 가능하도록 합니다.
-    search_fields = ('title', 'url', 'category__name', 'description', 'thumbnail_url', 'owner__username')
+    # 분류/소유자는 전체를 나열하지 않고 일부만 선택지로 표시합니다.
+    list_filter = (
+        ('category', LimitedRelatedFieldListFilter), ('owner', LimitedRelatedFieldListFilter),
+        'is_favorite', 'created_at', 'link_status',
+    )
+    # 링크 점검 결과 (check_bookmark_links 관리 명령이 기록, 수정 불가)
+    readonly_fields = ('link_status', 'link_error', 'final_url', 'thumbnail_status', 'last_checked_at')
+    # 검색 가능한 필드 (실제 검색은 get_search_results에서 검색 색인으로 처리, site:도메인 필터 지원)
+    search_fields = ('title', 'url', 'category__name', 'description')
+    search_help_text = '제목, URL, 분류, 설명에서 단어(접두어)로 검색합니다. site:example.com으로 도메인을 지정할 수 있습니다.'
     ordering = ('-created_at',)
 
+    list_select_related = ('category', 'owner') # 분류/소유자 이름을 JOIN으로 함께 읽음
+    autocomplete_fields = ('category', 'owner') # 전체를 <select>로 내려주지 않고 검색해서 선택
+
+    def get_search_results(self, request, queryset, search_term):
+        # 모든 소유자의 북마크를 대상으로 색인 검색 (소유자별 검색은 bookmark 앱의 검색 뷰)
+        if not search_term.strip():
+            return queryset, False
+        return search.search_bookmarks(queryset, None, search_term), False
+
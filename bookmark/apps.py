@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class BookmarkConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'bookmark'
+
+    def ready(self):
+        from bookmark import signals # noqa: F401 (검색 색인 동기화 시그널 수신기 등록)
@@ -0,0 +1,525 @@
+# bookmark/linkcheck.py
+# 북마크 링크 상태 / 썸네일 점검기입니다. (관리 명령 check_bookmark_links에서 사용)
+# - asyncio 스트림 위에 최소한의 HTTP/1.1 클라이언트를 두어 추가 의존성 없이 동작합니다.
+# - 전체 동시 요청 수(concurrency)와 호스트별 연결 수(per_host), 호스트별 요청 간격(host_rate)을 제한하고,
+#   호스트별로 keep-alive 연결을 재사용합니다.
+# - 다시 점검할 때는 저장해 둔 ETag / Last-Modified로 조건부 요청을 보내 304면 본문을 받지 않습니다.
+# - 연결 오류와 429 / 502 / 503 / 504 응답은 지수 백오프(Retry-After가 있으면 그 값)로 재시도합니다.
+# - HTML 응답의 <head>에서 og:image를 찾아 thumbnail_url로 저장하고, 썸네일 URL도 HEAD 요청으로 점검합니다.
+# - DNS 조회 결과가 내부 주소(루프백, 사설망, 링크 로컬/클라우드 메타데이터)인 호스트에는 요청하지 않습니다.
+
+import asyncio
+import ipaddress
+import random
+import socket
+import ssl
+from email.utils import parsedate_to_datetime
+from html.parser import HTMLParser
+from urllib.parse import quote, urljoin, urlsplit
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+
+from bookmark.models import Bookmark
+
+# 기본 설정 (settings.py에서 BOOKMARK_LINK_CHECK_<이름>으로 덮어쓸 수 있습니다)
+DEFAULTS = {
+    'CONCURRENCY': 64, # 전체 동시 요청 수
+    'PER_HOST': 4, # 호스트별 동시 연결 수
+    'HOST_RATE': 4.0, # 호스트별 초당 요청 수
+    'TIMEOUT': 10.0, # 요청 하나의 제한 시간 (초)
+    'RETRIES': 2, # 재시도 횟수
+    'BACKOFF': 0.5, # 첫 재시도 대기 시간 (초, 재시도마다 두 배)
+    'USER_AGENT': 'Mozilla/5.0 (compatible; BookmarkLinkChecker/1.0)',
+    'ALLOW_PRIVATE_ADDRESSES': False, # 내부 주소로의 요청 허용 (로컬 테스트 서버용)
+}
+
+MAX_REDIRECTS = 5
+MAX_HTML_BYTES = 256 * 1024 # og:image를 찾기 위해 읽는 HTML의 최대 크기
+DRAIN_BYTES = 64 * 1024 # 연결을 재사용하기 위해 읽고 버리는 본문의 최대 크기 (리디렉션, 오류 응답)
+MAX_RETRY_AFTER = 60.0
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+REDIRECT_STATUSES = {301, 302, 303, 307, 308}
+RETRY_STATUSES = {429, 502, 503, 504}
+REQUEST_TARGET_SAFE = "/%?=&;:@!$'()*+,~#[]"
+
+URL_MAX_LENGTH = Bookmark._meta.get_field('final_url').max_length
+THUMBNAIL_MAX_LENGTH = Bookmark._meta.get_field('thumbnail_url').max_length
+
+# 점검 결과로 갱신하는 필드 (bulk_update 대상)
+RESULT_FIELDS = [
+    'link_status', 'link_error', 'final_url', 'link_etag', 'link_last_modified',
+    'thumbnail_url', 'thumbnail_status', 'last_checked_at',
+]
+
+
+def get_setting(name):
+    return getattr(settings, f'BOOKMARK_LINK_CHECK_{name}', DEFAULTS[name])
+
+
+class LinkCheckError(Exception):
+    # 재시도해도 소용없는 오류 (지원하지 않는 URL, 잘못된 응답, 리디렉션 반복, 내부 주소)
+    pass
+
+
+# 북마크 하나의 점검 실패로 기록하는 오류 (이 밖의 오류로 전체 점검이 중단되지 않도록 북마크마다 잡습니다)
+# ValueError / LimitOverrunError: 잘못된 URL(urlsplit), StreamReader 한도(64KiB)를 넘는 응답 줄
+CHECK_ERRORS = (
+    LinkCheckError, OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, asyncio.LimitOverrunError, ValueError,
+)
+
+
+class Response:
+    def __init__(self, url, status, headers, body):
+        self.url = url
+        self.status = status
+        self.headers = headers # 소문자 이름 -> 값
+        self.body = body
+
+
+class OpenGraphImageParser(HTMLParser):
+    # <head>의 <meta property="og:image" content="..."> 값을 찾습니다. (없으면 twitter:image)
+    NAMES = ('og:image', 'og:image:url', 'og:image:secure_url', 'twitter:image', 'twitter:image:src')
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.found = {}
+        self.done = False
+
+    def handle_starttag(self, tag, attrs):
+        if self.done:
+            return
+        if tag == 'body':
+            self.done = True
+        elif tag == 'meta':
+            attrs = dict(attrs)
+            name = (attrs.get('property') or attrs.get('name') or '').strip().lower()
+            if name in self.NAMES and attrs.get('content'):
+                self.found.setdefault(name, attrs['content'].strip())
+
+    def handle_endtag(self, tag):
+        if tag == 'head':
+            self.done = True
+
+    @property
+    def image(self):
+        return next((self.found[name] for name in self.NAMES if name in self.found), None)
+
+
+def extract_og_image(response):
+    # HTML 응답 본문에서 og:image URL을 찾아 절대 URL로 돌려줍니다.
+    content_type = response.headers.get('content-type', '')
+    if 'html' not in content_type:
+        return None
+    charset = 'utf-8'
+    for param in content_type.split(';')[1:]:
+        key, _, value = param.strip().partition('=')
+        if key.lower() == 'charset' and value:
+            charset = value.strip('"\'')
+    try:
+        text = response.body.decode(charset, errors='replace')
+    except LookupError:
+        text = response.body.decode('utf-8', errors='replace')
+    parser = OpenGraphImageParser()
+    parser.feed(text)
+    if not parser.image:
+        return None
+    try:
+        image = urljoin(response.url, parser.image)
+    except ValueError: # 잘못된 URL (예: 'http://[::1/')
+        return None
+    if urlsplit(image).scheme not in ('http', 'https') or len(image) > THUMBNAIL_MAX_LENGTH:
+        return None
+    return image
+
+
+def retry_after(response):
+    # Retry-After 헤더(초 또는 HTTP 날짜)를 초 단위로 바꿉니다.
+    value = response.headers.get('retry-after', '').strip()
+    if not value:
+        return None
+    try:
+        seconds = float(value)
+    except ValueError:
+        try:
+            seconds = (parsedate_to_datetime(value) - timezone.now()).total_seconds()
+        except (TypeError, ValueError):
+            return None
+    return min(max(seconds, 0.0), MAX_RETRY_AFTER)
+
+
+def origin(url):
+    # 연결 풀의 키 (스킴, 호스트, 포트)
+    try:
+        parts = urlsplit(url)
+        port = parts.port
+    except ValueError: # 닫히지 않은 IPv6 대괄호, 숫자가 아닌 포트 등
+        raise LinkCheckError(f'잘못된 URL입니다: {url[:100]}')
+    if parts.scheme not in DEFAULT_PORTS or not parts.hostname:
+        raise LinkCheckError(f'지원하지 않는 URL입니다: {url[:100]}')
+    try:
+        return parts.scheme, parts.hostname.encode('idna').decode('ascii'), port or DEFAULT_PORTS[parts.scheme]
+    except (ValueError, UnicodeError):
+        raise LinkCheckError(f'잘못된 호스트입니다: {url[:100]}')
+
+
+def is_public_address(address):
+    # 인터넷에서 접근할 수 있는 주소인지 (루프백, 사설망, 링크 로컬(169.254.169.254 메타데이터 포함), 예약 주소는 False)
+    ip = ipaddress.ip_address(address)
+    if ip.version == 6 and ip.ipv4_mapped: # ::ffff:127.0.0.1
+        ip = ip.ipv4_mapped
+    return ip.is_global and not ip.is_multicast
+
+
+async def readline(reader):
+    # 응답의 한 줄 (StreamReader 한도를 넘는 줄은 ValueError 대신 LinkCheckError)
+    try:
+        return await reader.readline()
+    except (ValueError, asyncio.LimitOverrunError):
+        raise LinkCheckError('응답의 한 줄이 너무 깁니다.')
+
+
+def describe_error(error):
+    if isinstance(error, asyncio.TimeoutError):
+        return '시간 초과'
+    if isinstance(error, socket.gaierror):
+        return f'DNS 조회 실패: {error}'[:200]
+    return f'{type(error).__name__}: {error}'[:200]
+
+
+class HostPool:
+    # 호스트(스킴, 이름, 포트)별 keep-alive 연결 풀과 요청 간격 제한
+
+    def __init__(self, limit, interval):
+        self.semaphore = asyncio.Semaphore(limit)
+        self.idle = [] # 재사용할 수 있는 (reader, writer)
+        self.interval = interval
+        self.next_start = 0.0
+
+    async def wait_turn(self):
+        # 요청 시작 시각을 interval 간격으로 예약합니다. (같은 호스트에 요청이 몰려도 초당 요청 수가 일정)
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        start = max(now, self.next_start)
+        self.next_start = start + self.interval
+        if start > now:
+            await asyncio.sleep(start - now)
+
+    def defer(self, delay):
+        # 429 / 503 응답을 받은 호스트는 delay초 동안 새 요청을 시작하지 않습니다.
+        self.next_start = max(self.next_start, asyncio.get_running_loop().time() + delay)
+
+    def close(self):
+        for _, writer in self.idle:
+            writer.close()
+        self.idle.clear()
+
+
+class LinkChecker:
+    # 같은 이벤트 루프 안에서 여러 URL을 동시에 점검하는 HTTP 클라이언트
+    # async with LinkChecker() as checker: result = await checker.check(bookmark)
+    # ssl_context: HTTPS 검증 설정 (테스트용 자체 서명 인증서 등), 기본값은 시스템 인증서
+    # allow_private_addresses: 내부 주소로의 요청 허용 (로컬 테스트 서버용)
+
+    def __init__(self, concurrency=None, per_host=None, host_rate=None, timeout=None, retries=None,
+                 backoff=None, user_agent=None, ssl_context=None, allow_private_addresses=None):
+        self.concurrency = concurrency or get_setting('CONCURRENCY')
+        self.per_host = per_host or get_setting('PER_HOST')
+        host_rate = host_rate or get_setting('HOST_RATE')
+        self.interval = 1 / host_rate if host_rate > 0 else 0.0
+        self.timeout = timeout or get_setting('TIMEOUT')
+        self.retries = get_setting('RETRIES') if retries is None else retries
+        self.backoff = get_setting('BACKOFF') if backoff is None else backoff
+        self.user_agent = user_agent or get_setting('USER_AGENT')
+        self.ssl_context = ssl_context
+        if allow_private_addresses is None:
+            allow_private_addresses = get_setting('ALLOW_PRIVATE_ADDRESSES')
+        self.allow_private_addresses = allow_private_addresses
+        self.semaphore = asyncio.Semaphore(self.concurrency)
+        self.pools = {}
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        for pool in self.pools.values():
+            pool.close()
+        self.pools.clear()
+
+    def _pool(self, key):
+        pool = self.pools.get(key)
+        if pool is None:
+            pool = self.pools[key] = HostPool(self.per_host, self.interval)
+        return pool
+
+    # --- HTTP/1.1 요청 ---
+
+    async def request(self, method, url, headers=None, read_body=False):
+        # 요청 한 번을 보내고 Response를 반환합니다. (리디렉션, 재시도 없음)
+        # read_body가 False이면 본문을 읽지 않습니다. (작은 본문은 연결 재사용을 위해 읽고 버림)
+        scheme, host, port = origin(url)
+        parts = urlsplit(url)
+        bracketed = f'[{host}]' if ':' in host else host # IPv6 주소
+        host_header = bracketed if port == DEFAULT_PORTS[scheme] else f'{bracketed}:{port}'
+        target = quote(parts.path or '/', safe=REQUEST_TARGET_SAFE)
+        if parts.query:
+            target += '?' + quote(parts.query, safe=REQUEST_TARGET_SAFE)
+        lines = [
+            f'{method} {target} HTTP/1.1',
+            f'Host: {host_header}',
+            f'User-Agent: {self.user_agent}',
+            'Accept: text/html,application/xhtml+xml,*/*;q=0.8',
+            'Accept-Encoding: identity',
+            'Connection: keep-alive',
+            *(f'{name}: {value}' for name, value in (headers or {}).items()),
+        ]
+        message = ('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1', errors='replace')
+
+        pool = self._pool((scheme, host, port))
+        # 호스트 제한을 먼저 기다려, 한 호스트에 몰린 요청이 전체 동시 요청 수를 차지하지 않게 합니다.
+        async with pool.semaphore:
+            await pool.wait_turn()
+            async with self.semaphore:
+                return await asyncio.wait_for(
+                    self._send(pool, scheme, host, port, message, method, url, read_body),
+                    self.timeout,
+                )
+
+    async def _send(self, pool, scheme, host, port, message, method, url, read_body):
+        while True:
+            if pool.idle:
+                connection, reused = pool.idle.pop(), True
+            else:
+                connection, reused = await self._connect(scheme, host, port), False
+            reader, writer = connection
+            try:
+                writer.write(message)
+                await writer.drain()
+                response, keep_alive = await self._read_response(reader, method, url, read_body)
+            except (ConnectionError, asyncio.IncompleteReadError):
+                writer.close()
+                if reused:
+                    continue # 서버가 이미 닫은 keep-alive 연결이면 다음 연결로 다시 보냄
+                raise
+            except BaseException:
+                writer.close()
+                raise
+            if keep_alive:
+                pool.idle.append(connection)
+            else:
+                writer.close()
+            return response
+
+    async def _connect(self, scheme, host, port):
+        # 호스트 이름을 직접 조회하여 검사한 주소로 연결합니다.
+        # (연결할 때 다시 조회하지 않으므로 DNS 응답이 바뀌어도(DNS rebinding) 검사하지 않은 주소로 연결되지 않습니다)
+        infos = await asyncio.get_running_loop().getaddrinfo(host, port, type=socket.SOCK_STREAM)
+        addresses = list(dict.fromkeys(info[4][0] for info in infos))
+        if not self.allow_private_addresses:
+            blocked = [address for address in addresses if not is_public_address(address)]
+            if blocked:
+                raise LinkCheckError(f'내부 주소로는 요청하지 않습니다: {host} ({blocked[0]})'[:200])
+        options = {'ssl': self.ssl_context or True, 'server_hostname': host} if scheme == 'https' else {}
+        for index, address in enumerate(addresses):
+            try:
+                return await asyncio.open_connection(address, port, **options)
+            except OSError:
+                if index == len(addresses) - 1:
+                    raise
+
+    async def _read_response(self, reader, method, url, read_body):
+        while True:
+            status_line = await readline(reader)
+            if not status_line:
+                raise ConnectionResetError('응답 없이 연결이 닫혔습니다.')
+            try:
+                version, status = status_line.decode('latin-1').split(None, 2)[:2]
+                status = int(status)
+            except ValueError:
+                raise LinkCheckError('잘못된 HTTP 응답입니다.')
+            headers = {}
+            while (line := await readline(reader)) not in (b'\r\n', b'\n', b''):
+                name, _, value = line.decode('latin-1').partition(':')
+                headers[name.strip().lower()] = value.strip()
+            if not 100 <= status < 200: # 1xx 중간 응답은 건너뜀
+                break
+
+        connection_header = headers.get('connection', '').lower()
+        keep_alive = 'close' not in connection_header and (version != 'HTTP/1.0' or 'keep-alive' in connection_header)
+        if method == 'HEAD' or status in (204, 304):
+            return Response(url, status, headers, b''), keep_alive
+
+        limit = MAX_HTML_BYTES if read_body else DRAIN_BYTES
+        if 'chunked' in headers.get('transfer-encoding', '').lower():
+            body, complete = await self._read_chunked(reader, limit)
+        elif headers.get('content-length', '').isdigit():
+            length = int(headers['content-length'])
+            body = await reader.readexactly(min(length, limit))
+            complete = length <= limit
+        else:
+            body, complete = await reader.read(limit), False # 연결이 닫힐 때까지 이어지는 본문
+        return Response(url, status, headers, body if read_body else b''), keep_alive and complete
+
+    async def _read_chunked(self, reader, limit):
+        body = bytearray()
+        while True:
+            try:
+                size = int((await readline(reader)).split(b';')[0].strip(), 16)
+            except ValueError:
+                raise LinkCheckError('잘못된 chunked 본문입니다.')
+            if size == 0:
+                while (await readline(reader)) not in (b'\r\n', b'\n', b''): # trailer
+                    pass
+                return bytes(body), True
+            if len(body) + size > limit:
+                body += await reader.readexactly(limit - len(body))
+                return bytes(body), False
+            body += await reader.readexactly(size)
+            await reader.readexactly(2) # CRLF
+
+    async def request_with_retry(self, method, url, headers=None, read_body=False):
+        # 일시적인 오류(연결 실패, 시간 초과, 429 / 502 / 503 / 504)는 백오프 후 다시 요청합니다.
+        for attempt in range(self.retries + 1):
+            delay = self.backoff * 2 ** attempt
+            try:
+                response = await self.request(method, url, headers, read_body)
+            except (ssl.SSLCertVerificationError, socket.gaierror, LinkCheckError):
+                raise # 다시 시도해도 같은 결과
+            except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError):
+                if attempt == self.retries:
+                    raise
+            else:
+                if response.status not in RETRY_STATUSES or attempt == self.retries:
+                    return response
+                wait = retry_after(response)
+                if wait is not None:
+                    delay = wait
+                    self._pool(origin(url)).defer(wait)
+            await asyncio.sleep(delay + random.uniform(0, delay / 2)) # 동시에 실패한 요청들이 한꺼번에 다시 몰리지 않도록
+
+    async def follow(self, method, url, conditional=None, read_body=False):
+        # 리디렉션을 따라가 최종 응답을 반환합니다. (Response.url이 최종 URL)
+        # conditional: (URL, ETag, Last-Modified) - 해당 URL을 요청할 때 조건부 요청 헤더를 붙입니다.
+        for _ in range(MAX_REDIRECTS + 1):
+            headers = {}
+            if conditional and conditional[0] == url:
+                if conditional[1]:
+                    headers['If-None-Match'] = conditional[1]
+                if conditional[2]:
+                    headers['If-Modified-Since'] = conditional[2]
+            response = await self.request_with_retry(method, url, headers, read_body)
+            location = response.headers.get('location')
+            if response.status not in REDIRECT_STATUSES or not location:
+                return response
+            try:
+                url = urljoin(url, location)
+            except ValueError:
+                raise LinkCheckError(f'잘못된 리디렉션 주소입니다: {location[:100]}')
+        raise LinkCheckError('리디렉션이 너무 많습니다.')
+
+    # --- 북마크 점검 ---
+
+    async def check_thumbnail(self, url):
+        # 썸네일 URL의 상태 코드 (HEAD를 지원하지 않는 서버는 GET으로 다시 요청)
+        try:
+            response = await self.follow('HEAD', url)
+            if response.status in (405, 501):
+                response = await self.follow('GET', url)
+        except CHECK_ERRORS:
+            return None
+        return response.status
+
+    async def check(self, bookmark):
+        # 북마크 하나를 점검하고 갱신할 필드 값(dict)을 반환합니다. (RESULT_FIELDS 중 바뀐 것만)
+        result = {'last_checked_at': timezone.now()}
+        conditional = None
+        if bookmark.link_status == 200 and (bookmark.link_etag or bookmark.link_last_modified):
+            conditional = (bookmark.final_url or bookmark.url, bookmark.link_etag, bookmark.link_last_modified)
+        try:
+            response = await self.follow('GET', bookmark.url, conditional, read_body=True)
+        except CHECK_ERRORS as error:
+            result.update(link_status=None, link_error=describe_error(error))
+            return result
+
+        final_url = response.url if len(response.url) <= URL_MAX_LENGTH else ''
+        result.update(link_error='', final_url=final_url)
+        thumbnail_url = bookmark.thumbnail_url
+        if response.status == 304:
+            pass # 변경 없음: 이전 상태와 썸네일을 그대로 둡니다.
+        elif response.status == 200:
+            result.update(
+                link_status=200,
+                link_etag=response.headers.get('etag', '')[:200],
+                link_last_modified=response.headers.get('last-modified', '')[:64],
+            )
+            thumbnail_url = extract_og_image(response) or thumbnail_url
+            result['thumbnail_url'] = thumbnail_url
+        else:
+            result.update(link_status=response.status, link_etag='', link_last_modified='')
+        if thumbnail_url:
+            result['thumbnail_status'] = await self.check_thumbnail(thumbnail_url)
+        return result
+
+
+def due_bookmarks(stale_after):
+    # 한 번도 점검하지 않았거나 마지막 점검 후 stale_after(timedelta)가 지난 북마크
+    cutoff = timezone.now() - stale_after
+    return Bookmark.objects.filter(Q(last_checked_at__isnull=True) | Q(last_checked_at__lt=cutoff))
+
+
+async def check_bookmarks(queryset, checker, batch_size=500, log=None):
+    # queryset의 북마크를 pk 순으로 batch_size개씩 읽어 점검하고, 결과를 batch_size개씩 bulk_update로 저장합니다.
+    # 작업자 수는 전체 동시 요청 수보다 넉넉하게 두어, 한 호스트의 제한을 기다리는 작업이 다른 호스트의 점검을 막지 않게 합니다.
+    # 반환값: {'checked', 'ok', 'broken', 'errors'}
+    queue = asyncio.Queue(maxsize=batch_size)
+    workers = checker.concurrency * 4
+    finished = []
+    counts = {'checked': 0, 'ok': 0, 'broken': 0, 'errors': 0}
+    fields = ['pk', 'url', *RESULT_FIELDS]
+
+    async def save():
+        batch = finished[:]
+        finished.clear()
+        if batch:
+            # bulk_update는 save() / 시그널을 거치지 않으므로 updated_at과 검색 색인은 바뀌지 않습니다.
+            await Bookmark.objects.abulk_update(batch, RESULT_FIELDS)
+            if log:
+                log(f'{counts["checked"]}개 점검')
+
+    async def produce():
+        last_pk = 0
+        while True:
+            page = [
+                bookmark async for bookmark in
+                queryset.filter(pk__gt=last_pk).order_by('pk').only(*fields)[:batch_size]
+            ]
+            if not page:
+                break
+            for bookmark in page:
+                await queue.put(bookmark)
+            last_pk = page[-1].pk
+        for _ in range(workers):
+            await queue.put(None)
+
+    async def work():
+        while (bookmark := await queue.get()) is not None:
+            for name, value in (await checker.check(bookmark)).items():
+                setattr(bookmark, name, value)
+            counts['checked'] += 1
+            if bookmark.link_status is None:
+                counts['errors'] += 1
+            elif bookmark.link_status >= 400:
+                counts['broken'] += 1
+            else:
+                counts['ok'] += 1
+            finished.append(bookmark)
+            if len(finished) >= batch_size:
+                await save()
+
+    await asyncio.gather(produce(), *(work() for _ in range(workers)))
+    await save()
+    return counts
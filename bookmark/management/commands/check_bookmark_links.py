@@ -0,0 +1,52 @@
+import asyncio
+import datetime
+
+from django.core.management.base import BaseCommand
+
+from bookmark import linkcheck
+
+
+# 북마크 링크와 썸네일의 상태를 점검하는 관리 명령 (주기적으로 cron 등에서 실행)
+# 마지막 점검 후 --stale-hours가 지난 북마크만 다시 점검하며, 이전 응답의 ETag / Last-Modified로 조건부 요청을 보냅니다.
+# 사용 예: python manage.py check_bookmark_links
+#          python manage.py check_bookmark_links --user admin --all --concurrency 128 --per-host 8
+class Command(BaseCommand):
+    help = '북마크 URL의 응답 상태, 최종 URL, og:image 썸네일을 비동기로 점검하여 저장합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--stale-hours', type=float, default=24, help='이 시간이 지난 점검 결과만 다시 점검 (기본값: 24)')
+        parser.add_argument('--all', action='store_true', help='마지막 점검 시각과 관계없이 모두 점검합니다.')
+        parser.add_argument('--user', help='이 사용자의 북마크만 점검합니다.')
+        parser.add_argument('--limit', type=int, help='점검할 최대 북마크 수')
+        parser.add_argument('--concurrency', type=int, help='전체 동시 요청 수')
+        parser.add_argument('--per-host', type=int, help='호스트별 동시 연결 수')
+        parser.add_argument('--host-rate', type=float, help='호스트별 초당 요청 수')
+        parser.add_argument('--timeout', type=float, help='요청 하나의 제한 시간 (초)')
+        parser.add_argument('--retries', type=int, help='일시적인 오류의 재시도 횟수')
+        parser.add_argument('--batch-size', type=int, default=500, help='한 번에 읽고 저장할 북마크 수 (기본값: 500)')
+
+    def handle(self, *args, **options):
+        stale_after = datetime.timedelta(0 if options['all'] else options['stale_hours'] * 3600)
+        queryset = linkcheck.due_bookmarks(stale_after)
+        if options['user']:
+            queryset = queryset.filter(owner__username=options['user'])
+        if options['limit']:
+            pks = list(queryset.order_by('pk').values_list('pk', flat=True)[:options['limit']])
+            queryset = queryset.filter(pk__in=pks)
+        counts = asyncio.run(self.check(queryset, options))
+        self.stdout.write(self.style.SUCCESS(
+            f"{counts['checked']}개의 북마크를 점검했습니다. "
+            f"(정상 {counts['ok']}개, 오류 응답 {counts['broken']}개, 연결 실패 {counts['errors']}개)"
+        ))
+
+    async def check(self, queryset, options):
+        async with linkcheck.LinkChecker(
+            concurrency=options['concurrency'],
+            per_host=options['per_host'],
+            host_rate=options['host_rate'],
+            timeout=options['timeout'],
+            retries=options['retries'],
+        ) as checker:
+            return await linkcheck.check_bookmarks(
+                queryset, checker, batch_size=options['batch_size'], log=self.stdout.write,
+            )
@@ -0,0 +1,39 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from bookmark import transfer
+
+
+# 브라우저 내보내기 파일(Netscape 북마크 HTML), JSON, CSV를 사용자의 북마크로 가져오는 관리 명령
+# 파일을 조금씩 읽어 batch 단위로 저장하므로 수십만 개의 항목도 메모리 사용량이 일정합니다.
+# 사용 예: python manage.py import_bookmarks bookmarks.html --user admin
+#          python manage.py import_bookmarks export.json --user admin --format json --batch-size 5000
+class Command(BaseCommand):
+    help = '북마크 파일(html, json, csv)을 지정한 사용자의 북마크로 가져옵니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='가져올 파일 경로')
+        parser.add_argument('--user', required=True, help='북마크를 소유할 사용자 이름')
+        parser.add_argument('--format', choices=transfer.FORMATS, help='파일 형식 (기본값: 파일 확장자로 판단)')
+        parser.add_argument(
+            '--batch-size', type=int, default=transfer.DEFAULT_BATCH_SIZE,
+            help=f'한 번에 저장할 북마크 수 (기본값: {transfer.DEFAULT_BATCH_SIZE})',
+        )
+
+    def handle(self, *args, **options):
+        try:
+            owner = get_user_model().objects.get(username=options['user'])
+        except get_user_model().DoesNotExist:
+            raise CommandError(f"사용자 '{options['user']}'을(를) 찾을 수 없습니다.")
+        format = options['format'] or transfer.guess_format(options['path'])
+        if format is None:
+            raise CommandError('파일 형식을 알 수 없습니다. --format을 지정하세요.')
+        try:
+            with open(options['path'], encoding='utf-8-sig', errors='replace', newline='') as file:
+                counts = transfer.import_bookmarks(owner, file, format, batch_size=options['batch_size'])
+        except (OSError, ValueError) as error:
+            raise CommandError(str(error))
+        self.stdout.write(self.style.SUCCESS(
+            f"새 북마크 {counts['created']}개, 갱신 {counts['updated']}개를 가져왔습니다. "
+            f"(다른 사용자의 URL {counts['conflicts']}개, 잘못된 항목 {counts['invalid']}개 건너뜀)"
+        ))
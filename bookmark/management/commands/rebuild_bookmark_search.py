@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+
+from bookmark import search
+from bookmark.models import Bookmark
+
+
+# 북마크의 host / domain 필드와 검색 색인(bookmark_fts)을 처음부터 다시 만드는 관리 명령
+# 사용 예: python manage.py rebuild_bookmark_search
+class Command(BaseCommand):
+    help = '북마크 URL 분해 필드(host, domain)와 검색 색인(bookmark_fts)을 다시 생성합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000, help='한 번에 처리할 북마크 수 (기본값: 1000)')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        last_pk = 0
+        while True:
+            batch = list(Bookmark.objects.filter(pk__gt=last_pk).order_by('pk')[:batch_size])
+            if not batch:
+                break
+            for bookmark in batch:
+                bookmark.set_url_parts()
+            Bookmark.objects.bulk_update(batch, ['host', 'domain'])
+            last_pk = batch[-1].pk
+        count = search.rebuild_index(batch_size=batch_size)
+        self.stdout.write(self.style.SUCCESS(f'{count}개의 북마크를 색인했습니다.'))
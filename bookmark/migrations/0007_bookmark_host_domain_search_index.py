@@ -0,0 +1,76 @@
+# Generated by Django 5.2.4 on 2026-10-18 09:53
+
+from django.conf import settings
+from django.db import migrations, models
+
+from bookmark.search import registrable_domain, split_host, url_tokens
+
+
+# 북마크 검색용 FTS5 가상 테이블 (rowid = bookmark_bookmark.id)
+# owner 컬럼에는 'u<소유자 id>' 토큰이 들어가 소유자별로 검색 범위를 제한합니다.
+CREATE_FTS_TABLE = """
+CREATE VIRTUAL TABLE IF NOT EXISTS bookmark_fts USING fts5(
+    owner, url, title, description, category,
+    tokenize = 'unicode61 remove_diacritics 2',
+    prefix = '2 3'
+)
+"""
+
+DROP_FTS_TABLE = 'DROP TABLE IF EXISTS bookmark_fts'
+
+
+def populate_url_parts_and_index(apps, schema_editor):
+    # 기존 북마크의 host / domain을 채우고 검색 색인을 만듭니다.
+    Bookmark = apps.get_model('bookmark', 'Bookmark')
+    db_alias = schema_editor.connection.alias
+    bookmarks = list(Bookmark.objects.using(db_alias).select_related('category'))
+    for bookmark in bookmarks:
+        bookmark.host = split_host(bookmark.url)
+        bookmark.domain = registrable_domain(bookmark.host)
+    Bookmark.objects.using(db_alias).bulk_update(bookmarks, ['host', 'domain'], batch_size=500)
+    with schema_editor.connection.cursor() as cursor:
+        cursor.executemany(
+            'INSERT INTO bookmark_fts (rowid, owner, url, title, description, category) VALUES (%s, %s, %s, %s, %s, %s)',
+            [
+                (
+                    bookmark.pk,
+                    f'u{bookmark.owner_id}',
+                    url_tokens(bookmark.url),
+                    bookmark.title,
+                    bookmark.description,
+                    bookmark.category.name if bookmark.category_id else '',
+                )
+                for bookmark in bookmarks
+            ],
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookmark', '0006_bookmark_is_favorite'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='bookmark',
+            name='domain',
+            field=models.CharField(blank=True, editable=False, max_length=255, verbose_name='도메인'),
+        ),
+        migrations.AddField(
+            model_name='bookmark',
+            name='host',
+            field=models.CharField(blank=True, editable=False, max_length=255, verbose_name='호스트'),
+        ),
+        migrations.AddIndex(
+            model_name='bookmark',
+            index=models.Index(fields=['owner', 'domain'], name='bookmark_owner_domain_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='bookmark',
+            index=models.Index(fields=['owner', 'host'], name='bookmark_owner_host_idx'),
+        ),
+        migrations.RunSQL(CREATE_FTS_TABLE, DROP_FTS_TABLE),
+        migrations.RunPython(populate_url_parts_and_index, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookmark', '0007_bookmark_host_domain_search_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='bookmark',
+            name='final_url',
+            field=models.URLField(blank=True, editable=False, max_length=2000, verbose_name='최종 URL'),
+        ),
+        migrations.AddField(
+            model_name='bookmark',
+            name='last_checked_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True, verbose_name='마지막 점검일'),
+        ),
+        migrations.AddField(
+            model_name='bookmark',
+            name='link_error',
+            field=models.CharField(blank=True, editable=False, max_length=200, verbose_name='링크 오류'),
+        ),
+        migrations.AddField(
+            model_name='bookmark',
+            name='link_etag',
+            field=models.CharField(blank=True, editable=False, max_length=200),
+        ),
+        migrations.AddField(
+            model_name='bookmark',
+            name='link_last_modified',
+            field=models.CharField(blank=True, editable=False, max_length=64),
+        ),
+        migrations.AddField(
+            model_name='bookmark',
+            name='link_status',
+            field=models.PositiveSmallIntegerField(blank=True, editable=False, null=True, verbose_name='링크 상태'),
+        ),
+        migrations.AddField(
+            model_name='bookmark',
+            name='thumbnail_status',
+            field=models.PositiveSmallIntegerField(blank=True, editable=False, null=True, verbose_name='썸네일 상태'),
+        ),
+    ]
@@ -0,0 +1,52 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:45
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def populate_category_name(apps, schema_editor):
+    # 기존 북마크의 category_name을 카테고리 이름으로 채웁니다. (UPDATE 1회)
+    Bookmark = apps.get_model('bookmark', 'Bookmark')
+    Category = apps.get_model('bookmark', 'Category')
+    db_alias = schema_editor.connection.alias
+    Bookmark.objects.using(db_alias).filter(category__isnull=False).update(
+        category_name=Subquery(Category.objects.using(db_alias).filter(pk=OuterRef('category_id')).values('name')[:1]),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookmark', '0008_bookmark_link_check'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='bookmark',
+            name='category_name',
+            field=models.CharField(blank=True, editable=False, max_length=50, verbose_name='카테고리 이름'),
+        ),
+        migrations.AddIndex(
+            model_name='bookmark',
+            index=models.Index(fields=['owner', 'title'], name='bookmark_owner_title_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='bookmark',
+            index=models.Index(fields=['owner', 'url'], name='bookmark_owner_url_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='bookmark',
+            index=models.Index(fields=['owner', 'created_at'], name='bookmark_owner_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='bookmark',
+            index=models.Index(fields=['owner', 'updated_at'], name='bookmark_owner_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='bookmark',
+            index=models.Index(fields=['owner', 'category_name'], name='bookmark_owner_category_idx'),
+        ),
+        migrations.RunPython(populate_category_name, migrations.RunPython.noop),
+    ]
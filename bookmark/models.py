@@ -2,6 +2,7 @@ from django.db import models
 from django.urls import reverse
 from django.utils import timezone
 from django.conf import settings
+from bookmark.search import registrable_domain, split_host # URL 분해 함수 (검색 색인용)
 
 # Category 모델
 class Category(models.Model):
@@ -46,10 +47,44 @@ class Bookmark(models.Model):
     created_at = models.DateTimeField(auto_now_add=True, verbose_name='생성일')
     updated_at = models.DateTimeField(auto_now=True, verbose_name='수정일')
 
+    # URL에서 파생되는 검색용 필드 (save() 시 자동 계산, 'site:' 검색 필터에 사용)
+    # host: www.를 제외한 호스트 이름 (예: blog.example.co.kr)
+    # domain: 등록 도메인 (예: example.co.kr)
+    host = models.CharField(max_length=255, blank=True, editable=False, verbose_name='호스트')
+    domain = models.CharField(max_length=255, blank=True, editable=False, verbose_name='도메인')
+
+    # 카테고리 이름 정렬용 사본 (save() 시 자동 계산, 카테고리 이름 변경/삭제는 bookmark/signals.py에서 반영)
+    # category__name으로 정렬하면 카테고리를 LEFT JOIN한 결과 전체를 임시 B-tree로 정렬해야 하므로,
+    # 목록의 '카테고리' 정렬은 이 필드와 (owner, category_name) 인덱스를 사용합니다.
+    category_name = models.CharField(max_length=50, blank=True, editable=False, verbose_name='카테고리 이름')
+
+    # 링크 상태 점검 결과 (bookmark/linkcheck.py, 관리 명령 check_bookmark_links에서 기록)
+    # link_status: 마지막 응답의 HTTP 상태 코드 (연결 실패 등으로 응답이 없으면 NULL, 사유는 link_error)
+    # link_etag / link_last_modified: 다음 점검 때 조건부 요청(If-None-Match / If-Modified-Since)에 사용
+    link_status = models.PositiveSmallIntegerField(null=True, blank=True, editable=False, verbose_name='링크 상태')
+    link_error = models.CharField(max_length=200, blank=True, editable=False, verbose_name='링크 오류')
+    final_url = models.URLField(max_length=2000, blank=True, editable=False, verbose_name='최종 URL')
+    link_etag = models.CharField(max_length=200, blank=True, editable=False)
+    link_last_modified = models.CharField(max_length=64, blank=True, editable=False)
+    thumbnail_status = models.PositiveSmallIntegerField(null=True, blank=True, editable=False, verbose_name='썸네일 상태')
+    last_checked_at = models.DateTimeField(null=True, blank=True, editable=False, verbose_name='마지막 점검일')
+
     class Meta:
         verbose_name = '북마크'
         verbose_name_plural = '북마크 목록'
         ordering = ['-created_at']
+        indexes = [
+            # 소유자별 'site:' 검색을 인덱스로 처리하기 위한 복합 인덱스
+            models.Index(fields=['owner', 'domain'], name='bookmark_owner_domain_idx'),
+            models.Index(fields=['owner', 'host'], name='bookmark_owner_host_idx'),
+            # 목록의 정렬 기준(VALID_SORT_FIELDS)마다 소유자 + 정렬 필드 복합 인덱스
+            # 소유자의 북마크를 인덱스 순서대로 읽으므로 정렬용 임시 B-tree 없이 LIMIT만큼만 읽습니다.
+            models.Index(fields=['owner', 'title'], name='bookmark_owner_title_idx'),
+            models.Index(fields=['owner', 'url'], name='bookmark_owner_url_idx'),
+            models.Index(fields=['owner', 'created_at'], name='bookmark_owner_created_idx'),
+            models.Index(fields=['owner', 'updated_at'], name='bookmark_owner_updated_idx'),
+            models.Index(fields=['owner', 'category_name'], name='bookmark_owner_category_idx'),
+        ]
 
     def __str__(self):
         return self.title
@@ -57,3 +92,21 @@ class Bookmark(models.Model):
     def get_absolute_url(self):
         return reverse('bookmark:detail', args=[self.pk])
 
+    @property
+    def is_link_broken(self):
+        # 점검 결과 응답이 없거나 오류 상태(4xx / 5xx)인 링크
+        return self.last_checked_at is not None and (self.link_status is None or self.link_status >= 400)
+
+    def save(self, *args, **kwargs):
+        # URL / 카테고리가 바뀔 수 있으므로 저장할 때마다 host / domain / category_name을 다시 계산합니다.
+        self.set_url_parts()
+        self.set_category_name()
+        super().save(*args, **kwargs)
+
+    def set_url_parts(self):
+        self.host = split_host(self.url)
+        self.domain = registrable_domain(self.host)
+
+    def set_category_name(self):
+        self.category_name = self.category.name if self.category_id else ''
+
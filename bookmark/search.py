@@ -0,0 +1,141 @@
+# bookmark/search.py
+# 북마크 검색 색인 모듈입니다.
+# - URL을 호스트(host), 등록 도메인(domain), 경로 토큰으로 분해합니다.
+# - SQLite FTS5 가상 테이블(bookmark_fts, rowid = Bookmark.id)에 소유자별로 색인합니다.
+#   owner 컬럼에 'u<소유자 id>' 토큰을 넣어, 검색이 항상 해당 사용자의 문서 목록 안에서만 이루어지게 합니다.
+# - 'site:example.com' 필터는 Bookmark.host / Bookmark.domain 컬럼의 (owner, ...) 인덱스로 처리합니다.
+# 색인 동기화는 bookmark/signals.py에서, 검색은 BookmarkSearchListView에서 사용합니다.
+
+import re
+from urllib.parse import unquote, urlsplit
+
+from django.db import connections, router
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+
+from _20250723django.fts import build_match_query
+
+FTS_TABLE = 'bookmark_fts'
+
+# 국가 코드 최상위 도메인 아래에서 흔히 쓰이는 2단계 도메인 목록
+# (예: example.co.kr, example.com.au) - 이 경우 등록 도메인은 마지막 3개 레이블이 됩니다.
+# 공개 접미사 목록(Public Suffix List) 전체를 내장하지 않고 자주 쓰이는 경우만 근사합니다.
+SECOND_LEVEL_LABELS = {'co', 'com', 'ac', 'go', 'or', 'ne', 're', 'pe', 'org', 'net', 'gov', 'edu', 'mil'}
+
+SITE_FILTER_RE = re.compile(r'(?:^|\s)site:(\S+)', re.IGNORECASE)
+
+
+def split_host(url):
+    # URL에서 소문자 호스트 이름을 꺼냅니다. (포트 제외, 'www.' 접두어 제거)
+    host = (urlsplit(url).hostname or '').lower().rstrip('.')
+    if host.startswith('www.'):
+        host = host[4:]
+    return host
+
+
+def registrable_domain(host):
+    # 호스트에서 등록 도메인을 구합니다. (예: blog.example.co.kr -> example.co.kr)
+    # IP 주소나 단일 레이블 호스트(localhost)는 그대로 반환합니다.
+    labels = host.split('.')
+    if len(labels) <= 2 or host.replace('.', '').isdigit():
+        return host
+    if len(labels[-1]) == 2 and labels[-2] in SECOND_LEVEL_LABELS:
+        return '.'.join(labels[-3:])
+    return '.'.join(labels[-2:])
+
+
+def url_tokens(url):
+    # 색인용 URL 텍스트를 만듭니다: 호스트, 등록 도메인, 디코딩된 경로와 쿼리 문자열
+    # FTS5 토크나이저가 '.', '/', '-' 등을 구분자로 처리하므로 각 레이블과 경로 조각이 개별 토큰이 됩니다.
+    parts = urlsplit(url)
+    host = split_host(url)
+    path = unquote(parts.path)
+    query = unquote(parts.query)
+    return ' '.join(part for part in (host, registrable_domain(host), path, query) if part)
+
+
+def parse_query(search_query):
+    # 검색어에서 site: 필터를 분리합니다. (site 목록, 나머지 검색어) 튜플을 반환합니다.
+    sites = [split_host(f'//{site}') for site in SITE_FILTER_RE.findall(search_query)]
+    text = SITE_FILTER_RE.sub(' ', search_query).strip()
+    return [site for site in sites if site], text
+
+
+def _owner_token(owner_id):
+    return f'u{owner_id}'
+
+
+def _bookmark_document(bookmark):
+    category_name = bookmark.category.name if bookmark.category_id else ''
+    return [
+        _owner_token(bookmark.owner_id),
+        url_tokens(bookmark.url),
+        bookmark.title,
+        bookmark.description,
+        category_name,
+    ]
+
+
+def index_bookmarks(bookmarks, using=None):
+    # 북마크 색인 행을 새로 씁니다. (FTS5에는 UPSERT가 없으므로 삭제 후 삽입)
+    bookmarks = list(bookmarks)
+    if not bookmarks:
+        return
+    using = using or router.db_for_write(bookmarks[0].__class__)
+    with connections[using].cursor() as cursor:
+        cursor.executemany(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [[bookmark.pk] for bookmark in bookmarks])
+        cursor.executemany(
+            f'INSERT INTO {FTS_TABLE} (rowid, owner, url, title, description, category) VALUES (%s, %s, %s, %s, %s, %s)',
+            [[bookmark.pk, *_bookmark_document(bookmark)] for bookmark in bookmarks],
+        )
+
+
+def remove_bookmark(bookmark_id, using):
+    # 삭제된 북마크의 색인 행을 제거합니다.
+    with connections[using].cursor() as cursor:
+        cursor.execute(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [bookmark_id])
+
+
+def rebuild_index(using=None, batch_size=1000):
+    # 색인 전체를 다시 만듭니다. (관리 명령 rebuild_bookmark_search에서 사용)
+    from bookmark.models import Bookmark
+
+    using = using or router.db_for_write(Bookmark)
+    with connections[using].cursor() as cursor:
+        cursor.execute(f'DELETE FROM {FTS_TABLE}')
+    queryset = Bookmark.objects.using(using).select_related('category').order_by('pk')
+    count = 0
+    last_pk = 0
+    while True:
+        batch = list(queryset.filter(pk__gt=last_pk)[:batch_size])
+        if not batch:
+            break
+        index_bookmarks(batch, using=using)
+        count += len(batch)
+        last_pk = batch[-1].pk
+    return count
+
+
+def search_bookmarks(queryset, owner, search_query):
+    # 소유자(owner)의 북마크 쿼리셋에 검색 조건을 적용합니다. (owner가 None이면 모든 소유자, 관리자 검색용)
+    # - site:도메인 -> 등록 도메인 또는 호스트가 정확히 일치하는 북마크 (인덱스 조회)
+    # - 나머지 단어 -> bookmark_fts 색인에서 접두어 일치 (owner 토큰으로 범위 제한)
+    # 결과는 일반 쿼리셋이므로 기존 정렬/페이지네이션을 그대로 사용할 수 있습니다.
+    sites, text = parse_query(search_query)
+    if sites:
+        site_filter = Q()
+        for site in sites:
+            site_filter |= Q(domain=site) | Q(host=site)
+        queryset = queryset.filter(site_filter)
+    match = build_match_query(text)
+    if match:
+        fts_match = f'{{url title description category}} : ({match})'
+        if owner is not None:
+            fts_match = f'owner : "{_owner_token(owner.pk)}" AND {fts_match}'
+        queryset = queryset.filter(
+            pk__in=RawSQL(f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s', [fts_match])
+        )
+    elif text and not sites:
+        # 검색어가 기호로만 이루어져 색인 질의를 만들 수 없는 경우 결과 없음
+        queryset = queryset.none()
+    return queryset
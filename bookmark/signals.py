@@ -0,0 +1,58 @@
+# bookmark/signals.py
+# Bookmark / Category 변경 사항을 북마크 검색 색인(bookmark_fts)과 정렬용 category_name에 반영하는 시그널 수신기 모음입니다.
+# BookmarkConfig.ready()에서 이 모듈을 임포트하여 수신기를 등록합니다.
+
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from bookmark import search
+from bookmark.models import Bookmark, Category
+
+
+# 북마크 저장 시 색인 갱신 (생성/수정 모두)
+@receiver(post_save, sender=Bookmark, dispatch_uid='bookmark_search_save')
+def update_bookmark_search_index(sender, instance, using, raw=False, **kwargs):
+    if raw: # fixture 로딩 중에는 건너뜀 (rebuild_bookmark_search로 재생성)
+        return
+    search.index_bookmarks([instance], using=using)
+
+
+# 북마크 삭제 시 색인 행 제거
+@receiver(post_delete, sender=Bookmark, dispatch_uid='bookmark_search_delete')
+def remove_bookmark_search_index(sender, instance, using, **kwargs):
+    search.remove_bookmark(instance.pk, using=using)
+
+
+# 카테고리 이름이 바뀌면 소속 북마크의 정렬용 이름을 갱신 (UPDATE 1회, 색인 갱신보다 먼저 등록)
+@receiver(post_save, sender=Category, dispatch_uid='bookmark_category_name_save')
+def update_bookmark_category_name(sender, instance, created, using, raw=False, **kwargs):
+    if created or raw:
+        return
+    instance.bookmarks.using(using).exclude(category_name=instance.name).update(category_name=instance.name)
+
+
+# 카테고리가 삭제되면 소속 북마크는 카테고리 없음이 되므로 정렬용 이름을 비움
+@receiver(pre_delete, sender=Category, dispatch_uid='bookmark_category_name_delete')
+def clear_bookmark_category_name(sender, instance, using, **kwargs):
+    instance.bookmarks.using(using).update(category_name='')
+
+
+# 카테고리 이름이 바뀌면 해당 카테고리의 북마크 색인을 갱신
+@receiver(post_save, sender=Category, dispatch_uid='bookmark_category_search')
+def update_bookmark_search_category(sender, instance, created, using, raw=False, **kwargs):
+    if created or raw:
+        return
+    search.index_bookmarks(instance.bookmarks.using(using).select_related('category'), using=using)
+
+
+# 카테고리가 삭제되면 소속 북마크의 category가 NULL이 되므로, 삭제 전에 대상 id를 기억해 두었다가 색인을 갱신
+@receiver(pre_delete, sender=Category, dispatch_uid='bookmark_category_search_pre_delete')
+def remember_category_bookmarks(sender, instance, using, **kwargs):
+    instance._search_bookmark_ids = list(instance.bookmarks.using(using).values_list('pk', flat=True))
+
+
+@receiver(post_delete, sender=Category, dispatch_uid='bookmark_category_search_delete')
+def update_bookmark_search_category_delete(sender, instance, using, **kwargs):
+    bookmark_ids = getattr(instance, '_search_bookmark_ids', [])
+    if bookmark_ids:
+        search.index_bookmarks(Bookmark.objects.using(using).filter(pk__in=bookmark_ids), using=using)
@@ -1,3 +1,287 @@
-from django.test import TestCase
+import asyncio
+import datetime
+import io
+import json
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.test import RequestFactory, SimpleTestCase, TestCase
+
+from _20250723django.pagination import CursorPaginator, encode_cursor
+from _20250723django.queryplan import plan_problems
+from bookmark import transfer
+from bookmark.linkcheck import LinkChecker
+from bookmark.models import Bookmark, Category
+from bookmark.views import BookmarkListView, BookmarkSearchListView, VALID_SORT_FIELDS, get_bookmark_cursor_ordering
+
+# 커서 토큰에 넣을 정렬 값 (두 번째 페이지 이후의 쿼리 계획 확인용)
+CURSOR_VALUES = {'created_at': '2024-01-01T00:00:00+00:00', 'updated_at': '2024-01-01T00:00:00+00:00'}
+
+
+# 북마크 목록/검색의 모든 정렬 기준이 (owner, 정렬 필드) 인덱스를 타는지 EXPLAIN QUERY PLAN으로 확인합니다.
+class BookmarkListQueryPlanTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('owner')
+        category = Category.objects.create(name='django')
+        Bookmark.objects.create(title='Django', url='https://www.djangoproject.com/', category=category, owner=cls.user)
+        Bookmark.objects.create(title='Python', url='https://www.python.org/', owner=cls.user)
+
+    def get_view(self, view_class, **params):
+        request = RequestFactory().get('/bookmark/', params)
+        request.user = self.user
+        view = view_class()
+        view.setup(request)
+        return view
+
+    def test_every_sort_uses_index(self):
+        for view_class in (BookmarkListView, BookmarkSearchListView):
+            for sort in VALID_SORT_FIELDS:
+                for order in ('asc', 'desc'):
+                    with self.subTest(view=view_class.__name__, sort=sort, order=order):
+                        view = self.get_view(view_class, sort=sort, order=order)
+                        queryset = view.get_queryset()
+                        # 번호 페이지 (OFFSET)
+                        self.assertEqual(plan_problems(queryset[:view.paginate_by]), [])
+                        # 커서 페이지: 첫 페이지, 다음 페이지, 이전 페이지
+                        field, descending = get_bookmark_cursor_ordering(view.request)
+                        paginator = CursorPaginator(queryset, view.paginate_by, field, descending)
+                        value = CURSOR_VALUES.get(field, 'm')
+                        for token in (None, encode_cursor(value, 1), encode_cursor(value, 1, reverse=True)):
+                            self.assertEqual(plan_problems(paginator._prepare(token)[0]), [])
+
+    def test_category_name_follows_category(self):
+        bookmark = Bookmark.objects.get(title='Django')
+        self.assertEqual(bookmark.category_name, 'django')
+        category = bookmark.category
+        category.name = 'web'
+        category.save()
+        bookmark.refresh_from_db()
+        self.assertEqual(bookmark.category_name, 'web')
+        category.delete()
+        bookmark.refresh_from_db()
+        self.assertEqual((bookmark.category_id, bookmark.category_name), (None, ''))
+
+
+def http_response(status, headers=(), body=b''):
+    # 원시 HTTP/1.1 응답 (Transfer-Encoding이 없으면 Content-Length를 붙임)
+    headers = list(headers)
+    if not any(name.lower() == 'transfer-encoding' for name, _ in headers):
+        headers.append(('Content-Length', str(len(body))))
+    head = ''.join(f'{name}: {value}\r\n' for name, value in headers)
+    return f'HTTP/1.1 {status} X\r\n{head}\r\n'.encode('latin-1') + body
+
+
+class StandInServer:
+    # 링크 점검 테스트용 로컬 HTTP 서버
+    # routes: 경로 -> 응답(bytes) 목록, 요청마다 차례로 보내고 마지막 응답은 계속 반복합니다. (None이면 응답하지 않음)
+    # requests: 받은 요청의 (메서드, 경로, 헤더) 목록
+
+    def __init__(self, routes):
+        self.routes = {path: list(responses) for path, responses in routes.items()}
+        self.requests = []
+        self.connections = {} # 처리 중인 연결 (작업 -> writer)
+
+    async def __aenter__(self):
+        self.server = await asyncio.start_server(self.handle, '127.0.0.1', 0)
+        self.port = self.server.sockets[0].getsockname()[1]
+        return self
+
+    async def __aexit__(self, *exc_info):
+        # keep-alive 연결을 닫아 처리 작업이 이벤트 루프보다 먼저 끝나게 합니다.
+        self.server.close()
+        for writer in self.connections.values():
+            writer.close()
+        await asyncio.gather(*self.connections)
+        await self.server.wait_closed()
+
+    def url(self, path):
+        return f'http://127.0.0.1:{self.port}{path}'
+
+    async def handle(self, reader, writer):
+        self.connections[asyncio.current_task()] = writer
+        try:
+            while request_line := await reader.readline():
+                method, path = request_line.decode('latin-1').split()[:2]
+                headers = {}
+                while (line := await reader.readline()) not in (b'\r\n', b''):
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+                self.requests.append((method, path, headers))
+                responses = self.routes[path]
+                response = responses.pop(0) if len(responses) > 1 else responses[0]
+                if response is None:
+                    await reader.read() # 클라이언트가 시간 초과로 연결을 닫을 때까지 대기
+                    return
+                writer.write(response)
+                await writer.drain()
+        finally:
+            writer.close()
+
+
+# 로컬 서버를 상대로 링크 점검기의 리디렉션, 조건부 요청, 재시도, 시간 초과, chunked 본문, 오류 기록을 확인합니다.
+class LinkCheckerTests(SimpleTestCase):
+
+    def checker(self, **options):
+        options = {'host_rate': 1000, 'retries': 1, 'backoff': 0.01, 'timeout': 2, 'allow_private_addresses': True, **options}
+        return LinkChecker(**options)
+
+    async def check(self, bookmark, **options):
+        async with self.checker(**options) as checker:
+            return await checker.check(bookmark)
+
+    async def test_follows_redirect_and_finds_thumbnail(self):
+        html = b'<html><head><meta property="og:image" content="/cover.png"></head><body></body></html>'
+        async with StandInServer({
+            '/old': [http_response(301, [('Location', '/new')])],
+            '/new': [http_response(200, [('Content-Type', 'text/html; charset=utf-8'), ('ETag', '"v1"')], html)],
+            '/cover.png': [http_response(200, [('Content-Type', 'image/png')])],
+        }) as server:
+            result = await self.check(Bookmark(url=server.url('/old')))
+        self.assertEqual(result['link_status'], 200)
+        self.assertEqual(result['final_url'], server.url('/new'))
+        self.assertEqual(result['link_etag'], '"v1"')
+        self.assertEqual(result['thumbnail_url'], server.url('/cover.png'))
+        self.assertEqual(result['thumbnail_status'], 200)
+        self.assertEqual([(method, path) for method, path, _ in server.requests], [('GET', '/old'), ('GET', '/new'), ('HEAD', '/cover.png')])
+
+    async def test_recheck_sends_validators_and_keeps_status_on_304(self):
+        async with StandInServer({'/page': [http_response(304)]}) as server:
+            bookmark = Bookmark(url=server.url('/page'), final_url=server.url('/page'), link_status=200, link_etag='"v1"',
+                                link_last_modified='Wed, 01 Jan 2025 00:00:00 GMT')
+            result = await self.check(bookmark)
+        self.assertNotIn('link_status', result) # 이전 상태를 그대로 둠
+        self.assertEqual(result['link_error'], '')
+        headers = server.requests[0][2]
+        self.assertEqual(headers['if-none-match'], '"v1"')
+        self.assertEqual(headers['if-modified-since'], 'Wed, 01 Jan 2025 00:00:00 GMT')
+
+    async def test_retries_503_after_retry_after(self):
+        async with StandInServer({'/busy': [http_response(503, [('Retry-After', '0')]), http_response(200)]}) as server:
+            result = await self.check(Bookmark(url=server.url('/busy')))
+        self.assertEqual(result['link_status'], 200)
+        self.assertEqual(len(server.requests), 2)
+
+    async def test_timeout_is_recorded(self):
+        async with StandInServer({'/slow': [None]}) as server:
+            result = await self.check(Bookmark(url=server.url('/slow')), timeout=0.2, retries=0)
+        self.assertIsNone(result['link_status'])
+        self.assertEqual(result['link_error'], '시간 초과')
+
+    async def test_reads_chunked_body(self):
+        chunks = [b'<html><head><meta property="og:', b'image" content="https://cdn.example.com/a.png"></head>']
+        body = b''.join(b'%x\r\n%s\r\n' % (len(chunk), chunk) for chunk in chunks) + b'0\r\n\r\n'
+        async with StandInServer({
+            '/chunked': [http_response(200, [('Content-Type', 'text/html'), ('Transfer-Encoding', 'chunked')], body)],
+        }) as server:
+            async with self.checker() as checker:
+                response = await checker.follow('GET', server.url('/chunked'), read_body=True)
+                again = await checker.follow('GET', server.url('/chunked'), read_body=True) # 같은 연결 재사용
+        self.assertEqual(response.body, b''.join(chunks))
+        self.assertEqual(again.body, response.body)
+
+    async def test_bad_responses_and_urls_are_recorded_per_bookmark(self):
+        long_header = http_response(200, [('X-Long', 'a' * 70000)])
+        async with StandInServer({'/long': [long_header]}) as server:
+            results = await asyncio.gather(
+                self.check(Bookmark(url=server.url('/long'))),
+                self.check(Bookmark(url='http://[::1/')),
+                self.check(Bookmark(url='http://example.com:port/')),
+            )
+        for result in results:
+            self.assertIsNone(result['link_status'])
+            self.assertTrue(result['link_error'])
+
+    async def test_refuses_private_addresses(self):
+        async with StandInServer({'/': [http_response(200)]}) as server:
+            for url in (server.url('/'), 'http://169.254.169.254/latest/meta-data/', 'http://10.0.0.1/', 'http://[::ffff:127.0.0.1]/'):
+                with self.subTest(url=url):
+                    result = await self.check(Bookmark(url=url), allow_private_addresses=False)
+                    self.assertIsNone(result['link_status'])
+                    self.assertIn('내부 주소', result['link_error'])
+        self.assertEqual(server.requests, [])
+
+
+# 가져오기/내보내기(bookmark/transfer.py): 세 형식 모두 내보낸 파일을 다시 가져오면 같은 북마크가 되어야 하고,
+# 다른 사용자의 URL은 (저장 직전에 생긴 경우에도) 덮어쓰지 않고 건너뛰어야 합니다.
+class BookmarkTransferTests(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user('owner')
+        self.other = User.objects.create_user('other')
+        category = Category.objects.create(name='개발 & "문서"')
+        created_at = datetime.datetime(2024, 1, 2, 3, 4, 5, tzinfo=datetime.timezone.utc)
+        Bookmark.objects.create(title='Django <docs>', url='https://www.djangoproject.com/?a=1&b=2', description='웹 프레임워크', category=category, owner=self.user)
+        Bookmark.objects.create(title='Python, "org"', url='https://www.python.org/', owner=self.user)
+        Bookmark.objects.update(created_at=created_at) # HTML 형식은 초 단위로 내보냄
+
+    def saved(self, owner):
+        return sorted(
+            Bookmark.objects.filter(owner=owner).values_list('url', 'title', 'description', 'category__name', 'created_at')
+        )
+
+    def test_round_trip(self):
+        expected = self.saved(self.user)
+        for format in transfer.FORMATS:
+            with self.subTest(format=format):
+                exporter = transfer.EXPORTERS[format][0]
+                content = ''.join(exporter(transfer.export_queryset(self.user)))
+                owner = User.objects.create_user(f'{format}-importer')
+                Bookmark.objects.filter(owner=self.user).update(owner=owner) # url은 전체 사용자에 대해 unique
+                counts = transfer.import_bookmarks(self.user, io.StringIO(content), format)
+                self.assertEqual(counts, {'created': 0, 'updated': 0, 'conflicts': 2, 'invalid': 0})
+                Bookmark.objects.filter(owner=owner).delete()
+                counts = transfer.import_bookmarks(self.user, io.StringIO(content), format)
+                self.assertEqual(counts, {'created': 2, 'updated': 0, 'conflicts': 0, 'invalid': 0})
+                self.assertEqual(self.saved(self.user), expected)
+
+    def test_parse_json_splits_array_and_lines_across_reads(self):
+        records = [{'url': f'https://example.com/{i}', 'title': '가' * i} for i in range(20)]
+        array = json.dumps(records, ensure_ascii=False, indent=2)
+        lines = '\n'.join(json.dumps(record, ensure_ascii=False) for record in records) + '\n'
+        for read_size in (1, 7, 64, transfer.READ_SIZE):
+            for name, content in (('array', array), ('lines', lines), ('empty', '[]'), ('export', '[\n' + ',\n'.join(lines.split('\n')[:-1]) + '\n]\n')):
+                with self.subTest(read_size=read_size, content=name), mock.patch.object(transfer, 'READ_SIZE', read_size):
+                    self.assertEqual(list(transfer.parse_json(io.StringIO(content))), [] if name == 'empty' else records)
+        with self.assertRaises(ValueError):
+            list(transfer.parse_json(io.StringIO('[{"url": "https://example.com/"}, {"url": ')))
+
+    def test_upsert_counts(self):
+        bookmark = Bookmark.objects.get(url='https://www.python.org/')
+        Bookmark.objects.create(title='Other', url='https://other.example.com/', owner=self.other)
+        records = [
+            {'url': 'https://www.python.org/', 'title': 'Python', 'category': 'lang', 'is_favorite': 'true'}, # 내 북마크 갱신
+            {'url': 'https://new.example.com/', 'title': 'first'},
+            {'url': 'https://new.example.com/', 'title': 'second'}, # 같은 배치의 중복 URL은 마지막 항목
+            {'url': 'https://other.example.com/', 'title': 'mine?'}, # 다른 사용자의 URL
+            {'url': 'javascript:alert(1)'}, {'title': 'no url'},
+        ]
+        counts = transfer.BookmarkImporter(self.user, batch_size=4).run(records)
+        self.assertEqual(counts, {'created': 1, 'updated': 1, 'conflicts': 1, 'invalid': 2})
+        updated = Bookmark.objects.select_related('category').get(pk=bookmark.pk)
+        self.assertEqual((updated.title, updated.category.name, updated.category_name), ('Python', 'lang', 'lang'))
+        self.assertEqual((updated.created_at, updated.is_favorite), (bookmark.created_at, bookmark.is_favorite)) # 기존 값 유지
+        self.assertEqual(Bookmark.objects.get(url='https://new.example.com/').title, 'second')
+        self.assertEqual(Bookmark.objects.get(url='https://other.example.com/').title, 'Other')
+
+    def test_other_owner_inserted_during_import_is_skipped(self):
+        # 소유자 확인 뒤, 저장 전에 다른 사용자가 같은 URL을 저장한 경우
+        importer = transfer.BookmarkImporter(self.user)
+        resolve_categories = importer._resolve_categories
+
+        def insert_concurrently(names):
+            Bookmark.objects.create(title='Other', url='https://race.example.com/', owner=self.other)
+            Bookmark.objects.filter(url='https://www.python.org/').update(owner=self.other)
+            resolve_categories(names)
+
+        with mock.patch.object(importer, '_resolve_categories', side_effect=insert_concurrently):
+            counts = importer.run([
+                {'url': 'https://race.example.com/', 'title': 'mine'},
+                {'url': 'https://www.python.org/', 'title': 'mine'},
+            ])
+        self.assertEqual(counts, {'created': 0, 'updated': 0, 'conflicts': 1, 'invalid': 0})
+        self.assertEqual(
+            sorted(Bookmark.objects.filter(owner=self.other).values_list('url', 'title')),
+            [('https://race.example.com/', 'Other'), ('https://www.python.org/', 'Python, "org"')],
+        )
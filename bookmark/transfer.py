@@ -0,0 +1,397 @@
+# bookmark/transfer.py
+# 북마크 가져오기(import) / 내보내기(export) 모듈입니다.
+# - 가져오기: 브라우저 내보내기 파일(Netscape 북마크 HTML), JSON(배열 또는 한 줄에 하나씩), CSV를
+#   파일 전체를 메모리에 올리지 않고 조금씩 읽으며 항목을 하나씩 만들어 냅니다.
+#   항목은 batch_size개씩 묶어 카테고리를 일괄 생성하고, 내 북마크는 bulk_update로 갱신, 새 URL은 bulk_create로 저장합니다.
+# - 내보내기: 사용자의 북마크를 iterator()로 나누어 읽으며 같은 세 형식의 텍스트 조각을 차례로 만들어 냅니다.
+#   (BookmarkExportView의 StreamingHttpResponse, 관리 명령 import_bookmarks에서 사용)
+# Bookmark.url은 전체 사용자에 대해 unique이므로, 다른 사용자가 이미 저장한 URL은 덮어쓰지 않고 건너뜁니다.
+
+import csv
+import datetime
+import html
+import json
+from html.parser import HTMLParser
+
+from django.core.exceptions import ValidationError
+from django.core.validators import URLValidator
+from django.db import transaction
+from django.utils import timezone
+
+from _20250723django.bulk import chunked, explicit_timestamps
+from bookmark import search
+from bookmark.models import Bookmark, Category
+
+FORMATS = ('html', 'json', 'csv')
+FIELDS = ('url', 'title', 'description', 'category', 'is_favorite', 'created_at')
+READ_SIZE = 64 * 1024 # 스트리밍 파싱 시 한 번에 읽을 문자 수
+DEFAULT_BATCH_SIZE = 1000
+
+URL_MAX_LENGTH = Bookmark._meta.get_field('url').max_length
+TITLE_MAX_LENGTH = Bookmark._meta.get_field('title').max_length
+CATEGORY_MAX_LENGTH = Category._meta.get_field('name').max_length
+
+validate_url = URLValidator(schemes=['http', 'https', 'ftp', 'ftps'])
+
+
+def guess_format(filename):
+    # 파일 확장자로 형식을 추측합니다. (.htm/.html -> html, .json/.jsonl -> json, .csv -> csv)
+    extension = filename.rsplit('.', 1)[-1].lower() if '.' in filename else ''
+    return {'htm': 'html', 'html': 'html', 'json': 'json', 'jsonl': 'json', 'csv': 'csv'}.get(extension)
+
+
+# --- 가져오기: 파서 ---
+# 각 파서는 텍스트 파일 객체를 받아 {'url', 'title', 'description', 'category', 'is_favorite', 'created_at'} dict를 차례로 돌려줍니다.
+
+class NetscapeBookmarkParser(HTMLParser):
+    # 브라우저(Chrome, Firefox, Edge, Safari)의 "북마크 HTML 내보내기" 형식
+    #   <DT><H3>폴더</H3>
+    #   <DL><p>
+    #       <DT><A HREF="https://..." ADD_DATE="1690000000">제목</A>
+    #       <DD>설명
+    #   </DL><p>
+    # 폴더 이름(가장 안쪽 폴더)을 카테고리로 사용합니다. feed()할 때마다 완성된 항목이 records에 쌓입니다.
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.records = []
+        self.folders = [] # 열린 <DL>마다 폴더 이름 (이름 없는 최상위 목록은 None)
+        self.pending_folder = None # 직전에 읽은 <H3> 이름 (다음 <DL>이 이 폴더의 내용)
+        self.current = None # 읽는 중인 항목 (<DD> 설명이 뒤따를 수 있으므로 다음 항목이 시작될 때 확정)
+        self.capture = None # 텍스트를 모으는 중인 대상 ('title', 'folder', 'description')
+        self.text = []
+
+    def _flush(self):
+        self._end_capture()
+        if self.current is not None:
+            self.records.append(self.current)
+            self.current = None
+
+    def _end_capture(self):
+        if self.capture is None:
+            return
+        text = ' '.join(''.join(self.text).split())
+        if self.capture == 'folder':
+            self.pending_folder = text
+        elif self.current is not None:
+            self.current[self.capture] = text
+        self.capture = None
+        self.text = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag in ('dt', 'dl', 'h3', 'a'):
+            self._flush()
+        if tag == 'dl':
+            self.folders.append(self.pending_folder)
+            self.pending_folder = None
+        elif tag == 'h3':
+            self.capture = 'folder'
+        elif tag == 'a':
+            attrs = dict(attrs)
+            add_date = attrs.get('add_date')
+            folder = next((name for name in reversed(self.folders) if name), '')
+            self.current = {
+                'url': attrs.get('href') or '',
+                'title': '',
+                'description': '',
+                'category': folder,
+                'is_favorite': False,
+                'created_at': add_date,
+            }
+            self.capture = 'title'
+        elif tag == 'dd' and self.current is not None:
+            self.capture = 'description'
+
+    def handle_endtag(self, tag):
+        if tag in ('a', 'h3'):
+            self._end_capture()
+        elif tag == 'dl':
+            self._flush()
+            if self.folders:
+                self.folders.pop()
+
+    def handle_data(self, data):
+        if self.capture is not None:
+            self.text.append(data)
+
+    def close(self):
+        super().close()
+        self._flush()
+
+
+def parse_netscape(file):
+    parser = NetscapeBookmarkParser()
+    while chunk := file.read(READ_SIZE):
+        parser.feed(chunk)
+        yield from parser.records
+        parser.records.clear()
+    parser.close()
+    yield from parser.records
+
+
+def parse_json(file):
+    # JSON 배열([{...}, {...}]) 또는 JSON Lines(한 줄에 객체 하나)를 객체 단위로 읽습니다.
+    # 배열도 json.load()로 한 번에 읽지 않고 raw_decode()로 객체를 하나씩 잘라내므로 메모리 사용량이 일정합니다.
+    decoder = json.JSONDecoder()
+    buffer = ''
+    eof = False
+    while True:
+        buffer = buffer.lstrip().lstrip('[,').lstrip()
+        if buffer.startswith(']'):
+            return
+        if buffer:
+            try:
+                obj, end = decoder.raw_decode(buffer)
+            except json.JSONDecodeError:
+                if eof:
+                    raise ValueError('JSON 형식이 올바르지 않습니다.')
+            else:
+                if isinstance(obj, dict):
+                    yield obj
+                buffer = buffer[end:]
+                continue
+        elif eof:
+            return
+        chunk = file.read(READ_SIZE)
+        if chunk:
+            buffer += chunk
+        else:
+            eof = True
+
+
+def parse_csv(file):
+    # 첫 줄이 머리글(url, title, description, category, is_favorite, created_at)인 CSV
+    yield from csv.DictReader(file)
+
+
+PARSERS = {'html': parse_netscape, 'json': parse_json, 'csv': parse_csv}
+
+
+def parse(file, format):
+    return PARSERS[format](file)
+
+
+# --- 가져오기: 저장 ---
+
+def _parse_bool(value):
+    if isinstance(value, str):
+        return value.strip().lower() in ('1', 'true', 'yes', 'y', 'on')
+    return bool(value)
+
+
+def _parse_datetime(value):
+    # Netscape ADD_DATE(초 단위 유닉스 시각), 숫자, ISO 8601 문자열을 aware datetime으로 바꿉니다.
+    if value in (None, ''):
+        return None
+    try:
+        return datetime.datetime.fromtimestamp(int(float(value)), tz=datetime.timezone.utc)
+    except (TypeError, ValueError, OverflowError, OSError):
+        pass
+    try:
+        parsed = datetime.datetime.fromisoformat(str(value))
+    except ValueError:
+        return None
+    return parsed if timezone.is_aware(parsed) else timezone.make_aware(parsed)
+
+
+def clean_record(record):
+    # 가져올 항목 하나를 정리합니다. 저장할 수 없는 항목(잘못된 URL 등)은 None
+    url = str(record.get('url') or '').strip()
+    if not url or len(url) > URL_MAX_LENGTH:
+        return None
+    try:
+        validate_url(url)
+    except ValidationError:
+        return None
+    return {
+        'url': url,
+        'title': (str(record.get('title') or '').strip() or url)[:TITLE_MAX_LENGTH],
+        'description': str(record.get('description') or '').strip(),
+        'category': str(record.get('category') or '').strip()[:CATEGORY_MAX_LENGTH],
+        'is_favorite': _parse_bool(record.get('is_favorite')),
+        'created_at': _parse_datetime(record.get('created_at')),
+    }
+
+
+class BookmarkImporter:
+    # 항목을 batch_size개씩 저장하는 가져오기 도구
+    # 결과는 counts (created: 새로 만든 수, updated: 내 북마크를 갱신한 수,
+    #               conflicts: 다른 사용자의 URL이라 건너뛴 수, invalid: 잘못된 항목 수)에 누적됩니다.
+
+    def __init__(self, owner, batch_size=DEFAULT_BATCH_SIZE):
+        self.owner = owner
+        self.batch_size = batch_size
+        self.category_ids = {} # 카테고리 이름 -> id (배치 사이에서 재사용)
+        self.counts = {'created': 0, 'updated': 0, 'conflicts': 0, 'invalid': 0}
+
+    def run(self, records):
+        for batch in chunked(records, self.batch_size):
+            self.save_batch(batch)
+        return self.counts
+
+    def _resolve_categories(self, names):
+        # 아직 모르는 카테고리 이름만 조회하고, 없는 것은 한 번에 만듭니다.
+        missing = {name for name in names if name and name not in self.category_ids}
+        if missing:
+            Category.objects.bulk_create([Category(name=name) for name in missing], ignore_conflicts=True)
+            self.category_ids.update(Category.objects.filter(name__in=missing).values_list('name', 'pk'))
+
+    def save_batch(self, records):
+        # 배치 안에서 같은 URL이 여러 번 나오면 마지막 항목을 사용합니다.
+        cleaned = {}
+        for record in records:
+            record = clean_record(record)
+            if record is None:
+                self.counts['invalid'] += 1
+            else:
+                cleaned[record['url']] = record
+        if not cleaned:
+            return
+
+        with transaction.atomic():
+            # url은 전체 사용자에 대해 unique: 내 북마크는 갱신, 다른 사용자의 북마크는 건너뜁니다.
+            existing = {}
+            for url, owner_id, pk in Bookmark.objects.filter(url__in=cleaned).values_list('url', 'owner_id', 'pk'):
+                if owner_id == self.owner.pk:
+                    existing[url] = pk
+                else:
+                    del cleaned[url]
+                    self.counts['conflicts'] += 1
+            if not cleaned:
+                return
+            self._resolve_categories({record['category'] for record in cleaned.values()})
+
+            now = timezone.now()
+            new_bookmarks, updated_bookmarks = [], []
+            for record in cleaned.values():
+                bookmark = Bookmark(
+                    pk=existing.get(record['url']),
+                    url=record['url'],
+                    title=record['title'],
+                    description=record['description'],
+                    category_id=self.category_ids.get(record['category']),
+                    category_name=record['category'] if record['category'] in self.category_ids else '',
+                    is_favorite=record['is_favorite'],
+                    owner=self.owner,
+                    created_at=record['created_at'] or now,
+                    updated_at=now,
+                )
+                bookmark.set_url_parts() # save()에서 계산하던 host / domain (category_name은 위에서 지정)
+                (updated_bookmarks if bookmark.pk else new_bookmarks).append(bookmark)
+
+            # 위의 소유자 확인과 저장 사이에 다른 사용자가 같은 URL을 저장할 수 있으므로 저장할 때 소유자를 다시 확인합니다.
+            # - 이미 있는 내 북마크: owner 조건을 붙여 내용만 갱신합니다. (작성일과 즐겨찾기 표시는 기존 값 유지)
+            # - 새 URL: 충돌하면 덮어쓰지 않고 건너뛰고(ignore_conflicts), 실제로 내 것이 된 URL만 센 뒤 나머지는 conflicts로 셉니다.
+            updated = Bookmark.objects.filter(owner=self.owner).bulk_update(
+                updated_bookmarks,
+                ['title', 'description', 'category', 'category_name', 'host', 'domain', 'updated_at'],
+            )
+            with explicit_timestamps(Bookmark):
+                Bookmark.objects.bulk_create(new_bookmarks, ignore_conflicts=True)
+            created = Bookmark.objects.filter(url__in=[bookmark.url for bookmark in new_bookmarks], owner=self.owner).count()
+            self.counts['conflicts'] += len(new_bookmarks) - created
+            # bulk_create / bulk_update는 post_save 시그널을 보내지 않으므로 검색 색인을 직접 갱신합니다.
+            search.index_bookmarks(
+                Bookmark.objects.filter(url__in=cleaned, owner=self.owner)
+                .select_related('category').only('url', 'title', 'description', 'owner', 'category__name')
+            )
+        self.counts['updated'] += updated
+        self.counts['created'] += created
+
+
+def import_bookmarks(owner, file, format, batch_size=DEFAULT_BATCH_SIZE):
+    # 텍스트 파일 객체(file)의 북마크를 owner의 북마크로 가져옵니다. 결과 counts dict를 반환합니다.
+    return BookmarkImporter(owner, batch_size).run(parse(file, format))
+
+
+# --- 내보내기 ---
+# 각 함수는 북마크 쿼리셋을 받아 응답 본문 조각(str)을 차례로 돌려줍니다.
+
+EXPORT_CHUNK_SIZE = 2000
+
+
+def export_queryset(owner):
+    # Netscape 형식의 폴더 구분을 위해 카테고리 순서로 정렬합니다. (카테고리 없는 북마크가 먼저)
+    return (
+        Bookmark.objects.filter(owner=owner)
+        .select_related('category')
+        .order_by('category__name', 'pk')
+    )
+
+
+def _timestamp(value):
+    return int(value.timestamp()) if value else ''
+
+
+def export_netscape(queryset):
+    yield (
+        '<!DOCTYPE NETSCAPE-Bookmark-file-1>\n'
+        '<META HTTP-EQUIV="Content-Type" CONTENT="text/html; charset=UTF-8">\n'
+        '<TITLE>Bookmarks</TITLE>\n<H1>Bookmarks</H1>\n<DL><p>\n'
+    )
+    current = None
+    lines = []
+    for bookmark in queryset.iterator(chunk_size=EXPORT_CHUNK_SIZE):
+        category = bookmark.category.name if bookmark.category_id else None
+        if category != current:
+            if current is not None:
+                lines.append('    </DL><p>\n')
+            if category is not None:
+                lines.append(f'    <DT><H3>{html.escape(category)}</H3>\n    <DL><p>\n')
+            current = category
+        indent = '        ' if current is not None else '    '
+        lines.append(
+            f'{indent}<DT><A HREF="{html.escape(bookmark.url)}" ADD_DATE="{_timestamp(bookmark.created_at)}"'
+            f'>{html.escape(bookmark.title)}</A>\n'
+        )
+        if bookmark.description:
+            lines.append(f'{indent}<DD>{html.escape(bookmark.description)}\n')
+        if len(lines) >= 200:
+            yield ''.join(lines)
+            lines = []
+    if current is not None:
+        lines.append('    </DL><p>\n')
+    lines.append('</DL><p>\n')
+    yield ''.join(lines)
+
+
+def _export_record(bookmark):
+    return {
+        'url': bookmark.url,
+        'title': bookmark.title,
+        'description': bookmark.description,
+        'category': bookmark.category.name if bookmark.category_id else '',
+        'is_favorite': bookmark.is_favorite,
+        'created_at': bookmark.created_at.isoformat() if bookmark.created_at else '',
+    }
+
+
+def export_json(queryset):
+    # 가져오기(parse_json)와 호환되는 JSON 배열 (한 줄에 객체 하나)
+    separator = '[\n'
+    for bookmark in queryset.iterator(chunk_size=EXPORT_CHUNK_SIZE):
+        yield separator + json.dumps(_export_record(bookmark), ensure_ascii=False)
+        separator = ',\n'
+    yield '[]\n' if separator == '[\n' else '\n]\n'
+
+
+class _Echo:
+    # csv.writer가 쓴 한 줄을 그대로 돌려주는 가짜 파일 (스트리밍 CSV용)
+    def write(self, value):
+        return value
+
+
+def export_csv(queryset):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(FIELDS)
+    for bookmark in queryset.iterator(chunk_size=EXPORT_CHUNK_SIZE):
+        record = _export_record(bookmark)
+        yield writer.writerow([record[field] for field in FIELDS])
+
+
+EXPORTERS = {
+    # 형식: (함수, Content-Type, 확장자)
+    'html': (export_netscape, 'text/html; charset=utf-8', 'html'),
+    'json': (export_json, 'application/json', 'json'),
+    'csv': (export_csv, 'text/csv; charset=utf-8', 'csv'),
+}
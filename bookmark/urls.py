@@ -10,4 +10,7 @@ urlpatterns = [
     path('<int:pk>/', views.BookmarkDetailView.as_view(), name='detail'),
     # 검색 기능 URL: BookmarkSearchListView 사용
     path('search/', views.BookmarkSearchListView.as_view(), name='search'),
+    # 가져오기 / 내보내기: Netscape 북마크 HTML, JSON, CSV
+    path('import/', views.BookmarkImportView.as_view(), name='import'),
+    path('export/', views.BookmarkExportView.as_view(), name='export'),
 ]
@@ -1,11 +1,51 @@
+import io
+
+from django.http import StreamingHttpResponse
 from django.shortcuts import render
+from django.views import View
 from django.views.generic.list import ListView
 from django.views.generic.detail import DetailView
 from bookmark.models import Bookmark, Category
-from django.db.models import Q # 검색 기능을 위해 Q 객체 임포트
+from bookmark.search import search_bookmarks # 북마크 검색 색인 조회
+from bookmark import transfer # 북마크 가져오기 / 내보내기 (스트리밍)
 from django.contrib.auth.mixins import LoginRequiredMixin # 로그인 여부 확인
+from _20250723django.mixins import ListQuerysetMixin # 목록 뷰 공통 쿼리셋 최적화 믹스인
+from _20250723django.pagination import CursorPaginationMixin # 커서(키셋) 페이지네이션 믹스인 (?cursor=)
+
+# 북마크 목록/검색에서 허용하는 정렬 필드 (sort 파라미터 값)
+VALID_SORT_FIELDS = ['title', 'url', 'created_at', 'updated_at', 'category__name']
+# 실제로 정렬에 사용하는 필드: 카테고리 이름은 JOIN 없이 (owner, category_name) 인덱스로 정렬하도록 사본 필드를 사용
+SORT_FIELD_COLUMNS = {'category__name': 'category_name'}
+
+
+def get_sort_column(sort_by):
+    return SORT_FIELD_COLUMNS.get(sort_by, sort_by)
+
+
+def get_bookmark_cursor_ordering(request):
+    # 커서 페이지네이션에 사용할 (정렬 필드, 내림차순 여부)를 sort / order 파라미터에서 구합니다.
+    sort_by = request.GET.get('sort', 'created_at')
+    if sort_by not in VALID_SORT_FIELDS:
+        sort_by = 'created_at'
+    return get_sort_column(sort_by), request.GET.get('order', 'desc') != 'asc'
+
+
+def get_page_range(paginator, page_obj, max_pages_to_show=5):
+    # 현재 페이지를 가운데에 두고 최대 max_pages_to_show개의 페이지 번호 범위를 만듭니다. (예: 1, 2, 3, ..., 10)
+    num_pages = paginator.num_pages
+    current_page = page_obj.number
+
+    start_page = max(1, current_page - (max_pages_to_show // 2))
+    end_page = min(num_pages, start_page + max_pages_to_show - 1)
+
+    # 시작 페이지 조정: 끝 페이지가 max_pages_to_show보다 작으면 시작 페이지를 더 당겨옴
+    if end_page - start_page + 1 < max_pages_to_show:
+        start_page = max(1, end_page - max_pages_to_show + 1)
+
+    return range(start_page, end_page + 1)
+
 
-class BookmarkListView(LoginRequiredMixin, ListView):
+class BookmarkListView(LoginRequiredMixin, CursorPaginationMixin, ListQuerysetMixin, ListView):
     # 모델 설정: Bookmark 모델을 사용
     model = Bookmark
     # 템플릿 파일 경로 설정: bookmark_list.html 템플릿을 사용
@@ -16,6 +56,8 @@ class BookmarkListView(LoginRequiredMixin, ListView):
     paginate_by = 10 
     # 로그인하지 않은 사용자가 접근 시 리다이렉트될 URL
     login_url = '/admin/login/' 
+    # 목록의 카테고리 배지를 JOIN으로 함께 가져와 항목마다 추가 쿼리가 생기지 않도록 함
+    list_select_related = ('category',)
 
     def get_queryset(self):
         # 현재 로그인한 사용자의 북마크만 가져오도록 필터링
@@ -25,9 +67,10 @@ class BookmarkListView(LoginRequiredMixin, ListView):
         sort_by = self.request.GET.get('sort', 'created_at') # 기본값: created_at
         order = self.request.GET.get('order', 'desc') # 기본값: 내림차순
 
-        valid_sort_fields = ['title', 'url', 'created_at', 'updated_at', 'category__name']
+        valid_sort_fields = VALID_SORT_FIELDS
         
         if sort_by in valid_sort_fields:
+            sort_by = get_sort_column(sort_by)
             if order == 'desc':
                 queryset = queryset.order_by(f'-{sort_by}')
             else:
@@ -35,6 +78,10 @@ class BookmarkListView(LoginRequiredMixin, ListView):
 
         return queryset
 
+    def get_cursor_ordering(self):
+        # 커서 페이지네이션도 현재 sort / order 파라미터의 정렬을 그대로 따릅니다.
+        return get_bookmark_cursor_ordering(self.request)
+
     def get_context_data(self, **kwargs):
         # 기본 컨텍스트 데이터를 가져옴
         context = super().get_context_data(**kwargs)
@@ -42,23 +89,9 @@ class BookmarkListView(LoginRequiredMixin, ListView):
         context['current_sort_by'] = self.request.GET.get('sort', 'created_at')
         context['current_order'] = self.request.GET.get('order', 'desc')
 
-        # 페이지네이션 정보를 템플릿으로 전달
-        paginator = context['paginator']
-        page_obj = context['page_obj']
-        
-        # 페이지 번호 목록 생성 (예: 1, 2, 3, ..., 10)
-        max_pages_to_show = 5 # 보여줄 최대 페이지 번호 개수
-        num_pages = paginator.num_pages
-        current_page = page_obj.number
-
-        start_page = max(1, current_page - (max_pages_to_show // 2))
-        end_page = min(num_pages, start_page + max_pages_to_show - 1)
-
-        # 시작 페이지 조정: 끝 페이지가 max_pages_to_show보다 작으면 시작 페이지를 더 당겨옴
-        if end_page - start_page + 1 < max_pages_to_show:
-            start_page = max(1, end_page - max_pages_to_show + 1)
-
-        context['page_range'] = range(start_page, end_page + 1)
+        # 페이지네이션 정보를 템플릿으로 전달 (커서 방식에서는 페이지 번호가 없으므로 생략)
+        if not context['cursor_page'] and context['is_paginated']:
+            context['page_range'] = get_page_range(context['paginator'], context['page_obj'])
         
         return context
 
@@ -76,41 +109,39 @@ class BookmarkDetailView(LoginRequiredMixin, DetailView):
         queryset = super().get_queryset().filter(owner=self.request.user)
         return queryset
 
-class BookmarkSearchListView(LoginRequiredMixin, ListView):
+class BookmarkSearchListView(LoginRequiredMixin, CursorPaginationMixin, ListQuerysetMixin, ListView):
     # 검색 뷰는 BookmarkListView를 상속받아 대부분의 기능을 재사용
     model = Bookmark
     template_name = 'bookmark/bookmark_list.html' # 동일한 템플릿 사용
     context_object_name = 'bookmarks' # 템플릿에서 북마크 목록을 'bookmarks'로 접근
     paginate_by = 10 # 한 페이지에 10개의 객체 표시
     login_url = '/admin/login/'
+    list_select_related = ('category',) # BookmarkListView와 같은 템플릿이므로 동일하게 최적화
 
     def get_queryset(self):
         # BookmarkListView의 get_queryset을 먼저 호출하여 기본 필터링(사용자)을 적용
         # 여기서는 LoginRequiredMixin의 get_queryset을 호출하는 것이 아니라,
-        # 직접 Bookmark.objects.filter(owner=self.request.user)를 사용합니다.
+        # ListQuerysetMixin이 적용된 기본 쿼리셋에 소유자 필터를 적용합니다.
         # 이렇게 하면 BookmarkSearchListView가 BookmarkListView를 상속받지 않아도 됩니다.
-        queryset = Bookmark.objects.filter(owner=self.request.user)
+        queryset = super().get_queryset().filter(owner=self.request.user)
         
         # 검색어 가져오기
         search_query = self.request.GET.get('q', '')
         self.search_query = search_query # 템플릿에 검색어를 전달하기 위해 저장
 
         if search_query:
-            # Q 객체를 사용하여 제목(title) 또는 URL(url) 또는 설명(description) 또는 카테고리 이름에서 검색
-            queryset = queryset.filter(
-                Q(title__icontains=search_query) |
-                Q(url__icontains=search_query) |
-                Q(description__icontains=search_query) |
-                Q(category__name__icontains=search_query)
-            ).distinct() # 중복 결과 제거
+            # 소유자별 검색 색인(bookmark_fts)에서 제목, URL(호스트/도메인/경로), 설명, 카테고리 이름을 접두어 검색
+            # 'site:example.com' 형태의 필터는 host / domain 인덱스로 처리합니다.
+            queryset = search_bookmarks(queryset, self.request.user, search_query)
 
         # 검색 결과에도 정렬을 적용합니다.
         sort_by = self.request.GET.get('sort', 'created_at')
         order = self.request.GET.get('order', 'desc')
         
-        valid_sort_fields = ['title', 'url', 'created_at', 'updated_at', 'category__name']
+        valid_sort_fields = VALID_SORT_FIELDS
         
         if sort_by in valid_sort_fields:
+            sort_by = get_sort_column(sort_by)
             if order == 'asc':
                 queryset = queryset.order_by(sort_by)
             elif order == 'desc':
@@ -118,6 +149,10 @@ class BookmarkSearchListView(LoginRequiredMixin, ListView):
 
         return queryset
 
+    def get_cursor_ordering(self):
+        # 커서 페이지네이션도 현재 sort / order 파라미터의 정렬을 그대로 따릅니다.
+        return get_bookmark_cursor_ordering(self.request)
+
     def get_context_data(self, **kwargs):
         # 기본 컨텍스트 데이터를 가져옴
         context = super().get_context_data(**kwargs)
@@ -127,22 +162,49 @@ class BookmarkSearchListView(LoginRequiredMixin, ListView):
         context['current_sort_by'] = self.request.GET.get('sort', 'created_at')
         context['current_order'] = self.request.GET.get('order', 'desc')
 
-        # 페이지네이션 정보를 템플릿으로 전달
-        paginator = context['paginator']
-        page_obj = context['page_obj']
+        # 페이지네이션 정보를 템플릿으로 전달 (커서 방식에서는 페이지 번호가 없으므로 생략)
+        if not context['cursor_page'] and context['is_paginated']:
+            context['page_range'] = get_page_range(context['paginator'], context['page_obj'])
         
-        # 페이지 번호 목록 생성 (예: 1, 2, 3, ..., 10)
-        max_pages_to_show = 5 # 보여줄 최대 페이지 번호 개수
-        num_pages = paginator.num_pages
-        current_page = page_obj.number
+        return context
 
-        start_page = max(1, current_page - (max_pages_to_show // 2))
-        end_page = min(num_pages, start_page + max_pages_to_show - 1)
+class BookmarkImportView(LoginRequiredMixin, View):
+    # 브라우저 내보내기 파일(Netscape 북마크 HTML), JSON, CSV를 현재 사용자의 북마크로 가져옵니다.
+    # 업로드 파일은 조금씩 읽어 batch 단위로 저장하므로 항목 수가 많아도 메모리 사용량이 일정합니다.
+    template_name = 'bookmark/bookmark_import.html'
+    login_url = '/admin/login/'
 
-        # 시작 페이지 조정: 끝 페이지가 max_pages_to_show보다 작으면 시작 페이지를 더 당겨옴
-        if end_page - start_page + 1 < max_pages_to_show:
-            start_page = max(1, end_page - max_pages_to_show + 1)
+    def get(self, request):
+        return render(request, self.template_name, {'formats': transfer.FORMATS})
+
+    def post(self, request):
+        context = {'formats': transfer.FORMATS}
+        upload = request.FILES.get('file')
+        format = request.POST.get('format') or (upload and transfer.guess_format(upload.name))
+        if upload is None or format not in transfer.FORMATS:
+            context['error'] = '가져올 파일과 형식(html, json, csv)을 선택하세요.'
+            return render(request, self.template_name, context, status=400)
+        # 업로드 파일(바이트)을 UTF-8 텍스트로 읽습니다. (BOM이 있는 CSV도 처리)
+        file = io.TextIOWrapper(upload.file, encoding='utf-8-sig', errors='replace', newline='')
+        try:
+            context['result'] = transfer.import_bookmarks(request.user, file, format)
+        except ValueError as error:
+            context['error'] = str(error)
+            return render(request, self.template_name, context, status=400)
+        finally:
+            file.detach() # 업로드 파일은 Django가 닫습니다.
+        return render(request, self.template_name, context)
+
+class BookmarkExportView(LoginRequiredMixin, View):
+    # 현재 사용자의 북마크를 파일로 내려받습니다. (?format=html|json|csv, 기본값: html)
+    # StreamingHttpResponse로 북마크를 나누어 읽으며 보내므로 전체 목록을 메모리에 올리지 않습니다.
+    login_url = '/admin/login/'
 
-        context['page_range'] = range(start_page, end_page + 1)
-        
-        return context
+    def get(self, request):
+        format = request.GET.get('format', 'html')
+        if format not in transfer.EXPORTERS:
+            format = 'html'
+        exporter, content_type, extension = transfer.EXPORTERS[format]
+        response = StreamingHttpResponse(exporter(transfer.export_queryset(request.user)), content_type=content_type)
+        response['Content-Disposition'] = f'attachment; filename="bookmarks.{extension}"'
+        return response
@@ -4,3 +4,10 @@ from django.apps import AppConfig
 class HomeConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'home'
+
+    def ready(self):
+        from django.db.models.signals import post_migrate
+
+        from home import signals # 읽기 전용 복제본 갱신 시그널 수신기
+        signals.connect_replica_receivers()
+        post_migrate.connect(signals.finish_migrate, dispatch_uid='home_finish_migrate')
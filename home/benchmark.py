@@ -0,0 +1,231 @@
+# home/benchmark.py
+# 같은 프로세스 안에서 WSGI / ASGI 애플리케이션에 직접 요청을 보내 응답 시간을 측정하는 도구입니다.
+# 네트워크와 서버 프로세스를 거치지 않으므로 Django 요청 처리(미들웨어, 뷰, ORM, 템플릿) 비용만 비교할 수 있습니다.
+# - WSGI: 스레드 풀(동시 요청 수 = 스레드 수)로 wsgi 애플리케이션을 호출합니다. (gunicorn --threads와 유사)
+# - ASGI: 하나의 이벤트 루프에서 동시 요청 수만큼의 작업이 asgi 애플리케이션을 호출합니다. (uvicorn 워커 1개와 유사)
+# - 이름 있는 URL 측정: 앱의 모든 URL 이름을 차례로 요청하여 URL별 p50/p95와 쿼리 수를 기록합니다. (bench_urls)
+
+import asyncio
+import io
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+from urllib.parse import quote, unquote, unquote_to_bytes, urlencode, urlsplit
+from wsgiref.util import setup_testing_defaults
+
+from django.conf import settings
+from django.db import connections
+from django.urls import get_resolver, reverse
+
+
+# 쿼리 문자열에서 그대로 둘 문자 (한글 등 ASCII가 아닌 문자와 공백만 퍼센트 인코딩)
+QUERY_SAFE = "=&+%;/?:@,$!'()*~"
+
+# 측정 요청의 Host 헤더 (측정 명령이 allow_host()로 ALLOWED_HOSTS에 추가)
+HOST = 'localhost'
+
+
+def allow_host():
+    # Host 검사에 걸려 모든 요청이 400으로 끝나지 않도록 HOST를 ALLOWED_HOSTS에 추가합니다.
+    # (DEBUG가 아니면 ALLOWED_HOSTS = []는 모든 호스트를 거부)
+    if HOST not in settings.ALLOWED_HOSTS:
+        settings.ALLOWED_HOSTS = [*settings.ALLOWED_HOSTS, HOST]
+
+
+def is_error(status):
+    # 2xx / 3xx가 아닌 응답은 모두 오류입니다. (400, 404도 뷰를 측정한 값이 아님)
+    return not 200 <= status < 400
+
+
+def percentile(values, pct):
+    # 정렬된 값 목록의 pct 백분위수 (최근접 순위 방식)
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered) + 0.5) - 1))
+    return ordered[index]
+
+
+def summarize(durations, statuses, elapsed):
+    # 요청별 소요 시간(초)과 상태 코드로 결과 요약(dict)을 만듭니다. 시간 단위는 밀리초입니다.
+    millis = [duration * 1000 for duration in durations]
+    return {
+        'requests': len(durations),
+        'errors': sum(1 for status in statuses if is_error(status)),
+        'p50_ms': round(percentile(millis, 50), 2) if millis else None,
+        'p95_ms': round(percentile(millis, 95), 2) if millis else None,
+        'mean_ms': round(statistics.fmean(millis), 2) if millis else None,
+        'rps': round(len(durations) / elapsed, 1) if elapsed else None,
+    }
+
+
+# --- WSGI ---
+
+def wsgi_request(application, url, headers=None):
+    # url(경로 + 쿼리 문자열)에 GET 요청을 보내고 (상태 코드, 헤더 dict, 본문)을 반환합니다.
+    parts = urlsplit(url)
+    environ = {
+        'REQUEST_METHOD': 'GET',
+        'PATH_INFO': unquote_to_bytes(parts.path).decode('iso-8859-1'), # WSGI 규약: UTF-8 바이트를 latin-1 문자열로
+        'QUERY_STRING': quote(parts.query, safe=QUERY_SAFE),
+        'SERVER_NAME': HOST,
+        'HTTP_HOST': HOST,
+        'wsgi.input': io.BytesIO(),
+    }
+    for name, value in (headers or {}).items():
+        environ['HTTP_' + name.upper().replace('-', '_')] = value
+    setup_testing_defaults(environ)
+    started = {}
+
+    def start_response(status, response_headers, exc_info=None):
+        started['status'] = int(status.split(' ', 1)[0])
+        started['headers'] = dict(response_headers)
+
+    result = application(environ, start_response)
+    try:
+        body = b''.join(result)
+    finally:
+        if hasattr(result, 'close'):
+            result.close() # request_finished 시그널 (DB 연결 정리 등)
+    return started['status'], started['headers'], body
+
+
+def run_wsgi(application, urls, concurrency, total):
+    # urls를 순환하며 total개의 요청을 concurrency개의 스레드로 보냅니다.
+    def timed(url):
+        start = time.perf_counter()
+        status, _, _ = wsgi_request(application, url)
+        return time.perf_counter() - start, status
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(timed, (urls[i % len(urls)] for i in range(total))))
+    elapsed = time.perf_counter() - started
+    return summarize([duration for duration, _ in results], [status for _, status in results], elapsed)
+
+
+# --- 이름 있는 URL 측정 (bench_urls) ---
+
+def url_patterns(namespace):
+    # 네임스페이스에 속한 (URL 이름, URL 인자 이름 목록)
+    _, resolver = get_resolver().namespace_dict[namespace]
+    return [
+        (pattern.name, list(pattern.pattern.regex.groupindex))
+        for pattern in resolver.url_patterns if getattr(pattern, 'name', None)
+    ]
+
+
+def named_urls(namespaces, samples, query_strings=None):
+    # 네임스페이스별 모든 이름 있는 URL을 samples(네임스페이스: {인자 이름: 값})로 채워 만듭니다.
+    # 반환값: ([(이름, URL), ...], 인자 값이 없어 건너뛴 이름 목록)
+    urls, skipped = [], []
+    for namespace in namespaces:
+        values = samples.get(namespace, {})
+        for name, args in url_patterns(namespace):
+            full_name = f'{namespace}:{name}'
+            if any(arg not in values for arg in args):
+                skipped.append(full_name)
+                continue
+            url = reverse(full_name, kwargs={arg: values[arg] for arg in args})
+            query = (query_strings or {}).get(full_name)
+            urls.append((full_name, f'{url}?{urlencode(query)}' if query else url))
+    return urls, skipped
+
+
+class QueryCounter:
+    # 모든 DB 별칭(default, replica 등)의 execute_wrapper()에 넣어 실행된 SQL 수를 셉니다. (DEBUG 설정과 무관)
+    # 읽기 전용 요청의 조회는 복제본(replica)에서 실행되므로 기본 DB만 세면 빠집니다.
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+    def wrap_connections(self):
+        stack = ExitStack()
+        for alias in connections:
+            stack.enter_context(connections[alias].execute_wrapper(self))
+        return stack
+
+
+def measure_url(application, url, iterations, headers=None):
+    # 같은 URL을 iterations번 차례로 요청하여 응답 시간 요약과 요청당 쿼리 수(최댓값)를 반환합니다.
+    durations, statuses, queries = [], [], []
+    for _ in range(iterations):
+        counter = QueryCounter()
+        with counter.wrap_connections():
+            start = time.perf_counter()
+            status, _, _ = wsgi_request(application, url, headers)
+            durations.append(time.perf_counter() - start)
+        statuses.append(status)
+        queries.append(counter.count)
+    result = summarize(durations, statuses, sum(durations))
+    result.update(status=statuses[-1], queries=max(queries))
+    return result
+
+
+# --- ASGI ---
+
+async def asgi_request(application, url, headers=None):
+    # url에 GET 요청을 보내고 (상태 코드, 헤더 dict, 본문)을 반환합니다.
+    parts = urlsplit(url)
+    scope = {
+        'type': 'http',
+        'asgi': {'version': '3.0'},
+        'http_version': '1.1',
+        'method': 'GET',
+        'scheme': 'http',
+        'path': unquote(parts.path),
+        'raw_path': quote(unquote(parts.path)).encode(),
+        'query_string': quote(parts.query, safe=QUERY_SAFE).encode(),
+        'root_path': '',
+        'headers': [(b'host', HOST.encode())] + [
+            (name.lower().encode(), value.encode()) for name, value in (headers or {}).items()
+        ],
+        'client': ('127.0.0.1', 0),
+        'server': (HOST, 80),
+    }
+    received = False
+    response = {'body': []}
+
+    async def receive():
+        nonlocal received
+        if not received:
+            received = True
+            return {'type': 'http.request', 'body': b'', 'more_body': False}
+        # 연결이 끊기지 않은 상태: 핸들러가 응답을 마치면 이 대기를 취소합니다.
+        await asyncio.Future()
+
+    async def send(message):
+        if message['type'] == 'http.response.start':
+            response['status'] = message['status']
+            response['headers'] = {name.decode(): value.decode() for name, value in message['headers']}
+        elif message['type'] == 'http.response.body':
+            response['body'].append(message.get('body', b''))
+
+    await application(scope, receive, send)
+    return response['status'], response['headers'], b''.join(response['body'])
+
+
+async def _run_asgi(application, urls, concurrency, total):
+    results = []
+    pending = iter(range(total))
+
+    async def worker():
+        for i in pending:
+            start = time.perf_counter()
+            status, _, _ = await asgi_request(application, urls[i % len(urls)])
+            results.append((time.perf_counter() - start, status))
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    return summarize([duration for duration, _ in results], [status for _, status in results], elapsed)
+
+
+def run_asgi(application, urls, concurrency, total):
+    # urls를 순환하며 total개의 요청을 concurrency개의 동시 작업으로 보냅니다. (새 이벤트 루프에서 실행)
+    return asyncio.run(_run_asgi(application, urls, concurrency, total))
@@ -0,0 +1,72 @@
+import json
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.core.wsgi import get_wsgi_application
+
+from blog.models import Post
+from home import benchmark
+from photo.models import Photo
+
+
+# 공개 조회 페이지를 WSGI(동기 뷰)와 ASGI(비동기 뷰)로 번갈아 요청하여 응답 시간을 비교하는 관리 명령
+# 서버 없이 같은 프로세스에서 애플리케이션을 직접 호출합니다. (home/benchmark.py)
+# 사용 예:
+#   python manage.py bench_async                          # 동시 요청 16개, 요청 400개
+#   python manage.py bench_async -c 64 -n 2000 --json     # 결과를 JSON으로 출력
+#   python manage.py bench_async --url /blog/ --url /photo/
+class Command(BaseCommand):
+    help = '공개 조회 페이지에 대해 WSGI와 ASGI의 응답 시간(p50/p95)과 처리량을 비교합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('-c', '--concurrency', type=int, default=16, help='동시 요청 수 (WSGI 스레드 수 / ASGI 동시 작업 수)')
+        parser.add_argument('-n', '--requests', type=int, default=400, help='모드별 전체 요청 수')
+        parser.add_argument('--url', action='append', dest='urls', help='요청할 URL (여러 번 지정 가능, 기본: 주요 공개 페이지)')
+        parser.add_argument('--page-cache', action='store_true', help='익명 페이지 캐시를 켠 상태로 측정합니다. (기본: 끔)')
+        parser.add_argument('--json', action='store_true', help='결과를 JSON으로 출력합니다.')
+
+    def default_urls(self):
+        urls = ['/blog/', '/blog/?page=2', '/blog/archive/', '/blog/tag/', '/photo/', '/tagcloud/']
+        post = Post.objects.order_by('-created_at').only('slug').first()
+        if post is not None:
+            urls.append(post.get_absolute_url())
+            urls.append(f'/blog/search/?{urlencode({"q": post.title.split()[0]})}')
+        photo = Photo.objects.order_by('-created_at').only('pk').first()
+        if photo is not None:
+            urls.append(photo.get_absolute_url())
+        return urls
+
+    def handle(self, *args, **options):
+        if not options['page_cache']:
+            settings.PAGE_CACHE_TIMEOUT = 0 # 뷰 자체의 비용을 비교하기 위해 캐시 적중을 막습니다.
+        benchmark.allow_host()
+        from _20250723django.asgi import application as asgi_application
+
+        wsgi_application = get_wsgi_application()
+        urls = options['urls'] or self.default_urls()
+        concurrency, total = options['concurrency'], options['requests']
+
+        # 준비 실행: 템플릿 로더, URL 설정, DB 연결 등 첫 요청 비용을 측정에서 제외합니다.
+        # 오류 응답(2xx / 3xx가 아닌 응답)이 있으면 뷰의 비용을 측정할 수 없으므로 중단합니다.
+        for mode, warmup in (('wsgi', benchmark.run_wsgi(wsgi_application, urls, 1, len(urls))),
+                             ('asgi', benchmark.run_asgi(asgi_application, urls, 1, len(urls)))):
+            if warmup['errors']:
+                raise CommandError(f'{mode.upper()} 준비 실행에서 {warmup["errors"]}개의 요청이 오류 응답을 반환했습니다.')
+
+        results = {
+            'urls': urls,
+            'concurrency': concurrency,
+            'wsgi': benchmark.run_wsgi(wsgi_application, urls, concurrency, total),
+            'asgi': benchmark.run_asgi(asgi_application, urls, concurrency, total),
+        }
+        if options['json']:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+        self.stdout.write(f'URL {len(urls)}개, 동시 요청 {concurrency}개, 요청 {total}개')
+        for mode in ('wsgi', 'asgi'):
+            result = results[mode]
+            self.stdout.write(
+                f'{mode.upper():5} p50 {result["p50_ms"]}ms  p95 {result["p95_ms"]}ms  '
+                f'평균 {result["mean_ms"]}ms  {result["rps"]} req/s  오류 {result["errors"]}'
+            )
@@ -0,0 +1,125 @@
+import json
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.core.wsgi import get_wsgi_application
+from django.test import Client
+from django.utils import timezone
+from taggit.models import TaggedItem
+
+from blog.models import Post
+from bookmark.models import Bookmark
+from home import benchmark
+from home.seed import USERNAME_PREFIX
+from photo.models import Photo
+from tag_cloud.models import TagStat
+
+DEFAULT_NAMESPACES = ('blog', 'photo', 'bookmark', 'tag_cloud')
+
+
+# 앱의 모든 이름 있는 URL을 차례로 요청하여 URL별 응답 시간(p50/p95)과 쿼리 수를 JSON으로 출력하는 관리 명령
+# seed_data로 만든 데이터에서 측정하고, 결과 파일을 저장해 두었다가 변경 전후를 비교합니다.
+# 사용 예:
+#   python manage.py bench_urls                                # 결과 JSON을 화면에 출력
+#   python manage.py bench_urls -n 50 --output before.json     # URL마다 50번 요청, 파일로 저장
+#   python manage.py bench_urls --namespace blog --page-cache  # blog만, 페이지 캐시를 켠 상태로
+class Command(BaseCommand):
+    help = 'blog / photo / bookmark / tag_cloud의 모든 이름 있는 URL에 대해 p50/p95 응답 시간과 쿼리 수를 측정합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('-n', '--iterations', type=int, default=20, help='URL마다 요청할 횟수')
+        parser.add_argument('--namespace', action='append', dest='namespaces', help='측정할 URL 네임스페이스 (여러 번 지정 가능)')
+        parser.add_argument('--user', help='로그인이 필요한 페이지(bookmark)를 요청할 사용자 이름 (기본: 첫 번째 시드 사용자)')
+        parser.add_argument('--page-cache', action='store_true', help='익명 페이지 캐시를 켠 상태로 측정합니다. (기본: 끔)')
+        parser.add_argument('--output', help='결과 JSON을 저장할 파일 (기본: 화면 출력)')
+
+    def get_user(self, username):
+        if username:
+            user = User.objects.filter(username=username).first()
+            if user is None:
+                raise CommandError(f'사용자 {username}이(가) 없습니다.')
+            return user
+        return (
+            User.objects.filter(username__startswith=USERNAME_PREFIX, my_bookmarks__isnull=False).order_by('pk').first()
+            or User.objects.filter(my_bookmarks__isnull=False).order_by('pk').first()
+        )
+
+    def get_samples(self, user):
+        # URL 인자로 쓸 대표 값 (가장 최근 게시물/사진, 가장 많이 쓰인 태그, 사용자의 최근 북마크)
+        samples = {'blog': {}, 'photo': {}, 'bookmark': {}, 'tag_cloud': {}}
+        post = Post.objects.order_by('-created_at').only('slug', 'created_at').first()
+        if post is not None:
+            day = timezone.localdate(post.created_at)
+            samples['blog'].update(slug=post.slug, year=day.year, month=f'{day.month:02d}', day=f'{day.day:02d}')
+        post_tag = TagStat.objects.filter(num_posts__gt=0).order_by('-num_posts').values_list('tag__slug', flat=True).first()
+        if post_tag:
+            samples['blog']['tag_slug'] = post_tag
+        photo = Photo.objects.order_by('-created_at').only('pk').first()
+        if photo is not None:
+            samples['photo']['pk'] = photo.pk
+        photo_tag = TagStat.objects.filter(num_photos__gt=0).order_by('-num_photos').values_list('tag__slug', flat=True).first()
+        if photo_tag:
+            samples['photo']['tag_slug'] = photo_tag
+        stream_tag = TagStat.objects.order_by('-num_items').values_list('tag__slug', flat=True).first()
+        if stream_tag:
+            samples['tag_cloud']['tag_slug'] = stream_tag # 통합 태그 페이지 (게시물 + 사진)
+        if user is not None:
+            bookmark = Bookmark.objects.filter(owner=user).order_by('-created_at').only('pk').first()
+            if bookmark is not None:
+                samples['bookmark']['pk'] = bookmark.pk
+        return samples, post
+
+    def handle(self, *args, **options):
+        if not options['page_cache']:
+            settings.PAGE_CACHE_TIMEOUT = 0 # 뷰 자체의 비용을 측정하기 위해 캐시 적중을 막습니다.
+        benchmark.allow_host()
+        namespaces = options['namespaces'] or DEFAULT_NAMESPACES
+        user = self.get_user(options['user'])
+        samples, post = self.get_samples(user)
+        keyword = post.title.split()[0] if post is not None and post.title.split() else 'django'
+        urls, skipped = benchmark.named_urls(namespaces, samples, {
+            'blog:search': {'q': keyword},
+            'bookmark:search': {'q': keyword},
+        })
+
+        headers = {}
+        if user is not None:
+            # 세션 쿠키로 로그인한 상태를 만듭니다. (익명 페이지도 같은 쿠키로 요청하면 로그인 사용자 기준이 되므로 구분)
+            client = Client()
+            client.force_login(user)
+            headers['Cookie'] = f'{settings.SESSION_COOKIE_NAME}={client.cookies[settings.SESSION_COOKIE_NAME].value}'
+
+        application = get_wsgi_application()
+        results = {}
+        for name, url in urls:
+            namespace = name.split(':', 1)[0]
+            request_headers = headers if namespace == 'bookmark' else None
+            status, _, _ = benchmark.wsgi_request(application, url, request_headers) # 준비 실행 (첫 요청 비용 제외)
+            if benchmark.is_error(status):
+                # 오류 응답의 시간은 뷰의 비용이 아니므로 측정하지 않고 중단합니다.
+                raise CommandError(f'{name} ({url}) 요청이 {status} 응답을 반환했습니다.')
+            results[name] = {'url': url, **benchmark.measure_url(application, url, options['iterations'], request_headers)}
+            self.stderr.write(f'{name}: p50 {results[name]["p50_ms"]}ms, 쿼리 {results[name]["queries"]}개')
+
+        report = {
+            'measured_at': timezone.now().isoformat(),
+            'iterations': options['iterations'],
+            'page_cache': options['page_cache'],
+            'database': {
+                'posts': Post.objects.count(),
+                'photos': Photo.objects.count(),
+                'bookmarks': Bookmark.objects.count(),
+                'tagged_items': TaggedItem.objects.count(),
+            },
+            'user': user.username if user is not None else None,
+            'urls': results,
+            'skipped': skipped, # 인자로 쓸 데이터가 없어 측정하지 못한 URL 이름
+        }
+        output = json.dumps(report, indent=2, ensure_ascii=False)
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as output_file:
+                output_file.write(output + '\n')
+            self.stdout.write(self.style.SUCCESS(f'{len(results)}개 URL의 측정 결과를 {options["output"]}에 저장했습니다.'))
+        else:
+            self.stdout.write(output)
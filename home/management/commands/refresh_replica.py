@@ -0,0 +1,24 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from _20250723django import replica
+
+
+# 기본 DB(db.sqlite3)를 SQLite 백업 API로 읽기 전용 복제본(db.replica.sqlite3)에 복사하는 관리 명령 (_20250723django/replica.py)
+# 복제본이 낡으면(기본 DB 파일이 복사 후에 바뀌면) 웹 프로세스가 기본 DB에서 읽으면서 백그라운드에서 다시 복사하지만,
+# 대량 쓰기(seed_data 등) 직후 첫 요청부터 복제본을 사용하려면 이 명령으로 미리 복사합니다.
+# 사용 예:
+#   python manage.py refresh_replica
+#   python manage.py seed_data && python manage.py refresh_replica
+class Command(BaseCommand):
+    help = '기본 DB를 읽기 전용 복제본 파일로 복사합니다. (SQLite 백업 API)'
+
+    def handle(self, *args, **options):
+        if not replica.replica_configured():
+            raise CommandError(f"settings.DATABASES에 '{replica.REPLICA_ALIAS}' 별칭이 없습니다.")
+        started = time.perf_counter()
+        pages = replica.refresh_replica()
+        self.stdout.write(self.style.SUCCESS(
+            f'복제본 갱신 완료 ({pages}페이지, {time.perf_counter() - started:.2f}초)'
+        ))
@@ -0,0 +1,56 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from home.seed import Seeder
+
+
+# 성능 측정용 대량 시드 데이터를 생성하는 관리 명령 (home/seed.py)
+# 사용 예:
+#   python manage.py seed_data                                   # 작은 규모 (빠른 확인용)
+#   python manage.py seed_data --posts 200000 --photos 50000 --bookmarks 1000000 --tags 5000
+#   python manage.py seed_data --posts 1000 --photos 0 --seed 42  # 같은 시드는 같은 데이터
+# 시드 데이터 생성 후 python manage.py bench_urls로 측정합니다.
+class Command(BaseCommand):
+    help = 'bulk_create로 게시물/사진/북마크/태그 시드 데이터를 대량 생성합니다. (성능 측정용)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=20, help='사용자 수 (북마크 소유자, 작성자)')
+        parser.add_argument('--posts', type=int, default=2000, help='게시물 수')
+        parser.add_argument('--photos', type=int, default=500, help='사진 수 (작은 JPEG 파일을 MEDIA_ROOT에 생성)')
+        parser.add_argument('--bookmarks', type=int, default=10000, help='북마크 수 (사용자에게 고르게 분배)')
+        parser.add_argument('--tags', type=int, default=500, help='태그 수 (Zipf 분포로 게시물/사진에 연결)')
+        parser.add_argument('--max-tags', type=int, default=5, help='게시물 하나에 달 최대 태그 수 (사진은 이 값의 절반)')
+        parser.add_argument('--years', type=float, default=5, help='작성일을 흩어 놓을 기간 (최근 N년)')
+        parser.add_argument('--batch-size', type=int, default=2000, help='bulk_create 배치 크기')
+        parser.add_argument('--image-size', default='160x120', help='생성할 사진 크기 (폭x높이)')
+        parser.add_argument('--seed', type=int, help='난수 시드 (지정하면 같은 데이터를 다시 만들 수 있음)')
+
+    def handle(self, *args, **options):
+        try:
+            width, height = (int(value) for value in options['image_size'].lower().split('x'))
+        except ValueError:
+            raise CommandError('--image-size는 160x120 형식이어야 합니다.')
+        if options['users'] < 1:
+            raise CommandError('--users는 1 이상이어야 합니다.')
+
+        started = time.perf_counter()
+        seeder = Seeder(
+            batch_size=options['batch_size'],
+            years=options['years'],
+            seed=options['seed'],
+            image_size=(width, height),
+            log=self.stdout.write,
+        )
+        seeder.seed_users(options['users'])
+        seeder.seed_tags(options['tags'])
+        tagged = seeder.seed_posts(options['posts'], options['max_tags'])
+        tagged += seeder.seed_photos(options['photos'], max(1, options['max_tags'] // 2))
+        seeder.seed_bookmarks(options['bookmarks'])
+        seeder.rebuild_derived()
+
+        self.stdout.write(self.style.SUCCESS(
+            f'시드 데이터 생성 완료 (실행 ID {seeder.run_id}, 태그 연결 {tagged}개, {time.perf_counter() - started:.1f}초)'
+        ))
+        if options['photos']:
+            self.stdout.write('사진 렌디션은 python manage.py generate_photo_renditions로 생성할 수 있습니다.')
@@ -0,0 +1,243 @@
+# home/seed.py
+# 운영 규모의 데이터로 성능을 측정하기 위한 대량 시드 데이터 생성 모듈입니다. (관리 명령 seed_data에서 사용)
+# - 모든 행은 batch_size 단위의 bulk_create로 넣습니다. (save()와 시그널을 거치지 않음)
+# - 시그널이 유지하던 파생 데이터(검색 색인, 날짜 히스토그램, 태그 통계, 북마크 host/domain)는
+#   마지막에 각 모듈의 rebuild 함수로 한 번에 다시 계산합니다.
+# - 태그는 Zipf 분포(순위 r의 태그가 1/r^s에 비례하는 빈도)로 달아 실제 사이트처럼 소수의 인기 태그에 몰리게 합니다.
+# - 같은 데이터베이스에 여러 번 실행할 수 있도록 slug / URL / 파일 이름에 실행마다 다른 접두어(run_id)를 붙입니다.
+
+import datetime
+import io
+import itertools
+import os
+import random
+import uuid
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
+from django.utils import timezone
+from PIL import Image
+from taggit.models import Tag, TaggedItem
+
+from _20250723django import pagecache
+from _20250723django.bulk import explicit_timestamps
+
+USERNAME_PREFIX = 'seed-user-'
+SEED_PASSWORD = 'seed-password' # 시드 사용자 공통 비밀번호 (로컬 측정 전용, 해시는 한 번만 계산)
+TAG_PREFIX = 'seed-tag-'
+ZIPF_EXPONENT = 1.1
+
+WORDS = (
+    'django', 'python', 'sqlite', 'cache', 'query', 'index', 'async', 'template', 'photo', 'travel',
+    '장고', '파이썬', '데이터베이스', '캐시', '성능', '여행', '사진', '개발', '블로그', '서버',
+    'performance', 'latency', 'window', 'cursor', 'archive', 'search', 'bookmark', 'tag', 'cloud', 'render',
+)
+
+# 북마크 URL에 쓸 사이트 (실제 북마크처럼 몇몇 사이트에 몰리도록 Zipf 분포로 고릅니다)
+SITES = (
+    'docs.djangoproject.com', 'github.com', 'stackoverflow.com', 'news.ycombinator.com', 'www.python.org',
+    'blog.naver.com', 'www.youtube.com', 'developer.mozilla.org', 'sqlite.org', 'medium.com',
+    'velog.io', 'tistory.com', 'www.reddit.com', 'pypi.org', 'realpython.com',
+    'news.naver.com', 'www.coupang.com', 'map.kakao.com', 'en.wikipedia.org', 'ko.wikipedia.org',
+)
+
+
+def zipf_weights(count, exponent=ZIPF_EXPONENT):
+    # 순위 1..count의 누적 가중치 (random.choices의 cum_weights로 사용)
+    return list(itertools.accumulate(1 / rank ** exponent for rank in range(1, count + 1)))
+
+
+def sentence(rng, words=8):
+    return ' '.join(rng.choice(WORDS) for _ in range(words))
+
+
+def random_datetime(rng, years):
+    # 최근 years년 사이의 임의 시각
+    return timezone.now() - datetime.timedelta(seconds=rng.randrange(int(years * 365 * 24 * 3600)))
+
+
+def batches(total, batch_size):
+    # [0, total)을 batch_size 단위의 range로 나눕니다.
+    for start in range(0, total, batch_size):
+        yield range(start, min(start + batch_size, total))
+
+
+def generate_image(rng, width, height):
+    # 작은 그라데이션 JPEG 이미지 (사진 목록/상세 템플릿과 렌디션 생성에 쓸 수 있는 실제 이미지 파일)
+    start = [rng.randrange(256) for _ in range(3)]
+    end = [rng.randrange(256) for _ in range(3)]
+    gradient = Image.linear_gradient('L').resize((width, height))
+    image = Image.merge('RGB', [
+        gradient.point(lambda value, a=a, b=b: a + (b - a) * value // 255) for a, b in zip(start, end)
+    ])
+    buffer = io.BytesIO()
+    image.save(buffer, format='JPEG', quality=70)
+    return buffer.getvalue()
+
+
+class Seeder:
+    # 시드 데이터 생성기
+    # log: 진행 상황을 출력할 함수 (관리 명령의 stdout.write)
+
+    def __init__(self, batch_size=2000, years=5, seed=None, image_size=(160, 120), log=print):
+        self.batch_size = batch_size
+        self.years = years
+        self.image_size = image_size
+        self.rng = random.Random(seed)
+        self.run_id = uuid.UUID(int=self.rng.getrandbits(128)).hex[:8]
+        self.log = log
+        self.users = []
+        self.tag_ids = []
+        self.tag_weights = []
+
+    def seed_users(self, count):
+        # 로그인이 필요한 페이지(bookmark) 측정용 사용자
+        existing = set(User.objects.filter(username__startswith=USERNAME_PREFIX).values_list('username', flat=True))
+        names = [f'{USERNAME_PREFIX}{i}' for i in range(count)]
+        password = make_password(SEED_PASSWORD)
+        User.objects.bulk_create([
+            User(username=name, password=password) for name in names if name not in existing
+        ], batch_size=self.batch_size)
+        self.users = list(User.objects.filter(username__in=names).values_list('pk', flat=True))
+        self.log(f'사용자 {len(self.users)}명')
+
+    def seed_tags(self, count):
+        # 태그 이름은 실행과 무관하게 고정(seed-tag-00001 ...)하여 여러 번 실행해도 같은 태그를 재사용합니다.
+        names = [f'{TAG_PREFIX}{i:05d}' for i in range(1, count + 1)]
+        Tag.objects.bulk_create(
+            [Tag(name=name, slug=name) for name in names], batch_size=self.batch_size, ignore_conflicts=True,
+        )
+        ids = dict(Tag.objects.filter(name__startswith=TAG_PREFIX).values_list('name', 'pk'))
+        self.tag_ids = [ids[name] for name in names] # 순위 순서 (앞쪽일수록 자주 쓰임)
+        self.tag_weights = zipf_weights(len(self.tag_ids))
+        self.log(f'태그 {len(self.tag_ids)}개')
+
+    def pick_tags(self, max_tags):
+        if not self.tag_ids or max_tags <= 0:
+            return set()
+        count = self.rng.randint(1, max_tags)
+        return set(self.rng.choices(self.tag_ids, cum_weights=self.tag_weights, k=count))
+
+    def _tag_objects(self, objects, max_tags):
+        # 방금 만든 객체들에 Zipf 분포로 태그를 답니다. (TaggedItem bulk_create)
+        content_type = ContentType.objects.get_for_model(type(objects[0]))
+        items = [
+            TaggedItem(content_type=content_type, object_id=obj.pk, tag_id=tag_id)
+            for obj in objects for tag_id in self.pick_tags(max_tags)
+        ]
+        TaggedItem.objects.bulk_create(items, batch_size=self.batch_size)
+        return len(items)
+
+    def seed_posts(self, count, max_tags=5):
+        from blog.models import Post
+
+        tagged = 0
+        with explicit_timestamps(Post):
+            for batch in batches(count, self.batch_size):
+                posts = []
+                for i in batch:
+                    created_at = random_datetime(self.rng, self.years)
+                    title = sentence(self.rng, 4)[:40]
+                    post = Post(
+                        title=title,
+                        slug=f'seed-{self.run_id}-{i}',
+                        description=sentence(self.rng, 8)[:100],
+                        content=''.join(f'<p>{sentence(self.rng, 30)}</p>' for _ in range(self.rng.randint(2, 6))),
+                        created_at=created_at,
+                        modify_dt=created_at,
+                        author_id=self.rng.choice(self.users),
+                    )
+                    post.set_rendered_content() # bulk_create는 save()를 거치지 않으므로 직접 계산
+                    posts.append(post)
+                with transaction.atomic():
+                    Post.objects.bulk_create(posts)
+                    tagged += self._tag_objects(posts, max_tags)
+                self.log(f'게시물 {batch.stop}/{count}')
+        return tagged
+
+    def seed_photos(self, count, max_tags=3):
+        from photo.models import Photo
+
+        directory = f'photos/seed/{self.run_id}'
+        os.makedirs(os.path.join(settings.MEDIA_ROOT, directory), exist_ok=True)
+        width, height = self.image_size
+        tagged = 0
+        with explicit_timestamps(Photo):
+            for batch in batches(count, self.batch_size):
+                photos = []
+                for i in batch:
+                    name = f'{directory}/{i}.jpg'
+                    with open(os.path.join(settings.MEDIA_ROOT, name), 'wb') as image_file:
+                        image_file.write(generate_image(self.rng, width, height))
+                    created_at = random_datetime(self.rng, self.years)
+                    photos.append(Photo(
+                        title=sentence(self.rng, 3),
+                        image=name,
+                        description=sentence(self.rng, 12),
+                        created_at=created_at,
+                        updated_at=created_at,
+                        author_id=self.rng.choice(self.users),
+                    ))
+                with transaction.atomic():
+                    Photo.objects.bulk_create(photos)
+                    tagged += self._tag_objects(photos, max_tags)
+                self.log(f'사진 {batch.stop}/{count}')
+        return tagged
+
+    def seed_bookmarks(self, count, categories=20):
+        from bookmark.models import Bookmark, Category
+
+        category_choices = [] # (id, 이름)
+        if categories:
+            Category.objects.bulk_create(
+                [Category(name=f'seed-category-{i}') for i in range(categories)], ignore_conflicts=True,
+            )
+            category_choices = list(Category.objects.filter(name__startswith='seed-category-').values_list('pk', 'name'))
+        site_weights = zipf_weights(len(SITES))
+        with explicit_timestamps(Bookmark):
+            for batch in batches(count, self.batch_size):
+                bookmarks = []
+                for i in batch:
+                    site = self.rng.choices(SITES, cum_weights=site_weights)[0]
+                    created_at = random_datetime(self.rng, self.years)
+                    title = sentence(self.rng, 4)[:100]
+                    url = f'https://{site}/{self.rng.choice(WORDS)}/{self.run_id}-{i}'
+                    category_id, category_name = self.rng.choice(category_choices) if category_choices else (None, '')
+                    bookmark = Bookmark(
+                        title=title,
+                        url=url,
+                        category_id=category_id,
+                        category_name=category_name,
+                        description=sentence(self.rng, 10),
+                        owner_id=self.users[i % len(self.users)], # 사용자마다 고르게 나눔
+                        is_favorite=self.rng.random() < 0.1,
+                        created_at=created_at,
+                        updated_at=created_at,
+                    )
+                    bookmark.set_url_parts() # save()에서 계산하던 host / domain (category_name은 위에서 지정)
+                    bookmarks.append(bookmark)
+                with transaction.atomic():
+                    Bookmark.objects.bulk_create(bookmarks)
+                self.log(f'북마크 {batch.stop}/{count}')
+
+    def rebuild_derived(self):
+        # bulk_create가 건너뛴 시그널 대신 파생 데이터를 한 번에 다시 계산합니다.
+        from blog import archive, search as blog_search
+        from bookmark import search as bookmark_search
+        from photo import search as photo_search
+        from tag_cloud import stats, stream
+
+        self.log(f'날짜 히스토그램 {archive.rebuild()}행')
+        self.log(f'게시물 검색 색인 {blog_search.rebuild_index()}행')
+        self.log(f'사진 검색 색인 {photo_search.rebuild_index()}행')
+        self.log(f'북마크 검색 색인 {bookmark_search.rebuild_index()}행')
+        self.log(f'태그 통계 {stats.rebuild()}행')
+        self.log(f'태그 스트림 {stream.rebuild()}행')
+        # 익명 페이지 캐시: 목록/태그 클라우드/태그별 목록 무효화
+        slugs = Tag.objects.filter(pk__in=self.tag_ids).values_list('slug', flat=True)
+        pagecache.invalidate(
+            'post-list', 'photo-list', pagecache.TAG_CLOUD, *(pagecache.taggit_tag(slug) for slug in slugs),
+        )
@@ -0,0 +1,44 @@
+# home/signals.py
+# 기본 DB에 모델이 저장/삭제되면 커밋 후 읽기 전용 복제본의 (백그라운드) 갱신을 요청하는 시그널 수신기입니다. (_20250723django/replica.py)
+# HomeConfig.ready()에서 connect_replica_receivers()를 호출하여 수신기를 등록합니다.
+
+from django.apps import apps
+from django.db import connections
+from django.db.models.signals import m2m_changed, post_delete, post_migrate, post_save
+
+from _20250723django import replica
+
+
+def refresh_replica_on_write(sender, using, raw=False, **kwargs):
+    if raw: # loaddata 후에는 refresh_replica 명령으로 갱신
+        return
+    replica.schedule_refresh(using)
+
+
+def refresh_replica_on_m2m(sender, action, using, **kwargs):
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        replica.schedule_refresh(using)
+
+
+def connect_replica_receivers():
+    # 앱 레지스트리에 등록된 모델(자동 생성된 M2M 중간 모델 포함)에만 연결합니다.
+    # migrate가 기록하는 django_migrations 행(MigrationRecorder)과 마이그레이션 안의 과거 모델은
+    # 등록된 모델이 아니므로, 스키마 변경 도중에 복제본을 복사하지 않습니다. (migrate 후에는 아래 post_migrate에서 복사)
+    for model in apps.get_models(include_auto_created=True):
+        label = model._meta.label_lower
+        post_save.connect(refresh_replica_on_write, sender=model, dispatch_uid=f'replica_refresh_save:{label}')
+        post_delete.connect(refresh_replica_on_write, sender=model, dispatch_uid=f'replica_refresh_delete:{label}')
+        m2m_changed.connect(refresh_replica_on_m2m, sender=model, dispatch_uid=f'replica_refresh_m2m:{label}')
+
+
+def finish_migrate(sender, using, **kwargs):
+    # migrate가 끝나면 WAL 모드를 켜고 복제본을 새 스키마로 다시 복사합니다.
+    # post_migrate는 모델이 있는 앱마다 순서대로 보내지고, 앞선 앱의 수신기가 콘텐츠 타입/권한 행을 만들므로 마지막 앱에서 한 번만 실행합니다.
+    app_configs = [app_config for app_config in apps.get_app_configs() if app_config.models_module is not None]
+    if sender is not app_configs[-1]:
+        return
+    connection = connections[using]
+    if using != replica.REPLICA_ALIAS and connection.vendor == 'sqlite' and not connection.is_in_memory_db():
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA journal_mode=WAL')
+    replica.refresh_replica(using)
@@ -1,3 +1,135 @@
-from django.test import TestCase
+import os
+import sqlite3
+import tempfile
+from unittest import mock
 
-# Create your tests here.
+from django.http import Http404
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from _20250723django import replica
+from _20250723django.media import serve_media
+
+
+# 읽기 전용 복제본: 복사 이후 기본 DB에 어떤 연결이든 쓰기를 커밋하면 (시그널 없이도) 낡은 복제본으로 판단해야 합니다.
+class ReplicaStalenessTests(SimpleTestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        paths = {'default': os.path.join(directory.name, 'db.sqlite3'), replica.REPLICA_ALIAS: os.path.join(directory.name, 'replica.sqlite3')}
+        self.primary = sqlite3.connect(paths['default']) # 다른 프로세스의 연결
+        self.addCleanup(self.primary.close)
+        self.primary.execute('PRAGMA journal_mode=WAL')
+        self.primary.execute('CREATE TABLE item (id INTEGER PRIMARY KEY)')
+        self.primary.commit()
+        for target in (
+            mock.patch.object(replica, '_database_path', paths.__getitem__),
+            mock.patch.object(replica, '_separate_replica', return_value=True),
+            mock.patch.object(replica, '_source_connections', {}),
+        ):
+            target.start()
+            self.addCleanup(target.stop)
+        self.addCleanup(lambda: [connection.close() for connection in replica._source_connections.values()])
+
+    def test_write_without_signals_makes_replica_stale(self):
+        replica.refresh_replica()
+        self.assertTrue(replica.replica_ready())
+        self.primary.execute('INSERT INTO item VALUES (1)')
+        self.primary.commit()
+        with mock.patch.object(replica, 'request_refresh') as request_refresh:
+            self.assertFalse(replica.replica_ready())
+        request_refresh.assert_called_once_with()
+        replica.refresh_replica()
+        self.assertTrue(replica.replica_ready())
+        copied = sqlite3.connect(replica._database_path(replica.REPLICA_ALIAS))
+        self.addCleanup(copied.close)
+        self.assertEqual(copied.execute('SELECT COUNT(*) FROM item').fetchone()[0], 1)
+
+
+# 업로드 파일 전송(media.serve_media): 범위 요청(206 / 416)과 If-Range, 조건부 요청,
+# 앞단 프록시에 전송을 맡기는 X-Accel-Redirect / X-Sendfile 헤더를 확인합니다.
+class ServeMediaTests(SimpleTestCase):
+    content = bytes(range(256)) * 4
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        os.makedirs(os.path.join(directory.name, 'photos'))
+        for name in ('a.jpg', '사진.jpg', '.hidden.jpg'):
+            with open(os.path.join(directory.name, 'photos', name), 'wb') as file:
+                file.write(self.content)
+        with open(os.path.join(directory.name, 'private.txt'), 'wb') as file:
+            file.write(b'private')
+        settings = override_settings(MEDIA_ROOT=directory.name, MEDIA_OFFLOAD=None)
+        settings.enable()
+        self.addCleanup(settings.disable)
+        self.root = directory.name
+
+    def get(self, path='photos/a.jpg', method='get', **headers):
+        response = serve_media(getattr(RequestFactory(), method)(f'/media/{path}', **headers), path)
+        self.addCleanup(response.close)
+        return response
+
+    def body(self, response):
+        return b''.join(response.streaming_content) if response.streaming else response.content
+
+    def test_full_response(self):
+        response = self.get()
+        self.assertEqual((response.status_code, self.body(response)), (200, self.content))
+        self.assertEqual((response['Content-Length'], response['Accept-Ranges'], response['Content-Type']), ('1024', 'bytes', 'image/jpeg'))
+        self.assertIn('max-age=', response['Cache-Control'])
+        head = self.get(method='head')
+        self.assertEqual((head.status_code, head.content, head['Content-Length']), (200, b'', '1024'))
+
+    def test_range(self):
+        for header, (start, end) in (('bytes=10-19', (10, 19)), ('bytes=-5', (1019, 1023)), ('bytes=1000-', (1000, 1023)), ('bytes=1000-5000', (1000, 1023))):
+            with self.subTest(header=header):
+                response = self.get(HTTP_RANGE=header)
+                self.assertEqual(response.status_code, 206)
+                self.assertEqual(self.body(response), self.content[start:end + 1])
+                self.assertEqual(response['Content-Range'], f'bytes {start}-{end}/1024')
+                self.assertEqual(response['Content-Length'], str(end - start + 1))
+        for header in ('bytes=0-1,5-6', 'bytes=20-10', 'items=0-1', 'bytes=-'): # 여러 범위 / 잘못된 범위는 전체 응답
+            with self.subTest(header=header):
+                response = self.get(HTTP_RANGE=header)
+                self.assertEqual((response.status_code, self.body(response)), (200, self.content))
+
+    def test_unsatisfiable_range(self):
+        for header in ('bytes=1024-', 'bytes=5000-6000', 'bytes=-0'):
+            with self.subTest(header=header):
+                response = self.get(HTTP_RANGE=header)
+                self.assertEqual(response.status_code, 416)
+                self.assertEqual(response['Content-Range'], 'bytes */1024')
+
+    def test_if_range(self):
+        etag, last_modified = self.get()['ETag'], self.get()['Last-Modified']
+        for if_range, status in ((etag, 206), (last_modified, 206), ('"stale"', 200), (f'W/{etag}', 200), ('Mon, 01 Jan 2001 00:00:00 GMT', 200)):
+            with self.subTest(if_range=if_range):
+                response = self.get(HTTP_RANGE='bytes=0-9', HTTP_IF_RANGE=if_range)
+                self.assertEqual(response.status_code, status)
+                self.assertEqual(self.body(response), self.content[:10] if status == 206 else self.content)
+
+    def test_conditional_request(self):
+        etag = self.get()['ETag']
+        response = self.get(HTTP_IF_NONE_MATCH=etag, HTTP_RANGE='bytes=0-9')
+        self.assertEqual((response.status_code, response['ETag']), (304, etag))
+        self.assertEqual(self.get(HTTP_IF_MATCH='"stale"').status_code, 412)
+
+    def test_not_public_paths_are_not_found(self):
+        for path in ('private.txt', 'photos/.hidden.jpg', 'photos/../private.txt', 'photos/missing.jpg', 'photos'):
+            for offload in (None, 'x-accel-redirect'):
+                with self.subTest(path=path, offload=offload), override_settings(MEDIA_OFFLOAD=offload):
+                    with self.assertRaises(Http404):
+                        self.get(path)
+
+    def test_offload_headers(self):
+        with override_settings(MEDIA_OFFLOAD='x-accel-redirect', MEDIA_ACCEL_REDIRECT_PREFIX='/protected/'):
+            response = self.get('photos/사진.jpg', HTTP_RANGE='bytes=0-9')
+            self.assertEqual((response.status_code, response.content), (200, b''))
+            self.assertEqual(response['X-Accel-Redirect'], '/protected/photos/%EC%82%AC%EC%A7%84.jpg')
+            self.assertEqual(response['Content-Type'], 'image/jpeg')
+            self.assertNotIn('Content-Range', response)
+        with override_settings(MEDIA_OFFLOAD='x-sendfile'):
+            response = self.get()
+            self.assertEqual(response['X-Sendfile'], os.path.join(self.root, 'photos', 'a.jpg'))
+            self.assertNotIn('X-Accel-Redirect', response)
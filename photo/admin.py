@@ -1,9 +1,13 @@
 from django.contrib import admin
+from django.utils.html import format_html
+from _20250723django.admin import LimitedRelatedFieldListFilter, ScalableAdminMixin, TagListFilter # 대용량 변경 목록 도구
 from .models import Photo # Photo 모델 임포트
+from . import renditions # 사진 렌디션 (썸네일용 작은 이미지)
+from . import search # 사진 검색 색인(photo_fts)
 
 # Photo 모델을 Django 관리자 페이지에 등록
 @admin.register(Photo)
-class PhotoAdmin(admin.ModelAdmin):
+class PhotoAdmin(ScalableAdminMixin, admin.ModelAdmin):
     # 관리자 목록에 표시할 필드 정의
     # 'image_tag'는 나중에 썸네일 이미지를 보여주기 위해 추가할 커스텀 메서드입니다.
     list_display = ('title', 'author', 'created_at', 'updated_at', 'image_tag')
@@ -12,10 +16,16 @@ class PhotoAdmin(admin.ModelAdmin):
     list_display_links = ('title',)
     
     # 필터링 옵션 추가
-    list_filter = ('created_at', 'author', 'tags') # tags 필터 추가 (taggit 사용 시)
+    # 작성자/태그는 전체를 나열하지 않고 일부만 선택지로 표시합니다. (태그는 사진에 많이 쓰인 순)
+    list_filter = ('created_at', ('author', LimitedRelatedFieldListFilter), TagListFilter)
     
-    # 검색 기능 필드 지정
-    search_fields = ('title', 'description', 'author__username', 'tags__name') # 태그 이름으로도 검색 가능
+    # 검색 기능 필드 지정 (실제 검색은 get_search_results에서 검색 색인으로 처리)
+    search_fields = ('title', 'description', 'tags__name') # 태그 이름으로도 검색 가능
+    search_help_text = '제목, 설명, 태그에서 단어(접두어)로 검색합니다.'
+
+    list_select_related = ('author',) # 작성자 이름을 JOIN으로 함께 읽음
+    list_defer = ('description', 'placeholder') # 목록에서 쓰지 않는 긴 필드
+    autocomplete_fields = ('author',) # 사용자 전체를 <select>로 내려주지 않고 검색해서 선택
     
     # Admin 페이지에서 객체 생성/수정 시 필드 순서 및 그룹화
     fieldsets = (
@@ -35,10 +45,25 @@ class PhotoAdmin(admin.ModelAdmin):
     # 이 메서드는 list_display에 'image_tag'로 지정됩니다.
     def image_tag(self, obj):
         if obj.image:
-            from django.utils.html import mark_safe
             # Admin 목록에서 클릭 가능한 작은 썸네일 이미지 표시
-            return mark_safe(f'<img src="{obj.image.url}" style="width: 100px; height: auto; border-radius: 5px;" />')
+            # 원본 대신 100px 표시 폭(고해상도 화면 2배)에 맞는 작은 렌디션을 사용합니다.
+            # 지연 로딩하고, 렌디션이 없으면(처리 중) 원본 대신 대표 색만 표시합니다.
+            if (obj.renditions or {}).get('source') != obj.image.name:
+                return format_html(
+                    '<span style="display: inline-block; width: 100px; height: 66px; border-radius: 5px; background: {};"></span>',
+                    obj.dominant_color or '#ccc',
+                )
+            return format_html(
+                '<img src="{}" loading="lazy" decoding="async" style="width: 100px; height: auto; border-radius: 5px;" />',
+                renditions.closest_url(obj, 200),
+            )
         return "No Image"
     
     image_tag.short_description = '썸네일' # Admin 목록 헤더 이름
 
+    def get_search_results(self, request, queryset, search_term):
+        # LIKE '%...%' 전체 스캔과 태그 JOIN(중복 행 제거용 DISTINCT) 대신 검색 색인에서 일치한 사진만 읽습니다.
+        if not search_term.strip():
+            return queryset, False
+        return search.filter_queryset(queryset, search_term), False
+
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class PhotoConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'photo'
+
+    def ready(self):
+        from photo import signals # noqa: F401 (렌디션 생성 시그널 수신기 등록)
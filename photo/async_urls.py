@@ -0,0 +1,7 @@
+from photo import async_views # 비동기 뷰 모듈 (ASGI 전용)
+from photo.urls import app_name, build_urlpatterns # 동기 URL과 같은 네임스페이스와 패턴
+
+# photo/async_urls.py
+# ASGI 요청에서 사용하는 photo URL (_20250723django/async_urls.py에서 포함)
+
+urlpatterns = build_urlpatterns(async_views)
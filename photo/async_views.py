@@ -0,0 +1,61 @@
+from taggit.models import Tag # Tag 모델 임포트 (taggit 사용을 위해)
+from .models import Photo # Photo 모델 임포트
+from _20250723django import pagecache # 익명 사용자 페이지 캐시 (의존 태그 선언)
+from _20250723django.async_views import AsyncListView, AsyncDetailView # 비동기 뷰 기반 클래스
+
+# photo/async_views.py
+# photo/views.py의 목록/상세 뷰를 비동기로 옮긴 버전입니다. (ASGI 전용, photo/async_urls.py)
+
+# Photo 목록을 보여주는 비동기 뷰
+class PhotoLV(AsyncListView):
+    model = Photo
+    template_name = 'photo/photo_list.html'
+    context_object_name = 'photos'
+    paginate_by = 6
+    list_select_related = ('author',)
+    list_prefetch_related = ('tags',)
+    validator_timestamp_field = 'updated_at'
+
+    def get_queryset(self):
+        queryset = super().get_queryset().order_by('-created_at')
+        tag_slug = self.kwargs.get('tag_slug')
+        if tag_slug:
+            # 태그를 먼저 조회하지 않고 slug로 바로 조인합니다. (없는 태그는 빈 목록)
+            queryset = queryset.filter(tags__slug=tag_slug)
+        return queryset
+
+    def get_page_cache_tags(self):
+        return pagecache.list_cache_tags(Photo, self.kwargs.get('tag_slug'))
+
+    async def aget_context_data(self, **kwargs):
+        context = await super().aget_context_data(**kwargs)
+        tag_slug = self.kwargs.get('tag_slug')
+        if tag_slug:
+            tag_name = await Tag.objects.filter(slug=tag_slug).values_list('name', flat=True).afirst()
+            if tag_name:
+                context['tagname'] = tag_name
+                context['tag_slug'] = tag_slug
+        return context
+
+# Photo 상세 정보를 보여주는 비동기 뷰
+class PhotoDV(AsyncDetailView):
+    model = Photo
+    template_name = 'photo/photo_detail.html'
+    context_object_name = 'photo'
+    validator_timestamp_field = 'updated_at'
+
+    def get_queryset(self):
+        # 템플릿이 작성자와 태그를 표시하므로 미리 가져옵니다. (비동기 뷰에서는 지연 조회를 할 수 없음)
+        return super().get_queryset().select_related('author').prefetch_related('tags')
+
+    def get_tag_slug(self):
+        return self.request.GET.get('tag') or None
+
+    def get_page_cache_tags(self):
+        return pagecache.detail_cache_tags(self.object, self.get_tag_slug())
+
+    async def aget_context_data(self, **kwargs):
+        context = await super().aget_context_data(**kwargs)
+        context['tag_slug'] = self.get_tag_slug()
+        context['previous_photo'], context['next_photo'] = await self.object.aget_neighbors(context['tag_slug'])
+        return context
@@ -0,0 +1,120 @@
+# photo/imaging.py
+# 사진 파일을 처리하는 순수 Pillow 함수 모음입니다.
+# 이 모듈의 함수는 프로세스 풀(ProcessPoolExecutor)의 작업 프로세스에서 실행되므로
+# Django 모델이나 설정을 임포트하지 않고, 파일 경로와 숫자만 주고받습니다.
+
+import base64
+import io
+import os
+
+from PIL import Image, ImageOps
+
+# 렌디션 포맷별 (Pillow 포맷 이름, 확장자)
+FORMATS = {
+    'avif': ('AVIF', 'avif'),
+    'webp': ('WEBP', 'webp'),
+}
+
+PLACEHOLDER_SIZE = 16 # 미리보기(LQIP) 이미지의 긴 변 (px), 브라우저가 흐리게 확대해 표시합니다.
+PLACEHOLDER_QUALITY = 40
+COLOR_SAMPLE_SIZE = 64 # 대표 색을 고를 때 줄여서 볼 크기 (px)
+COLOR_PALETTE_SIZE = 8 # 대표 색 후보 수 (가장 많은 픽셀을 차지하는 후보를 선택)
+
+
+def available_formats(formats):
+    # 현재 Pillow 빌드에서 저장 가능한 포맷만 남깁니다. (AVIF는 libavif가 있어야 지원)
+    Image.init()
+    return [fmt for fmt in formats if FORMATS[fmt][0] in Image.SAVE]
+
+
+def rendition_name(name, width, fmt):
+    # 원본 파일 이름으로부터 렌디션 파일 이름을 결정적으로 만듭니다.
+    # 예: photos/2025/07/28/sea.jpg -> photos/2025/07/28/sea.w640.webp
+    stem, _ = os.path.splitext(name)
+    return f'{stem}.w{width}.{FORMATS[fmt][1]}'
+
+
+def target_widths(original_width, widths):
+    # 원본보다 큰 크기로 확대하지 않도록, 원본보다 큰 폭은 원본 폭 하나로 합칩니다.
+    return sorted({min(width, original_width) for width in widths})
+
+
+def _normalize(image):
+    # EXIF 회전 정보를 반영하고, 렌디션 포맷이 지원하는 색 모드(RGB/RGBA)로 변환합니다.
+    image = ImageOps.exif_transpose(image)
+    if image.mode not in ('RGB', 'RGBA'):
+        has_alpha = 'A' in image.getbands() or 'transparency' in image.info
+        image = image.convert('RGBA' if has_alpha else 'RGB')
+    return image
+
+
+def _save_atomic(image, path, pillow_format, quality):
+    # 임시 파일에 저장한 뒤 이름을 바꿔, 요청 중인 브라우저가 반쯤 쓰인 파일을 받지 않도록 합니다.
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f'{path}.tmp'
+    image.save(tmp_path, format=pillow_format, quality=quality)
+    os.replace(tmp_path, path)
+
+
+def _render(image, media_root, name, widths, formats, quality):
+    formats = available_formats(formats)
+    result = {fmt: [] for fmt in formats}
+    for width in target_widths(image.width, widths):
+        height = max(1, round(image.height * width / image.width))
+        resized = image if width == image.width else image.resize((width, height), Image.LANCZOS)
+        for fmt in formats:
+            path = os.path.join(media_root, rendition_name(name, width, fmt))
+            _save_atomic(resized, path, FORMATS[fmt][0], quality)
+            result[fmt].append(width)
+    return result
+
+
+def dominant_color(image):
+    # 줄인 이미지를 COLOR_PALETTE_SIZE색으로 양자화한 뒤 가장 많은 픽셀을 차지하는 색 ('#rrggbb')
+    sample = image.convert('RGB')
+    sample.thumbnail((COLOR_SAMPLE_SIZE, COLOR_SAMPLE_SIZE))
+    quantized = sample.quantize(colors=COLOR_PALETTE_SIZE)
+    _, index = max(quantized.getcolors())
+    red, green, blue = quantized.getpalette()[index * 3:index * 3 + 3]
+    return f'#{red:02x}{green:02x}{blue:02x}'
+
+
+def placeholder_data_uri(image):
+    # 긴 변 PLACEHOLDER_SIZE px의 아주 작은 WebP(지원하지 않으면 JPEG)를 data: URI로 만듭니다. (수백 바이트)
+    small = image.convert('RGB')
+    small.thumbnail((PLACEHOLDER_SIZE, PLACEHOLDER_SIZE))
+    pillow_format, mime = ('WEBP', 'image/webp') if available_formats(['webp']) else ('JPEG', 'image/jpeg')
+    buffer = io.BytesIO()
+    small.save(buffer, format=pillow_format, quality=PLACEHOLDER_QUALITY)
+    return f'data:{mime};base64,{base64.b64encode(buffer.getvalue()).decode()}'
+
+
+def _metadata(image):
+    # Photo 모델에 저장할 크기(EXIF 회전 반영)와 로딩 전 표시용 대표 색/미리보기 이미지
+    # 투명한 부분이 있는 이미지는 원본 뒤로 비쳐 보이므로 대표 색/미리보기 이미지를 만들지 않습니다.
+    metadata = {'width': image.width, 'height': image.height, 'dominant_color': '', 'placeholder': ''}
+    if image.mode != 'RGBA' or image.getchannel('A').getextrema()[0] == 255:
+        metadata['dominant_color'] = dominant_color(image)
+        metadata['placeholder'] = placeholder_data_uri(image)
+    return metadata
+
+
+def render_renditions(media_root, name, widths, formats, quality=80):
+    # media_root/name 원본으로부터 폭(widths) x 포맷(formats) 조합의 렌디션을 만듭니다.
+    # 반환값: {'webp': [320, 640, ...], 'avif': [...]} - 실제로 만들어진 폭 목록
+    with Image.open(os.path.join(media_root, name)) as original:
+        return _render(_normalize(original), media_root, name, widths, formats, quality)
+
+
+def read_metadata(media_root, name):
+    # media_root/name 원본의 크기, 대표 색, 미리보기 이미지 (렌디션은 만들지 않음, 기존 사진 backfill용)
+    with Image.open(os.path.join(media_root, name)) as original:
+        return _metadata(_normalize(original))
+
+
+def process_photo(media_root, name, widths, formats, quality=80):
+    # 업로드된 사진의 렌디션과 메타데이터를 원본을 한 번만 열어 함께 만듭니다.
+    # 반환값: (render_renditions()의 결과, read_metadata()의 결과)
+    with Image.open(os.path.join(media_root, name)) as original:
+        image = _normalize(original)
+        return _render(image, media_root, name, widths, formats, quality), _metadata(image)
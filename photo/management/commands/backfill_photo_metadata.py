@@ -0,0 +1,36 @@
+from concurrent.futures import as_completed
+
+from django.core.management.base import BaseCommand
+
+from photo import renditions
+from photo.models import Photo
+
+
+# 기존 사진의 메타데이터(크기, 대표 색, 미리보기 이미지)를 일괄 생성(backfill)하는 관리 명령
+# 렌디션도 없는 사진은 렌디션과 메타데이터를 함께 만들고, 렌디션이 있는 사진은 메타데이터만 만듭니다.
+# 사용 예:
+#   python manage.py backfill_photo_metadata          # 메타데이터가 없는 사진만 처리
+#   python manage.py backfill_photo_metadata --force  # 모든 사진의 메타데이터를 다시 계산
+class Command(BaseCommand):
+    help = '기존 사진의 크기, 대표 색, 미리보기 이미지를 프로세스 풀에서 생성합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--force', action='store_true', help='이미 메타데이터가 있는 사진도 다시 계산합니다.')
+
+    def handle(self, *args, **options):
+        photos = Photo.objects.exclude(image='').only('pk', 'image', 'renditions', 'width').iterator()
+        futures = {}
+        for photo in photos:
+            if renditions.needs_renditions(photo):
+                futures[renditions.submit(photo)] = photo
+            elif options['force'] or renditions.needs_metadata(photo):
+                futures[renditions.submit_metadata(photo)] = photo
+
+        failed = 0
+        for future in as_completed(futures):
+            if future.exception() is not None:
+                failed += 1
+                self.stderr.write(f'실패: {futures[future].image.name} ({future.exception()})')
+        renditions.shutdown(wait=True) # 완료 콜백(결과 기록)까지 모두 끝날 때까지 대기
+
+        self.stdout.write(self.style.SUCCESS(f'{len(futures) - failed}개의 사진 메타데이터를 생성했습니다. (실패 {failed}개)'))
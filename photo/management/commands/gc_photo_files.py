@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from photo import storage
+
+
+# 어떤 사진도 쓰지 않는(참조 수 0) 원본 파일과 그 렌디션을 지우는 관리 명령 (cron 등으로 주기적으로 실행)
+# 참조 수가 0이 된 뒤 유예 시간(PHOTO_FILE_GC_GRACE)이 지난 파일만 지우므로, 그 사이 같은 파일이 다시 업로드되면 그대로 씁니다.
+# 사용 예:
+#   python manage.py gc_photo_files             # 설정의 유예 시간 사용
+#   python manage.py gc_photo_files --grace 0   # 참조 수가 0인 파일을 바로 삭제
+class Command(BaseCommand):
+    help = '참조 수가 0인 채로 유예 시간이 지난 사진 원본 파일과 렌디션을 삭제합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--grace', type=int, default=None, help='유예 시간(초), 생략하면 PHOTO_FILE_GC_GRACE 설정값')
+
+    def handle(self, *args, **options):
+        deleted = storage.collect_garbage(grace=options['grace'])
+        self.stdout.write(self.style.SUCCESS(f'{deleted}개의 사진 파일을 삭제했습니다.'))
@@ -0,0 +1,33 @@
+from concurrent.futures import as_completed
+
+from django.core.management.base import BaseCommand
+
+from photo import renditions
+from photo.models import Photo
+
+
+# 기존 사진의 렌디션을 일괄 생성(backfill)하는 관리 명령
+# 사용 예:
+#   python manage.py generate_photo_renditions          # 렌디션이 없는 사진만 처리
+#   python manage.py generate_photo_renditions --force  # 모든 사진을 다시 처리
+class Command(BaseCommand):
+    help = '기존 사진의 렌디션(크기별 WebP/AVIF 파일)을 프로세스 풀에서 생성합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--force', action='store_true', help='이미 렌디션이 있는 사진도 다시 생성합니다.')
+
+    def handle(self, *args, **options):
+        photos = Photo.objects.exclude(image='').only('pk', 'image', 'renditions').iterator()
+        futures = {}
+        for photo in photos:
+            if options['force'] or renditions.needs_renditions(photo):
+                futures[renditions.submit(photo)] = photo
+
+        failed = 0
+        for future in as_completed(futures):
+            if future.exception() is not None:
+                failed += 1
+                self.stderr.write(f'실패: {futures[future].image.name} ({future.exception()})')
+        renditions.shutdown(wait=True) # 완료 콜백(결과 기록)까지 모두 끝날 때까지 대기
+
+        self.stdout.write(self.style.SUCCESS(f'{len(futures) - failed}개의 사진 렌디션을 생성했습니다. (실패 {failed}개)'))
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from photo import search
+
+
+# 사진 검색 색인(photo_fts)을 처음부터 다시 만드는 관리 명령
+# 사용 예: python manage.py rebuild_photo_search
+class Command(BaseCommand):
+    help = '사진 검색 색인(photo_fts)을 다시 생성합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500, help='한 번에 색인할 사진 수 (기본값: 500)')
+
+    def handle(self, *args, **options):
+        count = search.rebuild_index(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'{count}개의 사진을 색인했습니다.'))
@@ -0,0 +1,46 @@
+# Generated by Django 5.2.18 on 2026-10-18 11:01
+
+import photo.storage
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('photo', '0004_photo_metadata'),
+        ('taggit', '0006_rename_taggeditem_content_type_object_id_taggit_tagg_content_8fc721_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PhotoFile',
+            fields=[
+                ('digest', models.CharField(max_length=64, primary_key=True, serialize=False, verbose_name='SHA-256')),
+                ('name', models.CharField(max_length=100, verbose_name='파일 이름')),
+                ('size', models.PositiveBigIntegerField(default=0, verbose_name='크기')),
+                ('ref_count', models.PositiveIntegerField(default=0, verbose_name='참조 수')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='작성일')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='수정일')),
+            ],
+            options={
+                'verbose_name': '사진 파일',
+                'verbose_name_plural': '사진 파일들',
+                'db_table': 'photo_file',
+            },
+        ),
+        migrations.AlterField(
+            model_name='photo',
+            name='image',
+            field=models.ImageField(storage=photo.storage.get_storage, upload_to='photos/', verbose_name='이미지 파일'),
+        ),
+        migrations.AddIndex(
+            model_name='photo',
+            index=models.Index(fields=['image'], name='photo_image_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='photofile',
+            index=models.Index(fields=['ref_count', 'updated_at'], name='photo_file_gc_idx'),
+        ),
+    ]
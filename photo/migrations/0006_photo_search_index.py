@@ -0,0 +1,46 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:00
+
+from django.db import migrations
+
+
+# 사진 검색용 FTS5 가상 테이블 (rowid = photo.id, 관리자 검색에서 사용)
+CREATE_FTS_TABLE = """
+CREATE VIRTUAL TABLE IF NOT EXISTS photo_fts USING fts5(
+    title, description, tags,
+    tokenize = 'unicode61 remove_diacritics 2',
+    prefix = '2 3'
+)
+"""
+
+DROP_FTS_TABLE = 'DROP TABLE IF EXISTS photo_fts'
+
+
+def populate_search_index(apps, schema_editor):
+    # 기존 사진을 색인에 채워 넣습니다. 태그 이름은 taggit 테이블에서 직접 모읍니다.
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute("""
+            INSERT INTO photo_fts (rowid, title, description, tags)
+            SELECT p.id, p.title, p.description,
+                   COALESCE((
+                       SELECT group_concat(t.name, ' ')
+                       FROM taggit_taggeditem ti
+                       JOIN taggit_tag t ON t.id = ti.tag_id
+                       JOIN django_content_type ct ON ct.id = ti.content_type_id
+                       WHERE ct.app_label = 'photo' AND ct.model = 'photo' AND ti.object_id = p.id
+                   ), '')
+            FROM photo p
+        """)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('photo', '0005_content_addressed_files'),
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('taggit', '0006_rename_taggeditem_content_type_object_id_taggit_tagg_content_8fc721_idx'),
+    ]
+
+    operations = [
+        migrations.RunSQL(CREATE_FTS_TABLE, DROP_FTS_TABLE),
+        migrations.RunPython(populate_search_index, migrations.RunPython.noop),
+    ]
@@ -2,15 +2,17 @@ from django.db import models
 from django.contrib.auth.models import User # 사용자 모델 임포트
 from django.urls import reverse # URL 패턴을 동적으로 가져오기 위해 임포트
 from taggit.managers import TaggableManager # 태그 기능을 위해 임포트 (선택 사항이지만 블로그와 일관성 유지)
+from _20250723django.neighbors import NeighborsMixin # 이전/다음 항목(get_neighbors)을 인덱스 탐색 쿼리 1회로 조회
+from photo.storage import get_storage # 내용 주소(SHA-256) 저장소, 같은 내용의 파일은 한 번만 저장
 
 # Photo 모델 정의
-class Photo(models.Model):
+class Photo(NeighborsMixin, models.Model):
     # 제목 필드: 최대 500자, 필수 필드
     title = models.CharField(max_length=500, verbose_name='제목')
     
     # 이미지 파일 필드: 'photos/' 디렉토리에 저장될 이미지 파일
-    # upload_to는 MEDIA_ROOT 아래의 경로를 의미합니다.
-    image = models.ImageField(upload_to='photos/%Y/%m/%d/', verbose_name='이미지 파일')
+    # 파일 이름은 저장소가 내용 해시로 정합니다. ('photos/<해시 앞 2자>/<다음 2자>/<해시>.<확장자>', photo/storage.py)
+    image = models.ImageField(upload_to='photos/', storage=get_storage, verbose_name='이미지 파일')
     
     # 설명 필드: 긴 텍스트를 위한 TextField, 필수는 아님 (blank=True)
     description = models.TextField(blank=True, verbose_name='설명')
@@ -29,12 +31,28 @@ class Photo(models.Model):
     # blank=True는 태그가 필수가 아님을 의미합니다.
     tags = TaggableManager(blank=True)
 
+    # 렌디션(크기별 WebP/AVIF 파일) 생성 결과: {'source': 원본 파일 이름, 'webp': [폭, ...], 'avif': [폭, ...]}
+    # 렌디션 파일은 원본 옆에 '<이름>.w<폭>.<확장자>'로 저장됩니다. (photo/renditions.py 참고)
+    renditions = models.JSONField(default=dict, blank=True, editable=False, verbose_name='렌디션')
+
+    # 렌디션과 같은 작업(요청 경로 밖의 프로세스 풀)에서 원본으로부터 계산하는 값입니다. (이미지가 바뀌면 비웠다가 다시 계산)
+    # 템플릿은 폭/높이로 자리를 미리 잡고, 이미지가 도착하기 전까지 대표 색과 미리보기 이미지를 표시합니다.
+    width = models.PositiveIntegerField(null=True, blank=True, editable=False, verbose_name='폭') # EXIF 회전 반영
+    height = models.PositiveIntegerField(null=True, blank=True, editable=False, verbose_name='높이')
+    dominant_color = models.CharField(max_length=7, blank=True, editable=False, verbose_name='대표 색') # '#rrggbb'
+    placeholder = models.TextField(blank=True, editable=False, verbose_name='미리보기 이미지') # 아주 작은 이미지의 data: URI
+
     # 메타 클래스: 모델의 옵션을 정의합니다.
     class Meta:
         # 테이블 이름을 명시적으로 지정 (선택 사항, 기본값은 '앱이름_모델이름')
         db_table = 'photo'
         # 기본 정렬 순서: 작성일 기준 내림차순 (최신 글이 먼저 오도록)
         ordering = ['-created_at']
+        # 목록(최신순)을 정렬 없이 인덱스 순서로 읽기 위한 인덱스
+        indexes = [
+            models.Index(fields=['created_at'], name='photo_created_at_idx'),
+            models.Index(fields=['image'], name='photo_image_idx'), # 같은 원본 파일을 쓰는 사진 찾기 (렌디션 재사용)
+        ]
         # Admin 페이지 등에서 보여질 모델의 단수/복수 이름 설정
         verbose_name = '사진'
         verbose_name_plural = '사진들'
@@ -43,6 +61,17 @@ class Photo(models.Model):
     def __str__(self):
         return self.title
 
+    def save(self, *args, **kwargs):
+        # 이미지가 새로 올라왔거나 바뀌었으면(렌디션 기록이 현재 이미지의 것이 아니면) 이전 이미지의 메타데이터를 비웁니다.
+        # 저장 후 post_save 시그널이 렌디션과 메타데이터 생성을 예약합니다. (photo/signals.py)
+        if self.image and (self.renditions or {}).get('source') != self.image.name:
+            self.clear_metadata()
+        super().save(*args, **kwargs)
+
+    def clear_metadata(self):
+        self.width = self.height = None
+        self.dominant_color = self.placeholder = ''
+
     # 객체의 절대 URL을 반환하는 메서드 (URLconf와 연결)
     # 이 메서드는 나중에 템플릿에서 photo.get_absolute_url과 같이 사용될 것입니다.
     def get_absolute_url(self):
@@ -52,3 +81,25 @@ class Photo(models.Model):
         # 여기서는 Django의 reverse 함수를 사용하여 Photo 상세 페이지의 URL을 동적으로 생성합니다.
         # Photo 모델은 일반적으로 slug 필드를 가지지 않으므로, id를 사용하여 고유 URL을 생성합니다.
         return reverse('photo:detail', args=[self.id])
+
+
+# 내용 주소 저장소(photo/storage.py)의 원본 파일 하나와 그 파일을 쓰는 사진 수
+# 참조 수는 photo/signals.py가 사진 저장/삭제 시 증감하고, 0인 채로 유예 시간이 지난 파일은 gc_photo_files 명령이 지웁니다.
+class PhotoFile(models.Model):
+    digest = models.CharField(max_length=64, primary_key=True, verbose_name='SHA-256')
+    name = models.CharField(max_length=100, verbose_name='파일 이름') # MEDIA_ROOT 기준 경로
+    size = models.PositiveBigIntegerField(default=0, verbose_name='크기') # 바이트
+    ref_count = models.PositiveIntegerField(default=0, verbose_name='참조 수')
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name='작성일')
+    updated_at = models.DateTimeField(auto_now=True, verbose_name='수정일') # 참조 수가 바뀐 시각 (유예 시간 기준)
+
+    class Meta:
+        db_table = 'photo_file'
+        indexes = [
+            models.Index(fields=['ref_count', 'updated_at'], name='photo_file_gc_idx'), # 지울 파일 찾기
+        ]
+        verbose_name = '사진 파일'
+        verbose_name_plural = '사진 파일들'
+
+    def __str__(self):
+        return self.name
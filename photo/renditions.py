@@ -0,0 +1,206 @@
+# photo/renditions.py
+# 사진 렌디션(크기별 WebP/AVIF 파일) 생성 파이프라인입니다.
+# - 업로드된 원본 옆(내용 주소 저장소, photo/storage.py)에 '<이름>.w<폭>.<확장자>' 파일을 만듭니다.
+#   같은 내용의 사진은 원본 이름이 같으므로 렌디션도 공유하고, 이미 처리된 사진이 있으면 다시 처리하지 않습니다. (copy_from_duplicate())
+# - 이미지 처리는 요청 경로 밖의 프로세스 풀에서 실행하고, 완료되면 Photo.renditions에 결과를 기록합니다.
+#   같은 작업에서 크기(width/height)와 로딩 전 표시용 대표 색(dominant_color)/미리보기 이미지(placeholder)도 기록합니다.
+# - 템플릿에서는 photo/templatetags/photo_tags.py의 photo_picture 태그로 srcset/sizes를 출력합니다.
+
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.db import connections, transaction
+from django.utils import timezone
+
+from _20250723django import pagecache, replica
+from photo import imaging
+
+logger = logging.getLogger(__name__)
+
+# 기본 설정 (settings.py에서 같은 이름으로 덮어쓸 수 있습니다)
+DEFAULT_WIDTHS = (160, 320, 640, 1024, 1600)
+DEFAULT_FORMATS = ('avif', 'webp') # srcset에서 먼저 나온 포맷을 브라우저가 우선 선택합니다.
+DEFAULT_QUALITY = 80
+
+_executor = None
+
+
+def get_widths():
+    return tuple(getattr(settings, 'PHOTO_RENDITION_WIDTHS', DEFAULT_WIDTHS))
+
+
+def get_formats():
+    return tuple(getattr(settings, 'PHOTO_RENDITION_FORMATS', DEFAULT_FORMATS))
+
+
+def get_executor():
+    # 프로세스 풀은 처음 필요할 때 한 번만 만듭니다.
+    # 작업 함수(photo.imaging)는 Django에 의존하지 않으므로 'spawn' 방식으로 깨끗한 프로세스를 띄웁니다.
+    global _executor
+    if _executor is None:
+        _executor = ProcessPoolExecutor(
+            max_workers=getattr(settings, 'PHOTO_RENDITION_WORKERS', 2),
+            mp_context=multiprocessing.get_context('spawn'),
+        )
+    return _executor
+
+
+def shutdown(wait=True):
+    # 프로세스 풀을 종료합니다. wait=True이면 진행 중인 작업과 완료 콜백(결과 기록)이 끝날 때까지 기다립니다.
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=wait)
+        _executor = None
+
+
+def needs_renditions(photo):
+    # 이미지가 있고, 현재 이미지 파일로 만든 렌디션 기록이 없으면 생성이 필요합니다.
+    return bool(photo.image) and (photo.renditions or {}).get('source') != photo.image.name
+
+
+def _render_args(name):
+    return (
+        settings.MEDIA_ROOT,
+        name,
+        get_widths(),
+        get_formats(),
+        getattr(settings, 'PHOTO_RENDITION_QUALITY', DEFAULT_QUALITY),
+    )
+
+
+def _process_fields(name, result):
+    # imaging.process_photo() 결과를 Photo 필드 값으로 바꿉니다.
+    rendered, metadata = result
+    return {'renditions': {'source': name, **rendered}, **metadata}
+
+
+def _metadata_fields(name, result):
+    # imaging.read_metadata() 결과는 필드 값 그대로입니다.
+    return result
+
+
+def _store_result(photo_id, name, fields):
+    # 작업 결과(필드 값)를 기록합니다. 그 사이 이미지가 다른 파일로 바뀌었다면(image != name) 기록하지 않습니다.
+    from photo.models import Photo
+
+    # 렌디션/크기가 바뀌면 페이지의 <picture> 태그가 바뀌므로 updated_at도 갱신합니다. (조건부 GET 검증값)
+    updated = Photo.objects.filter(pk=photo_id, image=name).update(**fields, updated_at=timezone.now())
+    if updated:
+        # update()는 시그널을 보내지 않으므로, 바뀐 페이지의 캐시 무효화와 복제본 갱신을 직접 요청합니다.
+        photo = Photo(pk=photo_id)
+        pagecache.invalidate(*pagecache.object_tags(photo, pagecache.current_tag_slugs(photo)))
+        replica.schedule_refresh()
+
+
+def _on_done(photo_id, name, to_fields, future):
+    # 프로세스 풀의 완료 콜백 (풀 관리 스레드에서 실행되므로 사용한 DB 연결을 직접 정리합니다)
+    try:
+        _store_result(photo_id, name, to_fields(name, future.result()))
+    except Exception:
+        logger.exception('사진 처리 실패: photo_id=%s, image=%s', photo_id, name)
+    finally:
+        connections.close_all()
+
+
+def _submit(photo, job, args, to_fields):
+    name = photo.image.name
+    try:
+        future = get_executor().submit(job, *args)
+    except BrokenProcessPool:
+        # 작업 프로세스가 비정상 종료되어 풀을 쓸 수 없게 되면 새 풀을 만들어 한 번 더 시도합니다.
+        shutdown(wait=False)
+        future = get_executor().submit(job, *args)
+    future.add_done_callback(partial(_on_done, photo.pk, name, to_fields))
+    return future
+
+
+def submit(photo):
+    # 렌디션과 메타데이터 생성을 프로세스 풀에 맡기고 Future를 반환합니다.
+    return _submit(photo, imaging.process_photo, _render_args(photo.image.name), _process_fields)
+
+
+def submit_metadata(photo):
+    # 메타데이터(크기, 대표 색, 미리보기 이미지)만 프로세스 풀에서 만듭니다. (렌디션이 이미 있는 사진의 backfill용)
+    return _submit(photo, imaging.read_metadata, (settings.MEDIA_ROOT, photo.image.name), _metadata_fields)
+
+
+def generate(photo):
+    # 현재 프로세스에서 바로 렌디션과 메타데이터를 만듭니다. (PHOTO_RENDITIONS_ASYNC = False 또는 관리 명령에서 사용)
+    name = photo.image.name
+    fields = _process_fields(name, imaging.process_photo(*_render_args(name)))
+    _store_result(photo.pk, name, fields)
+    for field, value in fields.items():
+        setattr(photo, field, value)
+    return photo.renditions
+
+
+def generate_metadata(photo):
+    # 현재 프로세스에서 바로 메타데이터만 만듭니다.
+    name = photo.image.name
+    fields = imaging.read_metadata(settings.MEDIA_ROOT, name)
+    _store_result(photo.pk, name, fields)
+    for field, value in fields.items():
+        setattr(photo, field, value)
+    return fields
+
+
+def needs_metadata(photo):
+    # 이미지가 있는데 크기가 기록되지 않았으면 메타데이터 생성이 필요합니다. (이미지가 바뀌면 Photo.save()가 지움)
+    return bool(photo.image) and photo.width is None
+
+
+def copy_from_duplicate(photo):
+    # 같은 원본 파일을 쓰는 다른 사진이 렌디션과 메타데이터를 이미 만들어 두었으면 복사하고 True를 반환합니다.
+    from photo.models import Photo
+
+    name = photo.image.name
+    fields = (
+        Photo.objects.filter(image=name, renditions__source=name, width__isnull=False)
+        .exclude(pk=photo.pk)
+        .values('renditions', 'width', 'height', 'dominant_color', 'placeholder')
+        .first()
+    )
+    if fields is None:
+        return False
+    Photo.objects.filter(pk=photo.pk, image=name).update(**fields)
+    for field, value in fields.items():
+        setattr(photo, field, value)
+    return True
+
+
+def schedule(photo, metadata_only=False):
+    # 사진 저장 트랜잭션이 커밋된 뒤에 렌디션(metadata_only=True이면 메타데이터만) 생성을 시작합니다. (롤백된 업로드는 처리하지 않음)
+    if getattr(settings, 'PHOTO_RENDITIONS_ASYNC', True):
+        transaction.on_commit(partial(submit_metadata if metadata_only else submit, photo))
+    else:
+        transaction.on_commit(partial(generate_metadata if metadata_only else generate, photo))
+
+
+def rendition_url(photo, width, fmt):
+    return default_storage.url(imaging.rendition_name(photo.image.name, width, fmt))
+
+
+def srcset(photo, fmt):
+    # 'url 320w, url 640w, ...' 형식의 srcset 문자열 (해당 포맷의 렌디션이 없으면 빈 문자열)
+    renditions = photo.renditions or {}
+    if renditions.get('source') != photo.image.name:
+        return ''
+    return ', '.join(f'{rendition_url(photo, width, fmt)} {width}w' for width in renditions.get(fmt, []))
+
+
+def closest_url(photo, width, fmt='webp'):
+    # width 이상인 가장 작은 렌디션의 URL (없으면 원본 URL) - 관리자 썸네일 등에 사용
+    renditions = photo.renditions or {}
+    if renditions.get('source') == photo.image.name:
+        widths = sorted(renditions.get(fmt, []))
+        for candidate in widths:
+            if candidate >= width:
+                return rendition_url(photo, candidate, fmt)
+        if widths:
+            return rendition_url(photo, widths[-1], fmt)
+    return photo.image.url
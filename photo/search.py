@@ -0,0 +1,65 @@
+# photo/search.py
+# SQLite FTS5 가상 테이블(photo_fts)을 이용한 사진 검색 색인 모듈입니다.
+# photo_fts의 rowid는 Photo.id와 같으며, title / description / tags 3개 컬럼을 색인합니다.
+# 색인 동기화는 photo/signals.py에서, 검색은 관리자 변경 목록(PhotoAdmin.get_search_results)에서 사용합니다.
+
+from django.db import connections, router
+from django.db.models.expressions import RawSQL
+
+from _20250723django.fts import build_match_query
+from photo.models import Photo
+
+FTS_TABLE = 'photo_fts'
+
+
+def _photo_document(photo):
+    tag_names = ' '.join(tag.name for tag in photo.tags.all())
+    return [photo.title, photo.description, tag_names]
+
+
+def index_photo(photo, using=None):
+    # 사진 하나의 색인 행을 새로 씁니다. (FTS5에는 UPSERT가 없으므로 삭제 후 삽입)
+    using = using or router.db_for_write(Photo, instance=photo)
+    with connections[using].cursor() as cursor:
+        cursor.execute(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [photo.pk])
+        cursor.execute(
+            f'INSERT INTO {FTS_TABLE} (rowid, title, description, tags) VALUES (%s, %s, %s, %s)',
+            [photo.pk, *_photo_document(photo)],
+        )
+
+
+def remove_photo(photo_id, using=None):
+    # 삭제된 사진의 색인 행을 제거합니다.
+    using = using or router.db_for_write(Photo)
+    with connections[using].cursor() as cursor:
+        cursor.execute(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [photo_id])
+
+
+def rebuild_index(using=None, batch_size=500):
+    # 색인 전체를 다시 만듭니다. (관리 명령 rebuild_photo_search에서 사용)
+    using = using or router.db_for_write(Photo)
+    with connections[using].cursor() as cursor:
+        cursor.execute(f'DELETE FROM {FTS_TABLE}')
+    queryset = Photo.objects.using(using).only('pk', 'title', 'description').prefetch_related('tags').order_by('pk')
+    count = 0
+    last_pk = 0
+    while True:
+        batch = list(queryset.filter(pk__gt=last_pk)[:batch_size])
+        if not batch:
+            break
+        with connections[using].cursor() as cursor:
+            cursor.executemany(
+                f'INSERT INTO {FTS_TABLE} (rowid, title, description, tags) VALUES (%s, %s, %s, %s)',
+                [[photo.pk, *_photo_document(photo)] for photo in batch],
+            )
+        count += len(batch)
+        last_pk = batch[-1].pk
+    return count
+
+
+def filter_queryset(queryset, keyword):
+    # 검색어와 일치하는 사진만 남긴 쿼리셋 (정렬은 그대로 유지)
+    match = build_match_query(keyword)
+    if not match:
+        return queryset.none()
+    return queryset.filter(pk__in=RawSQL(f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s', [match]))
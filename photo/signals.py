@@ -0,0 +1,127 @@
+# photo/signals.py
+# 사진이 업로드(또는 이미지가 교체)되면 렌디션과 메타데이터(크기, 대표 색, 미리보기 이미지) 생성을 예약하고, 사진 변경을 페이지 캐시에 반영하는 시그널 수신기입니다.
+# 원본 파일(내용 주소 저장소)의 참조 수와 관리자 검색 색인(photo_fts)도 여기서 갱신합니다. (photo/storage.py, photo/search.py)
+# PhotoConfig.ready()에서 이 모듈을 임포트하여 수신기를 등록합니다.
+
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+from taggit.models import Tag, TaggedItem
+
+from _20250723django import pagecache
+from _20250723django.neighbors import get_neighbors
+from photo import renditions, search, storage
+from photo.models import Photo
+
+TAG_REINDEX_BATCH_SIZE = 500 # 태그 삭제 후 색인을 갱신할 때 한 번에 읽는 사진 수 (IN 목록 길이)
+
+
+# 원본 파일 참조 수: 저장 전의 이미지 이름을 기억해 두었다가, 이미지가 바뀌면 새 파일 +1, 이전 파일 -1
+@receiver(pre_save, sender=Photo, dispatch_uid='photo_file_remember_image')
+def remember_photo_image(sender, instance, using, raw=False, **kwargs):
+    if raw:
+        return
+    previous = None
+    if instance.pk is not None and not instance._state.adding:
+        previous = Photo.objects.using(using).filter(pk=instance.pk).values_list('image', flat=True).first()
+    instance._previous_image_name = previous or ''
+
+
+@receiver(post_save, sender=Photo, dispatch_uid='photo_file_references_save')
+def update_photo_file_references(sender, instance, using, raw=False, **kwargs):
+    if raw:
+        return
+    previous = getattr(instance, '_previous_image_name', '')
+    current = instance.image.name or ''
+    if previous != current:
+        storage.add_reference(current, using=using)
+        storage.remove_reference(previous, using=using)
+    instance._previous_image_name = current
+
+
+@receiver(post_delete, sender=Photo, dispatch_uid='photo_file_references_delete')
+def release_photo_file_reference(sender, instance, using, **kwargs):
+    storage.remove_reference(instance.image.name, using=using)
+
+
+@receiver(post_save, sender=Photo, dispatch_uid='photo_schedule_renditions')
+def schedule_photo_renditions(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    if renditions.needs_renditions(instance) and renditions.copy_from_duplicate(instance):
+        return # 같은 내용의 사진이 이미 처리되어 있음
+    if renditions.needs_renditions(instance):
+        renditions.schedule(instance) # 렌디션과 메타데이터를 함께 생성
+    elif renditions.needs_metadata(instance):
+        renditions.schedule(instance, metadata_only=True) # 이 기능 이전에 렌디션을 만든 사진
+
+
+# 검색 색인: 사진 저장/삭제, 태그 추가/삭제, 태그 이름 변경 시 갱신 (blog/signals.py의 게시물 색인과 같은 방식)
+@receiver(post_save, sender=Photo, dispatch_uid='photo_search_save')
+def update_photo_search_index(sender, instance, using, raw=False, **kwargs):
+    if raw: # fixture 로딩 중에는 건너뜀 (rebuild_photo_search로 재생성)
+        return
+    search.index_photo(instance, using=using)
+
+
+@receiver(post_delete, sender=Photo, dispatch_uid='photo_search_delete')
+def remove_photo_search_index(sender, instance, using, **kwargs):
+    search.remove_photo(instance.pk, using=using)
+
+
+@receiver(m2m_changed, sender=TaggedItem, dispatch_uid='photo_search_tags')
+def update_photo_search_tags(sender, instance, action, using, **kwargs):
+    if isinstance(instance, Photo) and action in ('post_add', 'post_remove', 'post_clear'):
+        search.index_photo(instance, using=using)
+
+
+@receiver(post_save, sender=Tag, dispatch_uid='photo_tag_rename_search')
+def update_photo_search_tag_rename(sender, instance, created, using, raw=False, **kwargs):
+    if created or raw:
+        return
+    for photo in Photo.objects.using(using).filter(tags=instance).only('pk', 'title', 'description').prefetch_related('tags'):
+        search.index_photo(photo, using=using)
+
+
+# 태그 삭제 (blog/signals.py의 게시물 색인과 같은 방식: 삭제 전에 사진 id를 기억해 두었다가 삭제 후 색인 갱신)
+@receiver(pre_delete, sender=Tag, dispatch_uid='photo_tag_search_pre_delete')
+def remember_tag_photos(sender, instance, using, **kwargs):
+    instance._search_photo_ids = list(Photo.objects.using(using).filter(tags=instance).values_list('pk', flat=True))
+
+
+@receiver(post_delete, sender=Tag, dispatch_uid='photo_tag_search_delete')
+def update_photo_search_tag_delete(sender, instance, using, **kwargs):
+    photo_ids = getattr(instance, '_search_photo_ids', [])
+    for start in range(0, len(photo_ids), TAG_REINDEX_BATCH_SIZE):
+        batch = photo_ids[start:start + TAG_REINDEX_BATCH_SIZE]
+        for photo in Photo.objects.using(using).filter(pk__in=batch).only('pk', 'title', 'description').prefetch_related('tags'):
+            search.index_photo(photo, using=using)
+
+
+def _neighbor_tags(instance, using):
+    # 이전/다음 사진의 상세 페이지는 이 사진의 제목과 존재 여부를 표시하므로 함께 무효화합니다.
+    return [pagecache.instance_tag(neighbor) for neighbor in get_neighbors(instance, Photo.objects.using(using), fields=()) if neighbor]
+
+
+# 페이지 캐시: 사진 상세, 사진 목록, 사진에 달린 태그별 목록을 무효화합니다.
+@receiver(post_save, sender=Photo, dispatch_uid='photo_page_cache_save')
+def invalidate_photo_pages(sender, instance, using, raw=False, **kwargs):
+    if raw:
+        return
+    pagecache.invalidate(
+        *pagecache.object_tags(instance, pagecache.current_tag_slugs(instance, using)),
+        *_neighbor_tags(instance, using),
+        using=using,
+    )
+
+
+@receiver(pre_delete, sender=Photo, dispatch_uid='photo_page_cache_pre_delete')
+def remember_photo_tag_slugs(sender, instance, using, **kwargs):
+    instance._page_cache_tag_slugs = pagecache.current_tag_slugs(instance, using)
+    instance._page_cache_neighbor_tags = _neighbor_tags(instance, using)
+
+
+@receiver(post_delete, sender=Photo, dispatch_uid='photo_page_cache_delete')
+def invalidate_deleted_photo_pages(sender, instance, using, **kwargs):
+    tag_slugs = getattr(instance, '_page_cache_tag_slugs', [])
+    neighbor_tags = getattr(instance, '_page_cache_neighbor_tags', [])
+    pagecache.invalidate(*pagecache.object_tags(instance, tag_slugs), *neighbor_tags, pagecache.TAG_CLOUD, using=using)
@@ -0,0 +1,185 @@
+# photo/storage.py
+# 사진 원본의 내용 주소(content-addressed) 저장소와 참조 수 관리
+# - 원본은 SHA-256 해시로 이름을 정해 'photos/<해시 앞 2자>/<다음 2자>/<해시>.<확장자>'에 저장합니다.
+#   (디렉터리 하나에 파일이 몰리지 않도록 해시 앞부분으로 2단계 분산)
+# - 같은 내용의 파일이 이미 있으면 다시 쓰지 않고 기존 이름을 그대로 사용하므로 중복 업로드는 디스크를 쓰지 않습니다.
+#   새 파일은 임시 이름으로 다 쓴 뒤 해시 이름으로 옮기므로, 같은 파일을 동시에 올려도 항상 해시 이름 하나만 남습니다.
+#   해시에 해당하는 파일은 분산 디렉터리 하나만 보면 찾을 수 있습니다. (find())
+# - 해시는 업로드 핸들러(_20250723django/uploads.py)가 받으면서 계산한 값을 쓰고, 없을 때만 파일을 읽어 계산합니다.
+# - 파일마다 PhotoFile 행이 그 파일을 쓰는 사진 수(ref_count)를 셉니다. (photo/signals.py에서 증감)
+#   0이 된 파일은 바로 지우지 않고, gc_photo_files 관리 명령이 유예 시간(PHOTO_FILE_GC_GRACE)이 지난 뒤 렌디션과 함께 지웁니다.
+#   (유예 시간 안에 같은 파일이 다시 올라오면 그대로 되살아남)
+#   기존 파일을 재사용하는 업로드는 먼저 행의 updated_at을 갱신하고, gc_photo_files는 행과 파일을 한 쓰기 트랜잭션에서
+#   updated_at을 다시 확인하며 지우므로, 재사용하기로 한 파일이 참조 수를 올리기 전에 지워지지 않습니다.
+# 이 기능 이전에 'photos/%Y/%m/%d/'에 저장된 파일은 이름이 해시가 아니므로 참조 수를 세지 않고 그대로 둡니다.
+
+import hashlib
+import os
+import re
+import secrets
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files.storage import FileSystemStorage
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+from django.utils.deconstruct import deconstructible
+
+# 기본 설정 (settings.py에서 같은 이름으로 덮어쓸 수 있습니다)
+DEFAULT_GC_GRACE = 60 * 60 * 24 # 초, 참조 수가 0이 된 뒤 파일을 지우기까지의 유예 시간
+
+PREFIX = 'photos/'
+SHARD_LEVELS = 2
+SHARD_WIDTH = 2
+HASH_CHUNK_SIZE = 64 * 1024
+NAME_RE = re.compile(r'^photos/(?:[0-9a-f]{2}/){2}(?P<digest>[0-9a-f]{64})\.[0-9a-z]+$')
+
+
+def shard_directory(digest):
+    parts = [digest[i * SHARD_WIDTH:(i + 1) * SHARD_WIDTH] for i in range(SHARD_LEVELS)]
+    return PREFIX + '/'.join(parts)
+
+
+def content_name(digest, extension):
+    return f'{shard_directory(digest)}/{digest}{extension}'
+
+
+def digest_from_name(name):
+    # 내용 주소 이름이면 해시를, 아니면(이전 방식의 이름, 렌디션 등) None을 반환합니다.
+    match = NAME_RE.match(name or '')
+    return match.group('digest') if match else None
+
+
+def file_digest(content):
+    # 업로드 핸들러가 계산해 둔 해시를 쓰고, 없으면 파일을 조각 단위로 읽어 계산합니다.
+    digest = getattr(content, 'content_hash', None)
+    if digest is None:
+        hasher = hashlib.sha256()
+        for chunk in content.chunks(HASH_CHUNK_SIZE):
+            hasher.update(chunk)
+        digest = hasher.hexdigest()
+        if content.seekable():
+            content.seek(0)
+    return digest
+
+
+@deconstructible
+class ContentAddressedStorage(FileSystemStorage):
+    # Photo.image의 저장소 (upload_to로 만든 이름 대신 내용 해시로 이름을 정함)
+
+    def save(self, name, content, max_length=None):
+        if content is None or not hasattr(content, 'chunks'):
+            return super().save(name, content, max_length=max_length)
+        digest = file_digest(content)
+        existing = self.find(digest)
+        if existing is not None and self.claim(digest, existing):
+            return existing # 같은 내용의 파일이 이미 있으므로 쓰지 않음
+        _, extension = os.path.splitext(name)
+        name = content_name(digest, extension.lower())
+        # 같은 내용을 동시에 올린 요청끼리 경쟁하므로 숨김 임시 이름으로 끝까지 쓴 뒤 내용 주소 이름으로 옮깁니다.
+        # (바로 쓰면 먼저 만든 쪽의 파일 때문에 get_available_name()이 해시가 아닌 '<해시>_abc1234.jpg'를 만들고,
+        #  find()가 다 쓰지 않은 파일을 찾을 수 있음)
+        temporary = super().save(f'{shard_directory(digest)}/.{digest}.{secrets.token_hex(8)}.part', content)
+        if self.exists(name):
+            self.delete(temporary) # 그 사이 다른 요청이 같은 내용을 저장함
+        else:
+            os.replace(self.path(temporary), self.path(name)) # 동시에 옮겨도 내용이 같으므로 어느 쪽이 남아도 됨
+        return name
+
+    def claim(self, digest, name):
+        # 같은 내용의 기존 파일 name을 재사용해도 되는지 확인합니다.
+        # PhotoFile 행의 updated_at을 갱신하여 유예 시간을 다시 세게 하므로, 참조 수가 0인 파일이어도 이 업로드가
+        # 참조 수를 올리기(add_reference) 전에 gc_photo_files가 지우지 않습니다.
+        # 그 전에 gc_photo_files가 행과 파일을 지웠다면(갱신된 행 없음) 파일도 없으므로 새로 씁니다.
+        # (행이 없어도 파일이 있으면 참조 수를 세기 전인, 동시에 올라온 같은 내용의 파일이므로 재사용)
+        from photo.models import PhotoFile
+
+        PhotoFile.objects.filter(digest=digest).update(updated_at=timezone.now())
+        return self.exists(name)
+
+    def find(self, digest):
+        # 해시에 해당하는 파일 이름 (확장자가 달라도 같은 내용이면 찾음), 없으면 None
+        directory = shard_directory(digest)
+        try:
+            entries = os.listdir(self.path(directory))
+        except FileNotFoundError:
+            return None
+        for entry in sorted(entries):
+            stem, _ = os.path.splitext(entry)
+            if stem == digest:
+                return f'{directory}/{entry}'
+        return None
+
+
+photo_storage = ContentAddressedStorage()
+
+
+def get_storage():
+    # ImageField(storage=...)에 넘기는 호출 가능 객체 (마이그레이션에 저장소 설정이 고정되지 않도록)
+    return photo_storage
+
+
+# --- 참조 수 (PhotoFile) ---
+
+def add_reference(name, using=None):
+    # 사진이 내용 주소 파일 name을 쓰기 시작함 (참조 수 +1, 처음이면 행 생성)
+    from photo.models import PhotoFile
+
+    digest = digest_from_name(name)
+    if digest is None:
+        return
+    files = PhotoFile.objects.using(using)
+    updated = files.filter(digest=digest).update(ref_count=F('ref_count') + 1, updated_at=timezone.now())
+    if not updated:
+        size = photo_storage.size(name) if photo_storage.exists(name) else 0
+        _, created = files.get_or_create(digest=digest, defaults={'name': name, 'size': size, 'ref_count': 1})
+        if not created: # 동시에 다른 요청이 행을 만든 경우
+            files.filter(digest=digest).update(ref_count=F('ref_count') + 1, updated_at=timezone.now())
+
+
+def remove_reference(name, using=None):
+    # 사진이 내용 주소 파일 name을 더 이상 쓰지 않음 (참조 수 -1, 0이 되어도 파일은 gc_photo_files가 유예 후 삭제)
+    from photo.models import PhotoFile
+
+    digest = digest_from_name(name)
+    if digest is None:
+        return
+    PhotoFile.objects.using(using).filter(digest=digest, ref_count__gt=0).update(
+        ref_count=F('ref_count') - 1, updated_at=timezone.now(),
+    )
+
+
+def _delete_files(digest):
+    # 원본과 그 렌디션('<해시>.w<폭>.<확장자>') 파일을 지웁니다. (렌디션 이름은 원본 이름에서 정해지므로 같은 내용의 사진끼리 공유됨)
+    # 원본을 마지막에 지우므로 도중에 실패해도(트랜잭션 롤백으로 행이 남음) 행이 없는 원본을 가리키지 않습니다.
+    directory = shard_directory(digest)
+    try:
+        entries = os.listdir(photo_storage.path(directory))
+    except FileNotFoundError:
+        return
+    for entry in sorted(entries, key=lambda entry: entry.count('.') == 1): # 원본('<해시>.<확장자>')을 마지막에
+        if entry.startswith(f'{digest}.'):
+            photo_storage.delete(f'{directory}/{entry}')
+
+
+def collect_garbage(using=None, grace=None):
+    # 참조 수가 0인 채로 유예 시간이 지난 파일을 지우고, 지운 파일 수를 반환합니다.
+    from photo.models import PhotoFile
+
+    if grace is None:
+        grace = getattr(settings, 'PHOTO_FILE_GC_GRACE', DEFAULT_GC_GRACE)
+    cutoff = timezone.now() - timedelta(seconds=grace)
+    files = PhotoFile.objects.using(using)
+    deleted = 0
+    for digest in list(files.filter(ref_count=0, updated_at__lt=cutoff).values_list('digest', flat=True)):
+        with transaction.atomic(using=using):
+            # 그 사이 다시 참조되었거나(ref_count > 0) 업로드가 재사용하기로 했으면(updated_at 갱신, storage.claim())
+            # 행이 지워지지 않으므로 파일도 그대로 둡니다.
+            if not files.filter(digest=digest, ref_count=0, updated_at__lt=cutoff).delete()[0]:
+                continue
+            # 파일도 이 쓰기 트랜잭션 안에서 지웁니다. 커밋 후에 지우면 그 사이 행이 없는 것을 보고 새로 쓴 같은 내용의 파일을 지울 수 있음
+            # (claim()의 updated_at 갱신은 이 트랜잭션이 끝날 때까지 기다리므로, 갱신된 행이 없으면 파일도 이미 지워진 뒤)
+            _delete_files(digest)
+        deleted += 1
+    return deleted
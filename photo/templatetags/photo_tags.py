@@ -0,0 +1,56 @@
+# photo/templatetags/photo_tags.py
+# 사진 렌디션을 반응형 이미지(<picture> + srcset/sizes)로 출력하는 템플릿 태그입니다.
+# 크기가 기록된 사진은 레이아웃 자리를 미리 잡고, 원본이 도착할 때까지 대표 색/미리보기 이미지를 표시합니다.
+# 사용 예:
+#   {% load photo_tags %}
+#   {% photo_picture photo sizes="(min-width: 768px) 33vw, 100vw" class="card-img-top" %}
+
+from django import template
+from django.utils.html import format_html, format_html_join
+
+from photo import renditions
+from photo.imaging import FORMATS
+
+register = template.Library()
+
+
+def placeholder_attrs(photo, attrs):
+    # 크기가 기록된 사진이면 width/height 속성으로 비율만큼 자리를 잡고,
+    # 이미지가 도착하기 전까지 대표 색과 미리보기 이미지(data: URI)를 배경으로 흐리게 표시합니다.
+    if not (photo.width and photo.height):
+        return attrs
+    attrs = {'width': photo.width, 'height': photo.height, **attrs}
+    background = []
+    if photo.dominant_color:
+        background.append(f'background-color: {photo.dominant_color};')
+    if photo.placeholder:
+        background.append(f'background-image: url("{photo.placeholder}"); background-size: cover; background-position: center;')
+    if background:
+        attrs['style'] = ' '.join([*background, attrs.get('style', '')]).strip()
+    return attrs
+
+
+@register.simple_tag
+def photo_picture(photo, sizes='100vw', alt=None, loading='lazy', **attrs):
+    # 렌디션이 있으면 포맷별 <source srcset sizes>를, 없으면(아직 생성 중) 원본 <img>만 출력합니다.
+    # class, style 등 나머지 키워드 인자는 <img> 속성으로 그대로 전달됩니다.
+    # 크기/미리보기 이미지가 있으면 width, height, 배경 스타일을 함께 출력합니다. (placeholder_attrs)
+    attrs = placeholder_attrs(photo, attrs)
+    sources = []
+    for fmt in renditions.get_formats():
+        fmt_srcset = renditions.srcset(photo, fmt)
+        if fmt_srcset:
+            sources.append(format_html(
+                '<source type="image/{}" srcset="{}" sizes="{}">',
+                FORMATS[fmt][1], fmt_srcset, sizes,
+            ))
+    img = format_html(
+        '<img src="{}" alt="{}" loading="{}" decoding="async"{}>',
+        photo.image.url,
+        photo.title if alt is None else alt,
+        loading,
+        format_html_join('', ' {}="{}"', sorted(attrs.items())),
+    )
+    if not sources:
+        return img
+    return format_html('<picture>{}{}</picture>', format_html_join('', '{}', ((source,) for source in sources)), img)
@@ -1,3 +1,102 @@
-from django.test import TestCase
+import os
+import tempfile
+from datetime import timedelta
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth.models import AnonymousUser, User
+from django.core.files.base import ContentFile
+from django.http import Http404
+from django.test import RequestFactory, SimpleTestCase, TestCase
+from django.utils import timezone
+
+from _20250723django.neighbors import neighbor_queryset
+from _20250723django.pagination import CursorPaginator, encode_cursor
+from _20250723django.queryplan import plan_problems, query_plan
+from photo import storage
+from photo.models import Photo, PhotoFile
+from photo.storage import ContentAddressedStorage, digest_from_name
+from photo.views import PhotoLV
+
+
+# 사진 목록(최신순)이 created_at 인덱스 순서로 읽히는지 EXPLAIN QUERY PLAN으로 확인합니다.
+class PhotoListQueryPlanTests(TestCase):
+
+    def test_list_uses_created_at_index(self):
+        view = PhotoLV()
+        view.setup(RequestFactory().get('/photo/'))
+        queryset = view.get_queryset()
+        self.assertEqual(plan_problems(queryset[:view.paginate_by]), [])
+        paginator = CursorPaginator(queryset, view.paginate_by)
+        for token in (None, encode_cursor('2024-01-01T00:00:00+00:00', 1), encode_cursor('2024-01-01T00:00:00+00:00', 1, reverse=True)):
+            with self.subTest(token=token):
+                self.assertEqual(plan_problems(paginator._prepare(token)[0]), [])
+
+    def test_invalid_cursor_is_not_found(self):
+        # encode_cursor()가 만들지 않는 토큰 (정렬 값 null / 빈 값 / 객체, 범위를 넘는 id)은 500이 아니라 404입니다.
+        for value, pk in ((None, 1), ('', 1), ({'a': 1}, 1), (5, 1), ('2024-01-01T00:00:00+00:00', 2 ** 70)):
+            with self.subTest(value=value, pk=pk):
+                request = RequestFactory().get('/photo/', {'cursor': encode_cursor(value, pk)})
+                request.user = AnonymousUser()
+                with self.assertRaises(Http404):
+                    PhotoLV.as_view()(request)
+
+    def test_neighbors_seek_created_at_index(self):
+        # 이전/다음 사진은 (created_at, id) 인덱스 범위 탐색 두 번으로 찾아야 합니다. (전체 스캔/윈도 계산 없음)
+        author = User.objects.create_user('author')
+        photo = Photo.objects.create(title='t', image='photos/t.jpg', author=author)
+        plan = query_plan(neighbor_queryset(photo))
+        self.assertEqual([detail for detail in plan if detail.startswith('SCAN ') or 'TEMP B-TREE' in detail], [])
+        self.assertEqual(sum('USING COVERING INDEX' in detail for detail in plan), 2)
+
+
+# 내용 주소 저장소: 같은 내용을 동시에 올려도(find()가 서로의 파일을 못 본 경우) 해시 이름 파일 하나만 남아야 합니다.
+class ContentAddressedStorageTests(SimpleTestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.storage = ContentAddressedStorage(location=directory.name)
+
+    def test_identical_uploads_share_hash_name(self):
+        first = self.storage.save('a.JPG', ContentFile(b'same image', name='a.JPG'))
+        with mock.patch.object(self.storage, 'find', return_value=None): # 앞 요청의 파일을 보기 전에 저장하는 경우
+            second = self.storage.save('b.jpg', ContentFile(b'same image', name='b.jpg'))
+        self.assertEqual(first, second)
+        self.assertIsNotNone(digest_from_name(first))
+        self.assertEqual(os.listdir(os.path.dirname(self.storage.path(first))), [os.path.basename(first)])
+        with self.storage.open(first) as saved:
+            self.assertEqual(saved.read(), b'same image')
+
+
+# 참조 수 0인 파일의 재사용과 gc_photo_files: 업로드가 재사용하기로 한 파일은 지우지 않고,
+# 먼저 지워진 파일은 재사용하지 않고 새로 써야 합니다.
+class PhotoFileGarbageCollectionTests(TestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.storage = ContentAddressedStorage(location=directory.name)
+        patcher = mock.patch.object(storage, 'photo_storage', self.storage)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.name = self.storage.save('a.jpg', ContentFile(b'image', name='a.jpg'))
+        digest = digest_from_name(self.name)
+        self.storage.save(f'{storage.shard_directory(digest)}/{digest}.w320.webp', ContentFile(b'rendition')) # 렌디션
+        PhotoFile.objects.create(digest=digest, name=self.name, size=5, ref_count=0)
+        PhotoFile.objects.filter(digest=digest).update(updated_at=timezone.now() - timedelta(days=2)) # 유예 시간이 지난 파일
+
+    def test_claimed_file_is_not_collected(self):
+        self.assertEqual(self.storage.save('b.jpg', ContentFile(b'image', name='b.jpg')), self.name)
+        self.assertEqual(storage.collect_garbage(), 0)
+        self.assertTrue(self.storage.exists(self.name))
+        storage.add_reference(self.name)
+        self.assertEqual(PhotoFile.objects.get().ref_count, 1)
+
+    def test_collected_file_is_written_again(self):
+        self.assertEqual(storage.collect_garbage(), 1)
+        self.assertEqual(os.listdir(os.path.dirname(self.storage.path(self.name))), [])
+        self.assertEqual(self.storage.save('b.jpg', ContentFile(b'image', name='b.jpg')), self.name)
+        with self.storage.open(self.name) as saved:
+            self.assertEqual(saved.read(), b'image')
+        storage.add_reference(self.name)
+        self.assertEqual(PhotoFile.objects.values_list('size', 'ref_count').get(), (5, 1))
@@ -2,13 +2,21 @@ from django.views.generic import ListView, DetailView # ListView와 DetailView 
 from .models import Photo # Photo 모델 임포트
 from taggit.models import Tag # Tag 모델 임포트 (taggit 사용을 위해)
 from django.db.models import Q # Q 객체 임포트 (태그 필터링에 필요)
+from _20250723django.mixins import ListQuerysetMixin # 목록 뷰 공통 쿼리셋 최적화 믹스인
+from _20250723django.pagination import CursorPaginationMixin # 커서(키셋) 페이지네이션 믹스인 (?cursor=)
+from _20250723django import pagecache # 익명 사용자 페이지 캐시 (의존 태그 선언)
+from _20250723django.pagecache import PageCacheMixin
+from _20250723django.conditional import ConditionalGetMixin # 조건부 GET (ETag / Last-Modified, 304 응답)
 
 # Photo 목록을 보여주는 클래스 기반 뷰 (ListView)
-class PhotoLV(ListView):
+class PhotoLV(ConditionalGetMixin, PageCacheMixin, CursorPaginationMixin, ListQuerysetMixin, ListView):
     model = Photo # 이 뷰가 사용할 모델은 Photo입니다.
     template_name = 'photo/photo_list.html' # 이 뷰가 렌더링할 템플릿 파일 경로
     context_object_name = 'photos' # 템플릿에서 사용할 객체 목록의 변수 이름 (기본값은 object_list)
     paginate_by = 6 # 한 페이지에 보여줄 사진의 개수 (페이지네이션)
+    list_select_related = ('author',) # 카드의 작성자 표시용 (JOIN)
+    list_prefetch_related = ('tags',) # 카드의 태그 배지 표시용 (쿼리 1회)
+    validator_timestamp_field = 'updated_at' # 조건부 GET 사용 (검증값은 목록 범위의 개수/최대 수정 시각과 페이지 캐시 태그 버전)
 
     def get_queryset(self):
         # 기본 쿼리셋: 모든 사진을 최신 작성일 기준으로 정렬
@@ -37,10 +45,32 @@ class PhotoLV(ListView):
         # 태그 이름이 있다면 컨텍스트에 추가하여 템플릿으로 전달
         if self.tag_name:
             context['tagname'] = self.tag_name # 템플릿에서 'tagname'으로 접근
+            context['tag_slug'] = self.kwargs['tag_slug'] # 상세 페이지의 같은 태그 내 이전/다음 이동용
         return context
 
+    def get_page_cache_tags(self):
+        # 태그별 목록은 해당 태그의 변경에만, 전체 목록은 사진 변경 전체에 의존합니다.
+        return pagecache.list_cache_tags(Photo, self.kwargs.get('tag_slug'))
+
 # Photo 상세 정보를 보여주는 클래스 기반 뷰 (DetailView)
-class PhotoDV(DetailView):
+class PhotoDV(ConditionalGetMixin, PageCacheMixin, DetailView):
     model = Photo # 이 뷰가 사용할 모델은 Photo입니다.
     template_name = 'photo/photo_detail.html' # 이 뷰가 렌더링할 템플릿 파일 경로
     context_object_name = 'photo' # 템플릿에서 사용할 단일 객체의 변수 이름 (기본값은 object)
+    queryset = Photo.objects.prefetch_related('tags') # 태그는 템플릿과 검증값에서 사용
+    # 검증값: 사진의 수정 시각과 태그, 'photo:<id>' 태그 버전 (이전/다음 사진이 바뀌어도 올라감)
+    validator_timestamp_field = 'updated_at'
+
+    def get_tag_slug(self):
+        # 태그별 목록에서 들어온 경우(?tag=<slug>) 같은 태그의 사진 사이에서 이전/다음으로 이동합니다.
+        return self.request.GET.get('tag') or None
+
+    def get_page_cache_tags(self):
+        # 'photo:<id>'와 이전/다음 사진
+        return pagecache.detail_cache_tags(self.object, self.get_tag_slug())
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['tag_slug'] = self.get_tag_slug()
+        context['previous_photo'], context['next_photo'] = self.object.get_neighbors(context['tag_slug'])
+        return context
@@ -0,0 +1,55 @@
+// 관리자 태그 입력칸 자동 완성 (_20250723django/admin.py의 TagAutocompleteWidget)
+// 쉼표로 구분한 입력 중 마지막 태그를 관리자 자동 완성 API(/admin/autocomplete/)로 검색하여
+// "앞부분, 제안 태그" 형태의 datalist 항목으로 보여줍니다. 전체 태그 목록은 내려받지 않습니다.
+'use strict';
+(function () {
+    const DELAY = 250; // 밀리초, 입력이 멈춘 뒤 요청
+
+    function attach(input, index) {
+        const datalist = document.createElement('datalist');
+        datalist.id = `admin-tag-autocomplete-${index}`;
+        input.after(datalist);
+        input.setAttribute('list', datalist.id);
+
+        let timer = null;
+        let controller = null;
+        input.addEventListener('input', function () {
+            clearTimeout(timer);
+            timer = setTimeout(function () {
+                const value = input.value;
+                const separator = value.lastIndexOf(',');
+                const prefix = separator >= 0 ? value.slice(0, separator + 1) + ' ' : '';
+                const term = value.slice(separator + 1).trim();
+                if (!term) {
+                    datalist.replaceChildren();
+                    return;
+                }
+                const params = new URLSearchParams({
+                    term: term,
+                    app_label: input.dataset.appLabel,
+                    model_name: input.dataset.modelName,
+                    field_name: input.dataset.fieldName,
+                });
+                if (controller) {
+                    controller.abort(); // 이전 요청 취소 (느린 응답이 최신 제안을 덮어쓰지 않도록)
+                }
+                controller = new AbortController();
+                fetch(`${input.dataset.autocompleteUrl}?${params}`, {signal: controller.signal, credentials: 'same-origin'})
+                    .then(response => response.ok ? response.json() : {results: []})
+                    .then(function (data) {
+                        datalist.replaceChildren(...data.results.map(function (result) {
+                            const option = document.createElement('option');
+                            // 공백이나 쉼표가 있는 태그 이름은 taggit 입력 형식대로 큰따옴표로 감쌉니다.
+                            option.value = prefix + (/[\s,]/.test(result.text) ? `"${result.text}"` : result.text);
+                            return option;
+                        }));
+                    })
+                    .catch(function () {});
+            }, DELAY);
+        });
+    }
+
+    document.addEventListener('DOMContentLoaded', function () {
+        document.querySelectorAll('input.admin-tag-autocomplete').forEach(attach);
+    });
+})();
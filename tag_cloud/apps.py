@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class TagCloudConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'tag_cloud'
+
+    def ready(self):
+        from tag_cloud import signals # noqa: F401 (태그 통계 갱신 시그널 수신기 등록)
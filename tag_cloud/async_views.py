@@ -0,0 +1,35 @@
+from django.http import Http404
+from taggit.models import Tag
+from tag_cloud.stats import tags_with_counts # 태그 통계 테이블 기반 태그 클라우드 쿼리셋
+from tag_cloud.stream import TagStreamPaginator # 게시물 + 사진 통합 태그 스트림 (스트림 테이블, 커서 페이지)
+from _20250723django import pagecache # 익명 사용자 페이지 캐시 (의존 태그 선언)
+from _20250723django.async_views import AsyncListView, AsyncPageView # 비동기 뷰 기반 클래스
+
+# tag_cloud/async_views.py
+# 통합 태그 클라우드 / 통합 태그 페이지 뷰의 비동기 버전입니다. (ASGI 전용, tag_cloud/async_urls.py)
+
+# 통합 태그 클라우드 뷰
+class UnifiedTagCloudTV(AsyncListView):
+    template_name = 'tag_cloud/unified_tag_cloud.html'
+    context_object_name = 'tags'
+    page_cache_tags = (pagecache.TAG_CLOUD,) # 태그 추가/삭제/이름 변경 시 무효화
+
+    def get_queryset(self):
+        return tags_with_counts()
+
+
+# 통합 태그 페이지
+class TagStreamView(AsyncPageView):
+    template_name = 'tag_cloud/tag_stream.html'
+    paginate_by = 12
+
+    def get_page_cache_tags(self):
+        return [pagecache.taggit_tag(self.kwargs['tag_slug'])]
+
+    async def aget_context_data(self, **kwargs):
+        try:
+            tag = await Tag.objects.aget(slug=self.kwargs['tag_slug'])
+        except Tag.DoesNotExist:
+            raise Http404('태그를 찾을 수 없습니다.')
+        page = await TagStreamPaginator(tag, self.paginate_by).apage(self.request.GET.get('cursor'))
+        return await super().aget_context_data(tag=tag, items=page.object_list, cursor_page=page, **kwargs)
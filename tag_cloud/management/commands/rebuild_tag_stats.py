@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from tag_cloud import stats, stream
+
+
+# 태그 통계 테이블(TagStat)을 검사하거나 다시 계산하는 관리 명령
+# 다시 계산할 때 통합 태그 스트림 테이블(TagStreamItem)도 함께 다시 채웁니다.
+# 사용 예:
+#   python manage.py rebuild_tag_stats          # 어긋난 태그를 보고한 뒤 테이블을 다시 계산
+#   python manage.py rebuild_tag_stats --check  # 검사만 수행 (어긋남이 있으면 오류 종료)
+class Command(BaseCommand):
+    help = '태그 통계 테이블(TagStat)의 어긋남(drift)을 검사하고 다시 계산합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--check', action='store_true', help='다시 계산하지 않고 어긋남만 검사합니다.')
+
+    def handle(self, *args, **options):
+        drift = stats.find_drift()
+        for tag_id, saved, actual in drift:
+            self.stdout.write(f'tag_id={tag_id}: 저장된 값(posts, photos, items)={saved}, 실제 값={actual}')
+
+        if options['check']:
+            if drift:
+                raise CommandError(f'{len(drift)}개의 태그 통계가 실제 값과 다릅니다.')
+            self.stdout.write(self.style.SUCCESS('태그 통계가 실제 값과 일치합니다.'))
+            return
+
+        count = stats.rebuild()
+        self.stdout.write(self.style.SUCCESS(f'어긋난 태그 {len(drift)}개를 바로잡고, {count}개의 태그 통계를 다시 계산했습니다.'))
+        self.stdout.write(self.style.SUCCESS(f'태그 스트림 {stream.rebuild()}행을 다시 채웠습니다.'))
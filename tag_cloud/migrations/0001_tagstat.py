@@ -0,0 +1,48 @@
+# Generated by Django 5.2.4 on 2026-10-18 09:54
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def populate_tag_stats(apps, schema_editor):
+    # 기존 태그 사용 횟수를 한 번 집계하여 통계 테이블을 채웁니다.
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute("""
+            INSERT INTO tag_stat (tag_id, num_posts, num_photos, num_items)
+            SELECT ti.tag_id,
+                   SUM(CASE WHEN ct.app_label = 'blog' AND ct.model = 'post' THEN 1 ELSE 0 END),
+                   SUM(CASE WHEN ct.app_label = 'photo' AND ct.model = 'photo' THEN 1 ELSE 0 END),
+                   SUM(CASE WHEN (ct.app_label = 'blog' AND ct.model = 'post')
+                             OR (ct.app_label = 'photo' AND ct.model = 'photo') THEN 1 ELSE 0 END)
+            FROM taggit_taggeditem ti
+            JOIN django_content_type ct ON ct.id = ti.content_type_id
+            GROUP BY ti.tag_id
+        """)
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('taggit', '0006_rename_taggeditem_content_type_object_id_taggit_tagg_content_8fc721_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TagStat',
+            fields=[
+                ('tag', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stat', serialize=False, to='taggit.tag', verbose_name='태그')),
+                ('num_posts', models.PositiveIntegerField(default=0, verbose_name='게시물 수')),
+                ('num_photos', models.PositiveIntegerField(default=0, verbose_name='사진 수')),
+                ('num_items', models.PositiveIntegerField(db_index=True, default=0, verbose_name='전체 항목 수')),
+            ],
+            options={
+                'verbose_name': '태그 통계',
+                'verbose_name_plural': '태그 통계 목록',
+                'db_table': 'tag_stat',
+            },
+        ),
+        migrations.RunPython(populate_tag_stats, migrations.RunPython.noop),
+    ]
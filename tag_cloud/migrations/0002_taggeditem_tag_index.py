@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-18 11:05
+
+from django.db import migrations
+
+
+# taggit_taggeditem은 다른 앱(taggit)의 테이블이므로 모델 Meta 대신 SQL로 인덱스를 추가합니다.
+# 태그 하나가 달린 특정 종류(게시물/사진)의 id만 인덱스에서 읽습니다. (태그별 게시물/사진 목록의 조인)
+CREATE_INDEX = """
+CREATE INDEX IF NOT EXISTS taggit_taggeditem_tag_type_obj_idx
+ON taggit_taggeditem (tag_id, content_type_id, object_id)
+"""
+
+DROP_INDEX = 'DROP INDEX IF EXISTS taggit_taggeditem_tag_type_obj_idx'
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tag_cloud', '0001_tagstat'),
+        ('taggit', '0006_rename_taggeditem_content_type_object_id_taggit_tagg_content_8fc721_idx'),
+    ]
+
+    operations = [
+        migrations.RunSQL(CREATE_INDEX, DROP_INDEX),
+    ]
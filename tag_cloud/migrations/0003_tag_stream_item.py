@@ -0,0 +1,50 @@
+# Generated by Django 5.2.18 on 2026-10-18 11:49
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def populate_tag_stream(apps, schema_editor):
+    # 기존 태그 연결(게시물/사진)을 작성일과 함께 스트림 테이블로 복사합니다.
+    with schema_editor.connection.cursor() as cursor:
+        for kind, app_label, table in (('photo', 'photo', 'photo'), ('post', 'blog', 'my_post')):
+            cursor.execute(f"""
+                INSERT INTO tag_stream_item (tag_id, kind, object_id, created_at)
+                SELECT ti.tag_id, %s, obj.id, obj.created_at
+                FROM taggit_taggeditem ti
+                JOIN django_content_type ct ON ct.id = ti.content_type_id
+                JOIN {table} obj ON obj.id = ti.object_id
+                WHERE ct.app_label = %s AND ct.model = %s
+            """, [kind, app_label, kind])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0007_post_rendered_content'),
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('photo', '0006_photo_search_index'),
+        ('tag_cloud', '0002_taggeditem_tag_index'),
+        ('taggit', '0006_rename_taggeditem_content_type_object_id_taggit_tagg_content_8fc721_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TagStreamItem',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(max_length=10, verbose_name='종류')),
+                ('object_id', models.BigIntegerField(verbose_name='객체 id')),
+                ('created_at', models.DateTimeField(verbose_name='작성일')),
+                ('tag', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='taggit.tag', verbose_name='태그')),
+            ],
+            options={
+                'verbose_name': '태그 스트림 항목',
+                'verbose_name_plural': '태그 스트림 항목 목록',
+                'db_table': 'tag_stream_item',
+                'indexes': [models.Index(fields=['tag', 'created_at', 'kind', 'object_id'], name='tag_stream_item_seek_idx'), models.Index(fields=['kind', 'object_id'], name='tag_stream_item_object_idx')],
+                'constraints': [models.UniqueConstraint(fields=('tag', 'kind', 'object_id'), name='tag_stream_item_unique')],
+            },
+        ),
+        migrations.RunPython(populate_tag_stream, migrations.RunPython.noop),
+    ]
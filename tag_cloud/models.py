@@ -1,3 +1,49 @@
 from django.db import models
+from taggit.models import Tag # Tag 모델 임포트 (django-taggit에서 제공)
 
-# Create your models here.
+
+# 태그별 사용 횟수 통계 테이블 (비정규화)
+# 태그 클라우드를 요청마다 taggit_taggeditem 전체를 집계하지 않고,
+# 이 테이블의 인덱스만 읽어서 보여주기 위해 사용합니다.
+# 값은 tag_cloud/signals.py에서 태그가 추가/삭제될 때마다 증감되며,
+# rebuild_tag_stats 관리 명령으로 다시 계산하거나 어긋남(drift)을 검사할 수 있습니다.
+class TagStat(models.Model):
+    tag = models.OneToOneField(Tag, on_delete=models.CASCADE, primary_key=True, related_name='stat', verbose_name='태그')
+    num_posts = models.PositiveIntegerField(default=0, verbose_name='게시물 수')
+    num_photos = models.PositiveIntegerField(default=0, verbose_name='사진 수')
+    num_items = models.PositiveIntegerField(default=0, db_index=True, verbose_name='전체 항목 수') # num_posts + num_photos (정렬용)
+
+    class Meta:
+        db_table = 'tag_stat'
+        verbose_name = '태그 통계'
+        verbose_name_plural = '태그 통계 목록'
+
+    def __str__(self):
+        return f'{self.tag_id}: {self.num_posts} posts, {self.num_photos} photos'
+
+
+# 통합 태그 스트림 테이블 (비정규화)
+# 태그 하나가 달린 게시물/사진을 (작성일, 종류, id) 순서로 인덱스에서 바로 읽기 위해 태그 연결마다 작성일을 함께 저장합니다.
+# taggit_taggeditem에는 작성일이 없어, 두 테이블을 조인하면 태그의 모든 항목을 읽어 정렬해야 하기 때문입니다.
+# 값은 tag_cloud/signals.py에서 태그 연결과 게시물/사진이 바뀔 때마다 갱신되며, rebuild_tag_stats 관리 명령으로 다시 채울 수 있습니다.
+class TagStreamItem(models.Model):
+    tag = models.ForeignKey(Tag, on_delete=models.CASCADE, related_name='+', db_index=False, verbose_name='태그')
+    kind = models.CharField(max_length=10, verbose_name='종류') # 'photo' / 'post' (tag_cloud/stream.py의 STREAM_MODELS)
+    object_id = models.BigIntegerField(verbose_name='객체 id')
+    created_at = models.DateTimeField(verbose_name='작성일') # 게시물/사진의 created_at
+
+    class Meta:
+        db_table = 'tag_stream_item'
+        constraints = [
+            models.UniqueConstraint(fields=['tag', 'kind', 'object_id'], name='tag_stream_item_unique'),
+        ]
+        indexes = [
+            # 태그의 항목을 커서 위치부터 (작성일, 종류, id) 순서로 읽음 (정렬 없이 per_page + 1개에서 멈춤)
+            models.Index(fields=['tag', 'created_at', 'kind', 'object_id'], name='tag_stream_item_seek_idx'),
+            models.Index(fields=['kind', 'object_id'], name='tag_stream_item_object_idx'), # 게시물/사진 삭제, 작성일 변경
+        ]
+        verbose_name = '태그 스트림 항목'
+        verbose_name_plural = '태그 스트림 항목 목록'
+
+    def __str__(self):
+        return f'{self.tag_id}: {self.kind} {self.object_id}'
@@ -0,0 +1,130 @@
+# tag_cloud/signals.py
+# 게시물/사진의 태그 변경을 태그 통계 테이블(TagStat)과 통합 태그 스트림 테이블(TagStreamItem)에 증분 반영하고,
+# 태그와 관련된 페이지 캐시를 무효화하는 시그널 수신기 모음입니다.
+# TagCloudConfig.ready()에서 이 모듈을 임포트하여 수신기를 등록합니다.
+
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+from taggit.models import Tag, TaggedItem
+
+from _20250723django import pagecache
+from blog.models import Post
+from photo.models import Photo
+from tag_cloud import stats, stream
+
+
+# 태그 추가/삭제/초기화
+# taggit은 실제로 새로 추가되거나 삭제된 태그 id만 pk_set으로 전달합니다.
+# clear()는 pk_set이 None이므로, pre_clear에서 현재 태그 목록을 기억해 두었다가 post_clear에서 차감합니다.
+@receiver(m2m_changed, sender=TaggedItem, dispatch_uid='tag_stat_tags_changed')
+def update_tag_stats(sender, instance, action, pk_set, using, **kwargs):
+    model = type(instance)
+    if model not in stats.COUNTER_FIELDS:
+        return
+    if action == 'post_add':
+        stats.apply_delta(model, pk_set, 1, using=using)
+    elif action == 'post_remove':
+        stats.apply_delta(model, pk_set, -1, using=using)
+    elif action == 'pre_clear':
+        instance._tag_stat_cleared_ids = stats.current_tag_ids(instance, using=using)
+    elif action == 'post_clear':
+        stats.apply_delta(model, getattr(instance, '_tag_stat_cleared_ids', []), -1, using=using)
+
+
+# 게시물/사진 삭제
+# 삭제 시 TaggedItem은 GenericRelation을 통해 함께 지워지며 m2m_changed가 발생하지 않으므로,
+# 삭제 전에 태그 목록을 기억해 두었다가 삭제 후 차감합니다.
+@receiver(pre_delete, sender=Post, dispatch_uid='tag_stat_post_pre_delete')
+@receiver(pre_delete, sender=Photo, dispatch_uid='tag_stat_photo_pre_delete')
+def remember_deleted_tags(sender, instance, using, **kwargs):
+    instance._tag_stat_deleted_ids = stats.current_tag_ids(instance, using=using)
+
+
+@receiver(post_delete, sender=Post, dispatch_uid='tag_stat_post_post_delete')
+@receiver(post_delete, sender=Photo, dispatch_uid='tag_stat_photo_post_delete')
+def update_tag_stats_on_delete(sender, instance, using, **kwargs):
+    stats.apply_delta(sender, getattr(instance, '_tag_stat_deleted_ids', []), -1, using=using)
+
+
+# 통합 태그 스트림: 태그 연결마다 게시물/사진의 작성일을 함께 저장합니다.
+# 게시물/사진 삭제 시에는 m2m_changed가 발생하지 않으므로 post_delete에서 지웁니다.
+@receiver(m2m_changed, sender=TaggedItem, dispatch_uid='tag_stream_tags_changed')
+def update_tag_stream(sender, instance, action, pk_set, using, **kwargs):
+    if action == 'post_add':
+        stream.add_items(instance, pk_set, using=using)
+    elif action == 'post_remove':
+        stream.remove_items(instance, pk_set, using=using)
+    elif action == 'post_clear':
+        stream.remove_items(instance, using=using)
+
+
+@receiver(post_save, sender=Post, dispatch_uid='tag_stream_post_save')
+@receiver(post_save, sender=Photo, dispatch_uid='tag_stream_photo_save')
+def update_tag_stream_created_at(sender, instance, created, using, raw=False, update_fields=None, **kwargs):
+    if created or raw: # 새 객체는 아직 태그가 없습니다.
+        return
+    if update_fields is not None and 'created_at' not in update_fields:
+        return
+    stream.update_created_at(instance, using=using)
+
+
+@receiver(post_delete, sender=Post, dispatch_uid='tag_stream_post_delete')
+@receiver(post_delete, sender=Photo, dispatch_uid='tag_stream_photo_delete')
+def remove_deleted_from_tag_stream(sender, instance, using, **kwargs):
+    stream.remove_items(instance, using=using)
+
+
+# 페이지 캐시: 태그가 추가/삭제되면 객체 상세와 목록, 관련 태그별 목록, 태그 클라우드를 무효화합니다.
+# 제거된 태그의 목록에서도 객체가 사라져야 하므로 pk_set(추가/삭제된 태그)과 현재 태그를 모두 포함합니다.
+@receiver(m2m_changed, sender=TaggedItem, dispatch_uid='page_cache_tags_changed')
+def invalidate_tagged_pages(sender, instance, action, pk_set, using, **kwargs):
+    if type(instance) not in stats.COUNTER_FIELDS:
+        return
+    if action == 'pre_clear':
+        instance._page_cache_cleared_slugs = pagecache.current_tag_slugs(instance, using)
+        return
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    tag_slugs = set(pagecache.current_tag_slugs(instance, using))
+    if pk_set:
+        tag_slugs.update(Tag.objects.using(using).filter(pk__in=pk_set).values_list('slug', flat=True))
+    tag_slugs.update(instance.__dict__.pop('_page_cache_cleared_slugs', []))
+    pagecache.invalidate(*pagecache.object_tags(instance, tag_slugs), pagecache.TAG_CLOUD, using=using)
+
+
+def _tagged_item_page_tags(tag, using):
+    # 태그가 달린 모든 게시물/사진의 상세 페이지 태그 (예: 'post:3', 'photo:7')
+    items = TaggedItem.objects.using(using).filter(tag=tag).values_list('content_type__model', 'object_id')
+    return [f'{model}:{object_id}' for model, object_id in items]
+
+
+def _tag_pages(tag, slugs, using):
+    # 태그 이름/slug가 바뀌거나 삭제되면 그 태그를 표시하는 모든 페이지를 무효화합니다.
+    return [
+        *(pagecache.taggit_tag(slug) for slug in slugs),
+        pagecache.TAG_CLOUD,
+        pagecache.list_tag(Post),
+        pagecache.list_tag(Photo),
+        *_tagged_item_page_tags(tag, using),
+    ]
+
+
+@receiver(pre_save, sender=Tag, dispatch_uid='page_cache_tag_pre_save')
+def remember_tag_slug(sender, instance, using, raw=False, **kwargs):
+    instance._page_cache_old_slug = None
+    if instance.pk and not raw:
+        instance._page_cache_old_slug = Tag.objects.using(using).filter(pk=instance.pk).values_list('slug', flat=True).first()
+
+
+@receiver(post_save, sender=Tag, dispatch_uid='page_cache_tag_save')
+def invalidate_renamed_tag_pages(sender, instance, created, using, raw=False, **kwargs):
+    if created or raw: # 새 태그는 아직 어떤 페이지에도 표시되지 않습니다.
+        return
+    slugs = {instance.slug, getattr(instance, '_page_cache_old_slug', None) or instance.slug}
+    pagecache.invalidate(*_tag_pages(instance, slugs, using), using=using)
+
+
+# 태그 삭제 시 TaggedItem이 함께 지워지므로 삭제 전에 무효화할 페이지를 계산합니다.
+@receiver(pre_delete, sender=Tag, dispatch_uid='page_cache_tag_delete')
+def invalidate_deleted_tag_pages(sender, instance, using, **kwargs):
+    pagecache.invalidate(*_tag_pages(instance, {instance.slug}, using), using=using)
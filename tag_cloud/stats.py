@@ -0,0 +1,111 @@
+# tag_cloud/stats.py
+# 태그 통계 테이블(TagStat)을 갱신하고 조회하는 함수 모음입니다.
+
+from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
+from django.db.models import Count, F, Q
+from django.db.models.functions import Greatest
+from taggit.models import Tag, TaggedItem
+
+from blog.models import Post
+from photo.models import Photo
+from tag_cloud.models import TagStat
+
+# 태그가 달리는 모델별로 증감시킬 통계 필드
+COUNTER_FIELDS = {
+    Post: 'num_posts',
+    Photo: 'num_photos',
+}
+
+
+def apply_delta(model, tag_ids, delta, using='default'):
+    # model(Post 또는 Photo)에 대한 tag_ids 태그들의 사용 횟수를 delta만큼 증감합니다.
+    # 통계 행이 없으면 먼저 만들고, F() 식으로 갱신하므로 동시에 여러 요청이 와도 값이 어긋나지 않습니다.
+    # 통계가 이미 어긋나 있으면(예: 시그널 없이 태그를 만든 뒤 삭제, 새로 만든 행에서 차감) 음수가 되어
+    # PositiveIntegerField의 CHECK 제약을 위반하므로 0에서 멈추고, 어긋남은 find_drift()가 보고합니다.
+    field = COUNTER_FIELDS.get(model)
+    tag_ids = list(tag_ids or [])
+    if field is None or not tag_ids or not delta:
+        return
+    stats = TagStat.objects.using(using)
+    with transaction.atomic(using=using):
+        stats.bulk_create([TagStat(tag_id=tag_id) for tag_id in tag_ids], ignore_conflicts=True)
+        stats.filter(tag_id__in=tag_ids).update(
+            **{field: Greatest(F(field) + delta, 0)},
+            num_items=Greatest(F('num_items') + delta, 0),
+        )
+
+
+def current_tag_ids(instance, using='default'):
+    # instance(게시물/사진)에 현재 달려 있는 태그 id 목록 (삭제 직전 기억용)
+    content_type = ContentType.objects.db_manager(using).get_for_model(instance)
+    return list(
+        TaggedItem.objects.using(using)
+        .filter(content_type=content_type, object_id=instance.pk)
+        .values_list('tag_id', flat=True)
+    )
+
+
+def tags_with_counts():
+    # 태그 클라우드용 쿼리셋: 통계 테이블의 num_items 인덱스를 읽어 사용 횟수 순으로 정렬합니다.
+    # 템플릿이 사용하는 num_blog_posts / num_photos / num_items 이름을 그대로 제공합니다.
+    return (
+        Tag.objects.filter(stat__num_items__gt=0)
+        .annotate(
+            num_blog_posts=F('stat__num_posts'),
+            num_photos=F('stat__num_photos'),
+            num_items=F('stat__num_items'),
+        )
+        .order_by('-stat__num_items')
+    )
+
+
+def top_tags(model, limit, slug=None):
+    # model(Post 또는 Photo)에 가장 많이 쓰인 태그 limit개 (관리자 태그 필터용, slug를 주면 그 태그만)
+    field = COUNTER_FIELDS[model]
+    tags = Tag.objects.filter(**{f'stat__{field}__gt': 0})
+    if slug is not None:
+        tags = tags.filter(slug=slug)
+    return tags.order_by(f'-stat__{field}', 'name')[:limit]
+
+
+def compute_counts():
+    # taggit_taggeditem 전체를 집계하여 {tag_id: (num_posts, num_photos)}를 만듭니다. (재계산/검사용)
+    content_types = ContentType.objects.get_for_models(*COUNTER_FIELDS)
+    rows = (
+        TaggedItem.objects.values('tag_id')
+        .annotate(
+            num_posts=Count('id', filter=Q(content_type=content_types[Post])),
+            num_photos=Count('id', filter=Q(content_type=content_types[Photo])),
+        )
+    )
+    return {row['tag_id']: (row['num_posts'], row['num_photos']) for row in rows}
+
+
+def find_drift():
+    # 통계 테이블과 실제 집계 값이 다른 태그 목록을 [(tag_id, 저장된 값, 실제 값), ...] 형태로 반환합니다.
+    expected = compute_counts()
+    stored = {
+        stat.tag_id: (stat.num_posts, stat.num_photos, stat.num_items)
+        for stat in TagStat.objects.all()
+    }
+    drift = []
+    for tag_id in expected.keys() | stored.keys():
+        num_posts, num_photos = expected.get(tag_id, (0, 0))
+        actual = (num_posts, num_photos, num_posts + num_photos)
+        saved = stored.get(tag_id, (0, 0, 0))
+        if saved != actual:
+            drift.append((tag_id, saved, actual))
+    return drift
+
+
+@transaction.atomic
+def rebuild():
+    # 통계 테이블을 실제 집계 값으로 다시 채웁니다. 생성된 행 수를 반환합니다.
+    TagStat.objects.all().delete()
+    stats = [
+        TagStat(tag_id=tag_id, num_posts=num_posts, num_photos=num_photos, num_items=num_posts + num_photos)
+        for tag_id, (num_posts, num_photos) in compute_counts().items()
+    ]
+    TagStat.objects.bulk_create(stats, batch_size=1000)
+    return len(stats)
@@ -0,0 +1,178 @@
+# tag_cloud/stream.py
+# 태그 하나가 달린 게시물과 사진을 최신순으로 섞어 보여주는 통합 태그 스트림입니다.
+# - 태그 연결마다 게시물/사진의 작성일을 함께 저장한 스트림 테이블(TagStreamItem)을
+#   (tag_id, created_at, kind, object_id) 인덱스 순서대로 per_page + 1개만 읽습니다. (정렬 없음)
+#   커서 위치는 작성일 범위 조건으로 인덱스에서 바로 찾아가므로 (OFFSET 없음) 태그의 항목 수나 페이지 깊이와 관계없이 비용이 같습니다.
+# - 스트림 테이블은 태그 연결 / 게시물·사진 변경 시그널(tag_cloud/signals.py)이 갱신하고,
+#   시그널 없이 태그를 바꾼 뒤(bulk_create, seed_data)에는 rebuild_tag_stats 관리 명령(rebuild())으로 다시 채웁니다.
+# - 페이지의 게시물/사진 객체는 종류별 in_bulk() 한 번씩으로 불러와 스트림 순서대로 늘어놓습니다.
+
+from django.core.exceptions import ValidationError
+from django.db import connection, transaction
+from django.db.models import Q
+from django.http import Http404
+
+from _20250723django.pagination import CursorPage, InvalidCursor, decode_cursor, encode_cursor
+from blog.models import Post
+from photo.models import Photo
+from tag_cloud.models import TagStreamItem
+
+# 종류 이름: 모델 (같은 작성일에서는 종류 이름, id 순으로 정렬)
+STREAM_MODELS = {
+    'photo': Photo,
+    'post': Post,
+}
+STREAM_KINDS = {model: kind for kind, model in STREAM_MODELS.items()}
+
+
+# --- 스트림 테이블 갱신 ---
+
+def add_items(instance, tag_ids, using='default'):
+    # instance(게시물/사진)에 tag_ids 태그가 달림
+    kind = STREAM_KINDS.get(type(instance))
+    tag_ids = list(tag_ids or [])
+    if kind is None or not tag_ids:
+        return
+    TagStreamItem.objects.using(using).bulk_create([
+        TagStreamItem(tag_id=tag_id, kind=kind, object_id=instance.pk, created_at=instance.created_at)
+        for tag_id in tag_ids
+    ], ignore_conflicts=True)
+
+
+def remove_items(instance, tag_ids=None, using='default'):
+    # instance(게시물/사진)에서 tag_ids 태그가 빠짐 (None이면 모든 태그)
+    kind = STREAM_KINDS.get(type(instance))
+    if kind is None:
+        return
+    items = TagStreamItem.objects.using(using).filter(kind=kind, object_id=instance.pk)
+    if tag_ids is not None:
+        items = items.filter(tag_id__in=list(tag_ids))
+    items.delete()
+
+
+def update_created_at(instance, using='default'):
+    # 게시물/사진의 작성일이 바뀌면 스트림 안의 위치도 옮깁니다. (바뀌지 않았으면 갱신되는 행 없음)
+    kind = STREAM_KINDS.get(type(instance))
+    if kind is None:
+        return
+    TagStreamItem.objects.using(using).filter(kind=kind, object_id=instance.pk).exclude(
+        created_at=instance.created_at,
+    ).update(created_at=instance.created_at)
+
+
+def rebuild():
+    # 스트림 테이블을 태그 연결(taggit_taggeditem)과 게시물/사진의 작성일로 다시 채웁니다. 생성된 행 수를 반환합니다.
+    from django.contrib.contenttypes.models import ContentType
+    from taggit.models import TaggedItem
+
+    content_types = ContentType.objects.get_for_models(*STREAM_KINDS)
+    count = 0
+    with transaction.atomic(), connection.cursor() as cursor:
+        TagStreamItem.objects.all().delete()
+        for model, kind in STREAM_KINDS.items():
+            cursor.execute(f"""
+                INSERT INTO {TagStreamItem._meta.db_table} (tag_id, kind, object_id, created_at)
+                SELECT ti.tag_id, %s, obj.id, obj.created_at
+                FROM {TaggedItem._meta.db_table} ti
+                JOIN {model._meta.db_table} obj ON obj.id = ti.object_id
+                WHERE ti.content_type_id = %s
+            """, [kind, content_types[model].pk])
+            count += cursor.rowcount
+    return count
+
+
+# --- 페이지네이터 ---
+
+def _after(cursor, descending):
+    # 정렬 방향 기준으로 커서 (작성일, 종류, id) "다음"에 오는 항목 조건
+    # 앞의 작성일 범위 조건(이하/이상)으로 인덱스에서 커서 위치를 바로 찾고, 같은 작성일 안에서는 (종류, id)로 나눕니다.
+    created_at, kind, pk = cursor
+    op = 'lt' if descending else 'gt'
+    return Q(**{f'created_at__{op}e': created_at}) & (
+        Q(**{f'created_at__{op}': created_at})
+        | Q(created_at=created_at, **{f'kind__{op}': kind})
+        | Q(created_at=created_at, kind=kind, **{f'object_id__{op}': pk})
+    )
+
+
+class TagStreamPaginator:
+    # CursorPaginator와 같은 방식(한 개 더 읽기, 역방향으로 이전 페이지)의 태그 스트림 페이지네이터
+    # 페이지 항목은 게시물/사진 객체이며, 템플릿에서 구분할 수 있도록 stream_kind 속성('post' / 'photo')이 붙습니다.
+
+    def __init__(self, tag, per_page):
+        self.tag = tag
+        self.per_page = per_page
+
+    def _decode(self, token):
+        # 토큰의 정렬 값은 [작성일, 종류]입니다.
+        try:
+            (value, kind), pk, reverse = decode_cursor(token)
+            created_at = Post._meta.get_field('created_at').to_python(value)
+        except (InvalidCursor, ValidationError, TypeError, ValueError):
+            raise Http404('잘못된 페이지 커서입니다.')
+        if kind not in STREAM_MODELS or created_at is None:
+            raise Http404('잘못된 페이지 커서입니다.')
+        return (created_at, kind, pk), reverse
+
+    def _prepare(self, token):
+        # token이 가리키는 위치부터 (종류, id, 작성일)을 읽을 쿼리셋과 방향(reverse)을 준비합니다.
+        cursor, reverse = self._decode(token) if token else (None, False)
+        descending = not reverse
+        queryset = TagStreamItem.objects.filter(tag=self.tag)
+        if cursor is not None:
+            queryset = queryset.filter(_after(cursor, descending))
+        prefix = '-' if descending else ''
+        queryset = queryset.order_by(f'{prefix}created_at', f'{prefix}kind', f'{prefix}object_id')
+        return queryset.values('object_id', 'created_at', 'kind')[:self.per_page + 1], reverse
+
+    def _group(self, rows):
+        # 스트림 행 (id, 작성일, 종류)의 id를 종류별로 모읍니다.
+        ids = {}
+        for row in rows:
+            ids.setdefault(row['kind'], []).append(row['object_id'])
+        return ids
+
+    def _objects(self, kind):
+        model = STREAM_MODELS[kind]
+        # 카드에 표시하지 않는 게시물 본문은 읽지 않습니다.
+        return model.objects.select_related('author').defer(*getattr(model, 'list_deferred_fields', ()))
+
+    def _make_page(self, rows, objects, token, reverse):
+        has_more = len(rows) > self.per_page
+        rows = rows[:self.per_page]
+        if reverse:
+            rows.reverse()
+        items = []
+        for row in rows:
+            obj = objects[row['kind']].get(row['object_id'])
+            if obj is not None: # 스트림 조회와 객체 조회 사이에 삭제된 항목은 건너뜀
+                obj.stream_kind = row['kind']
+                items.append(obj)
+
+        if reverse:
+            has_next, has_previous = True, has_more
+        else:
+            has_next, has_previous = has_more, bool(token)
+        next_cursor = previous_cursor = None
+        if rows:
+            first, last = rows[0], rows[-1]
+            if has_next:
+                next_cursor = encode_cursor([last['created_at'].isoformat(), last['kind']], last['object_id'])
+            if has_previous:
+                previous_cursor = encode_cursor([first['created_at'].isoformat(), first['kind']], first['object_id'], reverse=True)
+        return CursorPage(items, next_cursor, previous_cursor)
+
+    def page(self, token=None):
+        queryset, reverse = self._prepare(token)
+        rows = list(queryset)
+        objects = {kind: self._objects(kind).in_bulk(pks) for kind, pks in self._group(rows).items()}
+        return self._make_page(rows, objects, token, reverse)
+
+    async def apage(self, token=None):
+        # page()의 비동기 버전 (비동기 뷰에서 사용)
+        queryset, reverse = self._prepare(token)
+        rows = [row async for row in queryset]
+        objects = {}
+        for kind, pks in self._group(rows).items():
+            objects[kind] = await self._objects(kind).ain_bulk(pks)
+        return self._make_page(rows, objects, token, reverse)
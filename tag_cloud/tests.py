@@ -1,3 +1,119 @@
-from django.test import TestCase
+from datetime import timedelta
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.http import Http404
+from django.test import RequestFactory, TestCase
+from django.utils import timezone
+from taggit.models import Tag
+
+from _20250723django.pagination import encode_cursor
+from _20250723django.queryplan import plan_problems, query_plan
+from blog.models import Post
+from photo.models import Photo
+from tag_cloud import stats, stream
+from tag_cloud.models import TagStat, TagStreamItem
+from tag_cloud.stream import TagStreamPaginator
+from tag_cloud.views import TagStreamView
+
+
+# 통합 태그 스트림: 작성일이 같은 게시물/사진이 섞여 있어도 다음/이전 페이지가 빠짐이나 중복 없이 이어져야 합니다.
+class TagStreamPaginatorTests(TestCase):
+
+    def setUp(self):
+        author = User.objects.create_user('author')
+        self.created_at = timezone.now().replace(microsecond=0)
+        self.objects = []
+        for i in range(3):
+            self.objects.append(Post.objects.create(title=f'p{i}', slug=f'p{i}', description='', content='', author=author))
+            self.objects.append(Photo.objects.create(title=f'f{i}', image=f'photos/f{i}.jpg', author=author))
+        older = Post.objects.create(title='old', slug='old', description='', content='', author=author)
+        for obj in self.objects:
+            obj.created_at = self.created_at # post_save가 스트림의 작성일도 옮깁니다.
+            obj.save()
+        older.created_at = self.created_at - timedelta(days=1)
+        older.save()
+        self.objects.append(older)
+        for obj in self.objects:
+            obj.tags.add('django')
+        self.tag = Tag.objects.get(slug='django')
+
+    def expected(self):
+        # 작성일, 종류, id 역순 (스트림 테이블 인덱스의 역방향 순서)
+        rows = [
+            (obj.created_at, stream.STREAM_KINDS[type(obj)], obj.pk)
+            for obj in self.objects if obj.tags.filter(pk=self.tag.pk).exists()
+        ]
+        return [(kind, pk) for _, kind, pk in sorted(rows, reverse=True)]
+
+    def traverse(self, per_page):
+        paginator = TagStreamPaginator(self.tag, per_page)
+        pages = [paginator.page()]
+        while pages[-1].next_cursor:
+            pages.append(paginator.page(pages[-1].next_cursor))
+        # 마지막 페이지에서 이전 페이지로 돌아가면 같은 페이지가 같은 순서로 나와야 합니다.
+        backward = [pages[-1]]
+        while backward[-1].previous_cursor:
+            backward.append(paginator.page(backward[-1].previous_cursor))
+        keys = lambda page: [(obj.stream_kind, obj.pk) for obj in page.object_list]
+        self.assertEqual([keys(page) for page in reversed(backward)], [keys(page) for page in pages])
+        return [key for page in pages for key in keys(page)]
+
+    def test_pages_traverse_tied_created_at(self):
+        for per_page in (1, 2, 4, 10):
+            with self.subTest(per_page=per_page):
+                self.assertEqual(self.traverse(per_page), self.expected())
+
+    def test_stream_follows_tag_and_object_changes(self):
+        removed, deleted, moved = self.objects[0], self.objects[1], self.objects[2]
+        removed.tags.remove('django')
+        deleted.delete()
+        self.objects.remove(deleted)
+        moved.created_at = self.created_at + timedelta(days=1)
+        moved.save(update_fields=['created_at'])
+        self.objects[-1].tags.clear()
+        expected = self.expected()
+        self.assertEqual(expected[0], ('post', moved.pk))
+        self.assertEqual(self.traverse(2), expected)
+        saved = sorted(TagStreamItem.objects.values_list('tag_id', 'kind', 'object_id', 'created_at'))
+        stream.rebuild() # 시그널로 갱신한 결과가 다시 채운 결과와 같아야 합니다.
+        self.assertEqual(sorted(TagStreamItem.objects.values_list('tag_id', 'kind', 'object_id', 'created_at')), saved)
+
+    def test_stream_seeks_index_without_sorting(self):
+        paginator = TagStreamPaginator(self.tag, 12)
+        cursor = [self.created_at.isoformat(), 'photo']
+        for token in (None, encode_cursor(cursor, 1), encode_cursor(cursor, 1, reverse=True)):
+            with self.subTest(token=token):
+                queryset = paginator._prepare(token)[0]
+                self.assertEqual(plan_problems(queryset), [])
+                self.assertTrue(any('tag_stream_item_seek_idx' in detail for detail in query_plan(queryset)))
+
+    def test_view_pages_and_invalid_cursor(self):
+        def context(**params):
+            view = TagStreamView()
+            view.setup(RequestFactory().get('/tagcloud/django/', params), tag_slug='django')
+            return view.get_context_data(tag_slug='django')
+
+        first = context()
+        self.assertEqual([(obj.stream_kind, obj.pk) for obj in first['items']], self.expected()[:TagStreamView.paginate_by])
+        self.assertEqual(first['tag'], self.tag)
+        for token in (encode_cursor(['x', 'photo'], 1), encode_cursor([self.created_at.isoformat(), 'tag'], 1)):
+            with self.subTest(token=token), self.assertRaises(Http404):
+                context(cursor=token)
+
+
+# 태그 통계(stats.apply_delta): 통계 행이 없거나 이미 어긋난 태그를 차감해도 오류 없이 0에서 멈추고, 어긋남은 find_drift()가 보고해야 합니다.
+class TagStatDeltaTests(TestCase):
+
+    def test_negative_delta_on_new_row_is_clamped(self):
+        author = User.objects.create_user('author')
+        post = Post.objects.create(title='t', slug='t', description='', content='', author=author)
+        post.tags.add('django')
+        tag = Tag.objects.get(slug='django')
+        TagStat.objects.all().delete() # 시그널 없이 태그를 단 경우 (통계 행 없음)
+        post.tags.remove(tag)
+        self.assertEqual(TagStat.objects.values_list('num_posts', 'num_photos', 'num_items').get(tag=tag), (0, 0, 0))
+        self.assertEqual(stats.find_drift(), [])
+        stats.apply_delta(Post, [tag.pk], -1)
+        stats.apply_delta(Photo, [tag.pk], 1)
+        self.assertEqual(TagStat.objects.values_list('num_posts', 'num_photos', 'num_items').get(tag=tag), (0, 1, 1))
+        self.assertEqual(stats.find_drift(), [(tag.pk, (0, 1, 1), (0, 0, 0))])
@@ -1,9 +1,18 @@
-from django.urls import path
-from .views import UnifiedTagCloudTV # UnifiedTagCloudTV 임포트
+from django.urls import path, re_path
+from . import views # UnifiedTagCloudTV가 있는 views 모듈 임포트
 
 app_name = 'tag_cloud' # 이 앱의 네임스페이스를 'tag_cloud'로 설정
 
-urlpatterns = [
-    # 통합 태그 클라우드 페이지: /tagcloud/
-    path('', UnifiedTagCloudTV.as_view(), name='index'),
-]
+
+def build_urlpatterns(views):
+    # 동기 뷰(tag_cloud/views.py)와 비동기 뷰(tag_cloud/async_views.py)가 같은 URL 패턴을 사용하도록 뷰 모듈을 인자로 받습니다.
+    return [
+        # 통합 태그 클라우드 페이지: /tagcloud/
+        path('', views.UnifiedTagCloudTV.as_view(), name='index'),
+
+        # 통합 태그 페이지 (게시물 + 사진, 최신순): /tagcloud/django/ (한글 태그 slug 허용)
+        re_path(r'^(?P<tag_slug>[-\w\uAC00-\uD7A3]+)/$', views.TagStreamView.as_view(), name='tag_detail'),
+    ]
+
+
+urlpatterns = build_urlpatterns(views)
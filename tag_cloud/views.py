@@ -1,32 +1,22 @@
-from django.views.generic import ListView
-from taggit.models import Tag # Tag 모델 임포트
-from django.db.models import Count, Q, F # Count, Q, F 함수 임포트
-from blog.models import Post # Post 모델 임포트 (블로그 게시물 수 계산을 위해)
-from photo.models import Photo # Photo 모델 임포트 (사진 수 계산을 위해)
+from django.shortcuts import get_object_or_404
+from django.views.generic import ListView, TemplateView
+from taggit.models import Tag
+from tag_cloud.stats import tags_with_counts # 태그 통계 테이블 기반 태그 클라우드 쿼리셋
+from tag_cloud.stream import TagStreamPaginator # 게시물 + 사진 통합 태그 스트림 (스트림 테이블, 커서 페이지)
+from _20250723django import pagecache # 익명 사용자 페이지 캐시 (의존 태그 선언)
+from _20250723django.pagecache import PageCacheMixin
 
 # 통합 태그 클라우드 뷰
-class UnifiedTagCloudTV(ListView):
+class UnifiedTagCloudTV(PageCacheMixin, ListView):
     # model = Tag # Tag 모델을 직접 사용하지 않고, 쿼리셋에서 Tag 객체를 생성하므로 주석 처리합니다.
     template_name = 'tag_cloud/unified_tag_cloud.html' # 렌더링할 템플릿 파일 경로
     context_object_name = 'tags' # 템플릿에서 태그 목록을 'tags'로 접근
+    page_cache_tags = (pagecache.TAG_CLOUD,) # 태그 추가/삭제/이름 변경 시 무효화
 
     def get_queryset(self):
-        # 모든 태그를 가져오고, 각 태그에 연결된 블로그 게시물과 사진의 개수를 계산합니다.
-        # TaggedItem을 통해 Post와 Photo를 구분하여 Count하는 방식을 사용합니다.
-        
-        tags_with_counts = Tag.objects.annotate(
-            # 'taggit_taggeditem_items'는 TaggedItem 모델의 related_name입니다.
-            # filter=Q(taggit_taggeditem_items__content_type__model='post')는
-            # TaggedItem이 연결된 모델이 'post'인 경우만 필터링하여 Count합니다.
-            num_blog_posts=Count('taggit_taggeditem_items', filter=Q(taggit_taggeditem_items__content_type__model='post')),
-            # 'photo' 모델에 연결된 TaggedItem만 필터링하여 Count합니다.
-            num_photos=Count('taggit_taggeditem_items', filter=Q(taggit_taggeditem_items__content_type__model='photo'))
-        ).annotate(
-            # 전체 아이템 수 = 블로그 게시물 수 + 사진 수
-            num_items=F('num_blog_posts') + F('num_photos')
-        ).filter(num_items__gt=0).order_by('-num_items') # 하나라도 연결된 태그만 표시하고, 전체 아이템 수 기준으로 내림차순 정렬
-
-        return tags_with_counts
+        # 태그 통계 테이블(TagStat)에 미리 집계된 게시물/사진 수를 읽어옵니다.
+        # 요청마다 taggit_taggeditem 전체를 집계하지 않고 num_items 인덱스 순서로 바로 조회합니다.
+        return tags_with_counts()
     
     # get_context_data는 이제 필요하지 않습니다. num_items가 쿼리셋에 이미 추가되었습니다.
     # def get_context_data(self, **kwargs):
@@ -34,3 +24,20 @@ class UnifiedTagCloudTV(ListView):
     #     for tag in context['tags']:
     #         tag.num_items = tag.num_blog_posts + tag.num_photos
     #     return context
+
+
+# 통합 태그 페이지: 태그가 달린 게시물과 사진을 최신순으로 함께 보여줍니다. (?cursor=로 다음/이전 페이지)
+class TagStreamView(PageCacheMixin, TemplateView):
+    template_name = 'tag_cloud/tag_stream.html'
+    paginate_by = 12
+
+    def get_page_cache_tags(self):
+        # 해당 태그가 달린 게시물/사진의 추가/삭제/수정에만 의존합니다.
+        return [pagecache.taggit_tag(self.kwargs['tag_slug'])]
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        tag = get_object_or_404(Tag, slug=self.kwargs['tag_slug'])
+        page = TagStreamPaginator(tag, self.paginate_by).page(self.request.GET.get('cursor'))
+        context.update(tag=tag, items=page.object_list, cursor_page=page)
+        return context